@@ -96,11 +96,20 @@ def catch_all(path):
     # Call the original WSGI app
     response_body = wsgi_app(request.environ, start_response)
 
+    # Streamed bodies (e.g. CSV exports) are passed through chunk by chunk instead of
+    # being joined in memory; the iterable is closed once the server finishes sending it.
+    if not isinstance(response_body, list):
+        response = flask_app.response_class(
+            response_body,
+            status=response_data.get('status', '200 OK'),
+            headers=response_data.get('headers', []),
+        )
+        if hasattr(response_body, 'close'):
+            response.call_on_close(response_body.close)
+        return response
+
     # Convert WSGI response to Flask response
-    if isinstance(response_body, list):
-        body = b''.join(response_body)
-    else:
-        body = b''.join(list(response_body))
+    body = b''.join(response_body)
 
     # Parse status code
     status_code = int(response_data.get('status', '200 OK').split()[0])
@@ -23,12 +23,13 @@ import smtplib
 import sqlite3
 import threading
 import traceback
+from functools import lru_cache
 from socketserver import ThreadingMixIn
 from urllib import error as urlerror
 from urllib import request as urlrequest
 from email.message import EmailMessage
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import parse_qs, quote, unquote, urlencode
 from wsgiref.simple_server import WSGIServer, make_server
 from zoneinfo import ZoneInfo
@@ -62,6 +63,8 @@ DB_SYNCHRONOUS = os.environ.get("MAKERSPACE_DB_SYNCHRONOUS", "NORMAL").strip().u
 DB_CACHE_SIZE_KB = max(4096, int(os.environ.get("MAKERSPACE_DB_CACHE_SIZE_KB", "65536")))
 DB_MMAP_SIZE_BYTES = max(0, int(os.environ.get("MAKERSPACE_DB_MMAP_SIZE_BYTES", "268435456")))
 DB_TEMP_STORE_MEMORY = os.environ.get("MAKERSPACE_DB_TEMP_STORE_MEMORY", "1") == "1"
+DB_STATEMENT_CACHE_SIZE = max(128, int(os.environ.get("MAKERSPACE_DB_STATEMENT_CACHE_SIZE", "512")))
+DB_POOL_SIZE = max(0, int(os.environ.get("MAKERSPACE_DB_POOL_SIZE", "8")))
 GCAL_CLIENT_ID = os.environ.get("MAKERSPACE_GCAL_CLIENT_ID", "")
 GCAL_CLIENT_SECRET = os.environ.get("MAKERSPACE_GCAL_CLIENT_SECRET", "")
 GCAL_REFRESH_TOKEN = os.environ.get("MAKERSPACE_GCAL_REFRESH_TOKEN", "")
@@ -584,7 +587,25 @@ COMMENTABLE_ENTITY_TABLE: Dict[str, str] = {
     "project": "projects",
 }
 
+# Reassignment statements used when a team/space is deleted. Keeping the SQL text constant lets
+# the connection's statement cache reuse the compiled plan; params are (replacement, org, old).
+TEAM_DELETE_REASSIGN_SQL = (
+    "UPDATE projects SET team_id = ? WHERE organization_id = ? AND team_id = ?",
+    "UPDATE tasks SET team_id = ? WHERE organization_id = ? AND team_id = ?",
+)
+SPACE_DELETE_REASSIGN_SQL = (
+    "UPDATE projects SET space_id = ? WHERE organization_id = ? AND space_id = ?",
+    "UPDATE tasks SET space_id = ? WHERE organization_id = ? AND space_id = ?",
+    "UPDATE consumables SET space_id = ? WHERE organization_id = ? AND space_id = ?",
+)
+# Rows fetched per chunk when streaming CSV exports / inserted per executemany on imports.
+CSV_EXPORT_BATCH_ROWS = 1000
+CSV_IMPORT_BATCH_ROWS = 1000
+
 RATE_LIMIT: Dict[str, List[dt.datetime]] = {}
+# Idle SQLite connections reused across requests (bounded by DB_POOL_SIZE).
+DB_POOL: List[sqlite3.Connection] = []
+DB_POOL_LOCK = threading.Lock()
 BOOTSTRAPPED = False
 BOOTSTRAP_LOCK = threading.Lock()
 BOOTSTRAP_ERROR = ""
@@ -1368,10 +1389,7 @@ class CompatCursor:
     def rowcount(self) -> int:
         return int(getattr(self._cursor, "rowcount", -1))
 
-    def fetchone(self):
-        row = self._cursor.fetchone()
-        if row is None:
-            return None
+    def _wrap(self, row: Any):
         if isinstance(row, dict):
             return CompatRow(row, self._order)
         if isinstance(row, tuple):
@@ -1379,18 +1397,17 @@ class CompatCursor:
             return CompatRow(mapped, self._order)
         return row
 
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is None:
+            return None
+        return self._wrap(row)
+
+    def fetchmany(self, size: int):
+        return [self._wrap(row) for row in self._cursor.fetchmany(size)]
+
     def fetchall(self):
-        rows = self._cursor.fetchall()
-        out = []
-        for row in rows:
-            if isinstance(row, dict):
-                out.append(CompatRow(row, self._order))
-            elif isinstance(row, tuple):
-                mapped = {self._order[idx]: row[idx] for idx in range(min(len(self._order), len(row)))}
-                out.append(CompatRow(mapped, self._order))
-            else:
-                out.append(row)
-        return out
+        return [self._wrap(row) for row in self._cursor.fetchall()]
 
 
 def _split_sql_script(script: str) -> List[str]:
@@ -1456,7 +1473,11 @@ def _adapt_sql_for_postgres(sql: str) -> str:
     # SQLite upsert shortcut compatibility.
     text = re.sub(r"INSERT\s+OR\s+IGNORE\s+INTO", "INSERT INTO", text, flags=re.IGNORECASE)
     if re.match(r"^INSERT\s+INTO\s+", text, flags=re.IGNORECASE) and " ON CONFLICT " not in text.upper():
-        text = f"{text} ON CONFLICT DO NOTHING"
+        returning = re.search(r"\sRETURNING\s", text, flags=re.IGNORECASE)
+        if returning:
+            text = f"{text[:returning.start()]} ON CONFLICT DO NOTHING{text[returning.start():]}"
+        else:
+            text = f"{text} ON CONFLICT DO NOTHING"
     return _replace_qmark_params(text)
 
 
@@ -1496,6 +1517,16 @@ class PostgresCompatConnection:
                 last_id = None
         return CompatCursor(cur, order=order, lastrowid=last_id)
 
+    def executemany(self, sql: str, seq_of_params: Iterable[Tuple[Any, ...]]):
+        cur = self._conn.cursor()
+        try:
+            cur.executemany(_adapt_sql_for_postgres(sql), list(seq_of_params))
+        except Exception as exc:
+            if getattr(exc, "sqlstate", "").startswith("23"):
+                raise sqlite3.IntegrityError(str(exc))
+            raise
+        return CompatCursor(cur)
+
     def executescript(self, script: str):
         for stmt in _split_sql_script(script):
             self.execute(stmt)
@@ -1515,7 +1546,14 @@ def db_connect():
         return PostgresCompatConnection(raw)
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH), timeout=DB_BUSY_TIMEOUT_MS / 1000.0)
+    # sqlite3 keeps compiled statements per connection keyed by SQL text; the default of 128
+    # entries is smaller than the distinct statements this app issues, which forces re-prepares.
+    conn = sqlite3.connect(
+        str(DB_PATH),
+        timeout=DB_BUSY_TIMEOUT_MS / 1000.0,
+        cached_statements=DB_STATEMENT_CACHE_SIZE,
+        check_same_thread=False,
+    )
     conn.row_factory = sqlite3.Row
     conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
     conn.execute("PRAGMA foreign_keys = ON")
@@ -1532,6 +1570,49 @@ def db_connect():
     return conn
 
 
+def acquire_db_connection():
+    """Return a request connection, reusing an idle pooled SQLite connection when available.
+
+    Decision rationale:
+    - `ThreadedWSGIServer` spawns a thread per request, so a thread-local cache would never be
+      reused; a small shared pool keeps the statement cache, page cache, and PRAGMAs warm instead.
+    - PostgreSQL connections keep the open-per-request behavior.
+    """
+    if DB_BACKEND == "sqlite" and DB_POOL_SIZE > 0:
+        with DB_POOL_LOCK:
+            if DB_POOL:
+                return DB_POOL.pop()
+    return db_connect()
+
+
+def release_db_connection(conn) -> None:
+    """Hand a request connection back to the pool, discarding uncommitted work first."""
+    if isinstance(conn, sqlite3.Connection) and DB_POOL_SIZE > 0:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+        with DB_POOL_LOCK:
+            if len(DB_POOL) < DB_POOL_SIZE:
+                DB_POOL.append(conn)
+                return
+    conn.close()
+
+
+def begin_immediate(conn) -> None:
+    """Open an explicit write transaction before a multi-statement change.
+
+    Decision rationale:
+    - `BEGIN IMMEDIATE` takes the SQLite write lock before validation reads, so the checks and
+      the follow-up UPDATE/DELETE batch see one consistent snapshot and commit together.
+    - PostgreSQL connections already run inside an implicit transaction, so this is a no-op there.
+    """
+    if isinstance(conn, sqlite3.Connection) and not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
 class ThreadedWSGIServer(ThreadingMixIn, WSGIServer):
     """Thread-per-request WSGI server for small-team production deployments.
 
@@ -3344,11 +3425,12 @@ class Response:
 
     def __init__(
         self,
-        body: str = "",
+        body: Any = "",
         status: str = "200 OK",
         content_type: str = "text/html; charset=utf-8",
         headers: Optional[List[Tuple[str, str]]] = None,
     ):
+        # Bytes bodies are sent in one piece; any other iterable of bytes is streamed as-is.
         self.body = body.encode("utf-8") if isinstance(body, str) else body
         self.status = status
         self.content_type = content_type
@@ -3368,7 +3450,9 @@ class Response:
             ),
         ]
         start_response(self.status, sec_headers + self.headers)
-        return [self.body]
+        if isinstance(self.body, bytes):
+            return [self.body]
+        return self.body
 
 
 def redirect(location: str, cookies: Optional[List[str]] = None) -> Response:
@@ -3520,6 +3604,17 @@ def assignable_membership_roles(can_assign_owner: bool) -> List[str]:
     return [role for role in MEMBERSHIP_ROLE_OPTIONS if role not in {"workspace_admin", "owner"}]
 
 
+# Checkbox-backed preferences; each is stored as a JSON boolean under the same key as its form field.
+BOOLEAN_PREFERENCE_KEYS = (
+    "show_weekend_alert",
+    "dashboard_compact",
+    "email_task_updates",
+    "email_project_updates",
+    "email_comments",
+    "email_mentions",
+)
+
+
 def default_user_preferences() -> Dict[str, object]:
     return {
         "default_task_scope": "my",
@@ -3560,18 +3655,26 @@ def save_user_preferences(conn: sqlite3.Connection, user_id: int, prefs: Dict[st
         )
 
 
-def available_nav_items(role: str) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+@lru_cache(maxsize=16)
+def available_nav_items(role: str) -> Tuple[Tuple[Dict[str, str], ...], Tuple[Dict[str, str], ...]]:
+    # Pure function of role + static nav config, so results are memoized (tuples keep them immutable).
     primary = [item for item in NAV_PRIMARY_ITEMS if role_allows(role, item["min_role"])]
     if not FEATURE_INTAKE_ENABLED:
         primary = [item for item in primary if str(item.get("key")) != "intake"]
     account = [item for item in NAV_ACCOUNT_ITEMS if role_allows(role, item["min_role"])]
-    return primary, account
+    return tuple(primary), tuple(account)
 
 
 def nav_keys(items: Iterable[Dict[str, str]]) -> List[str]:
     return [str(item["key"]) for item in items]
 
 
+@lru_cache(maxsize=16)
+def role_nav_keys(role: str) -> Tuple[str, ...]:
+    primary, account = available_nav_items(role)
+    return tuple(nav_keys(primary + account))
+
+
 def sanitize_nav_key_selection(
     requested: Iterable[object],
     allowed: Iterable[str],
@@ -3627,25 +3730,20 @@ def save_role_nav_preference(
     role: str,
     visible_keys: List[str],
     updated_by: int,
-) -> None:
-    existing = conn.execute(
-        "SELECT id FROM role_nav_preferences WHERE organization_id = ? AND role = ?",
-        (org_id, role),
+) -> Optional[sqlite3.Row]:
+    """Upsert a role's nav defaults and return the stored row (used as the audit after-snapshot)."""
+    return conn.execute(
+        """
+        INSERT INTO role_nav_preferences (organization_id, role, visible_json, updated_by, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (organization_id, role) DO UPDATE SET
+            visible_json = excluded.visible_json,
+            updated_by = excluded.updated_by,
+            updated_at = excluded.updated_at
+        RETURNING *
+        """,
+        (org_id, role, json.dumps(visible_keys), updated_by, iso()),
     ).fetchone()
-    payload = json.dumps(visible_keys)
-    if existing:
-        conn.execute(
-            "UPDATE role_nav_preferences SET visible_json = ?, updated_by = ?, updated_at = ? WHERE organization_id = ? AND role = ?",
-            (payload, updated_by, iso(), org_id, role),
-        )
-    else:
-        conn.execute(
-            """
-            INSERT INTO role_nav_preferences (organization_id, role, visible_json, updated_by, updated_at)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (org_id, role, payload, updated_by, iso()),
-        )
 
 
 def visible_nav_for_user(
@@ -3655,7 +3753,7 @@ def visible_nav_for_user(
     user_prefs: Dict[str, object],
 ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]], List[str]]:
     primary_allowed, account_allowed = available_nav_items(role)
-    allowed = nav_keys(primary_allowed + account_allowed)
+    allowed = role_nav_keys(role)
     role_default = load_role_nav_preference(conn, org_id, role, allowed)
     requested = user_prefs.get("nav_visibility")
     if isinstance(requested, list):
@@ -9252,7 +9350,7 @@ def render_settings_page(
     )
     primary_allowed, account_allowed = available_nav_items(role)
     nav_allowed = primary_allowed + account_allowed
-    nav_allowed_keys = nav_keys(nav_allowed)
+    nav_allowed_keys = role_nav_keys(role)
     role_defaults = load_role_nav_preference(conn, org_id, role, nav_allowed_keys)
     user_nav_raw = prefs.get("nav_visibility") if isinstance(prefs.get("nav_visibility"), list) else []
     user_nav_selected = sanitize_nav_key_selection(user_nav_raw, nav_allowed_keys, fallback=role_defaults)
@@ -9269,7 +9367,7 @@ def render_settings_page(
                 continue
             role_primary, role_account = available_nav_items(target_role)
             role_items = role_primary + role_account
-            role_item_keys = nav_keys(role_items)
+            role_item_keys = role_nav_keys(target_role)
             role_selected = load_role_nav_preference(conn, org_id, target_role, role_item_keys)
             role_checks = "".join(
                 [
@@ -9395,223 +9493,301 @@ def render_settings_page(
     """
 
 
+# Columns exposed by CSV export/import per entity; the keys double as the entity allowlist.
+ENTITY_CSV_COLUMNS: Dict[str, List[str]] = {
+    "projects": [
+        "id",
+        "organization_id",
+        "name",
+        "description",
+        "lane",
+        "status",
+        "priority",
+        "owner_user_id",
+        "start_date",
+        "due_date",
+        "tags",
+        "meta_json",
+        "created_by",
+        "created_at",
+        "updated_at",
+        "team_id",
+        "space_id",
+        "progress_pct",
+        "deleted_at",
+        "deleted_by_user_id",
+    ],
+    "tasks": [
+        "id",
+        "organization_id",
+        "project_id",
+        "title",
+        "description",
+        "status",
+        "priority",
+        "assignee_user_id",
+        "reporter_user_id",
+        "due_date",
+        "planned_week",
+        "energy",
+        "estimate_hours",
+        "meta_json",
+        "created_at",
+        "updated_at",
+        "team_id",
+        "space_id",
+        "deleted_at",
+        "deleted_by_user_id",
+    ],
+    "calendar_events": [
+        "id",
+        "organization_id",
+        "user_id",
+        "source",
+        "title",
+        "start_at",
+        "end_at",
+        "attendees_count",
+        "location",
+        "description",
+        "category",
+        "energy_score",
+        "created_at",
+    ],
+    "intake_requests": [
+        "id",
+        "organization_id",
+        "title",
+        "requestor_name",
+        "requestor_email",
+        "lane",
+        "urgency",
+        "impact",
+        "effort",
+        "score",
+        "status",
+        "owner_user_id",
+        "details",
+        "meta_json",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "deleted_by_user_id",
+    ],
+    "equipment_assets": [
+        "id",
+        "organization_id",
+        "name",
+        "space",
+        "asset_type",
+        "last_maintenance",
+        "next_maintenance",
+        "cert_required",
+        "cert_name",
+        "status",
+        "owner_user_id",
+        "notes",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "deleted_by_user_id",
+    ],
+    "consumables": [
+        "id",
+        "organization_id",
+        "space_id",
+        "name",
+        "category",
+        "quantity_on_hand",
+        "unit",
+        "reorder_point",
+        "status",
+        "owner_user_id",
+        "notes",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "deleted_by_user_id",
+    ],
+    "partnerships": [
+        "id",
+        "organization_id",
+        "partner_name",
+        "school",
+        "stage",
+        "last_contact",
+        "next_followup",
+        "owner_user_id",
+        "health",
+        "notes",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "deleted_by_user_id",
+    ],
+    "spaces": [
+        "id",
+        "organization_id",
+        "name",
+        "location",
+        "description",
+        "created_by",
+        "created_at",
+    ],
+    "teams": [
+        "id",
+        "organization_id",
+        "name",
+        "focus_area",
+        "lead_user_id",
+        "created_at",
+    ],
+    "meeting_note_sources": [
+        "id",
+        "organization_id",
+        "title",
+        "source_type",
+        "doc_url",
+        "body",
+        "linked_agenda_id",
+        "created_by",
+        "created_at",
+        "updated_at",
+    ],
+}
+CSV_ENTITIES = frozenset(ENTITY_CSV_COLUMNS)
+
+
 def entity_columns(entity: str) -> List[str]:
-    mapping = {
-        "projects": [
-            "id",
-            "organization_id",
-            "name",
-            "description",
-            "lane",
-            "status",
-            "priority",
-            "owner_user_id",
-            "start_date",
-            "due_date",
-            "tags",
-            "meta_json",
-            "created_by",
-            "created_at",
-            "updated_at",
-            "team_id",
-            "space_id",
-            "progress_pct",
-            "deleted_at",
-            "deleted_by_user_id",
-        ],
-        "tasks": [
-            "id",
-            "organization_id",
-            "project_id",
-            "title",
-            "description",
-            "status",
-            "priority",
-            "assignee_user_id",
-            "reporter_user_id",
-            "due_date",
-            "planned_week",
-            "energy",
-            "estimate_hours",
-            "meta_json",
-            "created_at",
-            "updated_at",
-            "team_id",
-            "space_id",
-            "deleted_at",
-            "deleted_by_user_id",
-        ],
-        "calendar_events": [
-            "id",
-            "organization_id",
-            "user_id",
-            "source",
-            "title",
-            "start_at",
-            "end_at",
-            "attendees_count",
-            "location",
-            "description",
-            "category",
-            "energy_score",
-            "created_at",
-        ],
-        "intake_requests": [
-            "id",
-            "organization_id",
-            "title",
-            "requestor_name",
-            "requestor_email",
-            "lane",
-            "urgency",
-            "impact",
-            "effort",
-            "score",
-            "status",
-            "owner_user_id",
-            "details",
-            "meta_json",
-            "created_at",
-            "updated_at",
-            "deleted_at",
-            "deleted_by_user_id",
-        ],
-        "equipment_assets": [
-            "id",
-            "organization_id",
-            "name",
-            "space",
-            "asset_type",
-            "last_maintenance",
-            "next_maintenance",
-            "cert_required",
-            "cert_name",
-            "status",
-            "owner_user_id",
-            "notes",
-            "created_at",
-            "updated_at",
-            "deleted_at",
-            "deleted_by_user_id",
-        ],
-        "consumables": [
-            "id",
-            "organization_id",
-            "space_id",
-            "name",
-            "category",
-            "quantity_on_hand",
-            "unit",
-            "reorder_point",
-            "status",
-            "owner_user_id",
-            "notes",
-            "created_at",
-            "updated_at",
-            "deleted_at",
-            "deleted_by_user_id",
-        ],
-        "partnerships": [
-            "id",
-            "organization_id",
-            "partner_name",
-            "school",
-            "stage",
-            "last_contact",
-            "next_followup",
-            "owner_user_id",
-            "health",
-            "notes",
-            "created_at",
-            "updated_at",
-            "deleted_at",
-            "deleted_by_user_id",
-        ],
-        "spaces": [
-            "id",
-            "organization_id",
-            "name",
-            "location",
-            "description",
-            "created_by",
-            "created_at",
-        ],
-        "teams": [
-            "id",
-            "organization_id",
-            "name",
-            "focus_area",
-            "lead_user_id",
-            "created_at",
-        ],
-        "meeting_note_sources": [
-            "id",
-            "organization_id",
-            "title",
-            "source_type",
-            "doc_url",
-            "body",
-            "linked_agenda_id",
-            "created_by",
-            "created_at",
-            "updated_at",
-        ],
-    }
-    return mapping.get(entity, [])
+    return ENTITY_CSV_COLUMNS.get(entity, [])
+
 
+def export_csv(org_id: int, entity: str) -> Response:
+    """Stream an entity's rows as CSV from a dedicated pooled connection.
 
-def export_csv(conn: sqlite3.Connection, org_id: int, entity: str) -> Response:
+    The SELECT runs here, before the response is returned, so SQL errors still reach app()'s
+    error handling instead of surfacing after the headers have been sent.
+    """
     cols = entity_columns(entity)
     if not cols:
         return Response("Unknown export entity", status="404 Not Found")
-    rows = conn.execute(
-        f"SELECT {', '.join(cols)} FROM {entity} WHERE organization_id = ? ORDER BY id",
-        (org_id,),
-    ).fetchall()
-    buf = io.StringIO()
-    writer = csv.DictWriter(buf, fieldnames=cols)
-    writer.writeheader()
-    for row in rows:
-        writer.writerow({col: row[col] for col in cols})
+    conn = acquire_db_connection()
+    try:
+        cursor = conn.execute(
+            f"SELECT {', '.join(cols)} FROM {entity} WHERE organization_id = ? ORDER BY id",
+            (org_id,),
+        )
+    except Exception:
+        release_db_connection(conn)
+        raise
     headers = [("Content-Disposition", f"attachment; filename={entity}.csv")]
-    return Response(buf.getvalue(), headers=headers, content_type="text/csv; charset=utf-8")
+    return Response(iter_export_csv(conn, cursor, cols), headers=headers, content_type="text/csv; charset=utf-8")
+
+
+def iter_export_csv(conn, cursor, cols: List[str]) -> Iterator[bytes]:
+    """Yield CSV export bytes in CSV_EXPORT_BATCH_ROWS-sized chunks.
+
+    Decision rationale:
+    - Large exports stay at O(batch) memory and the first bytes go out before the last row is read.
+    - The WSGI server drains this body after app() has released its request connection, so the
+      export reads from its own connection and returns it when iteration finishes or is closed.
+    """
+    try:
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=cols)
+        writer.writeheader()
+        while True:
+            rows = cursor.fetchmany(CSV_EXPORT_BATCH_ROWS)
+            for row in rows:
+                writer.writerow({col: row[col] for col in cols})
+            chunk = buf.getvalue()
+            if chunk:
+                yield chunk.encode("utf-8")
+                buf.seek(0)
+                buf.truncate(0)
+            if not rows:
+                break
+    finally:
+        release_db_connection(conn)
 
 
 def import_csv(conn: sqlite3.Connection, org_id: int, entity: str, file_obj: cgi.FieldStorage) -> Tuple[bool, str]:
     cols = entity_columns(entity)
     if not cols:
         return False, "Unknown import entity"
-    content = file_obj.file.read().decode("utf-8", errors="ignore")
-    reader = csv.DictReader(io.StringIO(content))
     allowed = [c for c in cols if c not in {"id", "created_at", "updated_at", "organization_id"}]
     inserted = 0
     skipped_invalid = 0
+    batch_cols: Tuple[str, ...] = ()
+    batch: List[Tuple[Any, ...]] = []
 
-    for row in reader:
-        values = {k: row.get(k) for k in allowed}
-        now = iso()
-        values["organization_id"] = org_id
-        if "created_at" in cols:
-            values["created_at"] = now
-        if "updated_at" in cols:
-            values["updated_at"] = now
-        insert_cols = [k for k in values.keys() if k in cols and values[k] not in (None, "")]
-        if not insert_cols:
-            skipped_invalid += 1
-            continue
-        placeholders = ", ".join(["?" for _ in insert_cols])
-        sql = f"INSERT INTO {entity} ({', '.join(insert_cols)}) VALUES ({placeholders})"
-        try:
-            conn.execute(sql, tuple(values[k] for k in insert_cols))
-            inserted += 1
-        except sqlite3.IntegrityError:
-            skipped_invalid += 1
+    # Decode the upload incrementally instead of reading it into one string, and hold a single
+    # write transaction for the whole import; the caller commits.
+    text = io.TextIOWrapper(file_obj.file, encoding="utf-8", errors="ignore", newline="")
+    begin_immediate(conn)
+    try:
+        for row in csv.DictReader(text):
+            values = {k: row.get(k) for k in allowed}
+            now = iso()
+            values["organization_id"] = org_id
+            if "created_at" in cols:
+                values["created_at"] = now
+            if "updated_at" in cols:
+                values["updated_at"] = now
+            insert_cols = tuple(k for k in values.keys() if k in cols and values[k] not in (None, ""))
+            if not insert_cols:
+                skipped_invalid += 1
+                continue
+            # Consecutive rows with the same populated columns share one executemany call.
+            if batch and (insert_cols != batch_cols or len(batch) >= CSV_IMPORT_BATCH_ROWS):
+                added, failed = insert_import_batch(conn, entity, batch_cols, batch)
+                inserted += added
+                skipped_invalid += failed
+                batch = []
+            batch_cols = insert_cols
+            batch.append(tuple(values[k] for k in insert_cols))
+        if batch:
+            added, failed = insert_import_batch(conn, entity, batch_cols, batch)
+            inserted += added
+            skipped_invalid += failed
+    finally:
+        text.detach()
 
     if skipped_invalid:
         return True, f"Imported {inserted} rows into {entity}; skipped {skipped_invalid} invalid rows"
     return True, f"Imported {inserted} rows into {entity}"
 
 
+def insert_import_batch(
+    conn: sqlite3.Connection,
+    entity: str,
+    insert_cols: Tuple[str, ...],
+    rows: List[Tuple[Any, ...]],
+) -> Tuple[int, int]:
+    """Insert one batch of import rows, returning (inserted, skipped_invalid).
+
+    The batch runs inside a savepoint; if any row violates a constraint the batch is rolled back
+    and replayed row by row so only the offending rows are skipped, as before batching.
+    """
+    placeholders = ", ".join(["?" for _ in insert_cols])
+    sql = f"INSERT INTO {entity} ({', '.join(insert_cols)}) VALUES ({placeholders})"
+    conn.execute("SAVEPOINT csv_import_batch")
+    try:
+        conn.executemany(sql, rows)
+        inserted, skipped = len(rows), 0
+    except sqlite3.IntegrityError:
+        conn.execute("ROLLBACK TO SAVEPOINT csv_import_batch")
+        inserted = skipped = 0
+        for params in rows:
+            try:
+                conn.execute(sql, params)
+                inserted += 1
+            except sqlite3.IntegrityError:
+                skipped += 1
+    conn.execute("RELEASE SAVEPOINT csv_import_batch")
+    return inserted, skipped
+
+
 def fill_csrf(content: str, csrf_token: str) -> str:
     """Fill csrf placeholders used by server-rendered templates."""
     safe = h(csrf_token)
@@ -9621,1387 +9797,1322 @@ def fill_csrf(content: str, csrf_token: str) -> str:
     return content.replace("{{csrf}}", safe).replace("{csrf}", safe)
 
 
-def app(environ, start_response):
-    """WSGI entrypoint.
+RouteHandler = Callable[[sqlite3.Connection, "Request", Dict[str, object], int, int], "Response"]
+ROUTES: Dict[Tuple[str, str], Tuple[RouteHandler, Optional[str], bool]] = {}
 
-    Route dispatch is intentionally explicit (`if req.path == ...`) rather than framework-based
-    so the project stays lightweight and easy to host in constrained environments.
-    """
-    req = Request(environ)
 
-    if req.path == "/website":
-        return redirect("/website/").wsgi(start_response)
-    if req.path.startswith("/website/"):
-        rel = req.path.replace("/website/", "", 1).strip("/")
-        if not rel:
-            rel = "index.html"
-        website_file = (WEBSITE_DIR / rel).resolve()
-        # Security decision: enforce website sandbox to prevent path traversal.
-        if WEBSITE_DIR.resolve() not in website_file.parents and website_file != WEBSITE_DIR.resolve():
-            return Response("Not found", status="404 Not Found").wsgi(start_response)
-        # Support extension-less wiki routes (e.g. /website/wiki/getting-started).
-        if not website_file.exists() and "." not in Path(rel).name:
-            html_fallback = (WEBSITE_DIR / f"{rel}.html").resolve()
-            if WEBSITE_DIR.resolve() in html_fallback.parents and html_fallback.exists() and html_fallback.is_file():
-                website_file = html_fallback
-            elif (WEBSITE_DIR / rel).resolve().is_dir():
-                # Keep canonical trailing slash for directory routes.
-                return redirect(f"/website/{rel}/").wsgi(start_response)
-        if website_file.is_dir():
-            website_file = website_file / "index.html"
-        if not website_file.exists() or not website_file.is_file():
-            return Response("Not found", status="404 Not Found").wsgi(start_response)
-        served_name = website_file.name.lower()
-        mime = "text/plain; charset=utf-8"
-        if served_name.endswith(".html"):
-            mime = "text/html; charset=utf-8"
-        elif served_name.endswith(".css"):
-            mime = "text/css; charset=utf-8"
-        elif served_name.endswith(".js"):
-            mime = "application/javascript; charset=utf-8"
-        elif served_name.endswith(".json"):
-            mime = "application/json; charset=utf-8"
-        elif served_name.endswith(".svg"):
-            mime = "image/svg+xml"
-        elif served_name.endswith(".md"):
-            mime = "text/markdown; charset=utf-8"
-        return Response(website_file.read_text(encoding="utf-8"), content_type=mime).wsgi(start_response)
+def route(method: str, *paths: str, min_role: Optional[str] = None, api: bool = False):
+    """Register an authenticated handler for exact `(method, path)` matches.
 
-    if req.path.startswith("/static/"):
-        rel = req.path.replace("/static/", "", 1)
-        static_file = STATIC_DIR / rel
-        if not static_file.exists() or not static_file.is_file():
-            return Response("Not found", status="404 Not Found").wsgi(start_response)
-        mime = "text/plain"
-        if rel.endswith(".css"):
-            mime = "text/css; charset=utf-8"
-        elif rel.endswith(".js"):
-            mime = "application/javascript; charset=utf-8"
-        elif rel.endswith(".svg"):
-            mime = "image/svg+xml"
-        return Response(static_file.read_text(), content_type=mime).wsgi(start_response)
+    Decision rationale:
+    - A dict probe replaces walking the `if req.path == ...` ladder for registered routes.
+    - The role gate is applied once by the dispatcher (JSON 403 for `api=True` routes), so
+      handlers start directly at their business logic with org/user ids already resolved.
+    """
 
-    if req.path == "/healthz":
-        return Response("ok", content_type="text/plain").wsgi(start_response)
-    if req.path == "/readyz":
-        # Readiness checks include DB reachability to catch locked/corrupt startup states.
-        try:
-            ensure_bootstrap()
-            probe = db_connect()
-            probe.execute("SELECT 1").fetchone()
-            probe.close()
-            return Response("ready", content_type="text/plain").wsgi(start_response)
-        except Exception as exc:
-            return Response(
-                f"not-ready: {h(str(exc))}",
-                status="503 Service Unavailable",
-                content_type="text/plain",
-            ).wsgi(start_response)
+    def decorator(fn: RouteHandler) -> RouteHandler:
+        for path in paths:
+            ROUTES[(method.upper(), path)] = (fn, min_role, api)
+        return fn
 
-    try:
-        ensure_bootstrap()
-    except Exception as exc:
-        body = f"<h1>503 Service Unavailable</h1><p>Database bootstrap failed: {h(str(exc))}</p>"
-        return Response(body, status="503 Service Unavailable").wsgi(start_response)
+    return decorator
 
-    conn = db_connect()
-    ctx = get_auth_context(conn, req)
-    notice = req.query.get("msg", "")
 
-    try:
-        # Public auth routes
-        if req.path == "/login" and req.method == "GET":
-            return Response(render_login(req, error=notice)).wsgi(start_response)
+def scoped_path(ctx: Dict[str, object], path: str) -> str:
+    """Route-handler counterpart of the `scoped()` helper used inline in `app()`."""
+    return with_space(path, ctx.get("active_space_id"))  # type: ignore[arg-type]
 
-        if req.path == "/login" and req.method == "POST":
-            ip = req.environ.get("REMOTE_ADDR", "unknown")
-            if not enforce_rate_limit(ip):
-                return Response(render_login(req, "Too many login attempts. Try again later."), status="429 Too Many Requests").wsgi(start_response)
 
-            email = req.form.get("email", "").strip().lower()
-            password = req.form.get("password", "")
-            user = conn.execute(
-                "SELECT * FROM users WHERE email = ? AND is_active = 1", (email,)
-            ).fetchone()
-            valid_password = False
-            if user:
-                try:
-                    valid_password = verify_password(
-                        password,
-                        str(user["password_hash"] or ""),
-                        str(user["password_salt"] or ""),
-                    )
-                except Exception:
-                    valid_password = False
-            if not user or not valid_password:
-                return Response(render_login(req, "Invalid credentials.")).wsgi(start_response)
+@route("POST", "/api/partnerships/save", min_role="staff", api=True)
+def handle_api_partnerships_save(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    role = str(ctx.get("role") or "viewer")
+    partnership_id = to_int(form.get("partnership_id"))
+    current = conn.execute(
+        "SELECT * FROM partnerships WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
+        (partnership_id, org_id),
+    ).fetchone()
+    if not current:
+        return json_response({"ok": False, "error": "not_found"}, status="404 Not Found")
+    before_snapshot = snapshot_row(current)
+    stage = form.get("stage", current["stage"])
+    if stage not in PARTNERSHIP_STAGES:
+        stage = current["stage"]
+    health = form.get("health", current["health"] or "Medium")
+    if health not in {"Strong", "Medium", "At Risk"}:
+        health = current["health"] or "Medium"
+    partner_name = sanitize_title_for_role(
+        conn,
+        org_id,
+        role,
+        "partnerships",
+        form.get("partner_name", current["partner_name"]),
+        current["partner_name"],
+        free_edit_min_role="manager",
+    )
 
-            raw_session, _csrf = create_session(
-                conn,
-                user["id"],
-                req.environ.get("REMOTE_ADDR", ""),
-                req.environ.get("HTTP_USER_AGENT", ""),
-            )
-            conn.commit()
-            cookie_session = set_cookie("session_token", raw_session, max_age=SESSION_DAYS * 24 * 3600)
-            return redirect("/dashboard", cookies=[cookie_session]).wsgi(start_response)
+    conn.execute(
+        """
+        UPDATE partnerships
+        SET partner_name = ?, school = ?, stage = ?, last_contact = ?, next_followup = ?, owner_user_id = ?, health = ?, notes = ?, updated_at = ?
+        WHERE id = ? AND organization_id = ?
+        """,
+        (
+            partner_name,
+            form.get("school", current["school"] or ""),
+            stage,
+            parse_date(form.get("last_contact", current["last_contact"] or "")),
+            parse_date(form.get("next_followup", current["next_followup"] or "")),
+            normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
+            health,
+            form.get("notes", current["notes"] or ""),
+            iso(),
+            partnership_id,
+            org_id,
+        ),
+    )
+    after_snapshot = snapshot_row(
+        conn.execute(
+            "SELECT * FROM partnerships WHERE id = ? AND organization_id = ?",
+            (partnership_id, org_id),
+        ).fetchone()
+    )
+    log_change_with_rollback(
+        conn,
+        org_id,
+        user_id,
+        "partnership_saved",
+        "partnerships",
+        partnership_id or 0,
+        before_snapshot,
+        after_snapshot,
+        f"Partnership updated: {partner_name}",
+    )
+    conn.commit()
+    return json_response({"ok": True, "status": stage})
 
-        if req.path == "/forgot-password" and req.method == "GET":
-            return Response(render_forgot_password(req, message=notice)).wsgi(start_response)
 
-        if req.path == "/forgot-password" and req.method == "POST":
-            email = req.form.get("email", "").strip().lower()
-            user = conn.execute("SELECT id FROM users WHERE email = ? AND is_active = 1", (email,)).fetchone()
-            if not user:
-                return Response(
-                    render_forgot_password(
-                        req,
-                        "If the account exists, a reset link is now available through your admin.",
-                    )
-                ).wsgi(start_response)
-            token, _expires = create_password_reset(conn, user["id"], created_by=None, hours=24)
-            conn.commit()
-            reset_link = f"/reset-password?token={token}"
-            msg = quote(f"Reset link (share securely): {reset_link}")
-            return redirect(f"/forgot-password?msg={msg}").wsgi(start_response)
+@route("POST", "/api/items/delete")
+def handle_api_items_delete(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    entity = str(form.get("entity") or "").strip().lower()
+    policy = delete_policy_for_entity(entity)
+    if not policy:
+        return json_response({"ok": False, "error": "invalid_entity"}, status="400 Bad Request")
+    gate = require_role(ctx, str(policy.get("min_role") or "staff"))
+    if gate:
+        return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden")
+    item_id = to_int(form.get("id") or form.get("item_id"))
+    if item_id is None:
+        return json_response({"ok": False, "error": "invalid_item"}, status="400 Bad Request")
+    ok, reason = entity_soft_delete(conn, org_id, user_id, entity, item_id)
+    if not ok:
+        status_code = "400 Bad Request"
+        payload: Dict[str, object] = {"ok": False, "error": reason}
+        if reason in {"not_found"}:
+            status_code = "404 Not Found"
+        if reason == "already_deleted":
+            status_code = "409 Conflict"
+        if reason.startswith("status_required:"):
+            required = [x for x in reason.split(":", 1)[1].split("|") if x]
+            payload = {"ok": False, "error": "status_required", "required_statuses": required}
+            status_code = "422 Unprocessable Entity"
+        return json_response(payload, status=status_code)
+    conn.commit()
+    return json_response({"ok": True})
+
+
+@route("POST", "/deleted/restore", min_role="workspace_admin")
+def handle_deleted_restore(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    entity = str(req.form.get("entity") or "").strip().lower()
+    item_id = to_int(req.form.get("item_id"))
+    if item_id is None:
+        return redirect(scoped_path(ctx, "/deleted?msg=Invalid%20item%20id"))
+    ok, reason = restore_soft_deleted_entity(conn, org_id, user_id, entity, item_id)
+    if not ok:
+        return redirect(scoped_path(ctx, f"/deleted?msg={quote(reason)}"))
+    conn.commit()
+    return redirect(scoped_path(ctx, "/deleted?msg=Item%20restored"))
+
+
+@route("POST", "/deleted/purge", min_role="workspace_admin")
+def handle_deleted_purge(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    entity = str(req.form.get("entity") or "").strip().lower()
+    item_id = to_int(req.form.get("item_id"))
+    if item_id is None:
+        return redirect(scoped_path(ctx, "/deleted?msg=Invalid%20item%20id"))
+    ok, reason = purge_soft_deleted_entity(conn, org_id, user_id, entity, item_id)
+    if not ok:
+        return redirect(scoped_path(ctx, f"/deleted?msg={quote(reason)}"))
+    conn.commit()
+    return redirect(scoped_path(ctx, "/deleted?msg=Item%20purged"))
+
+
+@route("POST", "/admin/users/new", min_role="workspace_admin")
+def handle_admin_users_new(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    actor_role = str(ctx.get("role") or "").strip().lower()
+    target_role = parse_membership_role(form.get("role"), default="staff")
+    if target_role in {"workspace_admin", "owner"} and not role_allows(actor_role, "owner"):
+        return redirect("/admin/users?msg=Only%20owner-level%20admins%20can%20assign%20workspace-admin%20or%20owner%20roles")
+    email = form.get("email", "").lower().strip()
+    existing = conn.execute("SELECT id FROM users WHERE email = ?", (email,)).fetchone()
+    if existing:
+        return redirect("/admin/users?msg=Email%20already%20exists")
 
-        if req.path == "/reset-password" and req.method == "GET":
-            token = req.query.get("token", "")
-            reset = verify_reset_token(conn, token) if token else None
-            if not reset:
-                return Response(render_login(req, "Reset link is invalid or expired.")).wsgi(start_response)
-            return Response(render_reset_password(req, token)).wsgi(start_response)
+    password = form.get("password", "").strip() or secrets.token_urlsafe(12)
+    if len(password) < 12:
+        return redirect("/admin/users?msg=Password%20must%20be%20at%20least%2012%20characters")
 
-        if req.path == "/reset-password" and req.method == "POST":
-            token = req.form.get("token", "")
-            password = req.form.get("password", "")
-            confirm = req.form.get("password_confirm", "")
-            if password != confirm or len(password) < 12:
-                return Response(render_reset_password(req, token, "Passwords must match and be at least 12 characters.")).wsgi(start_response)
-            reset = verify_reset_token(conn, token)
-            if not reset:
-                return Response(render_login(req, "Reset link is invalid or expired.")).wsgi(start_response)
-            pw_hash, pw_salt = hash_password(password)
-            conn.execute(
-                "UPDATE users SET password_hash = ?, password_salt = ? WHERE id = ?",
-                (pw_hash, pw_salt, reset["user_id"]),
-            )
-            conn.execute(
-                "UPDATE password_resets SET used_at = ? WHERE id = ?",
-                (iso(), reset["id"]),
-            )
-            conn.execute("DELETE FROM sessions WHERE user_id = ?", (reset["user_id"],))
-            conn.commit()
-            return redirect("/login?msg=Password%20updated.%20Please%20sign%20in.").wsgi(start_response)
+    pw_hash, pw_salt = hash_password(password)
+    conn.execute(
+        "INSERT INTO users (email, name, password_hash, password_salt, is_active, is_superuser, created_at) VALUES (?, ?, ?, ?, 1, 0, ?)",
+        (email, form.get("name", "New User"), pw_hash, pw_salt, iso()),
+    )
+    user_row = conn.execute("SELECT id FROM users WHERE email = ?", (email,)).fetchone()
+    conn.execute(
+        "INSERT INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, ?, ?)",
+        (user_row["id"], org_id, target_role, iso()),
+    )
+    conn.commit()
+    msg = quote(f"User created. Temporary password: {password}")
+    return redirect(f"/admin/users?msg={msg}")
+
+
+@route("POST", "/admin/users/role", min_role="workspace_admin")
+def handle_admin_users_role(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    user = ctx["user"]
+    form = req.form
+    actor_role = str(ctx.get("role") or "").strip().lower()
+    target_user_id = to_int(form.get("target_user_id"))
+    next_role = parse_membership_role(form.get("role"), default="staff")
+    if target_user_id is None:
+        return redirect("/admin/users?msg=User%20not%20found")
+    can_manage_target, reason = can_admin_manage_user(conn, org_id, user_id, actor_role, target_user_id)
+    if not can_manage_target:
+        return redirect(f"/admin/users?msg={quote(reason)}")
+    if next_role in {"workspace_admin", "owner"} and not role_allows(actor_role, "owner"):
+        return redirect("/admin/users?msg=Only%20owner-level%20admins%20can%20assign%20workspace-admin%20or%20owner%20roles")
+    if ROLE_RANK.get(next_role, 0) > ROLE_RANK.get(actor_role, 0) and not bool(user.get("is_superuser")):
+        return redirect("/admin/users?msg=Cannot%20assign%20a%20role%20higher%20than%20your%20own")
+    if is_workspace_admin_role(next_role) and not can_manage_workspace_admin_role(conn, target_user_id, org_id):
+        return redirect("/admin/users?msg=That%20admin%20account%20already%20controls%20another%20workspace")
+    conn.execute(
+        "UPDATE memberships SET role = ? WHERE organization_id = ? AND user_id = ?",
+        (next_role, org_id, target_user_id),
+    )
+    conn.commit()
+    return redirect("/admin/users?msg=Role%20updated")
+
+
+@route("POST", "/admin/users/toggle", min_role="workspace_admin")
+def handle_admin_users_toggle(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    target_id = int(req.form.get("target_user_id", "0") or 0)
+    is_active = 1 if req.form.get("is_active") == "1" else 0
+    if target_id == user_id and is_active == 0:
+        return redirect("/admin/users?msg=Cannot%20disable%20your%20own%20account")
+    actor_role = str(ctx.get("role") or "").strip().lower()
+    can_manage_target, reason = can_admin_manage_user(conn, org_id, user_id, actor_role, target_id)
+    if not can_manage_target:
+        return redirect(f"/admin/users?msg={quote(reason)}")
+    conn.execute("UPDATE users SET is_active = ? WHERE id = ?", (is_active, target_id))
+    if not is_active:
+        conn.execute("DELETE FROM sessions WHERE user_id = ?", (target_id,))
+    conn.commit()
+    return redirect("/admin/users?msg=Account%20status%20updated")
+
+
+@route("POST", "/admin/users/reset", min_role="workspace_admin")
+def handle_admin_users_reset(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    target_id = int(req.form.get("target_user_id", "0") or 0)
+    actor_role = str(ctx.get("role") or "").strip().lower()
+    can_manage_target, reason = can_admin_manage_user(conn, org_id, user_id, actor_role, target_id)
+    if not can_manage_target:
+        return redirect(f"/admin/users?msg={quote(reason)}")
+    target = conn.execute("SELECT id, email FROM users WHERE id = ?", (target_id,)).fetchone()
+    if not target:
+        return redirect("/admin/users?msg=User%20not%20found")
+    token, _expires = create_password_reset(conn, target["id"], created_by=user_id, hours=24)
+    conn.commit()
+    reset_link = f"/reset-password?token={token}"
+    return redirect(f"/admin/users?msg={quote('Reset link for '+target['email']+': '+reset_link)}")
+
+
+@route("POST", "/admin/users/delete", min_role="workspace_admin")
+def handle_admin_users_delete(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    target_id = to_int(form.get("target_user_id"))
+    replacement_id = to_int(form.get("reassign_user_id"))
+    if target_id is None:
+        return redirect("/admin/users?msg=User%20not%20found")
+    if target_id == user_id:
+        return redirect("/admin/users?msg=Cannot%20remove%20your%20own%20workspace%20membership")
+    actor_role = str(ctx.get("role") or "").strip().lower()
+    can_manage_target, reason = can_admin_manage_user(conn, org_id, user_id, actor_role, target_id)
+    if not can_manage_target:
+        return redirect(f"/admin/users?msg={quote(reason)}")
+    if replacement_id is None or int(replacement_id) == int(target_id):
+        return redirect("/admin/users?msg=Choose%20a%20valid%20reassignment%20owner")
+    replacement_ok = conn.execute(
+        """
+        SELECT 1
+        FROM memberships m
+        JOIN users u ON u.id = m.user_id
+        WHERE m.organization_id = ? AND m.user_id = ? AND u.is_active = 1
+        LIMIT 1
+        """,
+        (org_id, replacement_id),
+    ).fetchone()
+    if not replacement_ok:
+        return redirect("/admin/users?msg=Replacement%20user%20must%20be%20active%20in%20this%20workspace")
 
-        auth_required = require_auth(ctx)
-        if auth_required:
-            return auth_required.wsgi(start_response)
+    conn.execute(
+        "UPDATE projects SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
+        (replacement_id, org_id, target_id),
+    )
+    conn.execute(
+        "UPDATE tasks SET assignee_user_id = ? WHERE organization_id = ? AND assignee_user_id = ?",
+        (replacement_id, org_id, target_id),
+    )
+    conn.execute(
+        "UPDATE tasks SET reporter_user_id = ? WHERE organization_id = ? AND reporter_user_id = ?",
+        (replacement_id, org_id, target_id),
+    )
+    conn.execute(
+        "UPDATE intake_requests SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
+        (replacement_id, org_id, target_id),
+    )
+    conn.execute(
+        "UPDATE equipment_assets SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
+        (replacement_id, org_id, target_id),
+    )
+    conn.execute(
+        "UPDATE consumables SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
+        (replacement_id, org_id, target_id),
+    )
+    conn.execute(
+        "UPDATE partnerships SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
+        (replacement_id, org_id, target_id),
+    )
+    conn.execute(
+        "UPDATE meeting_agendas SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
+        (replacement_id, org_id, target_id),
+    )
+    conn.execute(
+        "UPDATE onboarding_assignments SET assignee_user_id = ? WHERE organization_id = ? AND assignee_user_id = ?",
+        (replacement_id, org_id, target_id),
+    )
+    conn.execute(
+        "UPDATE teams SET lead_user_id = ? WHERE organization_id = ? AND lead_user_id = ?",
+        (replacement_id, org_id, target_id),
+    )
+    conn.execute("DELETE FROM team_members WHERE user_id = ?", (target_id,))
+    conn.execute("DELETE FROM memberships WHERE organization_id = ? AND user_id = ?", (org_id, target_id))
+    remaining = conn.execute("SELECT COUNT(*) AS c FROM memberships WHERE user_id = ?", (target_id,)).fetchone()
+    if int(remaining["c"] or 0) == 0:
+        conn.execute("DELETE FROM sessions WHERE user_id = ?", (target_id,))
+        conn.execute("UPDATE users SET is_active = 0 WHERE id = ?", (target_id,))
+    conn.commit()
+    return redirect("/admin/users?msg=User%20removed%20from%20workspace%20and%20work%20reassigned")
 
-        if req.method == "POST" and not validate_csrf(req, ctx):
-            return Response("<h1>400 Bad Request</h1><p>CSRF token mismatch.</p>", status="400 Bad Request").wsgi(start_response)
 
-        user = ctx["user"]
-        org = ctx["active_org"]
-        user_id = int(user["id"])
-        org_id = int(org["organization_id"])
-        csrf_token = ctx.get("csrf", "")
-        spaces = get_spaces_for_org(conn, org_id)
-        space_ids = {int(s["id"]) for s in spaces}
-        selected_space_id = to_int(req.query.get("space_id"))
-        if selected_space_id is None:
-            selected_space_id = to_int(req.form.get("active_space_id"))
-        # Reject unknown space ids from query/form to avoid cross-space leakage via crafted URLs.
-        if selected_space_id not in space_ids:
-            selected_space_id = None
-        active_space = next((s for s in spaces if int(s["id"]) == int(selected_space_id or 0)), None)
-        ctx["spaces"] = spaces
-        ctx["active_space_id"] = selected_space_id
-        ctx["active_space"] = active_space
-        user_prefs = load_user_preferences(conn, user_id)
-        nav_primary_items, nav_account_items, effective_nav_keys = visible_nav_for_user(
-            conn,
-            org_id,
-            str(ctx.get("role") or "viewer"),
-            user_prefs,
+@route("POST", "/admin/data/purge-item", min_role="workspace_admin")
+def handle_admin_data_purge_item(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    entity = str(req.form.get("entity") or "").strip().lower()
+    item_id = to_int(req.form.get("item_id"))
+    policy = delete_policy_for_entity(entity)
+    if not policy or item_id is None:
+        return redirect("/admin/users?msg=Invalid%20entity%20or%20item%20id")
+    table = str(policy["table"])
+    before_snapshot = snapshot_row(
+        conn.execute(
+            f"SELECT * FROM {table} WHERE id = ? AND organization_id = ?",
+            (item_id, org_id),
+        ).fetchone()
+    )
+    deleted = conn.execute(
+        f"DELETE FROM {table} WHERE id = ? AND organization_id = ?",
+        (item_id, org_id),
+    ).rowcount
+    if int(deleted or 0) == 0:
+        return redirect("/admin/users?msg=Item%20not%20found")
+    log_change_with_rollback(
+        conn,
+        org_id,
+        user_id,
+        "item_purged_admin",
+        table,
+        item_id,
+        before_snapshot,
+        None,
+        f"Admin purge: {policy['label']} #{item_id}",
+        source="admin",
+    )
+    conn.commit()
+    return redirect("/admin/users?msg=Item%20purged")
+
+
+@route("POST", "/admin/data/purge-keyword", min_role="workspace_admin")
+def handle_admin_data_purge_keyword(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    keyword = str(req.form.get("keyword") or "").strip()
+    if len(keyword) < 2:
+        return redirect("/admin/users?msg=Keyword%20must%20be%20at%20least%202%20characters")
+    counts = purge_keyword_test_data(conn, org_id, keyword)
+    summary = ", ".join([f"{table}:{count}" for table, count in counts.items() if int(count or 0) > 0]) or "No matches"
+    log_action(
+        conn,
+        org_id,
+        user_id,
+        "admin_keyword_purge",
+        "cleanup",
+        keyword,
+        json.dumps({"source": "admin", "summary": f"Keyword purge: {keyword}", "payload": counts}, ensure_ascii=True)[:4000],
+    )
+    conn.commit()
+    return redirect(f"/admin/users?msg={quote('Keyword purge complete: ' + summary)}")
+
+
+@route("POST", "/admin/audit/rollback", min_role="workspace_admin")
+def handle_admin_audit_rollback(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    audit_id = to_int(req.form.get("audit_id"))
+    if audit_id is None:
+        return redirect("/admin/users?msg=Audit%20entry%20id%20is%20required")
+    ok, message = rollback_audit_entry(conn, org_id, user_id, audit_id)
+    if not ok:
+        return redirect(f"/admin/users?msg={quote(message)}")
+    conn.commit()
+    return redirect("/admin/users?msg=Rollback%20applied")
+
+
+@route("POST", "/admin/workspaces/new", "/admin/orgs/new", min_role="owner")
+def handle_admin_workspaces_new(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    user = ctx["user"]
+    form = req.form
+    is_super = bool(user.get("is_superuser"))
+    slug = form.get("slug", "").strip().lower().replace(" ", "-")
+    if not slug:
+        return redirect("/admin/users?msg=Slug%20required")
+    existing = conn.execute("SELECT id FROM organizations WHERE slug = ?", (slug,)).fetchone()
+    if existing:
+        return redirect("/admin/users?msg=Slug%20already%20exists")
+    admin_email = (form.get("workspace_admin_email") or "").strip().lower()
+    admin_name = (form.get("workspace_admin_name") or "").strip()
+    admin_password = (form.get("workspace_admin_password") or "").strip()
+    workspace_admin_id: Optional[int] = None
+    temp_password_message = ""
+
+    if admin_email:
+        existing_admin = conn.execute("SELECT id, name FROM users WHERE email = ?", (admin_email,)).fetchone()
+        if existing_admin:
+            workspace_admin_id = int(existing_admin["id"])
+            if not can_manage_workspace_admin_role(conn, workspace_admin_id, -1):
+                return redirect("/admin/users?msg=Selected%20workspace%20admin%20already%20manages%20another%20workspace")
+        else:
+            if admin_password and len(admin_password) < 12:
+                return redirect("/admin/users?msg=Workspace%20admin%20password%20must%20be%20at%20least%2012%20characters")
+            if not admin_password:
+                admin_password = secrets.token_urlsafe(12)
+            pw_hash, pw_salt = hash_password(admin_password)
+            created_admin = conn.execute(
+                "INSERT INTO users (email, name, password_hash, password_salt, is_active, is_superuser, created_at) VALUES (?, ?, ?, ?, 1, 0, ?) RETURNING id",
+                (admin_email, admin_name or "Workspace Admin", pw_hash, pw_salt, iso()),
+            ).fetchone()
+            workspace_admin_id = int(created_admin["id"])
+            temp_password_message = f" Workspace admin temporary password: {admin_password}"
+    elif is_super:
+        workspace_admin_id = user_id
+    else:
+        return redirect("/admin/users?msg=Provide%20a%20workspace%20admin%20email")
+
+    new_org = conn.execute(
+        "INSERT INTO organizations (name, slug, created_at) VALUES (?, ?, ?) RETURNING id",
+        (form.get("name", "New Department"), slug, iso()),
+    ).fetchone()
+    new_org_id = int(new_org["id"])
+    conn.execute(
+        "INSERT OR IGNORE INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, 'workspace_admin', ?)",
+        (workspace_admin_id, new_org_id, iso()),
+    )
+    if is_super:
+        conn.execute(
+            "INSERT OR IGNORE INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, 'owner', ?)",
+            (user_id, new_org_id, iso()),
         )
-        ctx["user_prefs"] = user_prefs
-        ctx["nav_primary_items"] = nav_primary_items
-        ctx["nav_account_items"] = nav_account_items
-        ctx["nav_visible_keys"] = effective_nav_keys
-        scoped = lambda path: with_space(path, selected_space_id)
+    ensure_default_view_templates(conn, new_org_id, workspace_admin_id)
+    ensure_default_report_templates(conn, new_org_id, workspace_admin_id)
+    conn.commit()
+    msg = f"Workspace created for {slug}.{temp_password_message}"
+    return redirect(f"/admin/users?msg={quote(msg)}")
+
+
+@route("POST", "/admin/workspaces/update", "/admin/orgs/update", min_role="owner")
+def handle_admin_workspaces_update(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    workspace_id = to_int(form.get("workspace_id"))
+    if workspace_id is None:
+        return redirect("/admin/users?msg=Workspace%20id%20required")
+    target = conn.execute("SELECT id, slug, name FROM organizations WHERE id = ?", (workspace_id,)).fetchone()
+    if not target:
+        return redirect("/admin/users?msg=Workspace%20not%20found")
+
+    raw_slug = form.get("slug", "").strip().lower().replace(" ", "-")
+    slug = re.sub(r"[^a-z0-9-]", "-", raw_slug)
+    slug = re.sub(r"-+", "-", slug).strip("-")
+    if not slug:
+        return redirect("/admin/users?msg=Slug%20required")
+    existing_slug = conn.execute("SELECT id FROM organizations WHERE slug = ? AND id != ?", (slug, workspace_id)).fetchone()
+    if existing_slug:
+        return redirect("/admin/users?msg=Slug%20already%20exists")
+
+    name = (form.get("name") or "").strip() or str(target["name"] or "Workspace")
+    conn.execute("UPDATE organizations SET name = ?, slug = ? WHERE id = ?", (name, slug, workspace_id))
+
+    admin_email = (form.get("workspace_admin_email") or "").strip().lower()
+    admin_name = (form.get("workspace_admin_name") or "").strip()
+    admin_password = (form.get("workspace_admin_password") or "").strip()
+    temp_password_message = ""
+    if admin_email:
+        existing_admin = conn.execute("SELECT id FROM users WHERE email = ?", (admin_email,)).fetchone()
+        if existing_admin:
+            workspace_admin_id = int(existing_admin["id"])
+        else:
+            if admin_password and len(admin_password) < 12:
+                return redirect("/admin/users?msg=Workspace%20admin%20password%20must%20be%20at%20least%2012%20characters")
+            if not admin_password:
+                admin_password = secrets.token_urlsafe(12)
+            pw_hash, pw_salt = hash_password(admin_password)
+            created_admin = conn.execute(
+                "INSERT INTO users (email, name, password_hash, password_salt, is_active, is_superuser, created_at) VALUES (?, ?, ?, ?, 1, 0, ?) RETURNING id",
+                (admin_email, admin_name or "Workspace Admin", pw_hash, pw_salt, iso()),
+            ).fetchone()
+            workspace_admin_id = int(created_admin["id"])
+            temp_password_message = f" New workspace admin temporary password: {admin_password}"
 
-        if req.path == "/":
-            return redirect(scoped("/dashboard")).wsgi(start_response)
+        if not can_manage_workspace_admin_role(conn, workspace_admin_id, workspace_id):
+            return redirect("/admin/users?msg=Selected%20workspace%20admin%20already%20manages%20another%20workspace")
 
-        if (not FEATURE_INTAKE_ENABLED) and req.path == "/intake":
-            content = """
-            <section class='card maker-hero'>
-              <h2>Intake Is Disabled</h2>
-              <p>The intake module has been removed from this workspace configuration.</p>
-              <a class='btn' href='/dashboard'>Return to Dashboard</a>
-            </section>
-            """
-            page = render_layout("Intake Disabled", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
+        conn.execute(
+            "UPDATE memberships SET role = 'staff' WHERE organization_id = ? AND role = 'workspace_admin' AND user_id != ?",
+            (workspace_id, workspace_admin_id),
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, 'workspace_admin', ?)",
+            (workspace_admin_id, workspace_id, iso()),
+        )
+        conn.execute(
+            "UPDATE memberships SET role = 'workspace_admin' WHERE user_id = ? AND organization_id = ?",
+            (workspace_admin_id, workspace_id),
+        )
 
-        if (not FEATURE_INTAKE_ENABLED) and (
-            req.path.startswith("/intake/") or req.path == "/api/intake/save"
-        ):
-            if req.path.startswith("/api/"):
-                return json_response({"ok": False, "error": "intake_disabled"}, status="410 Gone").wsgi(start_response)
-            return redirect(scoped("/dashboard?msg=Intake%20feature%20is%20disabled")).wsgi(start_response)
+    conn.commit()
+    msg = f"Workspace updated: {slug}.{temp_password_message}"
+    return redirect(f"/admin/users?msg={quote(msg)}")
+
+
+@route("POST", "/admin/workspaces/delete", "/admin/orgs/delete", min_role="owner")
+def handle_admin_workspaces_delete(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    slug = str(req.form.get("slug") or "").strip().lower()
+    confirm = str(req.form.get("confirm") or "").strip().upper()
+    if not slug:
+        return redirect("/admin/users?msg=Workspace%20slug%20required")
+    if confirm != "DELETE":
+        return redirect("/admin/users?msg=Type%20DELETE%20to%20confirm")
+    target = conn.execute("SELECT id, slug FROM organizations WHERE slug = ?", (slug,)).fetchone()
+    if not target:
+        return redirect("/admin/users?msg=Workspace%20not%20found")
+    target_org_id = int(target["id"])
+    conn.execute("DELETE FROM organizations WHERE id = ?", (target_org_id,))
+    conn.commit()
+    if target_org_id == org_id:
+        next_org = conn.execute(
+            "SELECT organization_id FROM memberships WHERE user_id = ? ORDER BY created_at LIMIT 1",
+            (user_id,),
+        ).fetchone()
+        if next_org:
+            return redirect(f"/dashboard?org_id={next_org['organization_id']}&msg=Workspace%20deleted")
+        return redirect("/login?msg=Workspace%20deleted.%20No%20remaining%20workspace%20access", cookies=[clear_cookie("session_token"), clear_cookie("active_org")])
+    return redirect("/admin/users?msg=Workspace%20deleted")
 
-        if req.path == "/logout" and req.method == "POST":
-            token = req.cookies.get("session_token", "")
-            if token:
-                conn.execute("DELETE FROM sessions WHERE token_hash = ?", (token_hash(token),))
-                conn.commit()
-            return redirect("/login", cookies=[clear_cookie("session_token"), clear_cookie("active_org")]).wsgi(start_response)
 
-        if req.path == "/dashboard":
-            content = build_dashboard(
-                conn,
-                org_id,
-                user_id,
-                active_space_id=selected_space_id,
-                active_space_name=active_space["name"] if active_space else "",
-                role=str(ctx.get("role") or "viewer"),
-            )
-            page = render_layout("Dashboard", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
+@route("POST", "/settings/update")
+def handle_settings_update(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    prefs = load_user_preferences(conn, user_id)
+    # Every key below is reassigned, never mutated in place, so a shallow copy is enough to diff.
+    loaded_prefs = dict(prefs)
+    prefs["default_task_scope"] = form.get("default_task_scope", "my")
+    prefs.update({key: form.get(key) == "1" for key in BOOLEAN_PREFERENCE_KEYS})
+    actor_role = str(ctx.get("role") or "viewer")
+    allowed = role_nav_keys(actor_role)
+    selected = [key for key in allowed if form.get(f"nav_{key}") == "1"]
+    role_default = load_role_nav_preference(conn, org_id, actor_role, allowed)
+    prefs["nav_visibility"] = sanitize_nav_key_selection(selected, allowed, fallback=role_default)
+    if prefs == loaded_prefs:
+        return redirect(scoped_path(ctx, "/settings?msg=Preferences%20saved"))
+    save_user_preferences(conn, user_id, prefs)
+    conn.commit()
+    return redirect(scoped_path(ctx, "/settings?msg=Preferences%20saved"))
+
+
+@route("POST", "/settings/nav-role/update", min_role="workspace_admin")
+def handle_settings_nav_role_update(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    actor_role = str(ctx.get("role") or "viewer")
+    target_role = parse_membership_role(form.get("target_role"), default="staff")
+    if target_role in {"workspace_admin", "owner"} and not role_allows(actor_role, "owner"):
+        return redirect(scoped_path(ctx, "/settings?msg=Only%20owner-level%20admins%20can%20edit%20workspace-admin%20or%20owner%20defaults"))
+    allowed = role_nav_keys(target_role)
+    selected = [key for key in allowed if form.get(f"role_nav_{key}") == "1"]
+    cleaned = sanitize_nav_key_selection(selected, allowed, fallback=allowed)
+    before_snapshot = snapshot_row(
+        conn.execute(
+            "SELECT * FROM role_nav_preferences WHERE organization_id = ? AND role = ?",
+            (org_id, target_role),
+        ).fetchone()
+    )
+    if before_snapshot and before_snapshot.get("visible_json") == json.dumps(cleaned):
+        # Re-submitted unchanged defaults: skip the upsert and the audit snapshot.
+        return redirect(scoped_path(ctx, "/settings?msg=Role%20navigation%20defaults%20saved"))
+    after_row = save_role_nav_preference(conn, org_id, target_role, cleaned, user_id)
+    after_snapshot = snapshot_row(after_row)
+    # RETURNING * yields the table's column order, so `id` is always the first column.
+    row_id = to_int(str(after_row[0])) if after_row else to_int(str(before_snapshot.get("id") if before_snapshot else ""))
+    if row_id is not None:
+        log_change_with_rollback(
+            conn,
+            org_id,
+            user_id,
+            "role_nav_saved",
+            "role_nav_preferences",
+            row_id,
+            before_snapshot,
+            after_snapshot,
+            f"Role nav defaults updated: {target_role}",
+            source="settings",
+        )
+    conn.commit()
+    return redirect(scoped_path(ctx, "/settings?msg=Role%20navigation%20defaults%20saved"))
 
-        if req.path == "/projects":
-            team_id = to_int(req.query.get("team_id"))
-            content = render_project_page(conn, org_id, user_id, selected_team_id=team_id, selected_space_id=selected_space_id)
-            page = render_layout("Projects", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
 
-        if req.path == "/projects/new" and req.method == "POST":
-            gate = require_role(ctx, "staff")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            role = str(ctx.get("role") or "viewer")
-            name = sanitize_title_for_role(
-                conn,
-                org_id,
-                role,
-                "projects",
-                form.get("name"),
-                None,
-                free_edit_min_role="manager",
-            )
-            status = form.get("status", "Planned")
-            if status not in PROJECT_STATUSES:
-                status = "Planned"
-            lane = form.get("lane", LANES[0])
-            if lane not in LANES:
-                lane = LANES[0]
-            priority = form.get("priority", "Medium")
-            if priority not in {"Low", "Medium", "High", "Critical"}:
-                priority = "Medium"
-            cursor = conn.execute(
-                """
-                INSERT INTO projects
-                (organization_id, name, description, lane, status, priority, owner_user_id, start_date, due_date, tags, meta_json, created_by, created_at, updated_at, team_id, space_id, progress_pct)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    org_id,
-                    name,
-                    form.get("description", ""),
-                    lane,
-                    status,
-                    priority,
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id")),
-                    parse_date(form.get("start_date", "")),
-                    parse_date(form.get("due_date", "")),
-                    form.get("tags", ""),
-                    "{}",
-                    user_id,
-                    iso(),
-                    iso(),
-                    int(form["team_id"]) if form.get("team_id") else None,
-                    int(form["space_id"]) if form.get("space_id") else None,
-                    int(form.get("progress_pct", "0") or 0),
-                ),
-            )
-            project_id = int(cursor.lastrowid)
-            created_snapshot = snapshot_row(
-                conn.execute(
-                    "SELECT * FROM projects WHERE id = ? AND organization_id = ?",
-                    (project_id, org_id),
-                ).fetchone()
-            )
-            log_change_with_rollback(
-                conn,
-                org_id,
-                user_id,
-                "project_created",
-                "projects",
-                project_id,
-                None,
-                created_snapshot,
-                f"Project created: {name}",
-            )
-            ensure_item_watchers_seeded(conn, org_id, "project", project_id, user_id)
-            notify_entity_watchers(
-                conn=conn,
-                org_id=org_id,
-                entity="project",
-                entity_id=project_id,
-                actor_user_id=user_id,
-                actor_name=str(user["name"]),
-                actor_email=str(user["email"]),
-                title=name,
-                summary="A new project was created.",
-                preference_key="email_project_updates",
-            )
-            conn.commit()
-            return redirect(scoped("/projects?msg=Project%20created")).wsgi(start_response)
+@route("POST", "/settings/profile")
+def handle_settings_profile(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    email = form.get("email", "").strip().lower()
+    # Uniqueness check and write in one statement: no row updated means the email is taken.
+    updated = conn.execute(
+        """
+        UPDATE users SET name = ?, email = ?, title = ?, timezone = ?
+        WHERE id = ? AND NOT EXISTS (SELECT 1 FROM users WHERE email = ? AND id != ?)
+        """,
+        (
+            form.get("name", ""),
+            email,
+            form.get("title", ""),
+            form.get("timezone", ""),
+            user_id,
+            email,
+            user_id,
+        ),
+    ).rowcount
+    if not updated:
+        return redirect(scoped_path(ctx, "/settings?msg=Email%20already%20in%20use"))
+    conn.commit()
+    return redirect(scoped_path(ctx, "/settings?msg=Profile%20updated"))
+
+
+@route("POST", "/settings/password")
+def handle_settings_password(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    current = form.get("current_password", "")
+    new_pw = form.get("new_password", "")
+    confirm = form.get("confirm_password", "")
+    if not current:
+        # Nothing to verify; skip the row lookup and the KDF entirely.
+        return redirect(scoped_path(ctx, "/settings?msg=Current%20password%20is%20incorrect"))
+    user_row = conn.execute(
+        "SELECT password_hash, password_salt FROM users WHERE id = ?",
+        (user_id,),
+    ).fetchone()
+    # Positional access matches the two-column projection above (password_hash, password_salt).
+    if not user_row or not verify_password(current, user_row[0], user_row[1]):
+        return redirect(scoped_path(ctx, "/settings?msg=Current%20password%20is%20incorrect"))
+    if new_pw != confirm or len(new_pw) < 12:
+        return redirect(scoped_path(ctx, "/settings?msg=New%20password%20must%20match%20and%20be%2012%2B%20chars"))
+    pw_hash, pw_salt = hash_password(new_pw)
+    # Hashing happens above so the write lock is only held for the two statements.
+    begin_immediate(conn)
+    conn.execute(
+        "UPDATE users SET password_hash = ?, password_salt = ? WHERE id = ?",
+        (pw_hash, pw_salt, user_id),
+    )
+    conn.execute("DELETE FROM sessions WHERE user_id = ? AND token_hash != ?", (user_id, token_hash(req.cookies.get("session_token", ""))))
+    conn.commit()
+    return redirect(scoped_path(ctx, "/settings?msg=Password%20updated"))
+
+
+@route("POST", "/settings/spaces/new", min_role="manager")
+def handle_settings_spaces_new(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    inserted = conn.execute(
+        "INSERT INTO spaces (organization_id, name, location, description, created_by, created_at) VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
+        (org_id, form.get("name", ""), form.get("location", ""), form.get("description", ""), user_id, iso()),
+    ).rowcount
+    if not inserted:
+        return redirect(scoped_path(ctx, "/settings?msg=Makerspace%20name%20already%20exists"))
+    conn.commit()
+    return redirect(scoped_path(ctx, "/settings?msg=Makerspace%20added"))
+
+
+@route("POST", "/settings/spaces/update", min_role="manager")
+def handle_settings_spaces_update(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    next_path = str(form.get("next", "/settings") or "/settings").strip()
+    if not next_path.startswith("/"):
+        next_path = "/settings"
+    space_id = to_int(form.get("space_id"))
+    current = conn.execute(
+        "SELECT * FROM spaces WHERE id = ? AND organization_id = ?",
+        (space_id, org_id),
+    ).fetchone()
+    if not current:
+        return redirect(scoped_path(ctx, f"{next_path}?msg=Makerspace%20not%20found"))
+    before_snapshot = snapshot_row(current)
+    name = sanitize_title_for_role(
+        conn,
+        org_id,
+        str(ctx.get("role") or "viewer"),
+        "spaces",
+        form.get("name"),
+        current["name"],
+        free_edit_min_role="manager",
+    )
+    # Name collisions leave the row untouched (rowcount 0) instead of raising IntegrityError.
+    updated = conn.execute(
+        """
+        UPDATE spaces SET name = ?, location = ?, description = ?
+        WHERE id = ? AND organization_id = ?
+          AND NOT EXISTS (SELECT 1 FROM spaces WHERE organization_id = ? AND name = ? AND id != ?)
+        """,
+        (
+            name,
+            form.get("location", ""),
+            form.get("description", ""),
+            space_id,
+            org_id,
+            org_id,
+            name,
+            space_id,
+        ),
+    ).rowcount
+    if not updated:
+        return redirect(scoped_path(ctx, f"{next_path}?msg=Makerspace%20name%20already%20exists"))
+    after_snapshot = snapshot_row(
+        conn.execute(
+            "SELECT * FROM spaces WHERE id = ? AND organization_id = ?",
+            (space_id, org_id),
+        ).fetchone()
+    )
+    if after_snapshot != before_snapshot:
+        log_change_with_rollback(
+            conn,
+            org_id,
+            user_id,
+            "space_saved",
+            "spaces",
+            space_id or 0,
+            before_snapshot,
+            after_snapshot,
+            f"Makerspace updated: {name}",
+            source="settings",
+        )
+    conn.commit()
+    return redirect(scoped_path(ctx, f"{next_path}?msg=Makerspace%20updated"))
+
+
+@route("POST", "/settings/spaces/delete", min_role="manager")
+def handle_settings_spaces_delete(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    space_id = to_int(form.get("space_id"))
+    replacement_space_id = to_int(form.get("replacement_space_id"))
+    if space_id is None or replacement_space_id is None or int(space_id) == int(replacement_space_id):
+        return redirect(scoped_path(ctx, "/settings?msg=Select%20a%20different%20replacement%20space"))
+    begin_immediate(conn)
+    current = conn.execute(
+        "SELECT id, name FROM spaces WHERE id = ? AND organization_id = ?",
+        (space_id, org_id),
+    ).fetchone()
+    replacement = conn.execute(
+        "SELECT id, name FROM spaces WHERE id = ? AND organization_id = ?",
+        (replacement_space_id, org_id),
+    ).fetchone()
+    if not current or not replacement:
+        return redirect(scoped_path(ctx, "/settings?msg=Invalid%20space%20selection"))
+    for sql in SPACE_DELETE_REASSIGN_SQL:
+        conn.execute(sql, (replacement_space_id, org_id, space_id))
+    conn.execute(
+        "UPDATE equipment_assets SET space = ? WHERE organization_id = ? AND space = ?",
+        (replacement["name"], org_id, current["name"]),
+    )
+    conn.execute("DELETE FROM spaces WHERE id = ? AND organization_id = ?", (space_id, org_id))
+    conn.commit()
+    return redirect(scoped_path(ctx, "/settings?msg=Makerspace%20deleted%20and%20work%20reassigned"))
 
-        if req.path == "/projects/update" and req.method == "POST":
-            gate = require_role(ctx, "staff")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            current = conn.execute(
-                "SELECT id, name, status, owner_user_id FROM projects WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
-                (form.get("project_id"), org_id),
-            ).fetchone()
-            if not current:
-                return redirect(scoped("/projects?msg=Project%20not%20found")).wsgi(start_response)
-            next_status = form.get("status", "Planned")
-            if next_status not in PROJECT_STATUSES:
-                next_status = "Planned"
-            progress_pct = to_int(form.get("progress_pct"), 0) or 0
-            progress_pct = max(0, min(100, progress_pct))
-            conn.execute(
-                "UPDATE projects SET status = ?, progress_pct = ?, updated_at = ? WHERE id = ? AND organization_id = ?",
-                (
-                    next_status,
-                    progress_pct,
-                    iso(),
-                    current["id"],
-                    org_id,
-                ),
-            )
-            ensure_item_watchers_seeded(conn, org_id, "project", int(current["id"]), user_id)
-            notify_entity_watchers(
-                conn=conn,
-                org_id=org_id,
-                entity="project",
-                entity_id=int(current["id"]),
-                actor_user_id=user_id,
-                actor_name=str(user["name"]),
-                actor_email=str(user["email"]),
-                title=str(current["name"] or f"Project #{current['id']}"),
-                summary=f"Project status changed to {next_status}.",
-                preference_key="email_project_updates",
-            )
-            conn.commit()
-            return redirect(scoped("/projects?msg=Project%20updated")).wsgi(start_response)
 
-        if req.path == "/tasks":
-            team_id = to_int(req.query.get("team_id"))
-            content = render_task_page(conn, org_id, user_id, selected_team_id=team_id, selected_space_id=selected_space_id)
-            page = render_layout("Tasks", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
+@route("POST", "/settings/teams/new", min_role="manager")
+def handle_settings_teams_new(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    # Without the IntegrityError fallback, only in-workspace leads may reach the FK column.
+    lead_user_id = normalize_org_user_id(conn, org_id, form.get("lead_user_id"))
+    cursor = conn.execute(
+        "INSERT INTO teams (organization_id, name, focus_area, lead_user_id, created_at) VALUES (?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
+        (
+            org_id,
+            form.get("name", ""),
+            form.get("focus_area", ""),
+            lead_user_id,
+            iso(),
+        ),
+    )
+    if not cursor.rowcount:
+        return redirect(scoped_path(ctx, "/settings?msg=Team%20name%20already%20exists"))
+    team_id = int(cursor.lastrowid)
+    if lead_user_id:
+        conn.execute(
+            "INSERT OR IGNORE INTO team_members (team_id, user_id, role, created_at) VALUES (?, ?, 'lead', ?)",
+            (team_id, lead_user_id, iso()),
+        )
+    conn.commit()
+    return redirect(scoped_path(ctx, "/settings?msg=Team%20added"))
 
-        if req.path == "/tasks/new" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            status = form.get("status", "Todo")
-            if status not in TASK_STATUSES:
-                status = "Todo"
-            priority = form.get("priority", "Medium")
-            if priority not in {"Low", "Medium", "High", "Critical"}:
-                priority = "Medium"
-            assignee_id = normalize_org_user_id(conn, org_id, form.get("assignee_user_id"))
-            project_id, space_id, relation_error = resolve_task_project_and_space(
-                conn,
-                org_id,
-                user_id,
-                form.get("project_id"),
-                to_int(form.get("space_id"), selected_space_id),
-            )
-            if relation_error == "invalid_project":
-                return redirect(scoped("/tasks?msg=Select%20a%20valid%20project")).wsgi(start_response)
-            if relation_error == "missing_space":
-                return redirect(scoped("/tasks?msg=Create%20a%20makerspace%20before%20adding%20tasks")).wsgi(start_response)
-            cursor = conn.execute(
-                """
-                INSERT INTO tasks
-                (organization_id, project_id, title, description, status, priority, assignee_user_id, reporter_user_id, due_date, planned_week, energy, estimate_hours, meta_json, created_at, updated_at, team_id, space_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    org_id,
-                    project_id,
-                    form.get("title", "Untitled Task"),
-                    form.get("description", ""),
-                    status,
-                    priority,
-                    assignee_id,
-                    user_id,
-                    parse_date(form.get("due_date", "")),
-                    dt.date.today().isocalendar()[1],
-                    form.get("energy", "Medium"),
-                    float(form.get("estimate_hours", "0") or 0),
-                    "{}",
-                    iso(),
-                    iso(),
-                    int(form["team_id"]) if form.get("team_id") else None,
-                    space_id,
-                ),
-            )
-            new_task_id = int(cursor.lastrowid)
-            created_snapshot = snapshot_row(
-                conn.execute(
-                    "SELECT * FROM tasks WHERE id = ? AND organization_id = ?",
-                    (new_task_id, org_id),
-                ).fetchone()
-            )
-            log_change_with_rollback(
-                conn,
-                org_id,
-                user_id,
-                "task_created",
-                "tasks",
-                new_task_id,
-                None,
-                created_snapshot,
-                f"Task created: {form.get('title', '')}",
-            )
-            ensure_item_watchers_seeded(conn, org_id, "task", new_task_id, user_id)
-            notify_task_assignment(
-                conn=conn,
-                org_id=org_id,
-                task_id=new_task_id,
-                actor_name=user["name"],
-                actor_email=user["email"],
-                task_title=form.get("title", "Untitled Task"),
-                task_status=status,
-                assignee_id=assignee_id,
-            )
-            conn.commit()
-            return redirect(scoped("/tasks?msg=Task%20created")).wsgi(start_response)
 
-        if req.path == "/tasks/update" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            current = conn.execute(
-                "SELECT id, title, status, assignee_user_id FROM tasks WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
-                (form.get("task_id"), org_id),
-            ).fetchone()
-            if not current:
-                return redirect(scoped("/tasks?msg=Task%20not%20found")).wsgi(start_response)
-            next_status = form.get("status", "Todo")
-            if next_status not in TASK_STATUSES:
-                next_status = str(current["status"] or "Todo")
-            conn.execute(
-                "UPDATE tasks SET status = ?, updated_at = ? WHERE id = ? AND organization_id = ?",
-                (next_status, iso(), form.get("task_id"), org_id),
-            )
-            if next_status != current["status"]:
-                notify_task_assignment(
-                    conn=conn,
-                    org_id=org_id,
-                    task_id=int(current["id"]),
-                    actor_name=user["name"],
-                    actor_email=user["email"],
-                    task_title=current["title"],
-                    task_status=next_status,
-                    assignee_id=to_int(str(current["assignee_user_id"]) if current["assignee_user_id"] else None),
-                )
-                ensure_item_watchers_seeded(conn, org_id, "task", int(current["id"]), user_id)
-                notify_entity_watchers(
-                    conn=conn,
-                    org_id=org_id,
-                    entity="task",
-                    entity_id=int(current["id"]),
-                    actor_user_id=user_id,
-                    actor_name=str(user["name"]),
-                    actor_email=str(user["email"]),
-                    title=str(current["title"] or f"Task #{current['id']}"),
-                    summary=f"Task status changed to {next_status}.",
-                    skip_user_ids=[to_int(current["assignee_user_id"])] if to_int(current["assignee_user_id"]) is not None else None,
-                    preference_key="email_task_updates",
-                )
-            conn.commit()
-            return redirect(scoped("/tasks?msg=Task%20updated")).wsgi(start_response)
+@route("POST", "/settings/teams/update", min_role="manager")
+def handle_settings_teams_update(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    team_id = to_int(form.get("team_id"))
+    current = conn.execute(
+        "SELECT * FROM teams WHERE id = ? AND organization_id = ?",
+        (team_id, org_id),
+    ).fetchone()
+    if not current:
+        return redirect(scoped_path(ctx, "/settings?msg=Team%20not%20found"))
+    before_snapshot = snapshot_row(current)
+    name = sanitize_title_for_role(
+        conn,
+        org_id,
+        str(ctx.get("role") or "viewer"),
+        "teams",
+        form.get("name"),
+        current["name"],
+        free_edit_min_role="manager",
+    )
+    lead_user_id = normalize_org_user_id(conn, org_id, form.get("lead_user_id"))
+    updated = conn.execute(
+        """
+        UPDATE teams SET name = ?, focus_area = ?, lead_user_id = ?
+        WHERE id = ? AND organization_id = ?
+          AND NOT EXISTS (SELECT 1 FROM teams WHERE organization_id = ? AND name = ? AND id != ?)
+        """,
+        (
+            name,
+            form.get("focus_area", ""),
+            lead_user_id,
+            team_id,
+            org_id,
+            org_id,
+            name,
+            team_id,
+        ),
+    ).rowcount
+    if not updated:
+        return redirect(scoped_path(ctx, "/settings?msg=Team%20name%20already%20exists"))
+    if lead_user_id:
+        conn.execute(
+            "INSERT OR IGNORE INTO team_members (team_id, user_id, role, created_at) VALUES (?, ?, 'lead', ?)",
+            (team_id, lead_user_id, iso()),
+        )
+    after_snapshot = snapshot_row(
+        conn.execute(
+            "SELECT * FROM teams WHERE id = ? AND organization_id = ?",
+            (team_id, org_id),
+        ).fetchone()
+    )
+    if after_snapshot != before_snapshot:
+        log_change_with_rollback(
+            conn,
+            org_id,
+            user_id,
+            "team_saved",
+            "teams",
+            team_id or 0,
+            before_snapshot,
+            after_snapshot,
+            f"Team updated: {name}",
+            source="settings",
+        )
+    conn.commit()
+    return redirect(scoped_path(ctx, "/settings?msg=Team%20updated"))
+
+
+@route("POST", "/settings/teams/delete", min_role="manager")
+def handle_settings_teams_delete(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    team_id = to_int(form.get("team_id"))
+    replacement_team_id = to_int(form.get("replacement_team_id"))
+    begin_immediate(conn)
+    current = conn.execute(
+        "SELECT id FROM teams WHERE id = ? AND organization_id = ?",
+        (team_id, org_id),
+    ).fetchone()
+    if not current:
+        return redirect(scoped_path(ctx, "/settings?msg=Team%20not%20found"))
+    if replacement_team_id is not None:
+        replacement = conn.execute(
+            "SELECT id FROM teams WHERE id = ? AND organization_id = ?",
+            (replacement_team_id, org_id),
+        ).fetchone()
+        if not replacement or int(replacement_team_id) == int(team_id or 0):
+            return redirect(scoped_path(ctx, "/settings?msg=Invalid%20replacement%20team"))
+    for sql in TEAM_DELETE_REASSIGN_SQL:
+        conn.execute(sql, (replacement_team_id, org_id, team_id))
+    conn.execute("DELETE FROM teams WHERE id = ? AND organization_id = ?", (team_id, org_id))
+    conn.commit()
+    return redirect(scoped_path(ctx, "/settings?msg=Team%20deleted%20and%20work%20reassigned"))
 
-        if req.path == "/tasks/delegate" and req.method == "POST":
-            gate = require_role(ctx, "staff")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            task = conn.execute(
-                "SELECT id, title, status FROM tasks WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
-                (form.get("task_id"), org_id),
-            ).fetchone()
-            if not task:
-                return redirect(scoped("/dashboard?msg=Task%20not%20found")).wsgi(start_response)
-            assignee_id = normalize_org_user_id(conn, org_id, form.get("assignee_user_id"))
-            conn.execute(
-                "UPDATE tasks SET assignee_user_id = ?, updated_at = ? WHERE id = ? AND organization_id = ?",
-                (assignee_id, iso(), task["id"], org_id),
-            )
-            notify_task_assignment(
-                conn=conn,
-                org_id=org_id,
-                task_id=int(task["id"]),
-                actor_name=user["name"],
-                actor_email=user["email"],
-                task_title=task["title"],
-                task_status=task["status"],
-                assignee_id=assignee_id,
-            )
-            ensure_item_watchers_seeded(conn, org_id, "task", int(task["id"]), user_id)
-            notify_entity_watchers(
-                conn=conn,
-                org_id=org_id,
-                entity="task",
-                entity_id=int(task["id"]),
-                actor_user_id=user_id,
-                actor_name=str(user["name"]),
-                actor_email=str(user["email"]),
-                title=str(task["title"] or f"Task #{task['id']}"),
-                summary="Task assignee was updated.",
-                skip_user_ids=[int(assignee_id)] if assignee_id is not None else None,
-                preference_key="email_task_updates",
-            )
-            conn.commit()
-            return redirect(scoped("/dashboard?msg=Task%20delegated")).wsgi(start_response)
 
-        if req.path == "/api/lookups":
-            return json_response(build_lookups(conn, org_id, role=str(ctx.get("role") or "viewer"))).wsgi(start_response)
+@route("POST", "/settings/field/new", min_role="manager")
+def handle_settings_field_new(conn: sqlite3.Connection, req: Request, ctx: Dict[str, object], org_id: int, user_id: int) -> Response:
+    form = req.form
+    inserted = conn.execute(
+        """
+        INSERT INTO field_configs
+        (organization_id, entity, field_key, label, field_type, is_required, is_enabled, created_at)
+        VALUES (?, ?, ?, ?, ?, 0, 1, ?) ON CONFLICT DO NOTHING
+        """,
+        (
+            org_id,
+            form.get("entity", "projects"),
+            form.get("field_key", "").strip(),
+            form.get("label", "Custom Field"),
+            form.get("field_type", "text"),
+            iso(),
+        ),
+    ).rowcount
+    if not inserted:
+        return redirect(scoped_path(ctx, "/settings?msg=Field%20already%20exists"))
+    conn.commit()
+    return redirect(scoped_path(ctx, "/settings?msg=Field%20added"))
 
-        if req.path == "/api/agenda/detail":
-            agenda_id = to_int(req.query.get("agenda_id"))
-            if agenda_id is None:
-                return json_response({"ok": False, "error": "invalid_agenda"}, status="400 Bad Request").wsgi(start_response)
-            agenda = conn.execute(
-                """
-                SELECT a.id, a.title, a.meeting_date, a.notes, a.status, a.priority, a.lane, a.team_id, a.space_id,
-                       a.due_date, a.description, a.owner_user_id,
-                       u.name AS owner_name, t.name AS team_name, s.name AS space_name
-                FROM meeting_agendas a
-                LEFT JOIN users u ON u.id = a.owner_user_id
-                LEFT JOIN teams t ON t.id = a.team_id
-                LEFT JOIN spaces s ON s.id = a.space_id
-                WHERE a.id = ? AND a.organization_id = ?
-                """,
-                (agenda_id, org_id),
-            ).fetchone()
-            if not agenda:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
 
-            line_items = conn.execute(
-                """
-                SELECT i.id, i.parent_item_id, i.section, i.minutes_estimate, i.sort_order,
-                       t.id AS task_id, t.title AS task_title, t.status AS task_status, t.priority AS task_priority, t.due_date AS task_due_date,
-                       p.id AS project_id, p.name AS project_name, p.status AS project_status, p.priority AS project_priority, p.due_date AS project_due_date
-                FROM meeting_items i
-                LEFT JOIN tasks t ON t.id = i.linked_task_id AND t.organization_id = ? AND t.deleted_at IS NULL
-                LEFT JOIN projects p ON p.id = i.linked_project_id AND p.organization_id = ? AND p.deleted_at IS NULL
-                WHERE i.agenda_id = ?
-                ORDER BY i.sort_order, i.id
-                """,
-                (org_id, org_id, agenda_id),
-            ).fetchall()
-            items_payload: List[Dict[str, object]] = []
-            for row in line_items:
-                if row["task_id"] is not None:
-                    items_payload.append(
-                        {
-                            "id": row["id"],
-                            "source_type": "task",
-                            "source_id": row["task_id"],
-                            "title": row["task_title"] or "Untitled Task",
-                            "status": row["task_status"] or "",
-                            "priority": row["task_priority"] or "Medium",
-                            "due_date": row["task_due_date"] or "",
-                            "section": row["section"] or "General",
-                            "minutes_estimate": row["minutes_estimate"] or 10,
-                            "parent_item_id": row["parent_item_id"] or "",
-                        }
-                    )
-                    continue
-                if row["project_id"] is not None:
-                    items_payload.append(
-                        {
-                            "id": row["id"],
-                            "source_type": "project",
-                            "source_id": row["project_id"],
-                            "title": row["project_name"] or "Untitled Project",
-                            "status": row["project_status"] or "",
-                            "priority": row["project_priority"] or "Medium",
-                            "due_date": row["project_due_date"] or "",
-                            "section": row["section"] or "General",
-                            "minutes_estimate": row["minutes_estimate"] or 10,
-                            "parent_item_id": row["parent_item_id"] or "",
-                        }
-                    )
-            task_options = conn.execute(
-                """
-                SELECT id, title, status
-                FROM tasks
-                WHERE organization_id = ?
-                  AND deleted_at IS NULL
-                  AND status NOT IN ('Done', 'Cancelled')
-                ORDER BY updated_at DESC, id DESC
-                LIMIT 200
-                """,
-                (org_id,),
-            ).fetchall()
-            project_options = conn.execute(
-                """
-                SELECT id, name, status
-                FROM projects
-                WHERE organization_id = ?
-                  AND deleted_at IS NULL
-                  AND status != 'Complete'
-                ORDER BY updated_at DESC, id DESC
-                LIMIT 200
-                """,
-                (org_id,),
-            ).fetchall()
-            return json_response(
-                {
-                    "ok": True,
-                    "agenda": {
-                        "id": agenda["id"],
-                        "title": agenda["title"] or "Untitled Meeting",
-                        "meeting_date": agenda["meeting_date"] or "",
-                        "notes": agenda["notes"] or "",
-                        "status": agenda["status"] or "Planned",
-                        "priority": agenda["priority"] or "Medium",
-                        "lane": agenda["lane"] or LANES[0],
-                        "team_id": agenda["team_id"] or "",
-                        "team_name": agenda["team_name"] or "",
-                        "space_id": agenda["space_id"] or "",
-                        "space_name": agenda["space_name"] or "",
-                        "due_date": agenda["due_date"] or "",
-                        "description": agenda["description"] or "",
-                        "owner_user_id": agenda["owner_user_id"] or "",
-                        "owner_name": agenda["owner_name"] or "",
-                    },
-                    "items": items_payload,
-                    "task_options": [{"id": row["id"], "title": row["title"], "status": row["status"]} for row in task_options],
-                    "project_options": [{"id": row["id"], "name": row["name"], "status": row["status"]} for row in project_options],
-                }
-            ).wsgi(start_response)
+def app(environ, start_response):
+    """WSGI entrypoint.
 
-        if req.path == "/api/agenda/save" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            form = req.form
-            agenda_id = to_int(form.get("agenda_id"))
-            if agenda_id is None:
-                return json_response({"ok": False, "error": "invalid_agenda"}, status="400 Bad Request").wsgi(start_response)
-            current = conn.execute(
-                "SELECT * FROM meeting_agendas WHERE id = ? AND organization_id = ?",
-                (agenda_id, org_id),
-            ).fetchone()
-            if not current:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            status = str(form.get("status") or current["status"] or "Planned").strip()
-            if status not in AGENDA_STATUSES:
-                status = str(current["status"] or "Planned")
-            priority = str(form.get("priority") or current["priority"] or "Medium").strip()
-            if priority not in {"Low", "Medium", "High", "Critical"}:
-                priority = str(current["priority"] or "Medium")
-            lane = str(form.get("lane") or current["lane"] or LANES[0]).strip()
-            if lane not in LANES:
-                lane = str(current["lane"] or LANES[0])
-            conn.execute(
-                """
-                UPDATE meeting_agendas
-                SET title = ?, meeting_date = ?, owner_user_id = ?, status = ?, priority = ?, lane = ?, team_id = ?, space_id = ?, due_date = ?, description = ?, notes = ?, updated_at = ?
-                WHERE id = ? AND organization_id = ?
-                """,
-                (
-                    str(form.get("title") or current["title"] or "Untitled Meeting").strip() or str(current["title"] or "Untitled Meeting"),
-                    parse_date(form.get("meeting_date", "")) or current["meeting_date"],
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
-                    status,
-                    priority,
-                    lane,
-                    to_int(form.get("team_id"), to_int(current["team_id"])),
-                    to_int(form.get("space_id"), to_int(current["space_id"])),
-                    parse_date(form.get("due_date", "")) if "due_date" in form else current["due_date"],
-                    form.get("description", current["description"] or ""),
-                    form.get("notes", current["notes"] or ""),
-                    iso(),
-                    agenda_id,
-                    org_id,
-                ),
-            )
-            conn.commit()
-            return json_response({"ok": True, "agenda_id": agenda_id, "status": status}).wsgi(start_response)
+    Route dispatch is intentionally explicit rather than framework-based so the project stays
+    lightweight and easy to host in constrained environments. Exact-match authenticated routes
+    live in the `ROUTES` table (see `route()`); page renders and prefix routes stay inline below.
+    """
+    req = Request(environ)
 
-        if req.path == "/api/agenda/item/attach" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            form = req.form
-            agenda_id = to_int(form.get("agenda_id"))
-            source_id = to_int(form.get("source_id"))
-            source_type = str(form.get("source_type") or "").strip().lower()
-            section = str(form.get("section") or "General").strip() or "General"
-            if agenda_id is None or source_id is None:
-                return json_response({"ok": False, "error": "invalid_request"}, status="400 Bad Request").wsgi(start_response)
-            target = conn.execute(
-                "SELECT id FROM meeting_agendas WHERE id = ? AND organization_id = ?",
-                (agenda_id, org_id),
-            ).fetchone()
-            if not target:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            parent_item_id = to_int(form.get("parent_item_id"))
-            if parent_item_id is not None:
-                parent = conn.execute(
-                    """
-                    SELECT i.id, i.parent_item_id
-                    FROM meeting_items i
-                    JOIN meeting_agendas a ON a.id = i.agenda_id
-                    WHERE i.id = ? AND i.agenda_id = ? AND a.organization_id = ?
-                    """,
-                    (parent_item_id, agenda_id, org_id),
-                ).fetchone()
-                if not parent or parent["parent_item_id"] is not None:
-                    return json_response({"ok": False, "error": "invalid_parent"}, status="400 Bad Request").wsgi(start_response)
-            if source_type == "task":
-                source = conn.execute(
-                    """
-                    SELECT id, title, status, priority, due_date, assignee_user_id
-                    FROM tasks
-                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
-                    """,
-                    (source_id, org_id),
-                ).fetchone()
-                if not source:
-                    return json_response({"ok": False, "error": "source_not_found"}, status="404 Not Found").wsgi(start_response)
-                conn.execute(
-                    """
-                    INSERT INTO meeting_items
-                    (agenda_id, parent_item_id, section, title, owner_user_id, status, priority, due_date, minutes_estimate, description, linked_task_id, item_type, sort_order, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        agenda_id,
-                        parent_item_id,
-                        section,
-                        source["title"] or "Untitled Task",
-                        source["assignee_user_id"],
-                        agenda_status_from_task_status(str(source["status"] or "")),
-                        source["priority"] or "Medium",
-                        source["due_date"],
-                        10,
-                        "",
-                        source["id"],
-                        "task",
-                        next_meeting_item_sort_order(conn, agenda_id),
-                        iso(),
-                        iso(),
-                    ),
-                )
-                conn.commit()
-                return json_response({"ok": True, "agenda_id": agenda_id, "source_type": "task"}).wsgi(start_response)
-            if source_type == "project":
-                source = conn.execute(
-                    """
-                    SELECT id, name, status, priority, due_date, owner_user_id
-                    FROM projects
-                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
-                    """,
-                    (source_id, org_id),
-                ).fetchone()
-                if not source:
-                    return json_response({"ok": False, "error": "source_not_found"}, status="404 Not Found").wsgi(start_response)
-                conn.execute(
-                    """
-                    INSERT INTO meeting_items
-                    (agenda_id, parent_item_id, section, title, owner_user_id, status, priority, due_date, minutes_estimate, description, linked_project_id, item_type, sort_order, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        agenda_id,
-                        parent_item_id,
-                        section,
-                        source["name"] or "Untitled Project",
-                        source["owner_user_id"],
-                        agenda_status_from_project_status(str(source["status"] or "")),
-                        source["priority"] or "Medium",
-                        source["due_date"],
-                        10,
-                        "",
-                        source["id"],
-                        "project",
-                        next_meeting_item_sort_order(conn, agenda_id),
-                        iso(),
-                        iso(),
-                    ),
-                )
-                conn.commit()
-                return json_response({"ok": True, "agenda_id": agenda_id, "source_type": "project"}).wsgi(start_response)
-            return json_response({"ok": False, "error": "invalid_source_type"}, status="400 Bad Request").wsgi(start_response)
-
-        if req.path == "/api/agenda/item/save" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            form = req.form
-            item_id = to_int(form.get("item_id"))
-            if item_id is None:
-                return json_response({"ok": False, "error": "invalid_item"}, status="400 Bad Request").wsgi(start_response)
-            target = conn.execute(
-                """
-                SELECT i.*, a.organization_id, t.id AS linked_task_exists, p.id AS linked_project_exists
-                FROM meeting_items i
-                JOIN meeting_agendas a ON a.id = i.agenda_id
-                LEFT JOIN tasks t ON t.id = i.linked_task_id AND t.organization_id = ? AND t.deleted_at IS NULL
-                LEFT JOIN projects p ON p.id = i.linked_project_id AND p.organization_id = ? AND p.deleted_at IS NULL
-                WHERE i.id = ? AND a.organization_id = ?
-                """,
-                (org_id, org_id, item_id, org_id),
-            ).fetchone()
-            if not target:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            title = str(form.get("title") or target["title"] or "Untitled").strip() or str(target["title"] or "Untitled")
-            section = str(form.get("section") or target["section"] or "General").strip() or "General"
-            status = str(form.get("status") or target["status"] or "Not Discussed").strip()
-            if status not in AGENDA_ITEM_STATUSES:
-                status = str(target["status"] or "Not Discussed")
-            priority = str(form.get("priority") or target["priority"] or "Medium").strip()
-            if priority not in {"Low", "Medium", "High", "Critical"}:
-                priority = str(target["priority"] or "Medium")
-            due_date = parse_date(str(form.get("due_date") or "")) if "due_date" in form else target["due_date"]
-            minutes_estimate = max(1, to_int(form.get("minutes_estimate"), int(target["minutes_estimate"] or 10)) or 10)
-            owner_user_id = normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(target["owner_user_id"]))
-            now_iso = iso()
-            before_snapshot = snapshot_row(target)
-            conn.execute(
-                "UPDATE meeting_items SET title = ?, section = ?, owner_user_id = ?, status = ?, priority = ?, due_date = ?, minutes_estimate = ?, updated_at = ? WHERE id = ?",
-                (title, section, owner_user_id, status, priority, due_date, minutes_estimate, now_iso, item_id),
-            )
-            if target["linked_task_exists"] is not None:
-                conn.execute(
-                    """
-                    UPDATE tasks
-                    SET title = ?, status = ?, priority = ?, due_date = ?, assignee_user_id = ?, updated_at = ?
-                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
-                    """,
-                    (title, task_status_from_agenda_status(status), priority, due_date, owner_user_id, now_iso, target["linked_task_id"], org_id),
-                )
-            elif target["linked_project_exists"] is not None:
-                conn.execute(
-                    """
-                    UPDATE projects
-                    SET name = ?, status = ?, priority = ?, due_date = ?, owner_user_id = ?, updated_at = ?
-                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
-                    """,
-                    (title, project_status_from_agenda_status(status), priority, due_date, owner_user_id, now_iso, target["linked_project_id"], org_id),
-                )
-            after_snapshot = snapshot_row(
-                conn.execute(
-                    "SELECT * FROM meeting_items WHERE id = ?",
-                    (item_id,),
-                ).fetchone()
-            )
-            log_change_with_rollback(
-                conn,
-                org_id,
-                user_id,
-                "agenda_item_updated",
-                "meeting_items",
-                item_id,
-                before_snapshot,
-                after_snapshot,
-                f"Agenda item updated: {title}",
-            )
-            conn.commit()
-            owner_name = ""
-            if owner_user_id is not None:
-                owner_row = conn.execute("SELECT name FROM users WHERE id = ?", (owner_user_id,)).fetchone()
-                owner_name = str(owner_row["name"] or "") if owner_row else ""
-            return json_response(
-                {
-                    "ok": True,
-                    "item_id": item_id,
-                    "status": status,
-                    "updated_at": now_iso,
-                    "owner_user_id": owner_user_id or "",
-                    "owner_name": owner_name,
-                }
-            ).wsgi(start_response)
+    if req.path == "/website":
+        return redirect("/website/").wsgi(start_response)
+    if req.path.startswith("/website/"):
+        rel = req.path.replace("/website/", "", 1).strip("/")
+        if not rel:
+            rel = "index.html"
+        website_file = (WEBSITE_DIR / rel).resolve()
+        # Security decision: enforce website sandbox to prevent path traversal.
+        if WEBSITE_DIR.resolve() not in website_file.parents and website_file != WEBSITE_DIR.resolve():
+            return Response("Not found", status="404 Not Found").wsgi(start_response)
+        # Support extension-less wiki routes (e.g. /website/wiki/getting-started).
+        if not website_file.exists() and "." not in Path(rel).name:
+            html_fallback = (WEBSITE_DIR / f"{rel}.html").resolve()
+            if WEBSITE_DIR.resolve() in html_fallback.parents and html_fallback.exists() and html_fallback.is_file():
+                website_file = html_fallback
+            elif (WEBSITE_DIR / rel).resolve().is_dir():
+                # Keep canonical trailing slash for directory routes.
+                return redirect(f"/website/{rel}/").wsgi(start_response)
+        if website_file.is_dir():
+            website_file = website_file / "index.html"
+        if not website_file.exists() or not website_file.is_file():
+            return Response("Not found", status="404 Not Found").wsgi(start_response)
+        served_name = website_file.name.lower()
+        mime = "text/plain; charset=utf-8"
+        if served_name.endswith(".html"):
+            mime = "text/html; charset=utf-8"
+        elif served_name.endswith(".css"):
+            mime = "text/css; charset=utf-8"
+        elif served_name.endswith(".js"):
+            mime = "application/javascript; charset=utf-8"
+        elif served_name.endswith(".json"):
+            mime = "application/json; charset=utf-8"
+        elif served_name.endswith(".svg"):
+            mime = "image/svg+xml"
+        elif served_name.endswith(".md"):
+            mime = "text/markdown; charset=utf-8"
+        return Response(website_file.read_text(encoding="utf-8"), content_type=mime).wsgi(start_response)
 
-        if req.path == "/api/agenda/item/detail":
-            item_id = to_int(req.query.get("item_id"))
-            if item_id is None:
-                return json_response({"ok": False, "error": "invalid_item"}, status="400 Bad Request").wsgi(start_response)
-            row = conn.execute(
-                """
-                SELECT i.id, i.agenda_id, i.parent_item_id, i.section, i.title, i.status, i.priority, i.due_date, i.minutes_estimate, i.description, i.updated_at, i.created_at,
-                       i.linked_task_id, i.linked_project_id, i.item_type,
-                       t.title AS linked_task_title, p.name AS linked_project_title,
-                       a.title AS agenda_title, a.meeting_date,
-                       u.name AS owner_name
-                FROM meeting_items i
-                JOIN meeting_agendas a ON a.id = i.agenda_id
-                LEFT JOIN users u ON u.id = i.owner_user_id
-                LEFT JOIN tasks t ON t.id = i.linked_task_id AND t.organization_id = ? AND t.deleted_at IS NULL
-                LEFT JOIN projects p ON p.id = i.linked_project_id AND p.organization_id = ? AND p.deleted_at IS NULL
-                WHERE i.id = ? AND a.organization_id = ?
-                """,
-                (org_id, org_id, item_id, org_id),
-            ).fetchone()
-            if not row:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            updates = conn.execute(
-                """
-                SELECT mu.id, mu.body, mu.created_at, u.name AS author_name
-                FROM meeting_item_updates mu
-                LEFT JOIN users u ON u.id = mu.author_user_id
-                WHERE mu.organization_id = ? AND mu.item_id = ?
-                ORDER BY mu.created_at DESC, mu.id DESC
-                LIMIT 80
-                """,
-                (org_id, item_id),
-            ).fetchall()
-            files = conn.execute(
-                """
-                SELECT f.id, f.file_name, f.file_url, f.created_at, u.name AS uploader_name
-                FROM meeting_item_files f
-                LEFT JOIN users u ON u.id = f.uploader_user_id
-                WHERE f.organization_id = ? AND f.item_id = ?
-                ORDER BY f.created_at DESC, f.id DESC
-                LIMIT 80
-                """,
-                (org_id, item_id),
-            ).fetchall()
-            audit_rows = conn.execute(
-                """
-                SELECT a.id, a.action, a.details, a.created_at, u.name AS actor_name
-                FROM audit_log a
-                LEFT JOIN users u ON u.id = a.user_id
-                WHERE a.organization_id = ? AND a.entity = 'meeting_items' AND a.entity_id = ?
-                ORDER BY a.id DESC
-                LIMIT 80
-                """,
-                (org_id, str(item_id)),
-            ).fetchall()
-            activity_items: List[Dict[str, str]] = []
-            for r in updates:
-                activity_items.append(
-                    {
-                        "kind": "update",
-                        "label": "Update posted",
-                        "summary": str(r["body"] or "")[:260],
-                        "author_name": str(r["author_name"] or "Unknown"),
-                        "created_at": str(r["created_at"] or ""),
-                    }
-                )
-            for r in files:
-                activity_items.append(
-                    {
-                        "kind": "file",
-                        "label": "File linked",
-                        "summary": str(r["file_name"] or "File"),
-                        "author_name": str(r["uploader_name"] or "Unknown"),
-                        "created_at": str(r["created_at"] or ""),
-                    }
-                )
-            for r in audit_rows:
-                activity_items.append(
-                    {
-                        "kind": "audit",
-                        "label": str(r["action"] or "activity").replace("_", " ").title(),
-                        "summary": audit_details_summary(r["details"]),
-                        "author_name": str(r["actor_name"] or "Unknown"),
-                        "created_at": str(r["created_at"] or ""),
-                    }
-                )
-            activity_items.sort(key=lambda item: item.get("created_at", ""), reverse=True)
-            return json_response(
-                {
-                    "ok": True,
-                    "item": {
-                        "id": row["id"],
-                        "agenda_id": row["agenda_id"],
-                        "agenda_title": row["agenda_title"] or "",
-                        "meeting_date": row["meeting_date"] or "",
-                        "parent_item_id": row["parent_item_id"] or "",
-                        "section": row["section"] or "General",
-                        "title": row["title"] or "Untitled",
-                        "status": row["status"] or "Not Discussed",
-                        "priority": row["priority"] or "Medium",
-                        "due_date": row["due_date"] or "",
-                        "minutes_estimate": row["minutes_estimate"] or 10,
-                        "description": row["description"] or "",
-                        "updated_at": row["updated_at"] or row["created_at"] or "",
-                        "item_type": row["item_type"] or "agenda",
-                        "owner_name": row["owner_name"] or "",
-                        "linked_task_id": row["linked_task_id"] or "",
-                        "linked_project_id": row["linked_project_id"] or "",
-                        "linked_task_title": row["linked_task_title"] or "",
-                        "linked_project_title": row["linked_project_title"] or "",
-                    },
-                    "updates": [
-                        {
-                            "id": r["id"],
-                            "body": r["body"] or "",
-                            "created_at": r["created_at"] or "",
-                            "author_name": r["author_name"] or "Unknown",
-                        }
-                        for r in updates
-                    ],
-                    "files": [
-                        {
-                            "id": r["id"],
-                            "file_name": r["file_name"] or "File",
-                            "file_url": r["file_url"] or "",
-                            "created_at": r["created_at"] or "",
-                            "uploader_name": r["uploader_name"] or "Unknown",
-                        }
-                        for r in files
-                    ],
-                    "activity": activity_items[:120],
-                }
+    if req.path.startswith("/static/"):
+        rel = req.path.replace("/static/", "", 1)
+        static_file = STATIC_DIR / rel
+        if not static_file.exists() or not static_file.is_file():
+            return Response("Not found", status="404 Not Found").wsgi(start_response)
+        mime = "text/plain"
+        if rel.endswith(".css"):
+            mime = "text/css; charset=utf-8"
+        elif rel.endswith(".js"):
+            mime = "application/javascript; charset=utf-8"
+        elif rel.endswith(".svg"):
+            mime = "image/svg+xml"
+        return Response(static_file.read_text(), content_type=mime).wsgi(start_response)
+
+    if req.path == "/healthz":
+        return Response("ok", content_type="text/plain").wsgi(start_response)
+    if req.path == "/readyz":
+        # Readiness checks include DB reachability to catch locked/corrupt startup states.
+        try:
+            ensure_bootstrap()
+            probe = db_connect()
+            probe.execute("SELECT 1").fetchone()
+            probe.close()
+            return Response("ready", content_type="text/plain").wsgi(start_response)
+        except Exception as exc:
+            return Response(
+                f"not-ready: {h(str(exc))}",
+                status="503 Service Unavailable",
+                content_type="text/plain",
             ).wsgi(start_response)
 
-        if req.path == "/api/agenda/item/updates/add" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            item_id = to_int(req.form.get("item_id"))
-            body = str(req.form.get("body") or "").strip()
-            if item_id is None or not body:
-                return json_response({"ok": False, "error": "invalid_request"}, status="400 Bad Request").wsgi(start_response)
-            if len(body) > 4000:
-                body = body[:4000]
-            target = conn.execute(
-                """
-                SELECT i.id
-                FROM meeting_items i
-                JOIN meeting_agendas a ON a.id = i.agenda_id
-                WHERE i.id = ? AND a.organization_id = ?
-                """,
-                (item_id, org_id),
+    try:
+        ensure_bootstrap()
+    except Exception as exc:
+        body = f"<h1>503 Service Unavailable</h1><p>Database bootstrap failed: {h(str(exc))}</p>"
+        return Response(body, status="503 Service Unavailable").wsgi(start_response)
+
+    conn = acquire_db_connection()
+    ctx = get_auth_context(conn, req)
+    notice = req.query.get("msg", "")
+
+    try:
+        # Public auth routes
+        if req.path == "/login" and req.method == "GET":
+            return Response(render_login(req, error=notice)).wsgi(start_response)
+
+        if req.path == "/login" and req.method == "POST":
+            ip = req.environ.get("REMOTE_ADDR", "unknown")
+            if not enforce_rate_limit(ip):
+                return Response(render_login(req, "Too many login attempts. Try again later."), status="429 Too Many Requests").wsgi(start_response)
+
+            email = req.form.get("email", "").strip().lower()
+            password = req.form.get("password", "")
+            user = conn.execute(
+                "SELECT * FROM users WHERE email = ? AND is_active = 1", (email,)
             ).fetchone()
-            if not target:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            created_at = iso()
-            conn.execute(
-                """
-                INSERT INTO meeting_item_updates (organization_id, item_id, author_user_id, body, created_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (org_id, item_id, user_id, body, created_at),
-            )
-            conn.execute("UPDATE meeting_items SET updated_at = ? WHERE id = ?", (created_at, item_id))
-            log_action(
+            valid_password = False
+            if user:
+                try:
+                    valid_password = verify_password(
+                        password,
+                        str(user["password_hash"] or ""),
+                        str(user["password_salt"] or ""),
+                    )
+                except Exception:
+                    valid_password = False
+            if not user or not valid_password:
+                return Response(render_login(req, "Invalid credentials.")).wsgi(start_response)
+
+            raw_session, _csrf = create_session(
                 conn,
-                org_id,
-                user_id,
-                "agenda_item_update_posted",
-                "meeting_items",
-                str(item_id),
-                json.dumps({"summary": body[:180], "source": "updates_panel"}),
+                user["id"],
+                req.environ.get("REMOTE_ADDR", ""),
+                req.environ.get("HTTP_USER_AGENT", ""),
             )
             conn.commit()
-            return json_response({"ok": True}).wsgi(start_response)
+            cookie_session = set_cookie("session_token", raw_session, max_age=SESSION_DAYS * 24 * 3600)
+            return redirect("/dashboard", cookies=[cookie_session]).wsgi(start_response)
 
-        if req.path == "/api/agenda/item/files/add" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            item_id = to_int(req.form.get("item_id"))
-            file_name = str(req.form.get("file_name") or "").strip()
-            file_url = str(req.form.get("file_url") or "").strip()
-            if item_id is None or not file_url:
-                return json_response({"ok": False, "error": "invalid_request"}, status="400 Bad Request").wsgi(start_response)
-            if not re.match(r"^https?://", file_url, flags=re.IGNORECASE):
-                return json_response({"ok": False, "error": "invalid_url"}, status="400 Bad Request").wsgi(start_response)
-            target = conn.execute(
-                """
-                SELECT i.id
-                FROM meeting_items i
-                JOIN meeting_agendas a ON a.id = i.agenda_id
-                WHERE i.id = ? AND a.organization_id = ?
-                """,
-                (item_id, org_id),
-            ).fetchone()
-            if not target:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            safe_name = file_name[:220]
-            if not safe_name:
-                safe_name = file_url.rstrip("/").rsplit("/", 1)[-1] or "Linked file"
-            created_at = iso()
-            cursor = conn.execute(
-                """
-                INSERT INTO meeting_item_files (organization_id, item_id, uploader_user_id, file_name, file_url, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (org_id, item_id, user_id, safe_name, file_url, created_at),
+        if req.path == "/forgot-password" and req.method == "GET":
+            return Response(render_forgot_password(req, message=notice)).wsgi(start_response)
+
+        if req.path == "/forgot-password" and req.method == "POST":
+            email = req.form.get("email", "").strip().lower()
+            user = conn.execute("SELECT id FROM users WHERE email = ? AND is_active = 1", (email,)).fetchone()
+            if not user:
+                return Response(
+                    render_forgot_password(
+                        req,
+                        "If the account exists, a reset link is now available through your admin.",
+                    )
+                ).wsgi(start_response)
+            token, _expires = create_password_reset(conn, user["id"], created_by=None, hours=24)
+            conn.commit()
+            reset_link = f"/reset-password?token={token}"
+            msg = quote(f"Reset link (share securely): {reset_link}")
+            return redirect(f"/forgot-password?msg={msg}").wsgi(start_response)
+
+        if req.path == "/reset-password" and req.method == "GET":
+            token = req.query.get("token", "")
+            reset = verify_reset_token(conn, token) if token else None
+            if not reset:
+                return Response(render_login(req, "Reset link is invalid or expired.")).wsgi(start_response)
+            return Response(render_reset_password(req, token)).wsgi(start_response)
+
+        if req.path == "/reset-password" and req.method == "POST":
+            token = req.form.get("token", "")
+            password = req.form.get("password", "")
+            confirm = req.form.get("password_confirm", "")
+            if password != confirm or len(password) < 12:
+                return Response(render_reset_password(req, token, "Passwords must match and be at least 12 characters.")).wsgi(start_response)
+            reset = verify_reset_token(conn, token)
+            if not reset:
+                return Response(render_login(req, "Reset link is invalid or expired.")).wsgi(start_response)
+            pw_hash, pw_salt = hash_password(password)
+            conn.execute(
+                "UPDATE users SET password_hash = ?, password_salt = ? WHERE id = ?",
+                (pw_hash, pw_salt, reset["user_id"]),
             )
-            conn.execute("UPDATE meeting_items SET updated_at = ? WHERE id = ?", (created_at, item_id))
-            log_action(
-                conn,
-                org_id,
-                user_id,
-                "agenda_item_file_added",
-                "meeting_items",
-                str(item_id),
-                json.dumps({"summary": safe_name, "source": "files_panel", "url": file_url[:280]}),
+            conn.execute(
+                "UPDATE password_resets SET used_at = ? WHERE id = ?",
+                (iso(), reset["id"]),
             )
+            conn.execute("DELETE FROM sessions WHERE user_id = ?", (reset["user_id"],))
             conn.commit()
-            return json_response(
-                {
-                    "ok": True,
-                    "file": {
-                        "id": int(cursor.lastrowid or 0),
-                        "file_name": safe_name,
-                        "file_url": file_url,
-                        "created_at": created_at,
-                    },
-                }
-            ).wsgi(start_response)
+            return redirect("/login?msg=Password%20updated.%20Please%20sign%20in.").wsgi(start_response)
+
+        auth_required = require_auth(ctx)
+        if auth_required:
+            return auth_required.wsgi(start_response)
+
+        if req.method == "POST" and not validate_csrf(req, ctx):
+            return Response("<h1>400 Bad Request</h1><p>CSRF token mismatch.</p>", status="400 Bad Request").wsgi(start_response)
+
+        user = ctx["user"]
+        org = ctx["active_org"]
+        user_id = int(user["id"])
+        org_id = int(org["organization_id"])
+        csrf_token = ctx.get("csrf", "")
+        spaces = get_spaces_for_org(conn, org_id)
+        space_ids = {int(s["id"]) for s in spaces}
+        selected_space_id = to_int(req.query.get("space_id"))
+        if selected_space_id is None:
+            selected_space_id = to_int(req.form.get("active_space_id"))
+        # Reject unknown space ids from query/form to avoid cross-space leakage via crafted URLs.
+        if selected_space_id not in space_ids:
+            selected_space_id = None
+        active_space = next((s for s in spaces if int(s["id"]) == int(selected_space_id or 0)), None)
+        ctx["spaces"] = spaces
+        ctx["active_space_id"] = selected_space_id
+        ctx["active_space"] = active_space
+        user_prefs = load_user_preferences(conn, user_id)
+        nav_primary_items, nav_account_items, effective_nav_keys = visible_nav_for_user(
+            conn,
+            org_id,
+            str(ctx.get("role") or "viewer"),
+            user_prefs,
+        )
+        ctx["user_prefs"] = user_prefs
+        ctx["nav_primary_items"] = nav_primary_items
+        ctx["nav_account_items"] = nav_account_items
+        ctx["nav_visible_keys"] = effective_nav_keys
+        scoped = lambda path: with_space(path, selected_space_id)
+
+        if req.path == "/":
+            return redirect(scoped("/dashboard")).wsgi(start_response)
+
+        if (not FEATURE_INTAKE_ENABLED) and req.path == "/intake":
+            content = """
+            <section class='card maker-hero'>
+              <h2>Intake Is Disabled</h2>
+              <p>The intake module has been removed from this workspace configuration.</p>
+              <a class='btn' href='/dashboard'>Return to Dashboard</a>
+            </section>
+            """
+            page = render_layout("Intake Disabled", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
+
+        if (not FEATURE_INTAKE_ENABLED) and (
+            req.path.startswith("/intake/") or req.path == "/api/intake/save"
+        ):
+            if req.path.startswith("/api/"):
+                return json_response({"ok": False, "error": "intake_disabled"}, status="410 Gone").wsgi(start_response)
+            return redirect(scoped("/dashboard?msg=Intake%20feature%20is%20disabled")).wsgi(start_response)
 
-        if req.path == "/api/agenda/item/files/delete" and req.method == "POST":
-            gate = require_role(ctx, "student")
+        registered = ROUTES.get((req.method, req.path))
+        if registered:
+            handler, min_role, is_api = registered
+            gate = require_role(ctx, min_role) if min_role else None
             if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            file_id = to_int(req.form.get("file_id"))
-            if file_id is None:
-                return json_response({"ok": False, "error": "invalid_request"}, status="400 Bad Request").wsgi(start_response)
-            row = conn.execute(
-                """
-                SELECT f.id, f.item_id, f.file_name
-                FROM meeting_item_files f
-                JOIN meeting_items i ON i.id = f.item_id
-                JOIN meeting_agendas a ON a.id = i.agenda_id
-                WHERE f.id = ? AND f.organization_id = ? AND a.organization_id = ?
-                """,
-                (file_id, org_id, org_id),
-            ).fetchone()
-            if not row:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            created_at = iso()
-            conn.execute("DELETE FROM meeting_item_files WHERE id = ? AND organization_id = ?", (file_id, org_id))
-            conn.execute("UPDATE meeting_items SET updated_at = ? WHERE id = ?", (created_at, row["item_id"]))
-            log_action(
+                if is_api:
+                    return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+                return gate.wsgi(start_response)
+            return handler(conn, req, ctx, org_id, user_id).wsgi(start_response)
+
+        if req.path == "/logout" and req.method == "POST":
+            token = req.cookies.get("session_token", "")
+            if token:
+                conn.execute("DELETE FROM sessions WHERE token_hash = ?", (token_hash(token),))
+                conn.commit()
+            return redirect("/login", cookies=[clear_cookie("session_token"), clear_cookie("active_org")]).wsgi(start_response)
+
+        if req.path == "/dashboard":
+            content = build_dashboard(
                 conn,
                 org_id,
                 user_id,
-                "agenda_item_file_removed",
-                "meeting_items",
-                str(row["item_id"]),
-                json.dumps({"summary": str(row["file_name"] or "File removed"), "source": "files_panel"}),
+                active_space_id=selected_space_id,
+                active_space_name=active_space["name"] if active_space else "",
+                role=str(ctx.get("role") or "viewer"),
             )
-            conn.commit()
-            return json_response({"ok": True}).wsgi(start_response)
+            page = render_layout("Dashboard", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
 
-        if req.path == "/api/activity":
-            limit = to_int(req.query.get("limit"), 40) or 40
-            limit = max(10, min(200, limit))
-            role = str(ctx.get("role") or "viewer")
-            if role_allows(role, "workspace_admin"):
-                rows = conn.execute(
-                    """
-                    SELECT em.id, em.subject, em.status, em.error_message, em.related_entity, em.related_id,
-                           em.created_at, em.sent_at, em.recipient_email, em.body,
-                           u.name AS recipient_name
-                    FROM email_messages em
-                    LEFT JOIN users u ON u.id = em.recipient_user_id
-                    WHERE em.organization_id = ?
-                    ORDER BY em.id DESC
-                    LIMIT ?
-                    """,
-                    (org_id, limit),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    """
-                    SELECT em.id, em.subject, em.status, em.error_message, em.related_entity, em.related_id,
-                           em.created_at, em.sent_at, em.recipient_email, em.body,
-                           u.name AS recipient_name
-                    FROM email_messages em
-                    LEFT JOIN users u ON u.id = em.recipient_user_id
-                    WHERE em.organization_id = ?
-                      AND (em.recipient_user_id = ? OR LOWER(em.recipient_email) = LOWER(?))
-                    ORDER BY em.id DESC
-                    LIMIT ?
-                    """,
-                    (org_id, user_id, user["email"], limit),
-                ).fetchall()
-            return json_response(
-                {
-                    "ok": True,
-                    "items": [
-                        {
-                            "id": row["id"],
-                            "subject": row["subject"],
-                            "status": row["status"],
-                            "error_message": row["error_message"] or "",
-                            "related_entity": row["related_entity"] or "",
-                            "related_id": row["related_id"] or "",
-                            "created_at": row["created_at"],
-                            "sent_at": row["sent_at"] or "",
-                            "recipient_name": row["recipient_name"] or "",
-                            "recipient_email": row["recipient_email"] or "",
-                            "preview": str(row["body"] or "")[:220],
-                        }
-                        for row in rows
-                    ],
-                }
-            ).wsgi(start_response)
+        if req.path == "/projects":
+            team_id = to_int(req.query.get("team_id"))
+            content = render_project_page(conn, org_id, user_id, selected_team_id=team_id, selected_space_id=selected_space_id)
+            page = render_layout("Projects", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
 
-        if req.path == "/api/interface/log" and req.method == "POST":
-            gate = require_role(ctx, "viewer")
+        if req.path == "/projects/new" and req.method == "POST":
+            gate = require_role(ctx, "staff")
             if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            action = str(req.form.get("action") or "ui_event").strip().lower()[:64]
-            entity_id = str(req.form.get("board_key") or req.form.get("context") or "").strip()[:120]
-            payload_raw = str(req.form.get("payload_json") or "").strip()
-            payload: object = {}
-            if payload_raw:
-                try:
-                    parsed = json.loads(payload_raw)
-                    payload = parsed if isinstance(parsed, (dict, list, str, int, float, bool)) else str(parsed)
-                except Exception:
-                    payload = payload_raw[:2400]
-            details = json.dumps(
-                {
-                    "source": "interface",
-                    "summary": str(req.form.get("summary") or action or "interface event")[:220],
-                    "path": req.form.get("path") or req.path,
-                    "payload": payload,
-                },
-                ensure_ascii=True,
-            )[:14000]
-            log_action(
+                return gate.wsgi(start_response)
+            form = req.form
+            role = str(ctx.get("role") or "viewer")
+            name = sanitize_title_for_role(
                 conn,
                 org_id,
-                user_id,
-                action or "ui_event",
-                "interface",
-                entity_id or None,
-                details,
+                role,
+                "projects",
+                form.get("name"),
+                None,
+                free_edit_min_role="manager",
             )
-            conn.commit()
-            return json_response({"ok": True}).wsgi(start_response)
-
-        if req.path == "/api/comments":
-            entity = str(req.query.get("entity") or "").strip().lower()
-            item_id = to_int(req.query.get("item_id"))
-            if item_id is None or not comment_table_for_entity(entity):
-                return json_response({"ok": False, "error": "invalid_target"}, status="400 Bad Request").wsgi(start_response)
-            if not comment_target_exists(conn, org_id, entity, item_id):
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            rows = load_item_comments(conn, org_id, entity, item_id, limit=250)
-            return json_response(
-                {
-                    "ok": True,
-                    "comments": [
-                        {
-                            "id": row["id"],
-                            "body": row["body"],
-                            "author_user_id": row["author_user_id"],
-                            "author_name": row["author_name"] or "Unknown",
-                            "created_at": row["created_at"],
-                        }
-                        for row in rows
-                    ],
-                }
-            ).wsgi(start_response)
-
-        if req.path == "/api/comments/add" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            entity = str(req.form.get("entity") or "").strip().lower()
-            item_id = to_int(req.form.get("item_id"))
-            body = str(req.form.get("body") or "").strip()
-            if item_id is None or not comment_table_for_entity(entity):
-                return json_response({"ok": False, "error": "invalid_target"}, status="400 Bad Request").wsgi(start_response)
-            if not body:
-                return json_response({"ok": False, "error": "comment_required"}, status="400 Bad Request").wsgi(start_response)
-            if len(body) > 4000:
-                body = body[:4000]
-            if not comment_target_exists(conn, org_id, entity, item_id):
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            status = form.get("status", "Planned")
+            if status not in PROJECT_STATUSES:
+                status = "Planned"
+            lane = form.get("lane", LANES[0])
+            if lane not in LANES:
+                lane = LANES[0]
+            priority = form.get("priority", "Medium")
+            if priority not in {"Low", "Medium", "High", "Critical"}:
+                priority = "Medium"
             cursor = conn.execute(
                 """
-                INSERT INTO item_comments (organization_id, entity, entity_id, author_user_id, body, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO projects
+                (organization_id, name, description, lane, status, priority, owner_user_id, start_date, due_date, tags, meta_json, created_by, created_at, updated_at, team_id, space_id, progress_pct)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (org_id, entity, item_id, user_id, body, iso()),
+                (
+                    org_id,
+                    name,
+                    form.get("description", ""),
+                    lane,
+                    status,
+                    priority,
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id")),
+                    parse_date(form.get("start_date", "")),
+                    parse_date(form.get("due_date", "")),
+                    form.get("tags", ""),
+                    "{}",
+                    user_id,
+                    iso(),
+                    iso(),
+                    int(form["team_id"]) if form.get("team_id") else None,
+                    int(form["space_id"]) if form.get("space_id") else None,
+                    int(form.get("progress_pct", "0") or 0),
+                ),
+            )
+            project_id = int(cursor.lastrowid)
+            created_snapshot = snapshot_row(
+                conn.execute(
+                    "SELECT * FROM projects WHERE id = ? AND organization_id = ?",
+                    (project_id, org_id),
+                ).fetchone()
+            )
+            log_change_with_rollback(
+                conn,
+                org_id,
+                user_id,
+                "project_created",
+                "projects",
+                project_id,
+                None,
+                created_snapshot,
+                f"Project created: {name}",
+            )
+            ensure_item_watchers_seeded(conn, org_id, "project", project_id, user_id)
+            notify_entity_watchers(
+                conn=conn,
+                org_id=org_id,
+                entity="project",
+                entity_id=project_id,
+                actor_user_id=user_id,
+                actor_name=str(user["name"]),
+                actor_email=str(user["email"]),
+                title=name,
+                summary="A new project was created.",
+                preference_key="email_project_updates",
+            )
+            conn.commit()
+            return redirect(scoped("/projects?msg=Project%20created")).wsgi(start_response)
+
+        if req.path == "/projects/update" and req.method == "POST":
+            gate = require_role(ctx, "staff")
+            if gate:
+                return gate.wsgi(start_response)
+            form = req.form
+            current = conn.execute(
+                "SELECT id, name, status, owner_user_id FROM projects WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
+                (form.get("project_id"), org_id),
+            ).fetchone()
+            if not current:
+                return redirect(scoped("/projects?msg=Project%20not%20found")).wsgi(start_response)
+            next_status = form.get("status", "Planned")
+            if next_status not in PROJECT_STATUSES:
+                next_status = "Planned"
+            progress_pct = to_int(form.get("progress_pct"), 0) or 0
+            progress_pct = max(0, min(100, progress_pct))
+            conn.execute(
+                "UPDATE projects SET status = ?, progress_pct = ?, updated_at = ? WHERE id = ? AND organization_id = ?",
+                (
+                    next_status,
+                    progress_pct,
+                    iso(),
+                    current["id"],
+                    org_id,
+                ),
             )
-            comment_id = int(cursor.lastrowid)
-            notify_comment_mentions_and_watchers(
+            ensure_item_watchers_seeded(conn, org_id, "project", int(current["id"]), user_id)
+            notify_entity_watchers(
                 conn=conn,
                 org_id=org_id,
-                entity=entity,
-                item_id=item_id,
+                entity="project",
+                entity_id=int(current["id"]),
                 actor_user_id=user_id,
                 actor_name=str(user["name"]),
                 actor_email=str(user["email"]),
-                comment_body=body,
+                title=str(current["name"] or f"Project #{current['id']}"),
+                summary=f"Project status changed to {next_status}.",
+                preference_key="email_project_updates",
             )
             conn.commit()
-            row = conn.execute(
-                """
-                SELECT c.id, c.body, c.created_at, c.author_user_id, u.name AS author_name
-                FROM item_comments c
-                LEFT JOIN users u ON u.id = c.author_user_id
-                WHERE c.id = ? AND c.organization_id = ?
-                """,
-                (comment_id, org_id),
-            ).fetchone()
-            return json_response(
-                {
-                    "ok": True,
-                    "comment": {
-                        "id": row["id"],
-                        "body": row["body"],
-                        "author_user_id": row["author_user_id"],
-                        "author_name": row["author_name"] or "Unknown",
-                        "created_at": row["created_at"],
-                    },
-                }
-            ).wsgi(start_response)
+            return redirect(scoped("/projects?msg=Project%20updated")).wsgi(start_response)
 
-        if req.path == "/api/tasks/create" and req.method == "POST":
+        if req.path == "/tasks":
+            team_id = to_int(req.query.get("team_id"))
+            content = render_task_page(conn, org_id, user_id, selected_team_id=team_id, selected_space_id=selected_space_id)
+            page = render_layout("Tasks", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
+
+        if req.path == "/tasks/new" and req.method == "POST":
             gate = require_role(ctx, "student")
             if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+                return gate.wsgi(start_response)
             form = req.form
-            role = str(ctx.get("role") or "viewer")
-            title = sanitize_title_for_role(
-                conn,
-                org_id,
-                role,
-                "tasks",
-                form.get("title"),
-                None,
-                free_edit_min_role="manager",
-            )
             status = form.get("status", "Todo")
             if status not in TASK_STATUSES:
                 status = "Todo"
             priority = form.get("priority", "Medium")
             if priority not in {"Low", "Medium", "High", "Critical"}:
                 priority = "Medium"
-            energy = form.get("energy", "Medium")
-            if energy not in {"Low", "Medium", "High"}:
-                energy = "Medium"
             assignee_id = normalize_org_user_id(conn, org_id, form.get("assignee_user_id"))
             project_id, space_id, relation_error = resolve_task_project_and_space(
                 conn,
@@ -11011,26 +11122,9 @@ def app(environ, start_response):
                 to_int(form.get("space_id"), selected_space_id),
             )
             if relation_error == "invalid_project":
-                return json_response({"ok": False, "error": "invalid_project"}, status="400 Bad Request").wsgi(start_response)
+                return redirect(scoped("/tasks?msg=Select%20a%20valid%20project")).wsgi(start_response)
             if relation_error == "missing_space":
-                return json_response({"ok": False, "error": "missing_space"}, status="400 Bad Request").wsgi(start_response)
-
-            meta: Dict[str, object] = {}
-            attachments = lines_to_items(form.get("attachments"))
-            if attachments:
-                meta["attachments"] = attachments
-            note = (form.get("note") or "").strip()
-            if note:
-                meta["note"] = note[:1500]
-            extra_json = (form.get("extra_json") or "").strip()
-            if extra_json:
-                try:
-                    extra_obj = json.loads(extra_json)
-                    if isinstance(extra_obj, dict):
-                        meta["extra"] = extra_obj
-                except json.JSONDecodeError:
-                    pass
-
+                return redirect(scoped("/tasks?msg=Create%20a%20makerspace%20before%20adding%20tasks")).wsgi(start_response)
             cursor = conn.execute(
                 """
                 INSERT INTO tasks
@@ -11040,28 +11134,28 @@ def app(environ, start_response):
                 (
                     org_id,
                     project_id,
-                    title,
-                    form.get("description", "").strip(),
+                    form.get("title", "Untitled Task"),
+                    form.get("description", ""),
                     status,
                     priority,
                     assignee_id,
                     user_id,
                     parse_date(form.get("due_date", "")),
                     dt.date.today().isocalendar()[1],
-                    energy,
-                    to_float(form.get("estimate_hours"), 0.0),
-                    json.dumps(meta),
+                    form.get("energy", "Medium"),
+                    float(form.get("estimate_hours", "0") or 0),
+                    "{}",
                     iso(),
                     iso(),
-                    to_int(form.get("team_id")),
+                    int(form["team_id"]) if form.get("team_id") else None,
                     space_id,
                 ),
             )
-            task_id = int(cursor.lastrowid)
+            new_task_id = int(cursor.lastrowid)
             created_snapshot = snapshot_row(
                 conn.execute(
                     "SELECT * FROM tasks WHERE id = ? AND organization_id = ?",
-                    (task_id, org_id),
+                    (new_task_id, org_id),
                 ).fetchone()
             )
             log_change_with_rollback(
@@ -11070,2893 +11164,3004 @@ def app(environ, start_response):
                 user_id,
                 "task_created",
                 "tasks",
-                task_id,
+                new_task_id,
                 None,
                 created_snapshot,
-                f"Task created: {title}",
+                f"Task created: {form.get('title', '')}",
             )
-            ensure_item_watchers_seeded(conn, org_id, "task", task_id, user_id)
+            ensure_item_watchers_seeded(conn, org_id, "task", new_task_id, user_id)
             notify_task_assignment(
                 conn=conn,
                 org_id=org_id,
-                task_id=task_id,
+                task_id=new_task_id,
                 actor_name=user["name"],
                 actor_email=user["email"],
-                task_title=title,
+                task_title=form.get("title", "Untitled Task"),
                 task_status=status,
                 assignee_id=assignee_id,
             )
             conn.commit()
-            return json_response({"ok": True, "task_id": task_id}).wsgi(start_response)
-
-        if req.path == "/api/tasks/save" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            form = req.form
-            role = str(ctx.get("role") or "viewer")
-            task_id = to_int(form.get("task_id"))
-            current = conn.execute(
-                "SELECT * FROM tasks WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
-                (task_id, org_id),
-            ).fetchone()
-            if not current:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            before_snapshot = snapshot_row(current)
-
-            def val(key: str, existing: object) -> object:
-                return form[key] if key in form else existing
-
-            meta = parse_meta_json(current["meta_json"])
-            if "attachments" in form:
-                attachments = lines_to_items(form.get("attachments"))
-                if attachments:
-                    meta["attachments"] = attachments
-                else:
-                    meta.pop("attachments", None)
-            if "note" in form:
-                note = (form.get("note") or "").strip()
-                if note:
-                    meta["note"] = note[:1500]
-                else:
-                    meta.pop("note", None)
-            if "extra_json" in form:
-                extra_json = (form.get("extra_json") or "").strip()
-                if extra_json:
-                    try:
-                        extra_obj = json.loads(extra_json)
-                        if isinstance(extra_obj, dict):
-                            meta["extra"] = extra_obj
-                    except json.JSONDecodeError:
-                        pass
-                else:
-                    meta.pop("extra", None)
-
-            status = str(val("status", current["status"]))
-            if status not in TASK_STATUSES:
-                status = str(current["status"])
-            priority = str(val("priority", current["priority"]))
-            if priority not in {"Low", "Medium", "High", "Critical"}:
-                priority = str(current["priority"] or "Medium")
-            energy = str(val("energy", current["energy"] or "Medium"))
-            if energy not in {"Low", "Medium", "High"}:
-                energy = str(current["energy"] or "Medium")
-            assignee_id = normalize_org_user_id(
-                conn,
-                org_id,
-                val("assignee_user_id", current["assignee_user_id"]),
-                fallback=to_int(current["assignee_user_id"]),
-            )
-
-            due_date = current["due_date"]
-            if "due_date" in form:
-                due_date = parse_date(form.get("due_date", ""))
-            title = sanitize_title_for_role(
-                conn,
-                org_id,
-                role,
-                "tasks",
-                val("title", current["title"]),
-                current["title"],
-                free_edit_min_role="manager",
-            )
-            project_id, space_id, relation_error = resolve_task_project_and_space(
-                conn,
-                org_id,
-                user_id,
-                val("project_id", current["project_id"]),
-                val("space_id", current["space_id"] if current["space_id"] is not None else selected_space_id),
-            )
-            if relation_error == "invalid_project":
-                return json_response({"ok": False, "error": "invalid_project"}, status="400 Bad Request").wsgi(start_response)
-            if relation_error == "missing_space":
-                return json_response({"ok": False, "error": "missing_space"}, status="400 Bad Request").wsgi(start_response)
+            return redirect(scoped("/tasks?msg=Task%20created")).wsgi(start_response)
 
-            conn.execute(
-                """
-                UPDATE tasks
-                SET title = ?, description = ?, status = ?, priority = ?, assignee_user_id = ?, project_id = ?,
-                    due_date = ?, energy = ?, estimate_hours = ?, team_id = ?, space_id = ?, meta_json = ?, updated_at = ?
-                WHERE id = ? AND organization_id = ?
-                """,
-                (
-                    title,
-                    str(val("description", current["description"] or ""))[:5000],
-                    status,
-                    priority,
-                    assignee_id,
-                    project_id,
-                    due_date,
-                    energy,
-                    to_float(val("estimate_hours", current["estimate_hours"] or 0.0), float(current["estimate_hours"] or 0.0)),
-                    to_int(val("team_id", current["team_id"])),
-                    space_id,
-                    json.dumps(meta),
-                    iso(),
-                    task_id,
-                    org_id,
-                ),
-            )
-            after_snapshot = snapshot_row(
-                conn.execute(
-                    "SELECT * FROM tasks WHERE id = ? AND organization_id = ?",
-                    (task_id, org_id),
-                ).fetchone()
-            )
-            log_change_with_rollback(
-                conn,
-                org_id,
-                user_id,
-                "task_saved",
-                "tasks",
-                task_id or 0,
-                before_snapshot,
-                after_snapshot,
-                f"Task updated: {title}",
+        if req.path == "/tasks/update" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return gate.wsgi(start_response)
+            form = req.form
+            current = conn.execute(
+                "SELECT id, title, status, assignee_user_id FROM tasks WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
+                (form.get("task_id"), org_id),
+            ).fetchone()
+            if not current:
+                return redirect(scoped("/tasks?msg=Task%20not%20found")).wsgi(start_response)
+            next_status = form.get("status", "Todo")
+            if next_status not in TASK_STATUSES:
+                next_status = str(current["status"] or "Todo")
+            conn.execute(
+                "UPDATE tasks SET status = ?, updated_at = ? WHERE id = ? AND organization_id = ?",
+                (next_status, iso(), form.get("task_id"), org_id),
             )
-            ensure_item_watchers_seeded(conn, org_id, "task", int(task_id or 0), user_id)
-            status_changed = status != str(current["status"] or "")
-            old_assignee_id = to_int(current["assignee_user_id"])
-            assignee_changed = assignee_id != old_assignee_id
-            if status != current["status"] or assignee_id != to_int(current["assignee_user_id"]):
+            if next_status != current["status"]:
                 notify_task_assignment(
                     conn=conn,
                     org_id=org_id,
-                    task_id=int(task_id or 0),
+                    task_id=int(current["id"]),
                     actor_name=user["name"],
                     actor_email=user["email"],
-                    task_title=title,
-                    task_status=status,
-                    assignee_id=assignee_id,
+                    task_title=current["title"],
+                    task_status=next_status,
+                    assignee_id=to_int(str(current["assignee_user_id"]) if current["assignee_user_id"] else None),
                 )
-            if before_snapshot != after_snapshot:
-                changed_fields: List[str] = []
-                if status_changed:
-                    changed_fields.append(f"status -> {status}")
-                if assignee_changed:
-                    changed_fields.append("assignee changed")
-                if title != str(current["title"] or ""):
-                    changed_fields.append("title updated")
-                if to_int(project_id) != to_int(current["project_id"]):
-                    changed_fields.append("project updated")
-                summary = "Task was updated."
-                if changed_fields:
-                    summary = f"Task was updated ({', '.join(changed_fields[:4])})."
-                skip_ids: List[int] = []
-                if assignee_changed and assignee_id is not None:
-                    skip_ids.append(int(assignee_id))
+                ensure_item_watchers_seeded(conn, org_id, "task", int(current["id"]), user_id)
                 notify_entity_watchers(
                     conn=conn,
                     org_id=org_id,
                     entity="task",
-                    entity_id=int(task_id or 0),
+                    entity_id=int(current["id"]),
                     actor_user_id=user_id,
                     actor_name=str(user["name"]),
                     actor_email=str(user["email"]),
-                    title=title,
-                    summary=summary,
-                    skip_user_ids=skip_ids,
+                    title=str(current["title"] or f"Task #{current['id']}"),
+                    summary=f"Task status changed to {next_status}.",
+                    skip_user_ids=[to_int(current["assignee_user_id"])] if to_int(current["assignee_user_id"]) is not None else None,
                     preference_key="email_task_updates",
                 )
             conn.commit()
-            return json_response({"ok": True, "task_id": task_id, "status": status}).wsgi(start_response)
+            return redirect(scoped("/tasks?msg=Task%20updated")).wsgi(start_response)
 
-        if req.path == "/api/projects/save" and req.method == "POST":
+        if req.path == "/tasks/delegate" and req.method == "POST":
             gate = require_role(ctx, "staff")
             if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+                return gate.wsgi(start_response)
             form = req.form
-            role = str(ctx.get("role") or "viewer")
-            project_id = to_int(form.get("project_id"))
-            current = conn.execute(
-                "SELECT * FROM projects WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
-                (project_id, org_id),
+            task = conn.execute(
+                "SELECT id, title, status FROM tasks WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
+                (form.get("task_id"), org_id),
             ).fetchone()
-            if not current:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            before_snapshot = snapshot_row(current)
+            if not task:
+                return redirect(scoped("/dashboard?msg=Task%20not%20found")).wsgi(start_response)
+            assignee_id = normalize_org_user_id(conn, org_id, form.get("assignee_user_id"))
+            conn.execute(
+                "UPDATE tasks SET assignee_user_id = ?, updated_at = ? WHERE id = ? AND organization_id = ?",
+                (assignee_id, iso(), task["id"], org_id),
+            )
+            notify_task_assignment(
+                conn=conn,
+                org_id=org_id,
+                task_id=int(task["id"]),
+                actor_name=user["name"],
+                actor_email=user["email"],
+                task_title=task["title"],
+                task_status=task["status"],
+                assignee_id=assignee_id,
+            )
+            ensure_item_watchers_seeded(conn, org_id, "task", int(task["id"]), user_id)
+            notify_entity_watchers(
+                conn=conn,
+                org_id=org_id,
+                entity="task",
+                entity_id=int(task["id"]),
+                actor_user_id=user_id,
+                actor_name=str(user["name"]),
+                actor_email=str(user["email"]),
+                title=str(task["title"] or f"Task #{task['id']}"),
+                summary="Task assignee was updated.",
+                skip_user_ids=[int(assignee_id)] if assignee_id is not None else None,
+                preference_key="email_task_updates",
+            )
+            conn.commit()
+            return redirect(scoped("/dashboard?msg=Task%20delegated")).wsgi(start_response)
 
-            def pval(key: str, existing: object) -> object:
-                return form[key] if key in form else existing
+        if req.path == "/api/lookups":
+            return json_response(build_lookups(conn, org_id, role=str(ctx.get("role") or "viewer"))).wsgi(start_response)
 
-            meta = parse_meta_json(current["meta_json"])
-            if "attachments" in form:
-                attachments = lines_to_items(form.get("attachments"))
-                if attachments:
-                    meta["attachments"] = attachments
-                else:
-                    meta.pop("attachments", None)
-            if "note" in form:
-                note = (form.get("note") or "").strip()
-                if note:
-                    meta["note"] = note[:1500]
-                else:
-                    meta.pop("note", None)
-            if "extra_json" in form:
-                extra_json = (form.get("extra_json") or "").strip()
-                if extra_json:
-                    try:
-                        extra_obj = json.loads(extra_json)
-                        if isinstance(extra_obj, dict):
-                            meta["extra"] = extra_obj
-                    except json.JSONDecodeError:
-                        pass
-                else:
-                    meta.pop("extra", None)
+        if req.path == "/api/agenda/detail":
+            agenda_id = to_int(req.query.get("agenda_id"))
+            if agenda_id is None:
+                return json_response({"ok": False, "error": "invalid_agenda"}, status="400 Bad Request").wsgi(start_response)
+            agenda = conn.execute(
+                """
+                SELECT a.id, a.title, a.meeting_date, a.notes, a.status, a.priority, a.lane, a.team_id, a.space_id,
+                       a.due_date, a.description, a.owner_user_id,
+                       u.name AS owner_name, t.name AS team_name, s.name AS space_name
+                FROM meeting_agendas a
+                LEFT JOIN users u ON u.id = a.owner_user_id
+                LEFT JOIN teams t ON t.id = a.team_id
+                LEFT JOIN spaces s ON s.id = a.space_id
+                WHERE a.id = ? AND a.organization_id = ?
+                """,
+                (agenda_id, org_id),
+            ).fetchone()
+            if not agenda:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
 
-            status = str(pval("status", current["status"]))
-            if status not in PROJECT_STATUSES:
-                status = str(current["status"])
-            lane = str(pval("lane", current["lane"]))
-            if lane not in LANES:
-                lane = str(current["lane"] or LANES[0])
-            priority = str(pval("priority", current["priority"]))
+            line_items = conn.execute(
+                """
+                SELECT i.id, i.parent_item_id, i.section, i.minutes_estimate, i.sort_order,
+                       t.id AS task_id, t.title AS task_title, t.status AS task_status, t.priority AS task_priority, t.due_date AS task_due_date,
+                       p.id AS project_id, p.name AS project_name, p.status AS project_status, p.priority AS project_priority, p.due_date AS project_due_date
+                FROM meeting_items i
+                LEFT JOIN tasks t ON t.id = i.linked_task_id AND t.organization_id = ? AND t.deleted_at IS NULL
+                LEFT JOIN projects p ON p.id = i.linked_project_id AND p.organization_id = ? AND p.deleted_at IS NULL
+                WHERE i.agenda_id = ?
+                ORDER BY i.sort_order, i.id
+                """,
+                (org_id, org_id, agenda_id),
+            ).fetchall()
+            items_payload: List[Dict[str, object]] = []
+            for row in line_items:
+                if row["task_id"] is not None:
+                    items_payload.append(
+                        {
+                            "id": row["id"],
+                            "source_type": "task",
+                            "source_id": row["task_id"],
+                            "title": row["task_title"] or "Untitled Task",
+                            "status": row["task_status"] or "",
+                            "priority": row["task_priority"] or "Medium",
+                            "due_date": row["task_due_date"] or "",
+                            "section": row["section"] or "General",
+                            "minutes_estimate": row["minutes_estimate"] or 10,
+                            "parent_item_id": row["parent_item_id"] or "",
+                        }
+                    )
+                    continue
+                if row["project_id"] is not None:
+                    items_payload.append(
+                        {
+                            "id": row["id"],
+                            "source_type": "project",
+                            "source_id": row["project_id"],
+                            "title": row["project_name"] or "Untitled Project",
+                            "status": row["project_status"] or "",
+                            "priority": row["project_priority"] or "Medium",
+                            "due_date": row["project_due_date"] or "",
+                            "section": row["section"] or "General",
+                            "minutes_estimate": row["minutes_estimate"] or 10,
+                            "parent_item_id": row["parent_item_id"] or "",
+                        }
+                    )
+            task_options = conn.execute(
+                """
+                SELECT id, title, status
+                FROM tasks
+                WHERE organization_id = ?
+                  AND deleted_at IS NULL
+                  AND status NOT IN ('Done', 'Cancelled')
+                ORDER BY updated_at DESC, id DESC
+                LIMIT 200
+                """,
+                (org_id,),
+            ).fetchall()
+            project_options = conn.execute(
+                """
+                SELECT id, name, status
+                FROM projects
+                WHERE organization_id = ?
+                  AND deleted_at IS NULL
+                  AND status != 'Complete'
+                ORDER BY updated_at DESC, id DESC
+                LIMIT 200
+                """,
+                (org_id,),
+            ).fetchall()
+            return json_response(
+                {
+                    "ok": True,
+                    "agenda": {
+                        "id": agenda["id"],
+                        "title": agenda["title"] or "Untitled Meeting",
+                        "meeting_date": agenda["meeting_date"] or "",
+                        "notes": agenda["notes"] or "",
+                        "status": agenda["status"] or "Planned",
+                        "priority": agenda["priority"] or "Medium",
+                        "lane": agenda["lane"] or LANES[0],
+                        "team_id": agenda["team_id"] or "",
+                        "team_name": agenda["team_name"] or "",
+                        "space_id": agenda["space_id"] or "",
+                        "space_name": agenda["space_name"] or "",
+                        "due_date": agenda["due_date"] or "",
+                        "description": agenda["description"] or "",
+                        "owner_user_id": agenda["owner_user_id"] or "",
+                        "owner_name": agenda["owner_name"] or "",
+                    },
+                    "items": items_payload,
+                    "task_options": [{"id": row["id"], "title": row["title"], "status": row["status"]} for row in task_options],
+                    "project_options": [{"id": row["id"], "name": row["name"], "status": row["status"]} for row in project_options],
+                }
+            ).wsgi(start_response)
+
+        if req.path == "/api/agenda/save" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+            form = req.form
+            agenda_id = to_int(form.get("agenda_id"))
+            if agenda_id is None:
+                return json_response({"ok": False, "error": "invalid_agenda"}, status="400 Bad Request").wsgi(start_response)
+            current = conn.execute(
+                "SELECT * FROM meeting_agendas WHERE id = ? AND organization_id = ?",
+                (agenda_id, org_id),
+            ).fetchone()
+            if not current:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            status = str(form.get("status") or current["status"] or "Planned").strip()
+            if status not in AGENDA_STATUSES:
+                status = str(current["status"] or "Planned")
+            priority = str(form.get("priority") or current["priority"] or "Medium").strip()
             if priority not in {"Low", "Medium", "High", "Critical"}:
                 priority = str(current["priority"] or "Medium")
-            owner_user_id = normalize_org_user_id(
-                conn,
-                org_id,
-                pval("owner_user_id", current["owner_user_id"]),
-                fallback=to_int(current["owner_user_id"]),
-            )
-
-            due_date = current["due_date"]
-            if "due_date" in form:
-                due_date = parse_date(form.get("due_date", ""))
-            start_date = current["start_date"]
-            if "start_date" in form:
-                start_date = parse_date(form.get("start_date", ""))
-
-            progress_pct = to_int(pval("progress_pct", current["progress_pct"]), int(current["progress_pct"] or 0)) or 0
-            progress_pct = max(0, min(100, progress_pct))
-            name = sanitize_title_for_role(
-                conn,
-                org_id,
-                role,
-                "projects",
-                pval("name", current["name"]),
-                current["name"],
-                free_edit_min_role="manager",
-            )
-
+            lane = str(form.get("lane") or current["lane"] or LANES[0]).strip()
+            if lane not in LANES:
+                lane = str(current["lane"] or LANES[0])
             conn.execute(
                 """
-                UPDATE projects
-                SET name = ?, description = ?, lane = ?, status = ?, priority = ?, owner_user_id = ?,
-                    start_date = ?, due_date = ?, tags = ?, team_id = ?, space_id = ?, progress_pct = ?, meta_json = ?, updated_at = ?
+                UPDATE meeting_agendas
+                SET title = ?, meeting_date = ?, owner_user_id = ?, status = ?, priority = ?, lane = ?, team_id = ?, space_id = ?, due_date = ?, description = ?, notes = ?, updated_at = ?
                 WHERE id = ? AND organization_id = ?
                 """,
                 (
-                    name,
-                    str(pval("description", current["description"] or ""))[:5000],
-                    lane,
+                    str(form.get("title") or current["title"] or "Untitled Meeting").strip() or str(current["title"] or "Untitled Meeting"),
+                    parse_date(form.get("meeting_date", "")) or current["meeting_date"],
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
                     status,
                     priority,
-                    owner_user_id,
-                    start_date,
-                    due_date,
-                    str(pval("tags", current["tags"] or ""))[:500],
-                    to_int(pval("team_id", current["team_id"])),
-                    to_int(pval("space_id", current["space_id"])),
-                    progress_pct,
-                    json.dumps(meta),
+                    lane,
+                    to_int(form.get("team_id"), to_int(current["team_id"])),
+                    to_int(form.get("space_id"), to_int(current["space_id"])),
+                    parse_date(form.get("due_date", "")) if "due_date" in form else current["due_date"],
+                    form.get("description", current["description"] or ""),
+                    form.get("notes", current["notes"] or ""),
                     iso(),
-                    project_id,
+                    agenda_id,
                     org_id,
                 ),
             )
-            after_snapshot = snapshot_row(
-                conn.execute(
-                    "SELECT * FROM projects WHERE id = ? AND organization_id = ?",
-                    (project_id, org_id),
-                ).fetchone()
-            )
-            log_change_with_rollback(
-                conn,
-                org_id,
-                user_id,
-                "project_saved",
-                "projects",
-                project_id or 0,
-                before_snapshot,
-                after_snapshot,
-                f"Project updated: {name}",
-            )
-            ensure_item_watchers_seeded(conn, org_id, "project", int(project_id or 0), user_id)
-            if before_snapshot != after_snapshot:
-                changed_fields: List[str] = []
-                if status != str(current["status"] or ""):
-                    changed_fields.append(f"status -> {status}")
-                if owner_user_id != to_int(current["owner_user_id"]):
-                    changed_fields.append("owner changed")
-                if progress_pct != int(current["progress_pct"] or 0):
-                    changed_fields.append(f"progress {progress_pct}%")
-                if name != str(current["name"] or ""):
-                    changed_fields.append("name updated")
-                summary = "Project was updated."
-                if changed_fields:
-                    summary = f"Project was updated ({', '.join(changed_fields[:4])})."
-                notify_entity_watchers(
-                    conn=conn,
-                    org_id=org_id,
-                    entity="project",
-                    entity_id=int(project_id or 0),
-                    actor_user_id=user_id,
-                    actor_name=str(user["name"]),
-                    actor_email=str(user["email"]),
-                    title=name,
-                    summary=summary,
-                    preference_key="email_project_updates",
-                )
             conn.commit()
-            return json_response({"ok": True, "project_id": project_id, "status": status, "progress_pct": progress_pct}).wsgi(start_response)
-
-        if req.path == "/api/tasks":
-            scope = req.query.get("scope", "my")
-            search = req.query.get("search", "")
-            team_id = to_int(req.query.get("team_id"))
-            rows = fetch_tasks(
-                conn,
-                org_id,
-                user_id,
-                scope=scope,
-                search=search,
-                team_id=team_id,
-                space_id=selected_space_id,
-            )
-            data = [
-                (
-                    lambda meta: {
-                        "id": r["id"],
-                        "title": r["title"],
-                        "description": r["description"],
-                        "project": r["project_name"],
-                        "project_id": r["project_id"],
-                        "assignee": r["assignee_name"],
-                        "assignee_user_id": r["assignee_user_id"],
-                        "team": r["team_name"],
-                        "team_id": r["team_id"],
-                        "space": r["space_name"],
-                        "space_id": r["space_id"],
-                        "status": r["status"],
-                        "priority": r["priority"],
-                        "due_date": r["due_date"],
-                        "energy": r["energy"],
-                        "estimate_hours": r["estimate_hours"],
-                        "attachments": [x for x in meta.get("attachments", []) if isinstance(x, str)],
-                        "note": str(meta.get("note", "")),
-                        "extra": meta.get("extra", {}),
-                    }
-                )(parse_meta_json(r["meta_json"]))
-                for r in rows
-            ]
-            return json_response({"tasks": data}).wsgi(start_response)
+            return json_response({"ok": True, "agenda_id": agenda_id, "status": status}).wsgi(start_response)
 
-        if req.path == "/agenda":
-            content = render_agenda_monday_page(conn, org_id)
-            page = render_layout("Meeting Agenda", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
+        if req.path == "/api/agenda/item/attach" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+            form = req.form
+            agenda_id = to_int(form.get("agenda_id"))
+            source_id = to_int(form.get("source_id"))
+            source_type = str(form.get("source_type") or "").strip().lower()
+            section = str(form.get("section") or "General").strip() or "General"
+            if agenda_id is None or source_id is None:
+                return json_response({"ok": False, "error": "invalid_request"}, status="400 Bad Request").wsgi(start_response)
+            target = conn.execute(
+                "SELECT id FROM meeting_agendas WHERE id = ? AND organization_id = ?",
+                (agenda_id, org_id),
+            ).fetchone()
+            if not target:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            parent_item_id = to_int(form.get("parent_item_id"))
+            if parent_item_id is not None:
+                parent = conn.execute(
+                    """
+                    SELECT i.id, i.parent_item_id
+                    FROM meeting_items i
+                    JOIN meeting_agendas a ON a.id = i.agenda_id
+                    WHERE i.id = ? AND i.agenda_id = ? AND a.organization_id = ?
+                    """,
+                    (parent_item_id, agenda_id, org_id),
+                ).fetchone()
+                if not parent or parent["parent_item_id"] is not None:
+                    return json_response({"ok": False, "error": "invalid_parent"}, status="400 Bad Request").wsgi(start_response)
+            if source_type == "task":
+                source = conn.execute(
+                    """
+                    SELECT id, title, status, priority, due_date, assignee_user_id
+                    FROM tasks
+                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
+                    """,
+                    (source_id, org_id),
+                ).fetchone()
+                if not source:
+                    return json_response({"ok": False, "error": "source_not_found"}, status="404 Not Found").wsgi(start_response)
+                conn.execute(
+                    """
+                    INSERT INTO meeting_items
+                    (agenda_id, parent_item_id, section, title, owner_user_id, status, priority, due_date, minutes_estimate, description, linked_task_id, item_type, sort_order, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        agenda_id,
+                        parent_item_id,
+                        section,
+                        source["title"] or "Untitled Task",
+                        source["assignee_user_id"],
+                        agenda_status_from_task_status(str(source["status"] or "")),
+                        source["priority"] or "Medium",
+                        source["due_date"],
+                        10,
+                        "",
+                        source["id"],
+                        "task",
+                        next_meeting_item_sort_order(conn, agenda_id),
+                        iso(),
+                        iso(),
+                    ),
+                )
+                conn.commit()
+                return json_response({"ok": True, "agenda_id": agenda_id, "source_type": "task"}).wsgi(start_response)
+            if source_type == "project":
+                source = conn.execute(
+                    """
+                    SELECT id, name, status, priority, due_date, owner_user_id
+                    FROM projects
+                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
+                    """,
+                    (source_id, org_id),
+                ).fetchone()
+                if not source:
+                    return json_response({"ok": False, "error": "source_not_found"}, status="404 Not Found").wsgi(start_response)
+                conn.execute(
+                    """
+                    INSERT INTO meeting_items
+                    (agenda_id, parent_item_id, section, title, owner_user_id, status, priority, due_date, minutes_estimate, description, linked_project_id, item_type, sort_order, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        agenda_id,
+                        parent_item_id,
+                        section,
+                        source["name"] or "Untitled Project",
+                        source["owner_user_id"],
+                        agenda_status_from_project_status(str(source["status"] or "")),
+                        source["priority"] or "Medium",
+                        source["due_date"],
+                        10,
+                        "",
+                        source["id"],
+                        "project",
+                        next_meeting_item_sort_order(conn, agenda_id),
+                        iso(),
+                        iso(),
+                    ),
+                )
+                conn.commit()
+                return json_response({"ok": True, "agenda_id": agenda_id, "source_type": "project"}).wsgi(start_response)
+            return json_response({"ok": False, "error": "invalid_source_type"}, status="400 Bad Request").wsgi(start_response)
 
-        if req.path == "/agenda/new" and req.method == "POST":
+        if req.path == "/api/agenda/item/save" and req.method == "POST":
             gate = require_role(ctx, "student")
             if gate:
-                return gate.wsgi(start_response)
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
             form = req.form
-            status = str(form.get("status") or "Planned").strip()
-            if status not in AGENDA_STATUSES:
-                status = "Planned"
-            priority = str(form.get("priority") or "Medium").strip()
-            if priority not in {"Low", "Medium", "High", "Critical"}:
-                priority = "Medium"
-            lane = str(form.get("lane") or LANES[0]).strip()
-            if lane not in LANES:
-                lane = LANES[0]
-            conn.execute(
+            item_id = to_int(form.get("item_id"))
+            if item_id is None:
+                return json_response({"ok": False, "error": "invalid_item"}, status="400 Bad Request").wsgi(start_response)
+            target = conn.execute(
                 """
-                INSERT INTO meeting_agendas
-                (organization_id, title, meeting_date, owner_user_id, status, priority, lane, team_id, space_id, due_date, description, notes, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                SELECT i.*, a.organization_id, t.id AS linked_task_exists, p.id AS linked_project_exists
+                FROM meeting_items i
+                JOIN meeting_agendas a ON a.id = i.agenda_id
+                LEFT JOIN tasks t ON t.id = i.linked_task_id AND t.organization_id = ? AND t.deleted_at IS NULL
+                LEFT JOIN projects p ON p.id = i.linked_project_id AND p.organization_id = ? AND p.deleted_at IS NULL
+                WHERE i.id = ? AND a.organization_id = ?
                 """,
-                (
-                    org_id,
-                    form.get("title", "Weekly Meeting"),
-                    parse_date(form.get("meeting_date", "")) or dt.date.today().isoformat(),
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=user_id),
-                    status,
-                    priority,
-                    lane,
-                    to_int(form.get("team_id")),
-                    to_int(form.get("space_id")),
-                    parse_date(form.get("due_date", "")),
-                    form.get("description", ""),
-                    form.get("notes", ""),
-                    iso(),
-                    iso(),
-                ),
+                (org_id, org_id, item_id, org_id),
+            ).fetchone()
+            if not target:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            title = str(form.get("title") or target["title"] or "Untitled").strip() or str(target["title"] or "Untitled")
+            section = str(form.get("section") or target["section"] or "General").strip() or "General"
+            status = str(form.get("status") or target["status"] or "Not Discussed").strip()
+            if status not in AGENDA_ITEM_STATUSES:
+                status = str(target["status"] or "Not Discussed")
+            priority = str(form.get("priority") or target["priority"] or "Medium").strip()
+            if priority not in {"Low", "Medium", "High", "Critical"}:
+                priority = str(target["priority"] or "Medium")
+            due_date = parse_date(str(form.get("due_date") or "")) if "due_date" in form else target["due_date"]
+            minutes_estimate = max(1, to_int(form.get("minutes_estimate"), int(target["minutes_estimate"] or 10)) or 10)
+            owner_user_id = normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(target["owner_user_id"]))
+            now_iso = iso()
+            before_snapshot = snapshot_row(target)
+            conn.execute(
+                "UPDATE meeting_items SET title = ?, section = ?, owner_user_id = ?, status = ?, priority = ?, due_date = ?, minutes_estimate = ?, updated_at = ? WHERE id = ?",
+                (title, section, owner_user_id, status, priority, due_date, minutes_estimate, now_iso, item_id),
+            )
+            if target["linked_task_exists"] is not None:
+                conn.execute(
+                    """
+                    UPDATE tasks
+                    SET title = ?, status = ?, priority = ?, due_date = ?, assignee_user_id = ?, updated_at = ?
+                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
+                    """,
+                    (title, task_status_from_agenda_status(status), priority, due_date, owner_user_id, now_iso, target["linked_task_id"], org_id),
+                )
+            elif target["linked_project_exists"] is not None:
+                conn.execute(
+                    """
+                    UPDATE projects
+                    SET name = ?, status = ?, priority = ?, due_date = ?, owner_user_id = ?, updated_at = ?
+                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
+                    """,
+                    (title, project_status_from_agenda_status(status), priority, due_date, owner_user_id, now_iso, target["linked_project_id"], org_id),
+                )
+            after_snapshot = snapshot_row(
+                conn.execute(
+                    "SELECT * FROM meeting_items WHERE id = ?",
+                    (item_id,),
+                ).fetchone()
+            )
+            log_change_with_rollback(
+                conn,
+                org_id,
+                user_id,
+                "agenda_item_updated",
+                "meeting_items",
+                item_id,
+                before_snapshot,
+                after_snapshot,
+                f"Agenda item updated: {title}",
             )
             conn.commit()
-            return redirect(scoped("/agenda?msg=Agenda%20created")).wsgi(start_response)
+            owner_name = ""
+            if owner_user_id is not None:
+                owner_row = conn.execute("SELECT name FROM users WHERE id = ?", (owner_user_id,)).fetchone()
+                owner_name = str(owner_row["name"] or "") if owner_row else ""
+            return json_response(
+                {
+                    "ok": True,
+                    "item_id": item_id,
+                    "status": status,
+                    "updated_at": now_iso,
+                    "owner_user_id": owner_user_id or "",
+                    "owner_name": owner_name,
+                }
+            ).wsgi(start_response)
+
+        if req.path == "/api/agenda/item/detail":
+            item_id = to_int(req.query.get("item_id"))
+            if item_id is None:
+                return json_response({"ok": False, "error": "invalid_item"}, status="400 Bad Request").wsgi(start_response)
+            row = conn.execute(
+                """
+                SELECT i.id, i.agenda_id, i.parent_item_id, i.section, i.title, i.status, i.priority, i.due_date, i.minutes_estimate, i.description, i.updated_at, i.created_at,
+                       i.linked_task_id, i.linked_project_id, i.item_type,
+                       t.title AS linked_task_title, p.name AS linked_project_title,
+                       a.title AS agenda_title, a.meeting_date,
+                       u.name AS owner_name
+                FROM meeting_items i
+                JOIN meeting_agendas a ON a.id = i.agenda_id
+                LEFT JOIN users u ON u.id = i.owner_user_id
+                LEFT JOIN tasks t ON t.id = i.linked_task_id AND t.organization_id = ? AND t.deleted_at IS NULL
+                LEFT JOIN projects p ON p.id = i.linked_project_id AND p.organization_id = ? AND p.deleted_at IS NULL
+                WHERE i.id = ? AND a.organization_id = ?
+                """,
+                (org_id, org_id, item_id, org_id),
+            ).fetchone()
+            if not row:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            updates = conn.execute(
+                """
+                SELECT mu.id, mu.body, mu.created_at, u.name AS author_name
+                FROM meeting_item_updates mu
+                LEFT JOIN users u ON u.id = mu.author_user_id
+                WHERE mu.organization_id = ? AND mu.item_id = ?
+                ORDER BY mu.created_at DESC, mu.id DESC
+                LIMIT 80
+                """,
+                (org_id, item_id),
+            ).fetchall()
+            files = conn.execute(
+                """
+                SELECT f.id, f.file_name, f.file_url, f.created_at, u.name AS uploader_name
+                FROM meeting_item_files f
+                LEFT JOIN users u ON u.id = f.uploader_user_id
+                WHERE f.organization_id = ? AND f.item_id = ?
+                ORDER BY f.created_at DESC, f.id DESC
+                LIMIT 80
+                """,
+                (org_id, item_id),
+            ).fetchall()
+            audit_rows = conn.execute(
+                """
+                SELECT a.id, a.action, a.details, a.created_at, u.name AS actor_name
+                FROM audit_log a
+                LEFT JOIN users u ON u.id = a.user_id
+                WHERE a.organization_id = ? AND a.entity = 'meeting_items' AND a.entity_id = ?
+                ORDER BY a.id DESC
+                LIMIT 80
+                """,
+                (org_id, str(item_id)),
+            ).fetchall()
+            activity_items: List[Dict[str, str]] = []
+            for r in updates:
+                activity_items.append(
+                    {
+                        "kind": "update",
+                        "label": "Update posted",
+                        "summary": str(r["body"] or "")[:260],
+                        "author_name": str(r["author_name"] or "Unknown"),
+                        "created_at": str(r["created_at"] or ""),
+                    }
+                )
+            for r in files:
+                activity_items.append(
+                    {
+                        "kind": "file",
+                        "label": "File linked",
+                        "summary": str(r["file_name"] or "File"),
+                        "author_name": str(r["uploader_name"] or "Unknown"),
+                        "created_at": str(r["created_at"] or ""),
+                    }
+                )
+            for r in audit_rows:
+                activity_items.append(
+                    {
+                        "kind": "audit",
+                        "label": str(r["action"] or "activity").replace("_", " ").title(),
+                        "summary": audit_details_summary(r["details"]),
+                        "author_name": str(r["actor_name"] or "Unknown"),
+                        "created_at": str(r["created_at"] or ""),
+                    }
+                )
+            activity_items.sort(key=lambda item: item.get("created_at", ""), reverse=True)
+            return json_response(
+                {
+                    "ok": True,
+                    "item": {
+                        "id": row["id"],
+                        "agenda_id": row["agenda_id"],
+                        "agenda_title": row["agenda_title"] or "",
+                        "meeting_date": row["meeting_date"] or "",
+                        "parent_item_id": row["parent_item_id"] or "",
+                        "section": row["section"] or "General",
+                        "title": row["title"] or "Untitled",
+                        "status": row["status"] or "Not Discussed",
+                        "priority": row["priority"] or "Medium",
+                        "due_date": row["due_date"] or "",
+                        "minutes_estimate": row["minutes_estimate"] or 10,
+                        "description": row["description"] or "",
+                        "updated_at": row["updated_at"] or row["created_at"] or "",
+                        "item_type": row["item_type"] or "agenda",
+                        "owner_name": row["owner_name"] or "",
+                        "linked_task_id": row["linked_task_id"] or "",
+                        "linked_project_id": row["linked_project_id"] or "",
+                        "linked_task_title": row["linked_task_title"] or "",
+                        "linked_project_title": row["linked_project_title"] or "",
+                    },
+                    "updates": [
+                        {
+                            "id": r["id"],
+                            "body": r["body"] or "",
+                            "created_at": r["created_at"] or "",
+                            "author_name": r["author_name"] or "Unknown",
+                        }
+                        for r in updates
+                    ],
+                    "files": [
+                        {
+                            "id": r["id"],
+                            "file_name": r["file_name"] or "File",
+                            "file_url": r["file_url"] or "",
+                            "created_at": r["created_at"] or "",
+                            "uploader_name": r["uploader_name"] or "Unknown",
+                        }
+                        for r in files
+                    ],
+                    "activity": activity_items[:120],
+                }
+            ).wsgi(start_response)
 
-        if req.path == "/agenda/update" and req.method == "POST":
+        if req.path == "/api/agenda/item/updates/add" and req.method == "POST":
             gate = require_role(ctx, "student")
             if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            agenda_id = to_int(form.get("agenda_id"))
-            if agenda_id is None:
-                return redirect(scoped("/agenda?msg=Agenda%20not%20found")).wsgi(start_response)
-            current = conn.execute(
-                "SELECT * FROM meeting_agendas WHERE id = ? AND organization_id = ?",
-                (agenda_id, org_id),
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+            item_id = to_int(req.form.get("item_id"))
+            body = str(req.form.get("body") or "").strip()
+            if item_id is None or not body:
+                return json_response({"ok": False, "error": "invalid_request"}, status="400 Bad Request").wsgi(start_response)
+            if len(body) > 4000:
+                body = body[:4000]
+            target = conn.execute(
+                """
+                SELECT i.id
+                FROM meeting_items i
+                JOIN meeting_agendas a ON a.id = i.agenda_id
+                WHERE i.id = ? AND a.organization_id = ?
+                """,
+                (item_id, org_id),
             ).fetchone()
-            if not current:
-                return redirect(scoped("/agenda?msg=Agenda%20not%20found")).wsgi(start_response)
-            status = str(form.get("status") or current["status"] or "Planned").strip()
-            if status not in AGENDA_STATUSES:
-                status = str(current["status"] or "Planned")
-            priority = str(form.get("priority") or current["priority"] or "Medium").strip()
-            if priority not in {"Low", "Medium", "High", "Critical"}:
-                priority = str(current["priority"] or "Medium")
-            lane = str(form.get("lane") or current["lane"] or LANES[0]).strip()
-            if lane not in LANES:
-                lane = str(current["lane"] or LANES[0])
+            if not target:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            created_at = iso()
             conn.execute(
                 """
-                UPDATE meeting_agendas
-                SET title = ?, meeting_date = ?, owner_user_id = ?, status = ?, priority = ?, lane = ?, team_id = ?, space_id = ?, due_date = ?, description = ?, notes = ?, updated_at = ?
-                WHERE id = ? AND organization_id = ?
+                INSERT INTO meeting_item_updates (organization_id, item_id, author_user_id, body, created_at)
+                VALUES (?, ?, ?, ?, ?)
                 """,
-                (
-                    str(form.get("title") or current["title"] or "Untitled Meeting").strip() or str(current["title"] or "Untitled Meeting"),
-                    parse_date(form.get("meeting_date", "")) or current["meeting_date"],
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
-                    status,
-                    priority,
-                    lane,
-                    to_int(form.get("team_id"), to_int(current["team_id"])),
-                    to_int(form.get("space_id"), to_int(current["space_id"])),
-                    parse_date(form.get("due_date", "")) if "due_date" in form else current["due_date"],
-                    form.get("description", current["description"] or ""),
-                    form.get("notes", current["notes"] or ""),
-                    iso(),
-                    agenda_id,
-                    org_id,
-                ),
+                (org_id, item_id, user_id, body, created_at),
+            )
+            conn.execute("UPDATE meeting_items SET updated_at = ? WHERE id = ?", (created_at, item_id))
+            log_action(
+                conn,
+                org_id,
+                user_id,
+                "agenda_item_update_posted",
+                "meeting_items",
+                str(item_id),
+                json.dumps({"summary": body[:180], "source": "updates_panel"}),
             )
             conn.commit()
-            return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Agenda%20updated")).wsgi(start_response)
+            return json_response({"ok": True}).wsgi(start_response)
 
-        if req.path == "/agenda/item/new" and req.method == "POST":
+        if req.path == "/api/agenda/item/files/add" and req.method == "POST":
             gate = require_role(ctx, "student")
             if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            agenda_id = to_int(form.get("agenda_id"))
-            if agenda_id is None:
-                return redirect(scoped("/agenda?msg=Select%20an%20agenda%20before%20adding%20items")).wsgi(start_response)
-            agenda = conn.execute(
-                "SELECT id FROM meeting_agendas WHERE id = ? AND organization_id = ?",
-                (agenda_id, org_id),
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+            item_id = to_int(req.form.get("item_id"))
+            file_name = str(req.form.get("file_name") or "").strip()
+            file_url = str(req.form.get("file_url") or "").strip()
+            if item_id is None or not file_url:
+                return json_response({"ok": False, "error": "invalid_request"}, status="400 Bad Request").wsgi(start_response)
+            if not re.match(r"^https?://", file_url, flags=re.IGNORECASE):
+                return json_response({"ok": False, "error": "invalid_url"}, status="400 Bad Request").wsgi(start_response)
+            target = conn.execute(
+                """
+                SELECT i.id
+                FROM meeting_items i
+                JOIN meeting_agendas a ON a.id = i.agenda_id
+                WHERE i.id = ? AND a.organization_id = ?
+                """,
+                (item_id, org_id),
             ).fetchone()
-            if not agenda:
-                return redirect(scoped("/agenda?msg=Agenda%20not%20found")).wsgi(start_response)
-            parent_item_id = to_int(form.get("parent_item_id"))
-            if parent_item_id is not None:
-                parent = conn.execute(
-                    """
-                    SELECT i.id, i.parent_item_id
-                    FROM meeting_items i
-                    JOIN meeting_agendas a ON a.id = i.agenda_id
-                    WHERE i.id = ? AND i.agenda_id = ? AND a.organization_id = ?
-                    """,
-                    (parent_item_id, agenda_id, org_id),
-                ).fetchone()
-                if not parent or parent["parent_item_id"] is not None:
-                    return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Invalid%20subitem%20parent")).wsgi(start_response)
-            conn.execute(
+            if not target:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            safe_name = file_name[:220]
+            if not safe_name:
+                safe_name = file_url.rstrip("/").rsplit("/", 1)[-1] or "Linked file"
+            created_at = iso()
+            cursor = conn.execute(
                 """
-                INSERT INTO meeting_items
-                (agenda_id, parent_item_id, section, title, owner_user_id, status, priority, due_date, minutes_estimate, description, item_type, sort_order, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO meeting_item_files (organization_id, item_id, uploader_user_id, file_name, file_url, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    agenda_id,
-                    parent_item_id,
-                    form.get("section", "General"),
-                    form.get("title", "Untitled Item"),
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=user_id),
-                    "Not Discussed",
-                    form.get("priority", "Medium") if form.get("priority", "Medium") in {"Low", "Medium", "High", "Critical"} else "Medium",
-                    parse_date(form.get("due_date", "")),
-                    int(form.get("minutes_estimate", "10") or 10),
-                    form.get("description", ""),
-                    "agenda",
-                    999,
-                    iso(),
-                    iso(),
-                ),
+                (org_id, item_id, user_id, safe_name, file_url, created_at),
             )
-            conn.commit()
-            return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Agenda%20item%20added")).wsgi(start_response)
-
-        if req.path == "/agenda/item/attach" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            agenda_id = to_int(form.get("agenda_id"))
-            source_type = str(form.get("source_type") or "").strip().lower()
-            source_id = to_int(form.get("source_id"))
-            section = str(form.get("section") or "Work Queue")
-            parent_item_id = to_int(form.get("parent_item_id"))
-            if agenda_id is None or source_id is None:
-                return redirect(scoped("/agenda?msg=Meeting%20and%20source%20are%20required")).wsgi(start_response)
-            agenda = conn.execute(
-                "SELECT id FROM meeting_agendas WHERE id = ? AND organization_id = ?",
-                (agenda_id, org_id),
-            ).fetchone()
-            if not agenda:
-                return redirect(scoped("/agenda?msg=Agenda%20not%20found")).wsgi(start_response)
-            if parent_item_id is not None:
-                parent = conn.execute(
-                    """
-                    SELECT i.id, i.parent_item_id
-                    FROM meeting_items i
-                    JOIN meeting_agendas a ON a.id = i.agenda_id
-                    WHERE i.id = ? AND i.agenda_id = ? AND a.organization_id = ?
-                    """,
-                    (parent_item_id, agenda_id, org_id),
-                ).fetchone()
-                if not parent or parent["parent_item_id"] is not None:
-                    return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Invalid%20subitem%20parent")).wsgi(start_response)
-            if source_type == "task":
-                source = conn.execute(
-                    """
-                    SELECT id, title, status, priority, due_date, assignee_user_id
-                    FROM tasks
-                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
-                    """,
-                    (source_id, org_id),
-                ).fetchone()
-                if not source:
-                    return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Task%20not%20found")).wsgi(start_response)
-                conn.execute(
-                    """
-                    INSERT INTO meeting_items
-                    (agenda_id, parent_item_id, section, title, owner_user_id, status, priority, due_date, minutes_estimate, description, linked_task_id, item_type, sort_order, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        agenda_id,
-                        parent_item_id,
-                        section,
-                        source["title"],
-                        source["assignee_user_id"],
-                        agenda_status_from_task_status(str(source["status"] or "")),
-                        source["priority"] or "Medium",
-                        source["due_date"],
-                        10,
-                        "",
-                        source["id"],
-                        "task",
-                        999,
-                        iso(),
-                        iso(),
-                    ),
-                )
-                conn.commit()
-                return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Task%20linked%20to%20agenda")).wsgi(start_response)
-            if source_type == "project":
-                source = conn.execute(
-                    """
-                    SELECT id, name, status, priority, due_date, owner_user_id
-                    FROM projects
-                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
-                    """,
-                    (source_id, org_id),
-                ).fetchone()
-                if not source:
-                    return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Project%20not%20found")).wsgi(start_response)
-                conn.execute(
-                    """
-                    INSERT INTO meeting_items
-                    (agenda_id, parent_item_id, section, title, owner_user_id, status, priority, due_date, minutes_estimate, description, linked_project_id, item_type, sort_order, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        agenda_id,
-                        parent_item_id,
-                        section,
-                        source["name"],
-                        source["owner_user_id"],
-                        agenda_status_from_project_status(str(source["status"] or "")),
-                        source["priority"] or "Medium",
-                        source["due_date"],
-                        10,
-                        "",
-                        source["id"],
-                        "project",
-                        999,
-                        iso(),
-                        iso(),
-                    ),
-                )
-                conn.commit()
-                return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Project%20linked%20to%20agenda")).wsgi(start_response)
-            return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Unsupported%20source%20type")).wsgi(start_response)
+            conn.execute("UPDATE meeting_items SET updated_at = ? WHERE id = ?", (created_at, item_id))
+            log_action(
+                conn,
+                org_id,
+                user_id,
+                "agenda_item_file_added",
+                "meeting_items",
+                str(item_id),
+                json.dumps({"summary": safe_name, "source": "files_panel", "url": file_url[:280]}),
+            )
+            conn.commit()
+            return json_response(
+                {
+                    "ok": True,
+                    "file": {
+                        "id": int(cursor.lastrowid or 0),
+                        "file_name": safe_name,
+                        "file_url": file_url,
+                        "created_at": created_at,
+                    },
+                }
+            ).wsgi(start_response)
 
-        if req.path == "/agenda/item/update" and req.method == "POST":
+        if req.path == "/api/agenda/item/files/delete" and req.method == "POST":
             gate = require_role(ctx, "student")
             if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            item_id = to_int(form.get("item_id"))
-            if item_id is None:
-                return redirect(scoped("/agenda?msg=Agenda%20item%20not%20found")).wsgi(start_response)
-            target = conn.execute(
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+            file_id = to_int(req.form.get("file_id"))
+            if file_id is None:
+                return json_response({"ok": False, "error": "invalid_request"}, status="400 Bad Request").wsgi(start_response)
+            row = conn.execute(
                 """
-                SELECT i.id, i.agenda_id, i.linked_task_id, i.linked_project_id
-                FROM meeting_items i
+                SELECT f.id, f.item_id, f.file_name
+                FROM meeting_item_files f
+                JOIN meeting_items i ON i.id = f.item_id
                 JOIN meeting_agendas a ON a.id = i.agenda_id
-                WHERE i.id = ? AND a.organization_id = ?
+                WHERE f.id = ? AND f.organization_id = ? AND a.organization_id = ?
                 """,
-                (item_id, org_id),
+                (file_id, org_id, org_id),
             ).fetchone()
-            if not target:
-                return redirect(scoped("/agenda?msg=Agenda%20item%20not%20found")).wsgi(start_response)
-            status = str(form.get("status") or "Not Discussed").strip()
-            if status not in set(AGENDA_ITEM_STATUSES):
-                status = "Not Discussed"
-            minutes_estimate = max(1, to_int(form.get("minutes_estimate"), 10) or 10)
-            priority = str(form.get("priority") or "Medium").strip()
-            if priority not in {"Low", "Medium", "High", "Critical"}:
-                priority = "Medium"
-            owner_user_id = normalize_org_user_id(conn, org_id, form.get("owner_user_id"))
-            due_date = parse_date(form.get("due_date", ""))
-            section = str(form.get("section") or "General").strip() or "General"
-            title = str(form.get("title") or "Untitled Item").strip() or "Untitled Item"
-            conn.execute(
-                "UPDATE meeting_items SET title = ?, section = ?, owner_user_id = ?, status = ?, priority = ?, due_date = ?, minutes_estimate = ?, updated_at = ? WHERE id = ?",
-                (title, section, owner_user_id, status, priority, due_date, minutes_estimate, iso(), item_id),
+            if not row:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            created_at = iso()
+            conn.execute("DELETE FROM meeting_item_files WHERE id = ? AND organization_id = ?", (file_id, org_id))
+            conn.execute("UPDATE meeting_items SET updated_at = ? WHERE id = ?", (created_at, row["item_id"]))
+            log_action(
+                conn,
+                org_id,
+                user_id,
+                "agenda_item_file_removed",
+                "meeting_items",
+                str(row["item_id"]),
+                json.dumps({"summary": str(row["file_name"] or "File removed"), "source": "files_panel"}),
             )
-            linked_task_id = to_int(str(target["linked_task_id"])) if target["linked_task_id"] is not None else None
-            linked_project_id = to_int(str(target["linked_project_id"])) if target["linked_project_id"] is not None else None
-            if linked_task_id is not None:
-                conn.execute(
+            conn.commit()
+            return json_response({"ok": True}).wsgi(start_response)
+
+        if req.path == "/api/activity":
+            limit = to_int(req.query.get("limit"), 40) or 40
+            limit = max(10, min(200, limit))
+            role = str(ctx.get("role") or "viewer")
+            if role_allows(role, "workspace_admin"):
+                rows = conn.execute(
                     """
-                    UPDATE tasks
-                    SET title = ?, status = ?, priority = ?, due_date = ?, assignee_user_id = ?, updated_at = ?
-                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
+                    SELECT em.id, em.subject, em.status, em.error_message, em.related_entity, em.related_id,
+                           em.created_at, em.sent_at, em.recipient_email, em.body,
+                           u.name AS recipient_name
+                    FROM email_messages em
+                    LEFT JOIN users u ON u.id = em.recipient_user_id
+                    WHERE em.organization_id = ?
+                    ORDER BY em.id DESC
+                    LIMIT ?
                     """,
-                    (
-                        title,
-                        task_status_from_agenda_status(status),
-                        priority,
-                        due_date,
-                        owner_user_id,
-                        iso(),
-                        linked_task_id,
-                        org_id,
-                    ),
-                )
-            if linked_project_id is not None:
-                conn.execute(
+                    (org_id, limit),
+                ).fetchall()
+            else:
+                rows = conn.execute(
                     """
-                    UPDATE projects
-                    SET name = ?, status = ?, priority = ?, due_date = ?, owner_user_id = ?, updated_at = ?
-                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
+                    SELECT em.id, em.subject, em.status, em.error_message, em.related_entity, em.related_id,
+                           em.created_at, em.sent_at, em.recipient_email, em.body,
+                           u.name AS recipient_name
+                    FROM email_messages em
+                    LEFT JOIN users u ON u.id = em.recipient_user_id
+                    WHERE em.organization_id = ?
+                      AND (em.recipient_user_id = ? OR LOWER(em.recipient_email) = LOWER(?))
+                    ORDER BY em.id DESC
+                    LIMIT ?
                     """,
-                    (
-                        title,
-                        project_status_from_agenda_status(status),
-                        priority,
-                        due_date,
-                        owner_user_id,
-                        iso(),
-                        linked_project_id,
-                        org_id,
-                    ),
-                )
+                    (org_id, user_id, user["email"], limit),
+                ).fetchall()
+            return json_response(
+                {
+                    "ok": True,
+                    "items": [
+                        {
+                            "id": row["id"],
+                            "subject": row["subject"],
+                            "status": row["status"],
+                            "error_message": row["error_message"] or "",
+                            "related_entity": row["related_entity"] or "",
+                            "related_id": row["related_id"] or "",
+                            "created_at": row["created_at"],
+                            "sent_at": row["sent_at"] or "",
+                            "recipient_name": row["recipient_name"] or "",
+                            "recipient_email": row["recipient_email"] or "",
+                            "preview": str(row["body"] or "")[:220],
+                        }
+                        for row in rows
+                    ],
+                }
+            ).wsgi(start_response)
+
+        if req.path == "/api/interface/log" and req.method == "POST":
+            gate = require_role(ctx, "viewer")
+            if gate:
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+            action = str(req.form.get("action") or "ui_event").strip().lower()[:64]
+            entity_id = str(req.form.get("board_key") or req.form.get("context") or "").strip()[:120]
+            payload_raw = str(req.form.get("payload_json") or "").strip()
+            payload: object = {}
+            if payload_raw:
+                try:
+                    parsed = json.loads(payload_raw)
+                    payload = parsed if isinstance(parsed, (dict, list, str, int, float, bool)) else str(parsed)
+                except Exception:
+                    payload = payload_raw[:2400]
+            details = json.dumps(
+                {
+                    "source": "interface",
+                    "summary": str(req.form.get("summary") or action or "interface event")[:220],
+                    "path": req.form.get("path") or req.path,
+                    "payload": payload,
+                },
+                ensure_ascii=True,
+            )[:14000]
+            log_action(
+                conn,
+                org_id,
+                user_id,
+                action or "ui_event",
+                "interface",
+                entity_id or None,
+                details,
+            )
             conn.commit()
-            return redirect(scoped(f"/agenda?agenda_id={target['agenda_id']}&msg=Agenda%20item%20updated")).wsgi(start_response)
+            return json_response({"ok": True}).wsgi(start_response)
 
-        if req.path == "/agenda/item/convert" and req.method == "POST":
+        if req.path == "/api/comments":
+            entity = str(req.query.get("entity") or "").strip().lower()
+            item_id = to_int(req.query.get("item_id"))
+            if item_id is None or not comment_table_for_entity(entity):
+                return json_response({"ok": False, "error": "invalid_target"}, status="400 Bad Request").wsgi(start_response)
+            if not comment_target_exists(conn, org_id, entity, item_id):
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            rows = load_item_comments(conn, org_id, entity, item_id, limit=250)
+            return json_response(
+                {
+                    "ok": True,
+                    "comments": [
+                        {
+                            "id": row["id"],
+                            "body": row["body"],
+                            "author_user_id": row["author_user_id"],
+                            "author_name": row["author_name"] or "Unknown",
+                            "created_at": row["created_at"],
+                        }
+                        for row in rows
+                    ],
+                }
+            ).wsgi(start_response)
+
+        if req.path == "/api/comments/add" and req.method == "POST":
             gate = require_role(ctx, "student")
             if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            item_id = to_int(form.get("item_id"))
-            target_kind = str(form.get("target") or "").strip().lower()
-            agenda_id = to_int(form.get("agenda_id"))
-            if item_id is None or target_kind not in {"task", "project"}:
-                return redirect(scoped("/agenda?msg=Invalid%20conversion%20request")).wsgi(start_response)
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+            entity = str(req.form.get("entity") or "").strip().lower()
+            item_id = to_int(req.form.get("item_id"))
+            body = str(req.form.get("body") or "").strip()
+            if item_id is None or not comment_table_for_entity(entity):
+                return json_response({"ok": False, "error": "invalid_target"}, status="400 Bad Request").wsgi(start_response)
+            if not body:
+                return json_response({"ok": False, "error": "comment_required"}, status="400 Bad Request").wsgi(start_response)
+            if len(body) > 4000:
+                body = body[:4000]
+            if not comment_target_exists(conn, org_id, entity, item_id):
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            cursor = conn.execute(
+                """
+                INSERT INTO item_comments (organization_id, entity, entity_id, author_user_id, body, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (org_id, entity, item_id, user_id, body, iso()),
+            )
+            comment_id = int(cursor.lastrowid)
+            notify_comment_mentions_and_watchers(
+                conn=conn,
+                org_id=org_id,
+                entity=entity,
+                item_id=item_id,
+                actor_user_id=user_id,
+                actor_name=str(user["name"]),
+                actor_email=str(user["email"]),
+                comment_body=body,
+            )
+            conn.commit()
             row = conn.execute(
                 """
-                SELECT i.*, a.organization_id
-                FROM meeting_items i
-                JOIN meeting_agendas a ON a.id = i.agenda_id
-                WHERE i.id = ? AND a.organization_id = ?
+                SELECT c.id, c.body, c.created_at, c.author_user_id, u.name AS author_name
+                FROM item_comments c
+                LEFT JOIN users u ON u.id = c.author_user_id
+                WHERE c.id = ? AND c.organization_id = ?
                 """,
-                (item_id, org_id),
+                (comment_id, org_id),
             ).fetchone()
-            if not row:
-                return redirect(scoped("/agenda?msg=Agenda%20item%20not%20found")).wsgi(start_response)
-            if target_kind == "task":
-                existing_link = to_int(str(row["linked_task_id"])) if row["linked_task_id"] is not None else None
-                if existing_link is not None:
-                    return redirect(scoped(f"/agenda?agenda_id={row['agenda_id']}&msg=Agenda%20item%20already%20linked%20to%20task")).wsgi(start_response)
-                project_id, space_id, relation_error = resolve_task_project_and_space(
-                    conn,
-                    org_id,
-                    user_id,
-                    form.get("project_id"),
-                    form.get("space_id"),
-                )
-                if relation_error:
-                    return redirect(scoped(f"/agenda?agenda_id={row['agenda_id']}&msg={quote(relation_error)}")).wsgi(start_response)
-                cursor = conn.execute(
-                    """
-                    INSERT INTO tasks
-                    (organization_id, project_id, title, description, status, priority, assignee_user_id, reporter_user_id, due_date, planned_week, energy, estimate_hours, meta_json, created_at, updated_at, team_id, space_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        org_id,
-                        project_id,
-                        row["title"],
-                        row["description"] or "",
-                        task_status_from_agenda_status(str(row["status"] or "Not Discussed")),
-                        row["priority"] or "Medium",
-                        row["owner_user_id"],
-                        user_id,
-                        row["due_date"],
-                        "",
-                        "Medium",
-                        None,
-                        "{}",
-                        iso(),
-                        iso(),
-                        to_int(form.get("team_id")),
-                        space_id,
-                    ),
-                )
-                new_task_id = int(cursor.lastrowid)
-                conn.execute(
-                    "UPDATE meeting_items SET linked_task_id = ?, item_type = 'task', updated_at = ? WHERE id = ?",
-                    (new_task_id, iso(), item_id),
-                )
-                conn.commit()
-                return redirect(scoped(f"/agenda?agenda_id={agenda_id or row['agenda_id']}&msg=Agenda%20item%20converted%20to%20task")).wsgi(start_response)
-            existing_link = to_int(str(row["linked_project_id"])) if row["linked_project_id"] is not None else None
-            if existing_link is not None:
-                return redirect(scoped(f"/agenda?agenda_id={row['agenda_id']}&msg=Agenda%20item%20already%20linked%20to%20project")).wsgi(start_response)
-            space_id = default_space_id_for_org(conn, org_id, preferred_space_id=to_int(form.get("space_id")))
+            return json_response(
+                {
+                    "ok": True,
+                    "comment": {
+                        "id": row["id"],
+                        "body": row["body"],
+                        "author_user_id": row["author_user_id"],
+                        "author_name": row["author_name"] or "Unknown",
+                        "created_at": row["created_at"],
+                    },
+                }
+            ).wsgi(start_response)
+
+        if req.path == "/api/tasks/create" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+            form = req.form
+            role = str(ctx.get("role") or "viewer")
+            title = sanitize_title_for_role(
+                conn,
+                org_id,
+                role,
+                "tasks",
+                form.get("title"),
+                None,
+                free_edit_min_role="manager",
+            )
+            status = form.get("status", "Todo")
+            if status not in TASK_STATUSES:
+                status = "Todo"
+            priority = form.get("priority", "Medium")
+            if priority not in {"Low", "Medium", "High", "Critical"}:
+                priority = "Medium"
+            energy = form.get("energy", "Medium")
+            if energy not in {"Low", "Medium", "High"}:
+                energy = "Medium"
+            assignee_id = normalize_org_user_id(conn, org_id, form.get("assignee_user_id"))
+            project_id, space_id, relation_error = resolve_task_project_and_space(
+                conn,
+                org_id,
+                user_id,
+                form.get("project_id"),
+                to_int(form.get("space_id"), selected_space_id),
+            )
+            if relation_error == "invalid_project":
+                return json_response({"ok": False, "error": "invalid_project"}, status="400 Bad Request").wsgi(start_response)
+            if relation_error == "missing_space":
+                return json_response({"ok": False, "error": "missing_space"}, status="400 Bad Request").wsgi(start_response)
+
+            meta: Dict[str, object] = {}
+            attachments = lines_to_items(form.get("attachments"))
+            if attachments:
+                meta["attachments"] = attachments
+            note = (form.get("note") or "").strip()
+            if note:
+                meta["note"] = note[:1500]
+            extra_json = (form.get("extra_json") or "").strip()
+            if extra_json:
+                try:
+                    extra_obj = json.loads(extra_json)
+                    if isinstance(extra_obj, dict):
+                        meta["extra"] = extra_obj
+                except json.JSONDecodeError:
+                    pass
+
             cursor = conn.execute(
                 """
-                INSERT INTO projects
-                (organization_id, name, description, lane, status, priority, owner_user_id, start_date, due_date, tags, meta_json, created_by, created_at, updated_at, team_id, space_id, progress_pct)
+                INSERT INTO tasks
+                (organization_id, project_id, title, description, status, priority, assignee_user_id, reporter_user_id, due_date, planned_week, energy, estimate_hours, meta_json, created_at, updated_at, team_id, space_id)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     org_id,
-                    row["title"],
-                    row["description"] or "",
-                    "Core Operations",
-                    project_status_from_agenda_status(str(row["status"] or "Not Discussed")),
-                    row["priority"] or "Medium",
-                    row["owner_user_id"],
-                    dt.date.today().isoformat(),
-                    row["due_date"],
-                    "agenda",
-                    "{}",
+                    project_id,
+                    title,
+                    form.get("description", "").strip(),
+                    status,
+                    priority,
+                    assignee_id,
                     user_id,
+                    parse_date(form.get("due_date", "")),
+                    dt.date.today().isocalendar()[1],
+                    energy,
+                    to_float(form.get("estimate_hours"), 0.0),
+                    json.dumps(meta),
                     iso(),
                     iso(),
                     to_int(form.get("team_id")),
                     space_id,
-                    0,
                 ),
             )
-            new_project_id = int(cursor.lastrowid)
-            conn.execute(
-                "UPDATE meeting_items SET linked_project_id = ?, item_type = 'project', updated_at = ? WHERE id = ?",
-                (new_project_id, iso(), item_id),
+            task_id = int(cursor.lastrowid)
+            created_snapshot = snapshot_row(
+                conn.execute(
+                    "SELECT * FROM tasks WHERE id = ? AND organization_id = ?",
+                    (task_id, org_id),
+                ).fetchone()
+            )
+            log_change_with_rollback(
+                conn,
+                org_id,
+                user_id,
+                "task_created",
+                "tasks",
+                task_id,
+                None,
+                created_snapshot,
+                f"Task created: {title}",
+            )
+            ensure_item_watchers_seeded(conn, org_id, "task", task_id, user_id)
+            notify_task_assignment(
+                conn=conn,
+                org_id=org_id,
+                task_id=task_id,
+                actor_name=user["name"],
+                actor_email=user["email"],
+                task_title=title,
+                task_status=status,
+                assignee_id=assignee_id,
+            )
+            conn.commit()
+            return json_response({"ok": True, "task_id": task_id}).wsgi(start_response)
+
+        if req.path == "/api/tasks/save" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+            form = req.form
+            role = str(ctx.get("role") or "viewer")
+            task_id = to_int(form.get("task_id"))
+            current = conn.execute(
+                "SELECT * FROM tasks WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
+                (task_id, org_id),
+            ).fetchone()
+            if not current:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            before_snapshot = snapshot_row(current)
+
+            def val(key: str, existing: object) -> object:
+                return form[key] if key in form else existing
+
+            meta = parse_meta_json(current["meta_json"])
+            if "attachments" in form:
+                attachments = lines_to_items(form.get("attachments"))
+                if attachments:
+                    meta["attachments"] = attachments
+                else:
+                    meta.pop("attachments", None)
+            if "note" in form:
+                note = (form.get("note") or "").strip()
+                if note:
+                    meta["note"] = note[:1500]
+                else:
+                    meta.pop("note", None)
+            if "extra_json" in form:
+                extra_json = (form.get("extra_json") or "").strip()
+                if extra_json:
+                    try:
+                        extra_obj = json.loads(extra_json)
+                        if isinstance(extra_obj, dict):
+                            meta["extra"] = extra_obj
+                    except json.JSONDecodeError:
+                        pass
+                else:
+                    meta.pop("extra", None)
+
+            status = str(val("status", current["status"]))
+            if status not in TASK_STATUSES:
+                status = str(current["status"])
+            priority = str(val("priority", current["priority"]))
+            if priority not in {"Low", "Medium", "High", "Critical"}:
+                priority = str(current["priority"] or "Medium")
+            energy = str(val("energy", current["energy"] or "Medium"))
+            if energy not in {"Low", "Medium", "High"}:
+                energy = str(current["energy"] or "Medium")
+            assignee_id = normalize_org_user_id(
+                conn,
+                org_id,
+                val("assignee_user_id", current["assignee_user_id"]),
+                fallback=to_int(current["assignee_user_id"]),
+            )
+
+            due_date = current["due_date"]
+            if "due_date" in form:
+                due_date = parse_date(form.get("due_date", ""))
+            title = sanitize_title_for_role(
+                conn,
+                org_id,
+                role,
+                "tasks",
+                val("title", current["title"]),
+                current["title"],
+                free_edit_min_role="manager",
+            )
+            project_id, space_id, relation_error = resolve_task_project_and_space(
+                conn,
+                org_id,
+                user_id,
+                val("project_id", current["project_id"]),
+                val("space_id", current["space_id"] if current["space_id"] is not None else selected_space_id),
             )
-            conn.commit()
-            return redirect(scoped(f"/agenda?agenda_id={agenda_id or row['agenda_id']}&msg=Agenda%20item%20converted%20to%20project")).wsgi(start_response)
+            if relation_error == "invalid_project":
+                return json_response({"ok": False, "error": "invalid_project"}, status="400 Bad Request").wsgi(start_response)
+            if relation_error == "missing_space":
+                return json_response({"ok": False, "error": "missing_space"}, status="400 Bad Request").wsgi(start_response)
 
-        if req.path == "/agenda/note/new" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            linked_agenda_id = to_int(form.get("agenda_id"))
-            if linked_agenda_id is not None:
-                agenda = conn.execute(
-                    "SELECT id FROM meeting_agendas WHERE id = ? AND organization_id = ?",
-                    (linked_agenda_id, org_id),
-                ).fetchone()
-                if not agenda:
-                    return redirect(scoped("/agenda?msg=Agenda%20not%20found%20for%20note%20link")).wsgi(start_response)
             conn.execute(
                 """
-                INSERT INTO meeting_note_sources
-                (organization_id, title, source_type, doc_url, body, linked_agenda_id, created_by, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                UPDATE tasks
+                SET title = ?, description = ?, status = ?, priority = ?, assignee_user_id = ?, project_id = ?,
+                    due_date = ?, energy = ?, estimate_hours = ?, team_id = ?, space_id = ?, meta_json = ?, updated_at = ?
+                WHERE id = ? AND organization_id = ?
                 """,
                 (
-                    org_id,
-                    form.get("title", "Meeting Notes"),
-                    "google_doc" if form.get("doc_url") else "manual_note",
-                    form.get("doc_url", ""),
-                    form.get("body", ""),
-                    linked_agenda_id,
-                    user_id,
-                    iso(),
+                    title,
+                    str(val("description", current["description"] or ""))[:5000],
+                    status,
+                    priority,
+                    assignee_id,
+                    project_id,
+                    due_date,
+                    energy,
+                    to_float(val("estimate_hours", current["estimate_hours"] or 0.0), float(current["estimate_hours"] or 0.0)),
+                    to_int(val("team_id", current["team_id"])),
+                    space_id,
+                    json.dumps(meta),
                     iso(),
+                    task_id,
+                    org_id,
                 ),
             )
-            conn.commit()
-            return redirect(scoped("/agenda?msg=Note%20source%20added")).wsgi(start_response)
-
-        if req.path == "/calendar":
-            view_mode = (req.query.get("view") or "week").strip().lower()
-            date_value = (req.query.get("date") or "").strip()
-            content = render_calendar_page(
+            after_snapshot = snapshot_row(
+                conn.execute(
+                    "SELECT * FROM tasks WHERE id = ? AND organization_id = ?",
+                    (task_id, org_id),
+                ).fetchone()
+            )
+            log_change_with_rollback(
                 conn,
                 org_id,
                 user_id,
-                selected_space_id=selected_space_id,
-                view_mode=view_mode,
-                anchor_date_value=date_value,
+                "task_saved",
+                "tasks",
+                task_id or 0,
+                before_snapshot,
+                after_snapshot,
+                f"Task updated: {title}",
             )
-            page = render_layout("Calendar Analytics", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
-
-        if req.path == "/calendar/import" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return gate.wsgi(start_response)
-            view_mode = (req.form.get("view") or "week").strip().lower()
-            if view_mode not in {"week", "month"}:
-                view_mode = "week"
-            date_value = parse_date(req.form.get("date", "")) or dt.date.today().isoformat()
-            base_redirect = f"/calendar?view={quote(view_mode)}&date={quote(date_value)}"
-            file = req.files.get("file")
-            if file is None:
-                return redirect(scoped(f"{base_redirect}&msg=No%20file%20uploaded")).wsgi(start_response)
-            raw = file.file.read().decode("utf-8", errors="ignore")
-            filename = (file.filename or "").lower()
-            if filename.endswith(".ics"):
-                parsed = parse_ics(raw)
-            else:
-                parsed = parse_google_csv(raw)
-
-            for event in parsed:
-                conn.execute(
-                    """
-                    INSERT INTO calendar_events
-                    (organization_id, user_id, source, title, start_at, end_at, attendees_count, location, description, category, energy_score, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        org_id,
-                        user_id,
-                        event["source"],
-                        event["title"],
-                        event["start_at"],
-                        event["end_at"],
-                        event["attendees_count"],
-                        event["location"],
-                        event["description"],
-                        event["category"],
-                        None,
-                        iso(),
-                    ),
+            ensure_item_watchers_seeded(conn, org_id, "task", int(task_id or 0), user_id)
+            status_changed = status != str(current["status"] or "")
+            old_assignee_id = to_int(current["assignee_user_id"])
+            assignee_changed = assignee_id != old_assignee_id
+            if status != current["status"] or assignee_id != to_int(current["assignee_user_id"]):
+                notify_task_assignment(
+                    conn=conn,
+                    org_id=org_id,
+                    task_id=int(task_id or 0),
+                    actor_name=user["name"],
+                    actor_email=user["email"],
+                    task_title=title,
+                    task_status=status,
+                    assignee_id=assignee_id,
+                )
+            if before_snapshot != after_snapshot:
+                changed_fields: List[str] = []
+                if status_changed:
+                    changed_fields.append(f"status -> {status}")
+                if assignee_changed:
+                    changed_fields.append("assignee changed")
+                if title != str(current["title"] or ""):
+                    changed_fields.append("title updated")
+                if to_int(project_id) != to_int(current["project_id"]):
+                    changed_fields.append("project updated")
+                summary = "Task was updated."
+                if changed_fields:
+                    summary = f"Task was updated ({', '.join(changed_fields[:4])})."
+                skip_ids: List[int] = []
+                if assignee_changed and assignee_id is not None:
+                    skip_ids.append(int(assignee_id))
+                notify_entity_watchers(
+                    conn=conn,
+                    org_id=org_id,
+                    entity="task",
+                    entity_id=int(task_id or 0),
+                    actor_user_id=user_id,
+                    actor_name=str(user["name"]),
+                    actor_email=str(user["email"]),
+                    title=title,
+                    summary=summary,
+                    skip_user_ids=skip_ids,
+                    preference_key="email_task_updates",
                 )
             conn.commit()
-            return redirect(scoped(f"{base_redirect}&msg=Imported%20{len(parsed)}%20events")).wsgi(start_response)
+            return json_response({"ok": True, "task_id": task_id, "status": status}).wsgi(start_response)
 
-        if req.path == "/calendar/gcal/pull" and req.method == "POST":
-            gate = require_role(ctx, "student")
+        if req.path == "/api/projects/save" and req.method == "POST":
+            gate = require_role(ctx, "staff")
             if gate:
-                return gate.wsgi(start_response)
-            view_mode = (req.form.get("view") or "week").strip().lower()
-            if view_mode not in {"week", "month"}:
-                view_mode = "week"
-            date_value = parse_date(req.form.get("date", "")) or dt.date.today().isoformat()
-            base_redirect = f"/calendar?view={quote(view_mode)}&date={quote(date_value)}"
-            calendar_id = (req.form.get("calendar_id") or GCAL_DEFAULT_CALENDAR_ID or "primary").strip()
-            lookback_days = clamp_int(req.form.get("lookback_days"), 30, 1, 365)
-            lookahead_days = clamp_int(req.form.get("lookahead_days"), 45, 1, 365)
-            push_window_days = clamp_int(req.form.get("push_window_days"), 30, 1, 365)
-            inserted, updated, error = pull_google_calendar_events(
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+            form = req.form
+            role = str(ctx.get("role") or "viewer")
+            project_id = to_int(form.get("project_id"))
+            current = conn.execute(
+                "SELECT * FROM projects WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
+                (project_id, org_id),
+            ).fetchone()
+            if not current:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            before_snapshot = snapshot_row(current)
+
+            def pval(key: str, existing: object) -> object:
+                return form[key] if key in form else existing
+
+            meta = parse_meta_json(current["meta_json"])
+            if "attachments" in form:
+                attachments = lines_to_items(form.get("attachments"))
+                if attachments:
+                    meta["attachments"] = attachments
+                else:
+                    meta.pop("attachments", None)
+            if "note" in form:
+                note = (form.get("note") or "").strip()
+                if note:
+                    meta["note"] = note[:1500]
+                else:
+                    meta.pop("note", None)
+            if "extra_json" in form:
+                extra_json = (form.get("extra_json") or "").strip()
+                if extra_json:
+                    try:
+                        extra_obj = json.loads(extra_json)
+                        if isinstance(extra_obj, dict):
+                            meta["extra"] = extra_obj
+                    except json.JSONDecodeError:
+                        pass
+                else:
+                    meta.pop("extra", None)
+
+            status = str(pval("status", current["status"]))
+            if status not in PROJECT_STATUSES:
+                status = str(current["status"])
+            lane = str(pval("lane", current["lane"]))
+            if lane not in LANES:
+                lane = str(current["lane"] or LANES[0])
+            priority = str(pval("priority", current["priority"]))
+            if priority not in {"Low", "Medium", "High", "Critical"}:
+                priority = str(current["priority"] or "Medium")
+            owner_user_id = normalize_org_user_id(
                 conn,
-                org_id=org_id,
-                user_id=user_id,
-                calendar_id=calendar_id,
-                lookback_days=lookback_days,
-                lookahead_days=lookahead_days,
+                org_id,
+                pval("owner_user_id", current["owner_user_id"]),
+                fallback=to_int(current["owner_user_id"]),
             )
-            save_calendar_sync_settings(
+
+            due_date = current["due_date"]
+            if "due_date" in form:
+                due_date = parse_date(form.get("due_date", ""))
+            start_date = current["start_date"]
+            if "start_date" in form:
+                start_date = parse_date(form.get("start_date", ""))
+
+            progress_pct = to_int(pval("progress_pct", current["progress_pct"]), int(current["progress_pct"] or 0)) or 0
+            progress_pct = max(0, min(100, progress_pct))
+            name = sanitize_title_for_role(
                 conn,
-                org_id=org_id,
-                user_id=user_id,
-                calendar_id=calendar_id,
-                lookback_days=lookback_days,
-                lookahead_days=lookahead_days,
-                push_window_days=push_window_days,
-                touch_pull=(error == ""),
+                org_id,
+                role,
+                "projects",
+                pval("name", current["name"]),
+                current["name"],
+                free_edit_min_role="manager",
             )
-            conn.commit()
-            if error:
-                return redirect(scoped(f"{base_redirect}&msg={quote('Google pull failed: ' + error[:220])}")).wsgi(start_response)
-            msg = f"Google pull complete: {inserted} imported, {updated} updated"
-            return redirect(scoped(f"{base_redirect}&msg={quote(msg)}")).wsgi(start_response)
 
-        if req.path == "/calendar/gcal/push" and req.method == "POST":
-            gate = require_role(ctx, "student")
-            if gate:
-                return gate.wsgi(start_response)
-            view_mode = (req.form.get("view") or "week").strip().lower()
-            if view_mode not in {"week", "month"}:
-                view_mode = "week"
-            date_value = parse_date(req.form.get("date", "")) or dt.date.today().isoformat()
-            base_redirect = f"/calendar?view={quote(view_mode)}&date={quote(date_value)}"
-            calendar_id = (req.form.get("calendar_id") or GCAL_DEFAULT_CALENDAR_ID or "primary").strip()
-            lookback_days = clamp_int(req.form.get("lookback_days"), 30, 1, 365)
-            lookahead_days = clamp_int(req.form.get("lookahead_days"), 45, 1, 365)
-            push_window_days = clamp_int(req.form.get("push_window_days"), 30, 1, 365)
-            created, updated, skipped, error = push_tasks_to_google_calendar(
-                conn,
-                org_id=org_id,
-                user_id=user_id,
-                calendar_id=calendar_id,
-                push_window_days=push_window_days,
-                selected_space_id=selected_space_id,
+            conn.execute(
+                """
+                UPDATE projects
+                SET name = ?, description = ?, lane = ?, status = ?, priority = ?, owner_user_id = ?,
+                    start_date = ?, due_date = ?, tags = ?, team_id = ?, space_id = ?, progress_pct = ?, meta_json = ?, updated_at = ?
+                WHERE id = ? AND organization_id = ?
+                """,
+                (
+                    name,
+                    str(pval("description", current["description"] or ""))[:5000],
+                    lane,
+                    status,
+                    priority,
+                    owner_user_id,
+                    start_date,
+                    due_date,
+                    str(pval("tags", current["tags"] or ""))[:500],
+                    to_int(pval("team_id", current["team_id"])),
+                    to_int(pval("space_id", current["space_id"])),
+                    progress_pct,
+                    json.dumps(meta),
+                    iso(),
+                    project_id,
+                    org_id,
+                ),
             )
-            save_calendar_sync_settings(
+            after_snapshot = snapshot_row(
+                conn.execute(
+                    "SELECT * FROM projects WHERE id = ? AND organization_id = ?",
+                    (project_id, org_id),
+                ).fetchone()
+            )
+            log_change_with_rollback(
                 conn,
-                org_id=org_id,
-                user_id=user_id,
-                calendar_id=calendar_id,
-                lookback_days=lookback_days,
-                lookahead_days=lookahead_days,
-                push_window_days=push_window_days,
-                touch_push=(error == ""),
+                org_id,
+                user_id,
+                "project_saved",
+                "projects",
+                project_id or 0,
+                before_snapshot,
+                after_snapshot,
+                f"Project updated: {name}",
             )
+            ensure_item_watchers_seeded(conn, org_id, "project", int(project_id or 0), user_id)
+            if before_snapshot != after_snapshot:
+                changed_fields: List[str] = []
+                if status != str(current["status"] or ""):
+                    changed_fields.append(f"status -> {status}")
+                if owner_user_id != to_int(current["owner_user_id"]):
+                    changed_fields.append("owner changed")
+                if progress_pct != int(current["progress_pct"] or 0):
+                    changed_fields.append(f"progress {progress_pct}%")
+                if name != str(current["name"] or ""):
+                    changed_fields.append("name updated")
+                summary = "Project was updated."
+                if changed_fields:
+                    summary = f"Project was updated ({', '.join(changed_fields[:4])})."
+                notify_entity_watchers(
+                    conn=conn,
+                    org_id=org_id,
+                    entity="project",
+                    entity_id=int(project_id or 0),
+                    actor_user_id=user_id,
+                    actor_name=str(user["name"]),
+                    actor_email=str(user["email"]),
+                    title=name,
+                    summary=summary,
+                    preference_key="email_project_updates",
+                )
             conn.commit()
-            if error and created == 0 and updated == 0:
-                return redirect(scoped(f"{base_redirect}&msg={quote('Google push failed: ' + error[:220])}")).wsgi(start_response)
-            msg = f"Google push complete: {created} created, {updated} updated, {skipped} skipped"
-            if error:
-                msg += f" ({error[:120]})"
-            return redirect(scoped(f"{base_redirect}&msg={quote(msg)}")).wsgi(start_response)
+            return json_response({"ok": True, "project_id": project_id, "status": status, "progress_pct": progress_pct}).wsgi(start_response)
 
-        if req.path == "/reports":
-            report_id = req.query.get("report_id")
-            content = render_reports_page(
+        if req.path == "/api/tasks":
+            scope = req.query.get("scope", "my")
+            search = req.query.get("search", "")
+            team_id = to_int(req.query.get("team_id"))
+            rows = fetch_tasks(
                 conn,
                 org_id,
                 user_id,
-                report_id,
-                selected_space_id=selected_space_id,
-                role=str(ctx.get("role") or "viewer"),
+                scope=scope,
+                search=search,
+                team_id=team_id,
+                space_id=selected_space_id,
             )
-            page = render_layout("Generate Reports", fill_csrf(content, csrf_token), req, ctx, notice)
+            data = [
+                (
+                    lambda meta: {
+                        "id": r["id"],
+                        "title": r["title"],
+                        "description": r["description"],
+                        "project": r["project_name"],
+                        "project_id": r["project_id"],
+                        "assignee": r["assignee_name"],
+                        "assignee_user_id": r["assignee_user_id"],
+                        "team": r["team_name"],
+                        "team_id": r["team_id"],
+                        "space": r["space_name"],
+                        "space_id": r["space_id"],
+                        "status": r["status"],
+                        "priority": r["priority"],
+                        "due_date": r["due_date"],
+                        "energy": r["energy"],
+                        "estimate_hours": r["estimate_hours"],
+                        "attachments": [x for x in meta.get("attachments", []) if isinstance(x, str)],
+                        "note": str(meta.get("note", "")),
+                        "extra": meta.get("extra", {}),
+                    }
+                )(parse_meta_json(r["meta_json"]))
+                for r in rows
+            ]
+            return json_response({"tasks": data}).wsgi(start_response)
+
+        if req.path == "/agenda":
+            content = render_agenda_monday_page(conn, org_id)
+            page = render_layout("Meeting Agenda", fill_csrf(content, csrf_token), req, ctx, notice)
             return Response(page).wsgi(start_response)
 
-        if req.path == "/reports/new" and req.method == "POST":
+        if req.path == "/agenda/new" and req.method == "POST":
             gate = require_role(ctx, "student")
             if gate:
                 return gate.wsgi(start_response)
             form = req.form
-            template_key = (form.get("template_key") or "").strip()
-            template = report_template_by_key(template_key) if template_key else None
-
-            name = (form.get("name") or "").strip()
-            if not name and template:
-                name = str(template.get("name") or "Untitled Report")
-            if not name:
-                name = "Untitled Report"
-            name = name[:120]
-
-            description = (form.get("description") or "").strip()[:800]
-            if not description and template:
-                description = str(template.get("description") or "")
-
-            raw_config = (form.get("config_json") or "").strip()
-            config: Dict[str, object]
-            if raw_config:
-                try:
-                    parsed_config = json.loads(raw_config)
-                except json.JSONDecodeError:
-                    parsed_config = {}
-                config = report_config_from_payload(parsed_config)
-            elif template:
-                config = report_config_from_payload({"widgets": template.get("widgets", [])})
-            else:
-                config = {"widgets": []}
-
-            if not sanitize_report_widgets(config.get("widgets")):
-                fallback = report_template_by_key("impact_report") or REPORT_TEMPLATE_LIBRARY[0]
-                config = report_config_from_payload({"widgets": fallback.get("widgets", [])})
-
-            can_share = role_allows(str(ctx.get("role") or "viewer"), "manager")
-            is_shared = 1 if can_share and form.get("is_shared") == "1" else 0
-            cursor = conn.execute(
+            status = str(form.get("status") or "Planned").strip()
+            if status not in AGENDA_STATUSES:
+                status = "Planned"
+            priority = str(form.get("priority") or "Medium").strip()
+            if priority not in {"Low", "Medium", "High", "Critical"}:
+                priority = "Medium"
+            lane = str(form.get("lane") or LANES[0]).strip()
+            if lane not in LANES:
+                lane = LANES[0]
+            conn.execute(
                 """
-                INSERT INTO report_templates
-                (organization_id, user_id, name, description, config_json, is_shared, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO meeting_agendas
+                (organization_id, title, meeting_date, owner_user_id, status, priority, lane, team_id, space_id, due_date, description, notes, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     org_id,
-                    user_id,
-                    name,
-                    description,
-                    report_config_json(config),
-                    is_shared,
+                    form.get("title", "Weekly Meeting"),
+                    parse_date(form.get("meeting_date", "")) or dt.date.today().isoformat(),
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=user_id),
+                    status,
+                    priority,
+                    lane,
+                    to_int(form.get("team_id")),
+                    to_int(form.get("space_id")),
+                    parse_date(form.get("due_date", "")),
+                    form.get("description", ""),
+                    form.get("notes", ""),
                     iso(),
                     iso(),
                 ),
             )
-            new_id = int(cursor.lastrowid)
-            log_action(conn, org_id, user_id, "report_template_created", "report_templates", str(new_id), name)
             conn.commit()
-            next_path = str(form.get("next") or "").strip()
-            if next_path.startswith("/dashboard"):
-                return redirect(scoped("/dashboard?msg=Report%20template%20saved")).wsgi(start_response)
-            return redirect(scoped(f"/reports?report_id={new_id}&msg=Report%20template%20saved")).wsgi(start_response)
+            return redirect(scoped("/agenda?msg=Agenda%20created")).wsgi(start_response)
 
-        if req.path == "/reports/visibility" and req.method == "POST":
-            report_id = to_int(req.form.get("report_id"))
-            target = conn.execute(
-                "SELECT id, user_id, is_shared FROM report_templates WHERE id = ? AND organization_id = ?",
-                (report_id, org_id),
+        if req.path == "/agenda/update" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return gate.wsgi(start_response)
+            form = req.form
+            agenda_id = to_int(form.get("agenda_id"))
+            if agenda_id is None:
+                return redirect(scoped("/agenda?msg=Agenda%20not%20found")).wsgi(start_response)
+            current = conn.execute(
+                "SELECT * FROM meeting_agendas WHERE id = ? AND organization_id = ?",
+                (agenda_id, org_id),
             ).fetchone()
-            if not target:
-                return redirect(scoped("/reports?msg=Report%20template%20not%20found")).wsgi(start_response)
-            if not (int(target["user_id"]) == int(user_id) or role_allows(str(ctx.get("role") or "viewer"), "manager")):
-                return Response("<h1>403 Forbidden</h1>", status="403 Forbidden").wsgi(start_response)
-            new_shared = 1 if req.form.get("is_shared") == "1" else 0
+            if not current:
+                return redirect(scoped("/agenda?msg=Agenda%20not%20found")).wsgi(start_response)
+            status = str(form.get("status") or current["status"] or "Planned").strip()
+            if status not in AGENDA_STATUSES:
+                status = str(current["status"] or "Planned")
+            priority = str(form.get("priority") or current["priority"] or "Medium").strip()
+            if priority not in {"Low", "Medium", "High", "Critical"}:
+                priority = str(current["priority"] or "Medium")
+            lane = str(form.get("lane") or current["lane"] or LANES[0]).strip()
+            if lane not in LANES:
+                lane = str(current["lane"] or LANES[0])
             conn.execute(
-                "UPDATE report_templates SET is_shared = ?, updated_at = ? WHERE id = ? AND organization_id = ?",
-                (new_shared, iso(), report_id, org_id),
+                """
+                UPDATE meeting_agendas
+                SET title = ?, meeting_date = ?, owner_user_id = ?, status = ?, priority = ?, lane = ?, team_id = ?, space_id = ?, due_date = ?, description = ?, notes = ?, updated_at = ?
+                WHERE id = ? AND organization_id = ?
+                """,
+                (
+                    str(form.get("title") or current["title"] or "Untitled Meeting").strip() or str(current["title"] or "Untitled Meeting"),
+                    parse_date(form.get("meeting_date", "")) or current["meeting_date"],
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
+                    status,
+                    priority,
+                    lane,
+                    to_int(form.get("team_id"), to_int(current["team_id"])),
+                    to_int(form.get("space_id"), to_int(current["space_id"])),
+                    parse_date(form.get("due_date", "")) if "due_date" in form else current["due_date"],
+                    form.get("description", current["description"] or ""),
+                    form.get("notes", current["notes"] or ""),
+                    iso(),
+                    agenda_id,
+                    org_id,
+                ),
             )
             conn.commit()
-            msg = "Report template shared" if new_shared else "Report template is now private"
-            return redirect(scoped(f"/reports?report_id={report_id}&msg={quote(msg)}")).wsgi(start_response)
-
-        if req.path == "/reports/delete" and req.method == "POST":
-            report_id = to_int(req.form.get("report_id"))
-            target = conn.execute(
-                "SELECT id, user_id, name FROM report_templates WHERE id = ? AND organization_id = ?",
-                (report_id, org_id),
-            ).fetchone()
-            if not target:
-                return redirect(scoped("/reports?msg=Report%20template%20not%20found")).wsgi(start_response)
-            if not (int(target["user_id"]) == int(user_id) or role_allows(str(ctx.get("role") or "viewer"), "manager")):
-                return Response("<h1>403 Forbidden</h1>", status="403 Forbidden").wsgi(start_response)
-            conn.execute("DELETE FROM report_templates WHERE id = ? AND organization_id = ?", (report_id, org_id))
-            log_action(conn, org_id, user_id, "report_template_deleted", "report_templates", str(report_id), str(target["name"]))
-            conn.commit()
-            return redirect(scoped("/reports?msg=Report%20template%20deleted")).wsgi(start_response)
-
-        if req.path == "/views":
-            content = render_views_page(conn, org_id, user_id, req.query.get("view_id"), selected_space_id=selected_space_id)
-            page = render_layout("Custom Views", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
+            return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Agenda%20updated")).wsgi(start_response)
 
-        if req.path == "/views/new" and req.method == "POST":
+        if req.path == "/agenda/item/new" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return gate.wsgi(start_response)
             form = req.form
-            template_key = (form.get("template_key") or "").strip()
-            template = view_template_by_key(template_key) if template_key else None
-            if template and (not FEATURE_INTAKE_ENABLED) and str(template.get("entity") or "") == "intake":
-                template = None
-            entity = (form.get("entity") or str(template.get("entity")) if template else "tasks").strip().lower()
-            if (not FEATURE_INTAKE_ENABLED) and entity == "intake":
-                entity = "tasks"
-            allowed_entities = VIEW_ENTITY_LABELS if FEATURE_INTAKE_ENABLED else {k: v for k, v in VIEW_ENTITY_LABELS.items() if k != "intake"}
-            if entity not in allowed_entities:
-                entity = "tasks"
-
-            name = (form.get("name") or "").strip()
-            if not name and template:
-                name = str(template.get("name") or "Untitled View")
-            if not name:
-                name = "Untitled View"
-
-            filters_json = (form.get("filters_json") or "").strip()
-            columns_json = (form.get("columns_json") or "").strip()
-            if not filters_json and template:
-                filters_json = json.dumps(template.get("filters", {}))
-            if not columns_json and template:
-                columns_json = json.dumps(template.get("columns", []))
-            if not filters_json:
-                fallback_filters: Dict[str, object] = {}
-                if form.get("scope"):
-                    fallback_filters["scope"] = form.get("scope")
-                if form.get("lane"):
-                    fallback_filters["lane"] = form.get("lane")
-                if form.get("team_id"):
-                    fallback_filters["team_id"] = to_int(form.get("team_id"))
-                if form.get("space_id"):
-                    fallback_filters["space_id"] = to_int(form.get("space_id"))
-                if form.get("search"):
-                    fallback_filters["search"] = form.get("search", "").strip()
-                if form.get("due_within_days"):
-                    fallback_filters["due_within_days"] = to_int(form.get("due_within_days"))
-                if form.get("followup_within_days"):
-                    fallback_filters["followup_within_days"] = to_int(form.get("followup_within_days"))
-                if form.get("maintenance_within_days"):
-                    fallback_filters["maintenance_within_days"] = to_int(form.get("maintenance_within_days"))
-                if form.get("min_score"):
-                    fallback_filters["min_score"] = to_float(form.get("min_score"))
-                if form.get("owner_user_id"):
-                    if entity in {"tasks", "onboarding"}:
-                        fallback_filters["assignee_user_id"] = to_int(form.get("owner_user_id"))
-                    else:
-                        fallback_filters["owner_user_id"] = to_int(form.get("owner_user_id"))
-                if form.get("only_unassigned") == "1":
-                    fallback_filters["only_unassigned"] = True
-                if form.get("cert_required") == "1":
-                    fallback_filters["cert_required"] = True
-                if form.get("hide_completed") == "1":
-                    if entity == "tasks":
-                        fallback_filters["status_exclude"] = ["Done", "Cancelled"]
-                    elif entity == "projects":
-                        fallback_filters["status_exclude"] = ["Complete"]
-                    elif entity == "partnerships":
-                        fallback_filters["status_exclude"] = ["Closed"]
-                    elif entity == "onboarding":
-                        fallback_filters["status_exclude"] = ["Done"]
-                filters_json = json.dumps(fallback_filters)
-            if not columns_json:
-                columns_json = json.dumps(view_default_columns(entity))
-
-            try:
-                parsed_filters = json.loads(filters_json)
-                parsed_columns = json.loads(columns_json)
-            except json.JSONDecodeError:
-                return redirect(scoped("/views?msg=Filters%20and%20columns%20must%20be%20valid%20JSON")).wsgi(start_response)
-            if not isinstance(parsed_filters, dict):
-                parsed_filters = {}
-            if not isinstance(parsed_columns, list):
-                parsed_columns = []
-            allowed_columns = {key for key, _label in VIEW_COLUMN_OPTIONS.get(entity, [])}
-            cleaned_columns = [str(c) for c in parsed_columns if str(c) in allowed_columns]
-            if not cleaned_columns:
-                cleaned_columns = view_default_columns(entity)
-
+            agenda_id = to_int(form.get("agenda_id"))
+            if agenda_id is None:
+                return redirect(scoped("/agenda?msg=Select%20an%20agenda%20before%20adding%20items")).wsgi(start_response)
+            agenda = conn.execute(
+                "SELECT id FROM meeting_agendas WHERE id = ? AND organization_id = ?",
+                (agenda_id, org_id),
+            ).fetchone()
+            if not agenda:
+                return redirect(scoped("/agenda?msg=Agenda%20not%20found")).wsgi(start_response)
+            parent_item_id = to_int(form.get("parent_item_id"))
+            if parent_item_id is not None:
+                parent = conn.execute(
+                    """
+                    SELECT i.id, i.parent_item_id
+                    FROM meeting_items i
+                    JOIN meeting_agendas a ON a.id = i.agenda_id
+                    WHERE i.id = ? AND i.agenda_id = ? AND a.organization_id = ?
+                    """,
+                    (parent_item_id, agenda_id, org_id),
+                ).fetchone()
+                if not parent or parent["parent_item_id"] is not None:
+                    return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Invalid%20subitem%20parent")).wsgi(start_response)
             conn.execute(
                 """
-                INSERT INTO custom_views
-                (organization_id, user_id, name, entity, filters_json, columns_json, is_shared, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO meeting_items
+                (agenda_id, parent_item_id, section, title, owner_user_id, status, priority, due_date, minutes_estimate, description, item_type, sort_order, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
-                    org_id,
-                    user_id,
-                    name,
-                    entity,
-                    json.dumps(parsed_filters),
-                    json.dumps(cleaned_columns),
-                    1 if form.get("is_shared") == "1" else 0,
+                    agenda_id,
+                    parent_item_id,
+                    form.get("section", "General"),
+                    form.get("title", "Untitled Item"),
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=user_id),
+                    "Not Discussed",
+                    form.get("priority", "Medium") if form.get("priority", "Medium") in {"Low", "Medium", "High", "Critical"} else "Medium",
+                    parse_date(form.get("due_date", "")),
+                    int(form.get("minutes_estimate", "10") or 10),
+                    form.get("description", ""),
+                    "agenda",
+                    999,
+                    iso(),
                     iso(),
                 ),
             )
             conn.commit()
-            return redirect(scoped("/views?msg=View%20saved")).wsgi(start_response)
-
-        if req.path == "/onboarding":
-            content = render_onboarding_page(conn, org_id)
-            page = render_layout("Onboarding", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
+            return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Agenda%20item%20added")).wsgi(start_response)
 
-        if req.path == "/onboarding/assign" and req.method == "POST":
-            gate = require_role(ctx, "staff")
+        if req.path == "/agenda/item/attach" and req.method == "POST":
+            gate = require_role(ctx, "student")
             if gate:
                 return gate.wsgi(start_response)
             form = req.form
-            tpl = conn.execute(
-                "SELECT * FROM onboarding_templates WHERE id = ? AND organization_id = ?",
-                (form.get("template_id"), org_id),
+            agenda_id = to_int(form.get("agenda_id"))
+            source_type = str(form.get("source_type") or "").strip().lower()
+            source_id = to_int(form.get("source_id"))
+            section = str(form.get("section") or "Work Queue")
+            parent_item_id = to_int(form.get("parent_item_id"))
+            if agenda_id is None or source_id is None:
+                return redirect(scoped("/agenda?msg=Meeting%20and%20source%20are%20required")).wsgi(start_response)
+            agenda = conn.execute(
+                "SELECT id FROM meeting_agendas WHERE id = ? AND organization_id = ?",
+                (agenda_id, org_id),
             ).fetchone()
-            if tpl:
-                assignee_user_id = normalize_org_user_id(conn, org_id, form.get("assignee_user_id"))
-                if assignee_user_id is None:
-                    return redirect(scoped("/onboarding?msg=Assignee%20must%20be%20an%20active%20workspace%20member")).wsgi(start_response)
-                due = dt.date.today() + dt.timedelta(days=int(tpl["due_offset_days"]))
+            if not agenda:
+                return redirect(scoped("/agenda?msg=Agenda%20not%20found")).wsgi(start_response)
+            if parent_item_id is not None:
+                parent = conn.execute(
+                    """
+                    SELECT i.id, i.parent_item_id
+                    FROM meeting_items i
+                    JOIN meeting_agendas a ON a.id = i.agenda_id
+                    WHERE i.id = ? AND i.agenda_id = ? AND a.organization_id = ?
+                    """,
+                    (parent_item_id, agenda_id, org_id),
+                ).fetchone()
+                if not parent or parent["parent_item_id"] is not None:
+                    return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Invalid%20subitem%20parent")).wsgi(start_response)
+            if source_type == "task":
+                source = conn.execute(
+                    """
+                    SELECT id, title, status, priority, due_date, assignee_user_id
+                    FROM tasks
+                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
+                    """,
+                    (source_id, org_id),
+                ).fetchone()
+                if not source:
+                    return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Task%20not%20found")).wsgi(start_response)
+                conn.execute(
+                    """
+                    INSERT INTO meeting_items
+                    (agenda_id, parent_item_id, section, title, owner_user_id, status, priority, due_date, minutes_estimate, description, linked_task_id, item_type, sort_order, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        agenda_id,
+                        parent_item_id,
+                        section,
+                        source["title"],
+                        source["assignee_user_id"],
+                        agenda_status_from_task_status(str(source["status"] or "")),
+                        source["priority"] or "Medium",
+                        source["due_date"],
+                        10,
+                        "",
+                        source["id"],
+                        "task",
+                        999,
+                        iso(),
+                        iso(),
+                    ),
+                )
+                conn.commit()
+                return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Task%20linked%20to%20agenda")).wsgi(start_response)
+            if source_type == "project":
+                source = conn.execute(
+                    """
+                    SELECT id, name, status, priority, due_date, owner_user_id
+                    FROM projects
+                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
+                    """,
+                    (source_id, org_id),
+                ).fetchone()
+                if not source:
+                    return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Project%20not%20found")).wsgi(start_response)
                 conn.execute(
                     """
-                    INSERT INTO onboarding_assignments
-                    (organization_id, template_id, assignee_user_id, status, due_date, notes, created_at, completed_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO meeting_items
+                    (agenda_id, parent_item_id, section, title, owner_user_id, status, priority, due_date, minutes_estimate, description, linked_project_id, item_type, sort_order, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
                     (
-                        org_id,
-                        tpl["id"],
-                        assignee_user_id,
-                        "Assigned",
-                        due.isoformat(),
+                        agenda_id,
+                        parent_item_id,
+                        section,
+                        source["name"],
+                        source["owner_user_id"],
+                        agenda_status_from_project_status(str(source["status"] or "")),
+                        source["priority"] or "Medium",
+                        source["due_date"],
+                        10,
                         "",
+                        source["id"],
+                        "project",
+                        999,
+                        iso(),
                         iso(),
-                        None,
                     ),
                 )
                 conn.commit()
-            return redirect(scoped("/onboarding?msg=Assignment%20created")).wsgi(start_response)
+                return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Project%20linked%20to%20agenda")).wsgi(start_response)
+            return redirect(scoped(f"/agenda?agenda_id={agenda_id}&msg=Unsupported%20source%20type")).wsgi(start_response)
 
-        if req.path == "/onboarding/status" and req.method == "POST":
+        if req.path == "/agenda/item/update" and req.method == "POST":
             gate = require_role(ctx, "student")
             if gate:
                 return gate.wsgi(start_response)
             form = req.form
-            next_status = str(form.get("status", "Assigned"))
-            if next_status not in ONBOARDING_STATUSES:
-                next_status = "Assigned"
-            completed_at = iso() if next_status == "Done" else None
+            item_id = to_int(form.get("item_id"))
+            if item_id is None:
+                return redirect(scoped("/agenda?msg=Agenda%20item%20not%20found")).wsgi(start_response)
+            target = conn.execute(
+                """
+                SELECT i.id, i.agenda_id, i.linked_task_id, i.linked_project_id
+                FROM meeting_items i
+                JOIN meeting_agendas a ON a.id = i.agenda_id
+                WHERE i.id = ? AND a.organization_id = ?
+                """,
+                (item_id, org_id),
+            ).fetchone()
+            if not target:
+                return redirect(scoped("/agenda?msg=Agenda%20item%20not%20found")).wsgi(start_response)
+            status = str(form.get("status") or "Not Discussed").strip()
+            if status not in set(AGENDA_ITEM_STATUSES):
+                status = "Not Discussed"
+            minutes_estimate = max(1, to_int(form.get("minutes_estimate"), 10) or 10)
+            priority = str(form.get("priority") or "Medium").strip()
+            if priority not in {"Low", "Medium", "High", "Critical"}:
+                priority = "Medium"
+            owner_user_id = normalize_org_user_id(conn, org_id, form.get("owner_user_id"))
+            due_date = parse_date(form.get("due_date", ""))
+            section = str(form.get("section") or "General").strip() or "General"
+            title = str(form.get("title") or "Untitled Item").strip() or "Untitled Item"
             conn.execute(
-                "UPDATE onboarding_assignments SET status = ?, completed_at = ? WHERE id = ? AND organization_id = ?",
-                (next_status, completed_at, form.get("assignment_id"), org_id),
+                "UPDATE meeting_items SET title = ?, section = ?, owner_user_id = ?, status = ?, priority = ?, due_date = ?, minutes_estimate = ?, updated_at = ? WHERE id = ?",
+                (title, section, owner_user_id, status, priority, due_date, minutes_estimate, iso(), item_id),
             )
+            linked_task_id = to_int(str(target["linked_task_id"])) if target["linked_task_id"] is not None else None
+            linked_project_id = to_int(str(target["linked_project_id"])) if target["linked_project_id"] is not None else None
+            if linked_task_id is not None:
+                conn.execute(
+                    """
+                    UPDATE tasks
+                    SET title = ?, status = ?, priority = ?, due_date = ?, assignee_user_id = ?, updated_at = ?
+                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
+                    """,
+                    (
+                        title,
+                        task_status_from_agenda_status(status),
+                        priority,
+                        due_date,
+                        owner_user_id,
+                        iso(),
+                        linked_task_id,
+                        org_id,
+                    ),
+                )
+            if linked_project_id is not None:
+                conn.execute(
+                    """
+                    UPDATE projects
+                    SET name = ?, status = ?, priority = ?, due_date = ?, owner_user_id = ?, updated_at = ?
+                    WHERE id = ? AND organization_id = ? AND deleted_at IS NULL
+                    """,
+                    (
+                        title,
+                        project_status_from_agenda_status(status),
+                        priority,
+                        due_date,
+                        owner_user_id,
+                        iso(),
+                        linked_project_id,
+                        org_id,
+                    ),
+                )
             conn.commit()
-            return redirect(scoped("/onboarding?msg=Onboarding%20status%20updated")).wsgi(start_response)
+            return redirect(scoped(f"/agenda?agenda_id={target['agenda_id']}&msg=Agenda%20item%20updated")).wsgi(start_response)
 
-        if req.path == "/onboarding/complete" and req.method == "POST":
+        if req.path == "/agenda/item/convert" and req.method == "POST":
             gate = require_role(ctx, "student")
             if gate:
                 return gate.wsgi(start_response)
             form = req.form
-            conn.execute(
-                "UPDATE onboarding_assignments SET status = 'Done', completed_at = ? WHERE id = ? AND organization_id = ?",
-                (iso(), form.get("assignment_id"), org_id),
-            )
-            conn.commit()
-            return redirect(scoped("/onboarding?msg=Assignment%20completed")).wsgi(start_response)
-
-        if req.path == "/onboarding/template/new" and req.method == "POST":
-            gate = require_role(ctx, "manager")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            role_target = str(form.get("role_target", "Student Worker")).strip()
-            if not role_target:
-                role_target = "Student Worker"
-            conn.execute(
+            item_id = to_int(form.get("item_id"))
+            target_kind = str(form.get("target") or "").strip().lower()
+            agenda_id = to_int(form.get("agenda_id"))
+            if item_id is None or target_kind not in {"task", "project"}:
+                return redirect(scoped("/agenda?msg=Invalid%20conversion%20request")).wsgi(start_response)
+            row = conn.execute(
                 """
-                INSERT INTO onboarding_templates
-                (organization_id, name, role_target, task_title, details, doc_url, sequence, due_offset_days, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                SELECT i.*, a.organization_id
+                FROM meeting_items i
+                JOIN meeting_agendas a ON a.id = i.agenda_id
+                WHERE i.id = ? AND a.organization_id = ?
                 """,
-                (
-                    org_id,
-                    str(form.get("name", "Onboarding")).strip() or "Onboarding",
-                    role_target,
-                    str(form.get("task_title", "Checklist item")).strip() or "Checklist item",
-                    str(form.get("details", "")).strip(),
-                    str(form.get("doc_url", "")).strip(),
-                    max(1, to_int(form.get("sequence", "10")) or 10),
-                    max(0, to_int(form.get("due_offset_days", "7")) or 7),
-                    iso(),
-                ),
-            )
-            conn.commit()
-            return redirect(scoped("/onboarding?msg=Template%20saved")).wsgi(start_response)
-
-        if req.path == "/onboarding/template/update" and req.method == "POST":
-            gate = require_role(ctx, "manager")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            template_id = to_int(form.get("template_id"))
-            if template_id is None:
-                return redirect(scoped("/onboarding?msg=Template%20not%20found")).wsgi(start_response)
-            current = conn.execute(
-                "SELECT id FROM onboarding_templates WHERE id = ? AND organization_id = ?",
-                (template_id, org_id),
+                (item_id, org_id),
             ).fetchone()
-            if not current:
-                return redirect(scoped("/onboarding?msg=Template%20not%20found")).wsgi(start_response)
-            conn.execute(
-                """
-                UPDATE onboarding_templates
-                SET name = ?, role_target = ?, task_title = ?, details = ?, doc_url = ?, sequence = ?, due_offset_days = ?
-                WHERE id = ? AND organization_id = ?
-                """,
-                (
-                    str(form.get("name", "Onboarding")).strip() or "Onboarding",
-                    str(form.get("role_target", "Student Worker")).strip() or "Student Worker",
-                    str(form.get("task_title", "Checklist item")).strip() or "Checklist item",
-                    str(form.get("details", "")).strip(),
-                    str(form.get("doc_url", "")).strip(),
-                    max(1, to_int(form.get("sequence"), 1) or 1),
-                    max(0, to_int(form.get("due_offset_days"), 0) or 0),
-                    template_id,
+            if not row:
+                return redirect(scoped("/agenda?msg=Agenda%20item%20not%20found")).wsgi(start_response)
+            if target_kind == "task":
+                existing_link = to_int(str(row["linked_task_id"])) if row["linked_task_id"] is not None else None
+                if existing_link is not None:
+                    return redirect(scoped(f"/agenda?agenda_id={row['agenda_id']}&msg=Agenda%20item%20already%20linked%20to%20task")).wsgi(start_response)
+                project_id, space_id, relation_error = resolve_task_project_and_space(
+                    conn,
                     org_id,
-                ),
-            )
-            conn.commit()
-            return redirect(scoped("/onboarding?msg=Template%20updated")).wsgi(start_response)
-
-        if req.path == "/onboarding/template/delete" and req.method == "POST":
-            gate = require_role(ctx, "manager")
-            if gate:
-                return gate.wsgi(start_response)
-            template_id = to_int(req.form.get("template_id"))
-            if template_id is not None:
+                    user_id,
+                    form.get("project_id"),
+                    form.get("space_id"),
+                )
+                if relation_error:
+                    return redirect(scoped(f"/agenda?agenda_id={row['agenda_id']}&msg={quote(relation_error)}")).wsgi(start_response)
+                cursor = conn.execute(
+                    """
+                    INSERT INTO tasks
+                    (organization_id, project_id, title, description, status, priority, assignee_user_id, reporter_user_id, due_date, planned_week, energy, estimate_hours, meta_json, created_at, updated_at, team_id, space_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        org_id,
+                        project_id,
+                        row["title"],
+                        row["description"] or "",
+                        task_status_from_agenda_status(str(row["status"] or "Not Discussed")),
+                        row["priority"] or "Medium",
+                        row["owner_user_id"],
+                        user_id,
+                        row["due_date"],
+                        "",
+                        "Medium",
+                        None,
+                        "{}",
+                        iso(),
+                        iso(),
+                        to_int(form.get("team_id")),
+                        space_id,
+                    ),
+                )
+                new_task_id = int(cursor.lastrowid)
                 conn.execute(
-                    "DELETE FROM onboarding_templates WHERE id = ? AND organization_id = ?",
-                    (template_id, org_id),
+                    "UPDATE meeting_items SET linked_task_id = ?, item_type = 'task', updated_at = ? WHERE id = ?",
+                    (new_task_id, iso(), item_id),
                 )
                 conn.commit()
-            return redirect(scoped("/onboarding?msg=Template%20deleted")).wsgi(start_response)
-
-        if req.path == "/onboarding/assignment/update" and req.method == "POST":
-            gate = require_role(ctx, "staff")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            assignment_id = to_int(form.get("assignment_id"))
-            if assignment_id is None:
-                return redirect(scoped("/onboarding?msg=Assignment%20not%20found")).wsgi(start_response)
-            current = conn.execute(
-                "SELECT completed_at, assignee_user_id FROM onboarding_assignments WHERE id = ? AND organization_id = ?",
-                (assignment_id, org_id),
-            ).fetchone()
-            if not current:
-                return redirect(scoped("/onboarding?msg=Assignment%20not%20found")).wsgi(start_response)
-            status_value = str(form.get("status", "Assigned"))
-            if status_value not in ONBOARDING_STATUSES:
-                status_value = "Assigned"
-            completed_at = current["completed_at"]
-            if status_value == "Done" and not completed_at:
-                completed_at = iso()
-            if status_value != "Done":
-                completed_at = None
-            assignee_user_id = normalize_org_user_id(
-                conn,
-                org_id,
-                form.get("assignee_user_id"),
-                fallback=to_int(current["assignee_user_id"]),
-            )
-            conn.execute(
+                return redirect(scoped(f"/agenda?agenda_id={agenda_id or row['agenda_id']}&msg=Agenda%20item%20converted%20to%20task")).wsgi(start_response)
+            existing_link = to_int(str(row["linked_project_id"])) if row["linked_project_id"] is not None else None
+            if existing_link is not None:
+                return redirect(scoped(f"/agenda?agenda_id={row['agenda_id']}&msg=Agenda%20item%20already%20linked%20to%20project")).wsgi(start_response)
+            space_id = default_space_id_for_org(conn, org_id, preferred_space_id=to_int(form.get("space_id")))
+            cursor = conn.execute(
                 """
-                UPDATE onboarding_assignments
-                SET status = ?, assignee_user_id = ?, due_date = ?, notes = ?, completed_at = ?
-                WHERE id = ? AND organization_id = ?
+                INSERT INTO projects
+                (organization_id, name, description, lane, status, priority, owner_user_id, start_date, due_date, tags, meta_json, created_by, created_at, updated_at, team_id, space_id, progress_pct)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
-                    status_value,
-                    assignee_user_id,
-                    parse_date(form.get("due_date", "")),
-                    str(form.get("notes", "")).strip(),
-                    completed_at,
-                    assignment_id,
                     org_id,
+                    row["title"],
+                    row["description"] or "",
+                    "Core Operations",
+                    project_status_from_agenda_status(str(row["status"] or "Not Discussed")),
+                    row["priority"] or "Medium",
+                    row["owner_user_id"],
+                    dt.date.today().isoformat(),
+                    row["due_date"],
+                    "agenda",
+                    "{}",
+                    user_id,
+                    iso(),
+                    iso(),
+                    to_int(form.get("team_id")),
+                    space_id,
+                    0,
                 ),
             )
+            new_project_id = int(cursor.lastrowid)
+            conn.execute(
+                "UPDATE meeting_items SET linked_project_id = ?, item_type = 'project', updated_at = ? WHERE id = ?",
+                (new_project_id, iso(), item_id),
+            )
             conn.commit()
-            return redirect(scoped("/onboarding?msg=Assignment%20updated")).wsgi(start_response)
-
-        if req.path == "/spaces":
-            content = render_spaces_page(conn, org_id)
-            page = render_layout("Spaces", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
-
-        if req.path == "/intake":
-            content = render_intake_page(conn, org_id)
-            page = render_layout("Intake", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
+            return redirect(scoped(f"/agenda?agenda_id={agenda_id or row['agenda_id']}&msg=Agenda%20item%20converted%20to%20project")).wsgi(start_response)
 
-        if req.path == "/intake/new" and req.method == "POST":
-            gate = require_role(ctx, "staff")
+        if req.path == "/agenda/note/new" and req.method == "POST":
+            gate = require_role(ctx, "student")
             if gate:
                 return gate.wsgi(start_response)
             form = req.form
-            role = str(ctx.get("role") or "viewer")
-            urgency = int(form.get("urgency", "3") or 3)
-            impact = int(form.get("impact", "3") or 3)
-            effort = int(form.get("effort", "3") or 3)
-            score = intake_score(urgency, impact, effort)
-            lane = form.get("lane", LANES[0])
-            if lane not in LANES:
-                lane = LANES[0]
-            title = sanitize_title_for_role(
-                conn,
-                org_id,
-                role,
-                "intake",
-                form.get("title"),
-                None,
-                free_edit_min_role="manager",
-            )
+            linked_agenda_id = to_int(form.get("agenda_id"))
+            if linked_agenda_id is not None:
+                agenda = conn.execute(
+                    "SELECT id FROM meeting_agendas WHERE id = ? AND organization_id = ?",
+                    (linked_agenda_id, org_id),
+                ).fetchone()
+                if not agenda:
+                    return redirect(scoped("/agenda?msg=Agenda%20not%20found%20for%20note%20link")).wsgi(start_response)
             conn.execute(
                 """
-                INSERT INTO intake_requests
-                (organization_id, title, requestor_name, requestor_email, lane, urgency, impact, effort, score, status, owner_user_id, details, meta_json, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO meeting_note_sources
+                (organization_id, title, source_type, doc_url, body, linked_agenda_id, created_by, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     org_id,
-                    title,
-                    form.get("requestor_name", ""),
-                    form.get("requestor_email", ""),
-                    lane,
-                    urgency,
-                    impact,
-                    effort,
-                    score,
-                    "Triage",
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id")),
-                    form.get("details", ""),
-                    "{}",
+                    form.get("title", "Meeting Notes"),
+                    "google_doc" if form.get("doc_url") else "manual_note",
+                    form.get("doc_url", ""),
+                    form.get("body", ""),
+                    linked_agenda_id,
+                    user_id,
                     iso(),
                     iso(),
                 ),
             )
             conn.commit()
-            return redirect(scoped("/intake?msg=Intake%20request%20created")).wsgi(start_response)
-
-        if req.path == "/intake/convert" and req.method == "POST":
-            gate = require_role(ctx, "staff")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            intake_id = to_int(form.get("intake_id"))
-            if intake_id is None:
-                return redirect(scoped("/intake?msg=Intake%20item%20not%20found")).wsgi(start_response)
-            intake = conn.execute(
-                "SELECT * FROM intake_requests WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
-                (intake_id, org_id),
-            ).fetchone()
-            if not intake:
-                return redirect(scoped("/intake?msg=Intake%20item%20not%20found")).wsgi(start_response)
-            if str(intake["status"] or "") in {"Done", "Rejected"}:
-                return redirect(scoped("/intake?msg=Only%20open%20intake%20items%20can%20be%20converted")).wsgi(start_response)
-
-            convert_to = str(form.get("convert_to") or "task").strip().lower()
-            if convert_to not in {"task", "project"}:
-                convert_to = "task"
+            return redirect(scoped("/agenda?msg=Note%20source%20added")).wsgi(start_response)
 
-            owner_user_id = normalize_org_user_id(
+        if req.path == "/calendar":
+            view_mode = (req.query.get("view") or "week").strip().lower()
+            date_value = (req.query.get("date") or "").strip()
+            content = render_calendar_page(
                 conn,
                 org_id,
-                intake["owner_user_id"],
-                fallback=to_int(intake["owner_user_id"]),
+                user_id,
+                selected_space_id=selected_space_id,
+                view_mode=view_mode,
+                anchor_date_value=date_value,
             )
-            lane = str(intake["lane"] or LANES[0])
-            if lane not in LANES:
-                lane = LANES[0]
-            score = to_float(str(intake["score"] or 0), 0.0)
-            priority = "Critical" if score >= 12 else ("High" if score >= 8 else ("Medium" if score >= 4 else "Low"))
-            project_id: Optional[int] = None
-            space_id: Optional[int] = None
-            created_entity = ""
-            created_id: Optional[int] = None
+            page = render_layout("Calendar Analytics", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
 
-            if convert_to == "project":
-                space_id = default_space_id_for_org(conn, org_id, preferred_space_id=to_int(form.get("space_id")))
-                cursor = conn.execute(
-                    """
-                    INSERT INTO projects
-                    (organization_id, name, description, lane, status, priority, owner_user_id, start_date, due_date, tags, meta_json, created_by, created_at, updated_at, team_id, space_id, progress_pct)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        org_id,
-                        str(intake["title"] or "Intake Project"),
-                        str(intake["details"] or ""),
-                        lane,
-                        "Planned",
-                        priority,
-                        owner_user_id,
-                        dt.date.today().isoformat(),
-                        None,
-                        "from_intake",
-                        "{}",
-                        user_id,
-                        iso(),
-                        iso(),
-                        None,
-                        space_id,
-                        0,
-                    ),
-                )
-                created_id = int(cursor.lastrowid)
-                created_entity = "project"
+        if req.path == "/calendar/import" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return gate.wsgi(start_response)
+            view_mode = (req.form.get("view") or "week").strip().lower()
+            if view_mode not in {"week", "month"}:
+                view_mode = "week"
+            date_value = parse_date(req.form.get("date", "")) or dt.date.today().isoformat()
+            base_redirect = f"/calendar?view={quote(view_mode)}&date={quote(date_value)}"
+            file = req.files.get("file")
+            if file is None:
+                return redirect(scoped(f"{base_redirect}&msg=No%20file%20uploaded")).wsgi(start_response)
+            raw = file.file.read().decode("utf-8", errors="ignore")
+            filename = (file.filename or "").lower()
+            if filename.endswith(".ics"):
+                parsed = parse_ics(raw)
             else:
-                project_id, space_id, relation_error = resolve_task_project_and_space(
-                    conn,
-                    org_id,
-                    user_id,
-                    form.get("project_id"),
-                    to_int(form.get("space_id"), selected_space_id),
-                )
-                if relation_error == "invalid_project":
-                    return redirect(scoped("/intake?msg=Select%20a%20valid%20target%20project")).wsgi(start_response)
-                if relation_error == "missing_space":
-                    return redirect(scoped("/intake?msg=Create%20a%20makerspace%20before%20converting")).wsgi(start_response)
-                cursor = conn.execute(
+                parsed = parse_google_csv(raw)
+
+            for event in parsed:
+                conn.execute(
                     """
-                    INSERT INTO tasks
-                    (organization_id, project_id, title, description, status, priority, assignee_user_id, reporter_user_id, due_date, planned_week, energy, estimate_hours, meta_json, created_at, updated_at, team_id, space_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO calendar_events
+                    (organization_id, user_id, source, title, start_at, end_at, attendees_count, location, description, category, energy_score, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
                     (
                         org_id,
-                        project_id,
-                        str(intake["title"] or "Intake Task"),
-                        "\n\n".join(
-                            [
-                                str(intake["details"] or "").strip(),
-                                f"Requestor: {intake['requestor_name'] or '-'} ({intake['requestor_email'] or '-'})",
-                            ]
-                        ).strip(),
-                        "Todo",
-                        priority,
-                        owner_user_id,
                         user_id,
+                        event["source"],
+                        event["title"],
+                        event["start_at"],
+                        event["end_at"],
+                        event["attendees_count"],
+                        event["location"],
+                        event["description"],
+                        event["category"],
                         None,
-                        dt.date.today().isocalendar()[1],
-                        "Medium",
-                        1.0,
-                        json.dumps({"source": "intake", "intake_id": intake_id}),
-                        iso(),
                         iso(),
-                        None,
-                        space_id,
                     ),
                 )
-                created_id = int(cursor.lastrowid)
-                created_entity = "task"
+            conn.commit()
+            return redirect(scoped(f"{base_redirect}&msg=Imported%20{len(parsed)}%20events")).wsgi(start_response)
 
-            intake_meta = parse_meta_json(intake["meta_json"])
-            intake_meta["converted_to"] = {"entity": created_entity, "id": created_id, "at": iso()}
-            conn.execute(
-                "UPDATE intake_requests SET status = 'Done', meta_json = ?, updated_at = ? WHERE id = ? AND organization_id = ?",
-                (json.dumps(intake_meta), iso(), intake_id, org_id),
+        if req.path == "/calendar/gcal/pull" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return gate.wsgi(start_response)
+            view_mode = (req.form.get("view") or "week").strip().lower()
+            if view_mode not in {"week", "month"}:
+                view_mode = "week"
+            date_value = parse_date(req.form.get("date", "")) or dt.date.today().isoformat()
+            base_redirect = f"/calendar?view={quote(view_mode)}&date={quote(date_value)}"
+            calendar_id = (req.form.get("calendar_id") or GCAL_DEFAULT_CALENDAR_ID or "primary").strip()
+            lookback_days = clamp_int(req.form.get("lookback_days"), 30, 1, 365)
+            lookahead_days = clamp_int(req.form.get("lookahead_days"), 45, 1, 365)
+            push_window_days = clamp_int(req.form.get("push_window_days"), 30, 1, 365)
+            inserted, updated, error = pull_google_calendar_events(
+                conn,
+                org_id=org_id,
+                user_id=user_id,
+                calendar_id=calendar_id,
+                lookback_days=lookback_days,
+                lookahead_days=lookahead_days,
             )
-            log_action(
+            save_calendar_sync_settings(
                 conn,
-                org_id,
-                user_id,
-                "intake_converted",
-                "intake_requests",
-                str(intake_id),
-                f"{created_entity}:{created_id}",
+                org_id=org_id,
+                user_id=user_id,
+                calendar_id=calendar_id,
+                lookback_days=lookback_days,
+                lookahead_days=lookahead_days,
+                push_window_days=push_window_days,
+                touch_pull=(error == ""),
             )
             conn.commit()
-            return redirect(scoped(f"/intake?msg=Intake%20converted%20to%20{quote(created_entity)}%20#{created_id}")).wsgi(start_response)
+            if error:
+                return redirect(scoped(f"{base_redirect}&msg={quote('Google pull failed: ' + error[:220])}")).wsgi(start_response)
+            msg = f"Google pull complete: {inserted} imported, {updated} updated"
+            return redirect(scoped(f"{base_redirect}&msg={quote(msg)}")).wsgi(start_response)
 
-        if req.path == "/api/intake/save" and req.method == "POST":
-            gate = require_role(ctx, "staff")
+        if req.path == "/calendar/gcal/push" and req.method == "POST":
+            gate = require_role(ctx, "student")
             if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            form = req.form
-            role = str(ctx.get("role") or "viewer")
-            intake_id = to_int(form.get("intake_id"))
-            current = conn.execute(
-                "SELECT * FROM intake_requests WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
-                (intake_id, org_id),
-            ).fetchone()
-            if not current:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            before_snapshot = snapshot_row(current)
-
-            status = form.get("status", current["status"])
-            if status not in INTAKE_STATUSES:
-                status = current["status"]
-            lane = form.get("lane", current["lane"])
-            if lane not in LANES:
-                lane = current["lane"]
-            urgency = to_int(form.get("urgency"), int(current["urgency"] or 3)) or 3
-            impact = to_int(form.get("impact"), int(current["impact"] or 3)) or 3
-            effort = to_int(form.get("effort"), int(current["effort"] or 3)) or 3
-            urgency = max(1, min(5, urgency))
-            impact = max(1, min(5, impact))
-            effort = max(1, min(5, effort))
-            score = intake_score(urgency, impact, effort)
-            title = sanitize_title_for_role(
+                return gate.wsgi(start_response)
+            view_mode = (req.form.get("view") or "week").strip().lower()
+            if view_mode not in {"week", "month"}:
+                view_mode = "week"
+            date_value = parse_date(req.form.get("date", "")) or dt.date.today().isoformat()
+            base_redirect = f"/calendar?view={quote(view_mode)}&date={quote(date_value)}"
+            calendar_id = (req.form.get("calendar_id") or GCAL_DEFAULT_CALENDAR_ID or "primary").strip()
+            lookback_days = clamp_int(req.form.get("lookback_days"), 30, 1, 365)
+            lookahead_days = clamp_int(req.form.get("lookahead_days"), 45, 1, 365)
+            push_window_days = clamp_int(req.form.get("push_window_days"), 30, 1, 365)
+            created, updated, skipped, error = push_tasks_to_google_calendar(
                 conn,
-                org_id,
-                role,
-                "intake",
-                form.get("title", current["title"]),
-                current["title"],
-                free_edit_min_role="manager",
-            )
-
-            conn.execute(
-                """
-                UPDATE intake_requests
-                SET title = ?, lane = ?, urgency = ?, impact = ?, effort = ?, score = ?, status = ?, owner_user_id = ?, details = ?, requestor_name = ?, requestor_email = ?, updated_at = ?
-                WHERE id = ? AND organization_id = ?
-                """,
-                (
-                    title,
-                    lane,
-                    urgency,
-                    impact,
-                    effort,
-                    score,
-                    status,
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
-                    form.get("details", current["details"] or ""),
-                    form.get("requestor_name", current["requestor_name"] or ""),
-                    form.get("requestor_email", current["requestor_email"] or ""),
-                    iso(),
-                    intake_id,
-                    org_id,
-                ),
+                org_id=org_id,
+                user_id=user_id,
+                calendar_id=calendar_id,
+                push_window_days=push_window_days,
+                selected_space_id=selected_space_id,
             )
-            after_snapshot = snapshot_row(
-                conn.execute(
-                    "SELECT * FROM intake_requests WHERE id = ? AND organization_id = ?",
-                    (intake_id, org_id),
-                ).fetchone()
+            save_calendar_sync_settings(
+                conn,
+                org_id=org_id,
+                user_id=user_id,
+                calendar_id=calendar_id,
+                lookback_days=lookback_days,
+                lookahead_days=lookahead_days,
+                push_window_days=push_window_days,
+                touch_push=(error == ""),
             )
-            log_change_with_rollback(
+            conn.commit()
+            if error and created == 0 and updated == 0:
+                return redirect(scoped(f"{base_redirect}&msg={quote('Google push failed: ' + error[:220])}")).wsgi(start_response)
+            msg = f"Google push complete: {created} created, {updated} updated, {skipped} skipped"
+            if error:
+                msg += f" ({error[:120]})"
+            return redirect(scoped(f"{base_redirect}&msg={quote(msg)}")).wsgi(start_response)
+
+        if req.path == "/reports":
+            report_id = req.query.get("report_id")
+            content = render_reports_page(
                 conn,
                 org_id,
                 user_id,
-                "intake_saved",
-                "intake_requests",
-                intake_id or 0,
-                before_snapshot,
-                after_snapshot,
-                f"Intake updated: {title}",
+                report_id,
+                selected_space_id=selected_space_id,
+                role=str(ctx.get("role") or "viewer"),
             )
-            conn.commit()
-            return json_response({"ok": True, "status": status, "score": score}).wsgi(start_response)
-
-        if req.path == "/assets":
-            content = render_assets_page(conn, org_id, selected_space_name=active_space["name"] if active_space else "")
-            page = render_layout("Assets", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
-
-        if req.path == "/consumables":
-            content = render_consumables_page(conn, org_id, selected_space_id=selected_space_id)
-            page = render_layout("Consumables", fill_csrf(content, csrf_token), req, ctx, notice)
+            page = render_layout("Generate Reports", fill_csrf(content, csrf_token), req, ctx, notice)
             return Response(page).wsgi(start_response)
 
-        if req.path == "/assets/new" and req.method == "POST":
-            gate = require_role(ctx, "staff")
+        if req.path == "/reports/new" and req.method == "POST":
+            gate = require_role(ctx, "student")
             if gate:
                 return gate.wsgi(start_response)
             form = req.form
-            role = str(ctx.get("role") or "viewer")
-            status = form.get("status", "Operational")
-            if status not in ASSET_STATUSES:
-                status = "Operational"
-            name = sanitize_title_for_role(
-                conn,
-                org_id,
-                role,
-                "assets",
-                form.get("name"),
-                None,
-                free_edit_min_role="manager",
-            )
-            conn.execute(
-                """
-                INSERT INTO equipment_assets
-                (organization_id, name, space, asset_type, last_maintenance, next_maintenance, cert_required, cert_name, status, owner_user_id, notes, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            template_key = (form.get("template_key") or "").strip()
+            template = report_template_by_key(template_key) if template_key else None
+
+            name = (form.get("name") or "").strip()
+            if not name and template:
+                name = str(template.get("name") or "Untitled Report")
+            if not name:
+                name = "Untitled Report"
+            name = name[:120]
+
+            description = (form.get("description") or "").strip()[:800]
+            if not description and template:
+                description = str(template.get("description") or "")
+
+            raw_config = (form.get("config_json") or "").strip()
+            config: Dict[str, object]
+            if raw_config:
+                try:
+                    parsed_config = json.loads(raw_config)
+                except json.JSONDecodeError:
+                    parsed_config = {}
+                config = report_config_from_payload(parsed_config)
+            elif template:
+                config = report_config_from_payload({"widgets": template.get("widgets", [])})
+            else:
+                config = {"widgets": []}
+
+            if not sanitize_report_widgets(config.get("widgets")):
+                fallback = report_template_by_key("impact_report") or REPORT_TEMPLATE_LIBRARY[0]
+                config = report_config_from_payload({"widgets": fallback.get("widgets", [])})
+
+            can_share = role_allows(str(ctx.get("role") or "viewer"), "manager")
+            is_shared = 1 if can_share and form.get("is_shared") == "1" else 0
+            cursor = conn.execute(
+                """
+                INSERT INTO report_templates
+                (organization_id, user_id, name, description, config_json, is_shared, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     org_id,
+                    user_id,
                     name,
-                    form.get("space", "Unknown Space"),
-                    form.get("asset_type", ""),
-                    parse_date(form.get("last_maintenance", "")),
-                    parse_date(form.get("next_maintenance", "")),
-                    1 if form.get("cert_required") == "1" else 0,
-                    form.get("cert_name", ""),
-                    status,
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id")),
-                    form.get("notes", ""),
+                    description,
+                    report_config_json(config),
+                    is_shared,
                     iso(),
                     iso(),
                 ),
             )
+            new_id = int(cursor.lastrowid)
+            log_action(conn, org_id, user_id, "report_template_created", "report_templates", str(new_id), name)
             conn.commit()
-            return redirect(scoped("/assets?msg=Asset%20added")).wsgi(start_response)
+            next_path = str(form.get("next") or "").strip()
+            if next_path.startswith("/dashboard"):
+                return redirect(scoped("/dashboard?msg=Report%20template%20saved")).wsgi(start_response)
+            return redirect(scoped(f"/reports?report_id={new_id}&msg=Report%20template%20saved")).wsgi(start_response)
 
-        if req.path == "/consumables/new" and req.method == "POST":
-            gate = require_role(ctx, "staff")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            role = str(ctx.get("role") or "viewer")
-            status = form.get("status", "In Stock")
-            if status not in CONSUMABLE_STATUSES:
-                status = "In Stock"
-            space_id = to_int(form.get("space_id"))
-            if not space_id:
-                return redirect(scoped("/consumables?msg=Space%20location%20is%20required")).wsgi(start_response)
-            valid_space = conn.execute(
-                "SELECT id FROM spaces WHERE id = ? AND organization_id = ?",
-                (space_id, org_id),
+        if req.path == "/reports/visibility" and req.method == "POST":
+            report_id = to_int(req.form.get("report_id"))
+            target = conn.execute(
+                "SELECT id, user_id, is_shared FROM report_templates WHERE id = ? AND organization_id = ?",
+                (report_id, org_id),
             ).fetchone()
-            if not valid_space:
-                return redirect(scoped("/consumables?msg=Select%20a%20valid%20space%20location")).wsgi(start_response)
-            name = sanitize_title_for_role(
-                conn,
-                org_id,
-                role,
-                "consumables",
-                form.get("name"),
-                None,
-                free_edit_min_role="manager",
+            if not target:
+                return redirect(scoped("/reports?msg=Report%20template%20not%20found")).wsgi(start_response)
+            if not (int(target["user_id"]) == int(user_id) or role_allows(str(ctx.get("role") or "viewer"), "manager")):
+                return Response("<h1>403 Forbidden</h1>", status="403 Forbidden").wsgi(start_response)
+            new_shared = 1 if req.form.get("is_shared") == "1" else 0
+            conn.execute(
+                "UPDATE report_templates SET is_shared = ?, updated_at = ? WHERE id = ? AND organization_id = ?",
+                (new_shared, iso(), report_id, org_id),
             )
+            conn.commit()
+            msg = "Report template shared" if new_shared else "Report template is now private"
+            return redirect(scoped(f"/reports?report_id={report_id}&msg={quote(msg)}")).wsgi(start_response)
+
+        if req.path == "/reports/delete" and req.method == "POST":
+            report_id = to_int(req.form.get("report_id"))
+            target = conn.execute(
+                "SELECT id, user_id, name FROM report_templates WHERE id = ? AND organization_id = ?",
+                (report_id, org_id),
+            ).fetchone()
+            if not target:
+                return redirect(scoped("/reports?msg=Report%20template%20not%20found")).wsgi(start_response)
+            if not (int(target["user_id"]) == int(user_id) or role_allows(str(ctx.get("role") or "viewer"), "manager")):
+                return Response("<h1>403 Forbidden</h1>", status="403 Forbidden").wsgi(start_response)
+            conn.execute("DELETE FROM report_templates WHERE id = ? AND organization_id = ?", (report_id, org_id))
+            log_action(conn, org_id, user_id, "report_template_deleted", "report_templates", str(report_id), str(target["name"]))
+            conn.commit()
+            return redirect(scoped("/reports?msg=Report%20template%20deleted")).wsgi(start_response)
+
+        if req.path == "/views":
+            content = render_views_page(conn, org_id, user_id, req.query.get("view_id"), selected_space_id=selected_space_id)
+            page = render_layout("Custom Views", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
+
+        if req.path == "/views/new" and req.method == "POST":
+            form = req.form
+            template_key = (form.get("template_key") or "").strip()
+            template = view_template_by_key(template_key) if template_key else None
+            if template and (not FEATURE_INTAKE_ENABLED) and str(template.get("entity") or "") == "intake":
+                template = None
+            entity = (form.get("entity") or str(template.get("entity")) if template else "tasks").strip().lower()
+            if (not FEATURE_INTAKE_ENABLED) and entity == "intake":
+                entity = "tasks"
+            allowed_entities = VIEW_ENTITY_LABELS if FEATURE_INTAKE_ENABLED else {k: v for k, v in VIEW_ENTITY_LABELS.items() if k != "intake"}
+            if entity not in allowed_entities:
+                entity = "tasks"
+
+            name = (form.get("name") or "").strip()
+            if not name and template:
+                name = str(template.get("name") or "Untitled View")
+            if not name:
+                name = "Untitled View"
+
+            filters_json = (form.get("filters_json") or "").strip()
+            columns_json = (form.get("columns_json") or "").strip()
+            if not filters_json and template:
+                filters_json = json.dumps(template.get("filters", {}))
+            if not columns_json and template:
+                columns_json = json.dumps(template.get("columns", []))
+            if not filters_json:
+                fallback_filters: Dict[str, object] = {}
+                if form.get("scope"):
+                    fallback_filters["scope"] = form.get("scope")
+                if form.get("lane"):
+                    fallback_filters["lane"] = form.get("lane")
+                if form.get("team_id"):
+                    fallback_filters["team_id"] = to_int(form.get("team_id"))
+                if form.get("space_id"):
+                    fallback_filters["space_id"] = to_int(form.get("space_id"))
+                if form.get("search"):
+                    fallback_filters["search"] = form.get("search", "").strip()
+                if form.get("due_within_days"):
+                    fallback_filters["due_within_days"] = to_int(form.get("due_within_days"))
+                if form.get("followup_within_days"):
+                    fallback_filters["followup_within_days"] = to_int(form.get("followup_within_days"))
+                if form.get("maintenance_within_days"):
+                    fallback_filters["maintenance_within_days"] = to_int(form.get("maintenance_within_days"))
+                if form.get("min_score"):
+                    fallback_filters["min_score"] = to_float(form.get("min_score"))
+                if form.get("owner_user_id"):
+                    if entity in {"tasks", "onboarding"}:
+                        fallback_filters["assignee_user_id"] = to_int(form.get("owner_user_id"))
+                    else:
+                        fallback_filters["owner_user_id"] = to_int(form.get("owner_user_id"))
+                if form.get("only_unassigned") == "1":
+                    fallback_filters["only_unassigned"] = True
+                if form.get("cert_required") == "1":
+                    fallback_filters["cert_required"] = True
+                if form.get("hide_completed") == "1":
+                    if entity == "tasks":
+                        fallback_filters["status_exclude"] = ["Done", "Cancelled"]
+                    elif entity == "projects":
+                        fallback_filters["status_exclude"] = ["Complete"]
+                    elif entity == "partnerships":
+                        fallback_filters["status_exclude"] = ["Closed"]
+                    elif entity == "onboarding":
+                        fallback_filters["status_exclude"] = ["Done"]
+                filters_json = json.dumps(fallback_filters)
+            if not columns_json:
+                columns_json = json.dumps(view_default_columns(entity))
+
+            try:
+                parsed_filters = json.loads(filters_json)
+                parsed_columns = json.loads(columns_json)
+            except json.JSONDecodeError:
+                return redirect(scoped("/views?msg=Filters%20and%20columns%20must%20be%20valid%20JSON")).wsgi(start_response)
+            if not isinstance(parsed_filters, dict):
+                parsed_filters = {}
+            if not isinstance(parsed_columns, list):
+                parsed_columns = []
+            allowed_columns = {key for key, _label in VIEW_COLUMN_OPTIONS.get(entity, [])}
+            cleaned_columns = [str(c) for c in parsed_columns if str(c) in allowed_columns]
+            if not cleaned_columns:
+                cleaned_columns = view_default_columns(entity)
+
             conn.execute(
                 """
-                INSERT INTO consumables
-                (organization_id, space_id, name, category, quantity_on_hand, unit, reorder_point, status, owner_user_id, notes, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO custom_views
+                (organization_id, user_id, name, entity, filters_json, columns_json, is_shared, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     org_id,
-                    space_id,
+                    user_id,
                     name,
-                    form.get("category", ""),
-                    to_float(form.get("quantity_on_hand"), 0.0),
-                    form.get("unit", ""),
-                    to_float(form.get("reorder_point"), 0.0),
-                    status,
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id")),
-                    form.get("notes", ""),
-                    iso(),
+                    entity,
+                    json.dumps(parsed_filters),
+                    json.dumps(cleaned_columns),
+                    1 if form.get("is_shared") == "1" else 0,
                     iso(),
                 ),
             )
             conn.commit()
-            return redirect(scoped("/consumables?msg=Consumable%20added")).wsgi(start_response)
+            return redirect(scoped("/views?msg=View%20saved")).wsgi(start_response)
 
-        if req.path == "/api/assets/save" and req.method == "POST":
+        if req.path == "/onboarding":
+            content = render_onboarding_page(conn, org_id)
+            page = render_layout("Onboarding", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
+
+        if req.path == "/onboarding/assign" and req.method == "POST":
             gate = require_role(ctx, "staff")
             if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+                return gate.wsgi(start_response)
             form = req.form
-            role = str(ctx.get("role") or "viewer")
-            asset_id = to_int(form.get("asset_id"))
-            current = conn.execute(
-                "SELECT * FROM equipment_assets WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
-                (asset_id, org_id),
+            tpl = conn.execute(
+                "SELECT * FROM onboarding_templates WHERE id = ? AND organization_id = ?",
+                (form.get("template_id"), org_id),
             ).fetchone()
-            if not current:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            before_snapshot = snapshot_row(current)
-            status = form.get("status", current["status"])
-            if status not in ASSET_STATUSES:
-                status = current["status"]
-            name = sanitize_title_for_role(
-                conn,
-                org_id,
-                role,
-                "assets",
-                form.get("name", current["name"]),
-                current["name"],
-                free_edit_min_role="manager",
+            if tpl:
+                assignee_user_id = normalize_org_user_id(conn, org_id, form.get("assignee_user_id"))
+                if assignee_user_id is None:
+                    return redirect(scoped("/onboarding?msg=Assignee%20must%20be%20an%20active%20workspace%20member")).wsgi(start_response)
+                due = dt.date.today() + dt.timedelta(days=int(tpl["due_offset_days"]))
+                conn.execute(
+                    """
+                    INSERT INTO onboarding_assignments
+                    (organization_id, template_id, assignee_user_id, status, due_date, notes, created_at, completed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        org_id,
+                        tpl["id"],
+                        assignee_user_id,
+                        "Assigned",
+                        due.isoformat(),
+                        "",
+                        iso(),
+                        None,
+                    ),
+                )
+                conn.commit()
+            return redirect(scoped("/onboarding?msg=Assignment%20created")).wsgi(start_response)
+
+        if req.path == "/onboarding/status" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return gate.wsgi(start_response)
+            form = req.form
+            next_status = str(form.get("status", "Assigned"))
+            if next_status not in ONBOARDING_STATUSES:
+                next_status = "Assigned"
+            completed_at = iso() if next_status == "Done" else None
+            conn.execute(
+                "UPDATE onboarding_assignments SET status = ?, completed_at = ? WHERE id = ? AND organization_id = ?",
+                (next_status, completed_at, form.get("assignment_id"), org_id),
+            )
+            conn.commit()
+            return redirect(scoped("/onboarding?msg=Onboarding%20status%20updated")).wsgi(start_response)
+
+        if req.path == "/onboarding/complete" and req.method == "POST":
+            gate = require_role(ctx, "student")
+            if gate:
+                return gate.wsgi(start_response)
+            form = req.form
+            conn.execute(
+                "UPDATE onboarding_assignments SET status = 'Done', completed_at = ? WHERE id = ? AND organization_id = ?",
+                (iso(), form.get("assignment_id"), org_id),
             )
+            conn.commit()
+            return redirect(scoped("/onboarding?msg=Assignment%20completed")).wsgi(start_response)
 
+        if req.path == "/onboarding/template/new" and req.method == "POST":
+            gate = require_role(ctx, "manager")
+            if gate:
+                return gate.wsgi(start_response)
+            form = req.form
+            role_target = str(form.get("role_target", "Student Worker")).strip()
+            if not role_target:
+                role_target = "Student Worker"
             conn.execute(
                 """
-                UPDATE equipment_assets
-                SET name = ?, space = ?, asset_type = ?, status = ?, last_maintenance = ?, next_maintenance = ?, cert_required = ?, cert_name = ?, owner_user_id = ?, notes = ?, updated_at = ?
-                WHERE id = ? AND organization_id = ?
+                INSERT INTO onboarding_templates
+                (organization_id, name, role_target, task_title, details, doc_url, sequence, due_offset_days, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
-                    name,
-                    form.get("space", current["space"]),
-                    form.get("asset_type", current["asset_type"] or ""),
-                    status,
-                    parse_date(form.get("last_maintenance", current["last_maintenance"] or "")),
-                    parse_date(form.get("next_maintenance", current["next_maintenance"] or "")),
-                    1 if form.get("cert_required", str(current["cert_required"])) in {"1", "true", "True", "on"} else 0,
-                    form.get("cert_name", current["cert_name"] or ""),
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
-                    form.get("notes", current["notes"] or ""),
-                    iso(),
-                    asset_id,
                     org_id,
+                    str(form.get("name", "Onboarding")).strip() or "Onboarding",
+                    role_target,
+                    str(form.get("task_title", "Checklist item")).strip() or "Checklist item",
+                    str(form.get("details", "")).strip(),
+                    str(form.get("doc_url", "")).strip(),
+                    max(1, to_int(form.get("sequence", "10")) or 10),
+                    max(0, to_int(form.get("due_offset_days", "7")) or 7),
+                    iso(),
                 ),
             )
-            after_snapshot = snapshot_row(
-                conn.execute(
-                    "SELECT * FROM equipment_assets WHERE id = ? AND organization_id = ?",
-                    (asset_id, org_id),
-                ).fetchone()
-            )
-            log_change_with_rollback(
-                conn,
-                org_id,
-                user_id,
-                "asset_saved",
-                "equipment_assets",
-                asset_id or 0,
-                before_snapshot,
-                after_snapshot,
-                f"Asset updated: {name}",
-            )
             conn.commit()
-            return json_response({"ok": True, "status": status}).wsgi(start_response)
+            return redirect(scoped("/onboarding?msg=Template%20saved")).wsgi(start_response)
 
-        if req.path == "/api/consumables/save" and req.method == "POST":
-            gate = require_role(ctx, "staff")
+        if req.path == "/onboarding/template/update" and req.method == "POST":
+            gate = require_role(ctx, "manager")
             if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+                return gate.wsgi(start_response)
             form = req.form
-            role = str(ctx.get("role") or "viewer")
-            consumable_id = to_int(form.get("consumable_id"))
+            template_id = to_int(form.get("template_id"))
+            if template_id is None:
+                return redirect(scoped("/onboarding?msg=Template%20not%20found")).wsgi(start_response)
             current = conn.execute(
-                "SELECT * FROM consumables WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
-                (consumable_id, org_id),
+                "SELECT id FROM onboarding_templates WHERE id = ? AND organization_id = ?",
+                (template_id, org_id),
             ).fetchone()
             if not current:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            before_snapshot = snapshot_row(current)
-
-            status = form.get("status", current["status"])
-            if status not in CONSUMABLE_STATUSES:
-                status = current["status"]
-            space_id = to_int(form.get("space_id"), current["space_id"])
-            if not space_id:
-                return json_response({"ok": False, "error": "space_required"}, status="400 Bad Request").wsgi(start_response)
-            valid_space = conn.execute(
-                "SELECT id FROM spaces WHERE id = ? AND organization_id = ?",
-                (space_id, org_id),
-            ).fetchone()
-            if not valid_space:
-                return json_response({"ok": False, "error": "invalid_space"}, status="400 Bad Request").wsgi(start_response)
-            name = sanitize_title_for_role(
-                conn,
-                org_id,
-                role,
-                "consumables",
-                form.get("name", current["name"]),
-                current["name"],
-                free_edit_min_role="manager",
-            )
+                return redirect(scoped("/onboarding?msg=Template%20not%20found")).wsgi(start_response)
             conn.execute(
                 """
-                UPDATE consumables
-                SET name = ?, category = ?, space_id = ?, quantity_on_hand = ?, unit = ?, reorder_point = ?, status = ?, owner_user_id = ?, notes = ?, updated_at = ?
+                UPDATE onboarding_templates
+                SET name = ?, role_target = ?, task_title = ?, details = ?, doc_url = ?, sequence = ?, due_offset_days = ?
                 WHERE id = ? AND organization_id = ?
                 """,
                 (
-                    name,
-                    form.get("category", current["category"] or ""),
-                    space_id,
-                    to_float(form.get("quantity_on_hand"), float(current["quantity_on_hand"] or 0.0)),
-                    form.get("unit", current["unit"] or ""),
-                    to_float(form.get("reorder_point"), float(current["reorder_point"] or 0.0)),
-                    status,
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
-                    form.get("notes", current["notes"] or ""),
-                    iso(),
-                    consumable_id,
+                    str(form.get("name", "Onboarding")).strip() or "Onboarding",
+                    str(form.get("role_target", "Student Worker")).strip() or "Student Worker",
+                    str(form.get("task_title", "Checklist item")).strip() or "Checklist item",
+                    str(form.get("details", "")).strip(),
+                    str(form.get("doc_url", "")).strip(),
+                    max(1, to_int(form.get("sequence"), 1) or 1),
+                    max(0, to_int(form.get("due_offset_days"), 0) or 0),
+                    template_id,
                     org_id,
                 ),
             )
-            after_snapshot = snapshot_row(
-                conn.execute(
-                    "SELECT * FROM consumables WHERE id = ? AND organization_id = ?",
-                    (consumable_id, org_id),
-                ).fetchone()
-            )
-            log_change_with_rollback(
-                conn,
-                org_id,
-                user_id,
-                "consumable_saved",
-                "consumables",
-                consumable_id or 0,
-                before_snapshot,
-                after_snapshot,
-                f"Consumable updated: {name}",
-            )
             conn.commit()
-            return json_response({"ok": True, "status": status}).wsgi(start_response)
+            return redirect(scoped("/onboarding?msg=Template%20updated")).wsgi(start_response)
 
-        if req.path == "/partnerships":
-            content = render_partnership_page(conn, org_id)
-            page = render_layout("Partnerships", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
+        if req.path == "/onboarding/template/delete" and req.method == "POST":
+            gate = require_role(ctx, "manager")
+            if gate:
+                return gate.wsgi(start_response)
+            template_id = to_int(req.form.get("template_id"))
+            if template_id is not None:
+                conn.execute(
+                    "DELETE FROM onboarding_templates WHERE id = ? AND organization_id = ?",
+                    (template_id, org_id),
+                )
+                conn.commit()
+            return redirect(scoped("/onboarding?msg=Template%20deleted")).wsgi(start_response)
 
-        if req.path == "/partnerships/new" and req.method == "POST":
+        if req.path == "/onboarding/assignment/update" and req.method == "POST":
             gate = require_role(ctx, "staff")
             if gate:
                 return gate.wsgi(start_response)
             form = req.form
-            role = str(ctx.get("role") or "viewer")
-            stage = form.get("stage", "Discovery")
-            if stage not in PARTNERSHIP_STAGES:
-                stage = "Discovery"
-            health = form.get("health", "Medium")
-            if health not in {"Strong", "Medium", "At Risk"}:
-                health = "Medium"
-            partner_name = sanitize_title_for_role(
+            assignment_id = to_int(form.get("assignment_id"))
+            if assignment_id is None:
+                return redirect(scoped("/onboarding?msg=Assignment%20not%20found")).wsgi(start_response)
+            current = conn.execute(
+                "SELECT completed_at, assignee_user_id FROM onboarding_assignments WHERE id = ? AND organization_id = ?",
+                (assignment_id, org_id),
+            ).fetchone()
+            if not current:
+                return redirect(scoped("/onboarding?msg=Assignment%20not%20found")).wsgi(start_response)
+            status_value = str(form.get("status", "Assigned"))
+            if status_value not in ONBOARDING_STATUSES:
+                status_value = "Assigned"
+            completed_at = current["completed_at"]
+            if status_value == "Done" and not completed_at:
+                completed_at = iso()
+            if status_value != "Done":
+                completed_at = None
+            assignee_user_id = normalize_org_user_id(
                 conn,
                 org_id,
-                role,
-                "partnerships",
-                form.get("partner_name"),
-                None,
-                free_edit_min_role="manager",
+                form.get("assignee_user_id"),
+                fallback=to_int(current["assignee_user_id"]),
             )
             conn.execute(
                 """
-                INSERT INTO partnerships
-                (organization_id, partner_name, school, stage, last_contact, next_followup, owner_user_id, health, notes, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                UPDATE onboarding_assignments
+                SET status = ?, assignee_user_id = ?, due_date = ?, notes = ?, completed_at = ?
+                WHERE id = ? AND organization_id = ?
                 """,
                 (
+                    status_value,
+                    assignee_user_id,
+                    parse_date(form.get("due_date", "")),
+                    str(form.get("notes", "")).strip(),
+                    completed_at,
+                    assignment_id,
                     org_id,
-                    partner_name,
-                    form.get("school", ""),
-                    stage,
-                    parse_date(form.get("last_contact", "")),
-                    parse_date(form.get("next_followup", "")),
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id")),
-                    health,
-                    form.get("notes", ""),
-                    iso(),
-                    iso(),
                 ),
             )
             conn.commit()
-            return redirect(scoped("/partnerships?msg=Partnership%20added")).wsgi(start_response)
+            return redirect(scoped("/onboarding?msg=Assignment%20updated")).wsgi(start_response)
 
-        if req.path == "/data-hub":
-            gate = require_role(ctx, "manager")
-            if gate:
-                return gate.wsgi(start_response)
-            content = render_data_hub_page(conn, org_id)
-            page = render_layout("Data Hub", fill_csrf(content, csrf_token), req, ctx, notice)
+        if req.path == "/spaces":
+            content = render_spaces_page(conn, org_id)
+            page = render_layout("Spaces", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
+
+        if req.path == "/intake":
+            content = render_intake_page(conn, org_id)
+            page = render_layout("Intake", fill_csrf(content, csrf_token), req, ctx, notice)
             return Response(page).wsgi(start_response)
 
-        if req.path == "/api/partnerships/save" and req.method == "POST":
+        if req.path == "/intake/new" and req.method == "POST":
             gate = require_role(ctx, "staff")
             if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
+                return gate.wsgi(start_response)
             form = req.form
             role = str(ctx.get("role") or "viewer")
-            partnership_id = to_int(form.get("partnership_id"))
-            current = conn.execute(
-                "SELECT * FROM partnerships WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
-                (partnership_id, org_id),
-            ).fetchone()
-            if not current:
-                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
-            before_snapshot = snapshot_row(current)
-            stage = form.get("stage", current["stage"])
-            if stage not in PARTNERSHIP_STAGES:
-                stage = current["stage"]
-            health = form.get("health", current["health"] or "Medium")
-            if health not in {"Strong", "Medium", "At Risk"}:
-                health = current["health"] or "Medium"
-            partner_name = sanitize_title_for_role(
+            urgency = int(form.get("urgency", "3") or 3)
+            impact = int(form.get("impact", "3") or 3)
+            effort = int(form.get("effort", "3") or 3)
+            score = intake_score(urgency, impact, effort)
+            lane = form.get("lane", LANES[0])
+            if lane not in LANES:
+                lane = LANES[0]
+            title = sanitize_title_for_role(
                 conn,
                 org_id,
                 role,
-                "partnerships",
-                form.get("partner_name", current["partner_name"]),
-                current["partner_name"],
+                "intake",
+                form.get("title"),
+                None,
                 free_edit_min_role="manager",
             )
-
             conn.execute(
                 """
-                UPDATE partnerships
-                SET partner_name = ?, school = ?, stage = ?, last_contact = ?, next_followup = ?, owner_user_id = ?, health = ?, notes = ?, updated_at = ?
-                WHERE id = ? AND organization_id = ?
+                INSERT INTO intake_requests
+                (organization_id, title, requestor_name, requestor_email, lane, urgency, impact, effort, score, status, owner_user_id, details, meta_json, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
-                    partner_name,
-                    form.get("school", current["school"] or ""),
-                    stage,
-                    parse_date(form.get("last_contact", current["last_contact"] or "")),
-                    parse_date(form.get("next_followup", current["next_followup"] or "")),
-                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
-                    health,
-                    form.get("notes", current["notes"] or ""),
-                    iso(),
-                    partnership_id,
                     org_id,
+                    title,
+                    form.get("requestor_name", ""),
+                    form.get("requestor_email", ""),
+                    lane,
+                    urgency,
+                    impact,
+                    effort,
+                    score,
+                    "Triage",
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id")),
+                    form.get("details", ""),
+                    "{}",
+                    iso(),
+                    iso(),
                 ),
             )
-            after_snapshot = snapshot_row(
-                conn.execute(
-                    "SELECT * FROM partnerships WHERE id = ? AND organization_id = ?",
-                    (partnership_id, org_id),
-                ).fetchone()
-            )
-            log_change_with_rollback(
-                conn,
-                org_id,
-                user_id,
-                "partnership_saved",
-                "partnerships",
-                partnership_id or 0,
-                before_snapshot,
-                after_snapshot,
-                f"Partnership updated: {partner_name}",
-            )
-            conn.commit()
-            return json_response({"ok": True, "status": stage}).wsgi(start_response)
-
-        if req.path == "/api/items/delete" and req.method == "POST":
-            form = req.form
-            entity = str(form.get("entity") or "").strip().lower()
-            policy = delete_policy_for_entity(entity)
-            if not policy:
-                return json_response({"ok": False, "error": "invalid_entity"}, status="400 Bad Request").wsgi(start_response)
-            gate = require_role(ctx, str(policy.get("min_role") or "staff"))
-            if gate:
-                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
-            item_id = to_int(form.get("id") or form.get("item_id"))
-            if item_id is None:
-                return json_response({"ok": False, "error": "invalid_item"}, status="400 Bad Request").wsgi(start_response)
-            ok, reason = entity_soft_delete(conn, org_id, user_id, entity, item_id)
-            if not ok:
-                status_code = "400 Bad Request"
-                payload: Dict[str, object] = {"ok": False, "error": reason}
-                if reason in {"not_found"}:
-                    status_code = "404 Not Found"
-                if reason == "already_deleted":
-                    status_code = "409 Conflict"
-                if reason.startswith("status_required:"):
-                    required = [x for x in reason.split(":", 1)[1].split("|") if x]
-                    payload = {"ok": False, "error": "status_required", "required_statuses": required}
-                    status_code = "422 Unprocessable Entity"
-                return json_response(payload, status=status_code).wsgi(start_response)
             conn.commit()
-            return json_response({"ok": True}).wsgi(start_response)
-
-        if req.path == "/deleted":
-            gate = require_role(ctx, "workspace_admin")
-            if gate:
-                return gate.wsgi(start_response)
-            content = render_deleted_page(conn, org_id)
-            page = render_layout("Deleted Items", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
+            return redirect(scoped("/intake?msg=Intake%20request%20created")).wsgi(start_response)
 
-        if req.path == "/deleted/restore" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
+        if req.path == "/intake/convert" and req.method == "POST":
+            gate = require_role(ctx, "staff")
             if gate:
                 return gate.wsgi(start_response)
-            entity = str(req.form.get("entity") or "").strip().lower()
-            item_id = to_int(req.form.get("item_id"))
-            if item_id is None:
-                return redirect(scoped("/deleted?msg=Invalid%20item%20id")).wsgi(start_response)
-            ok, reason = restore_soft_deleted_entity(conn, org_id, user_id, entity, item_id)
-            if not ok:
-                return redirect(scoped(f"/deleted?msg={quote(reason)}")).wsgi(start_response)
-            conn.commit()
-            return redirect(scoped("/deleted?msg=Item%20restored")).wsgi(start_response)
+            form = req.form
+            intake_id = to_int(form.get("intake_id"))
+            if intake_id is None:
+                return redirect(scoped("/intake?msg=Intake%20item%20not%20found")).wsgi(start_response)
+            intake = conn.execute(
+                "SELECT * FROM intake_requests WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
+                (intake_id, org_id),
+            ).fetchone()
+            if not intake:
+                return redirect(scoped("/intake?msg=Intake%20item%20not%20found")).wsgi(start_response)
+            if str(intake["status"] or "") in {"Done", "Rejected"}:
+                return redirect(scoped("/intake?msg=Only%20open%20intake%20items%20can%20be%20converted")).wsgi(start_response)
 
-        if req.path == "/deleted/purge" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
-            if gate:
-                return gate.wsgi(start_response)
-            entity = str(req.form.get("entity") or "").strip().lower()
-            item_id = to_int(req.form.get("item_id"))
-            if item_id is None:
-                return redirect(scoped("/deleted?msg=Invalid%20item%20id")).wsgi(start_response)
-            ok, reason = purge_soft_deleted_entity(conn, org_id, user_id, entity, item_id)
-            if not ok:
-                return redirect(scoped(f"/deleted?msg={quote(reason)}")).wsgi(start_response)
-            conn.commit()
-            return redirect(scoped("/deleted?msg=Item%20purged")).wsgi(start_response)
+            convert_to = str(form.get("convert_to") or "task").strip().lower()
+            if convert_to not in {"task", "project"}:
+                convert_to = "task"
 
-        if req.path == "/admin/users":
-            gate = require_role(ctx, "workspace_admin")
-            if gate:
-                return gate.wsgi(start_response)
-            content = render_admin_page(
+            owner_user_id = normalize_org_user_id(
                 conn,
                 org_id,
-                is_superuser=bool(user.get("is_superuser")),
-                can_provision_workspaces=role_allows(str(ctx.get("role") or ""), "owner"),
+                intake["owner_user_id"],
+                fallback=to_int(intake["owner_user_id"]),
             )
-            page = render_layout("Admin", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
-
-        if req.path == "/admin/users/new" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            actor_role = str(ctx.get("role") or "").strip().lower()
-            target_role = parse_membership_role(form.get("role"), default="staff")
-            if target_role in {"workspace_admin", "owner"} and not role_allows(actor_role, "owner"):
-                return redirect("/admin/users?msg=Only%20owner-level%20admins%20can%20assign%20workspace-admin%20or%20owner%20roles").wsgi(start_response)
-            email = form.get("email", "").lower().strip()
-            existing = conn.execute("SELECT id FROM users WHERE email = ?", (email,)).fetchone()
-            if existing:
-                return redirect("/admin/users?msg=Email%20already%20exists").wsgi(start_response)
+            lane = str(intake["lane"] or LANES[0])
+            if lane not in LANES:
+                lane = LANES[0]
+            score = to_float(str(intake["score"] or 0), 0.0)
+            priority = "Critical" if score >= 12 else ("High" if score >= 8 else ("Medium" if score >= 4 else "Low"))
+            project_id: Optional[int] = None
+            space_id: Optional[int] = None
+            created_entity = ""
+            created_id: Optional[int] = None
 
-            password = form.get("password", "").strip() or secrets.token_urlsafe(12)
-            if len(password) < 12:
-                return redirect("/admin/users?msg=Password%20must%20be%20at%20least%2012%20characters").wsgi(start_response)
+            if convert_to == "project":
+                space_id = default_space_id_for_org(conn, org_id, preferred_space_id=to_int(form.get("space_id")))
+                cursor = conn.execute(
+                    """
+                    INSERT INTO projects
+                    (organization_id, name, description, lane, status, priority, owner_user_id, start_date, due_date, tags, meta_json, created_by, created_at, updated_at, team_id, space_id, progress_pct)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        org_id,
+                        str(intake["title"] or "Intake Project"),
+                        str(intake["details"] or ""),
+                        lane,
+                        "Planned",
+                        priority,
+                        owner_user_id,
+                        dt.date.today().isoformat(),
+                        None,
+                        "from_intake",
+                        "{}",
+                        user_id,
+                        iso(),
+                        iso(),
+                        None,
+                        space_id,
+                        0,
+                    ),
+                )
+                created_id = int(cursor.lastrowid)
+                created_entity = "project"
+            else:
+                project_id, space_id, relation_error = resolve_task_project_and_space(
+                    conn,
+                    org_id,
+                    user_id,
+                    form.get("project_id"),
+                    to_int(form.get("space_id"), selected_space_id),
+                )
+                if relation_error == "invalid_project":
+                    return redirect(scoped("/intake?msg=Select%20a%20valid%20target%20project")).wsgi(start_response)
+                if relation_error == "missing_space":
+                    return redirect(scoped("/intake?msg=Create%20a%20makerspace%20before%20converting")).wsgi(start_response)
+                cursor = conn.execute(
+                    """
+                    INSERT INTO tasks
+                    (organization_id, project_id, title, description, status, priority, assignee_user_id, reporter_user_id, due_date, planned_week, energy, estimate_hours, meta_json, created_at, updated_at, team_id, space_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        org_id,
+                        project_id,
+                        str(intake["title"] or "Intake Task"),
+                        "\n\n".join(
+                            [
+                                str(intake["details"] or "").strip(),
+                                f"Requestor: {intake['requestor_name'] or '-'} ({intake['requestor_email'] or '-'})",
+                            ]
+                        ).strip(),
+                        "Todo",
+                        priority,
+                        owner_user_id,
+                        user_id,
+                        None,
+                        dt.date.today().isocalendar()[1],
+                        "Medium",
+                        1.0,
+                        json.dumps({"source": "intake", "intake_id": intake_id}),
+                        iso(),
+                        iso(),
+                        None,
+                        space_id,
+                    ),
+                )
+                created_id = int(cursor.lastrowid)
+                created_entity = "task"
 
-            pw_hash, pw_salt = hash_password(password)
+            intake_meta = parse_meta_json(intake["meta_json"])
+            intake_meta["converted_to"] = {"entity": created_entity, "id": created_id, "at": iso()}
             conn.execute(
-                "INSERT INTO users (email, name, password_hash, password_salt, is_active, is_superuser, created_at) VALUES (?, ?, ?, ?, 1, 0, ?)",
-                (email, form.get("name", "New User"), pw_hash, pw_salt, iso()),
+                "UPDATE intake_requests SET status = 'Done', meta_json = ?, updated_at = ? WHERE id = ? AND organization_id = ?",
+                (json.dumps(intake_meta), iso(), intake_id, org_id),
             )
-            user_row = conn.execute("SELECT id FROM users WHERE email = ?", (email,)).fetchone()
-            conn.execute(
-                "INSERT INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, ?, ?)",
-                (user_row["id"], org_id, target_role, iso()),
+            log_action(
+                conn,
+                org_id,
+                user_id,
+                "intake_converted",
+                "intake_requests",
+                str(intake_id),
+                f"{created_entity}:{created_id}",
             )
             conn.commit()
-            msg = quote(f"User created. Temporary password: {password}")
-            return redirect(f"/admin/users?msg={msg}").wsgi(start_response)
+            return redirect(scoped(f"/intake?msg=Intake%20converted%20to%20{quote(created_entity)}%20#{created_id}")).wsgi(start_response)
 
-        if req.path == "/admin/users/role" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
+        if req.path == "/api/intake/save" and req.method == "POST":
+            gate = require_role(ctx, "staff")
             if gate:
-                return gate.wsgi(start_response)
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
             form = req.form
-            actor_role = str(ctx.get("role") or "").strip().lower()
-            target_user_id = to_int(form.get("target_user_id"))
-            next_role = parse_membership_role(form.get("role"), default="staff")
-            if target_user_id is None:
-                return redirect("/admin/users?msg=User%20not%20found").wsgi(start_response)
-            can_manage_target, reason = can_admin_manage_user(conn, org_id, user_id, actor_role, target_user_id)
-            if not can_manage_target:
-                return redirect(f"/admin/users?msg={quote(reason)}").wsgi(start_response)
-            if next_role in {"workspace_admin", "owner"} and not role_allows(actor_role, "owner"):
-                return redirect("/admin/users?msg=Only%20owner-level%20admins%20can%20assign%20workspace-admin%20or%20owner%20roles").wsgi(start_response)
-            if ROLE_RANK.get(next_role, 0) > ROLE_RANK.get(actor_role, 0) and not bool(user.get("is_superuser")):
-                return redirect("/admin/users?msg=Cannot%20assign%20a%20role%20higher%20than%20your%20own").wsgi(start_response)
-            if is_workspace_admin_role(next_role) and not can_manage_workspace_admin_role(conn, target_user_id, org_id):
-                return redirect("/admin/users?msg=That%20admin%20account%20already%20controls%20another%20workspace").wsgi(start_response)
-            conn.execute(
-                "UPDATE memberships SET role = ? WHERE organization_id = ? AND user_id = ?",
-                (next_role, org_id, target_user_id),
-            )
-            conn.commit()
-            return redirect("/admin/users?msg=Role%20updated").wsgi(start_response)
-
-        if req.path == "/admin/users/toggle" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
-            if gate:
-                return gate.wsgi(start_response)
-            target_id = int(req.form.get("target_user_id", "0") or 0)
-            is_active = 1 if req.form.get("is_active") == "1" else 0
-            if target_id == user_id and is_active == 0:
-                return redirect("/admin/users?msg=Cannot%20disable%20your%20own%20account").wsgi(start_response)
-            actor_role = str(ctx.get("role") or "").strip().lower()
-            can_manage_target, reason = can_admin_manage_user(conn, org_id, user_id, actor_role, target_id)
-            if not can_manage_target:
-                return redirect(f"/admin/users?msg={quote(reason)}").wsgi(start_response)
-            conn.execute("UPDATE users SET is_active = ? WHERE id = ?", (is_active, target_id))
-            if not is_active:
-                conn.execute("DELETE FROM sessions WHERE user_id = ?", (target_id,))
-            conn.commit()
-            return redirect("/admin/users?msg=Account%20status%20updated").wsgi(start_response)
+            role = str(ctx.get("role") or "viewer")
+            intake_id = to_int(form.get("intake_id"))
+            current = conn.execute(
+                "SELECT * FROM intake_requests WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
+                (intake_id, org_id),
+            ).fetchone()
+            if not current:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            before_snapshot = snapshot_row(current)
 
-        if req.path == "/admin/users/reset" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
-            if gate:
-                return gate.wsgi(start_response)
-            target_id = int(req.form.get("target_user_id", "0") or 0)
-            actor_role = str(ctx.get("role") or "").strip().lower()
-            can_manage_target, reason = can_admin_manage_user(conn, org_id, user_id, actor_role, target_id)
-            if not can_manage_target:
-                return redirect(f"/admin/users?msg={quote(reason)}").wsgi(start_response)
-            target = conn.execute("SELECT id, email FROM users WHERE id = ?", (target_id,)).fetchone()
-            if not target:
-                return redirect("/admin/users?msg=User%20not%20found").wsgi(start_response)
-            token, _expires = create_password_reset(conn, target["id"], created_by=user_id, hours=24)
-            conn.commit()
-            reset_link = f"/reset-password?token={token}"
-            return redirect(f"/admin/users?msg={quote('Reset link for '+target['email']+': '+reset_link)}").wsgi(start_response)
+            status = form.get("status", current["status"])
+            if status not in INTAKE_STATUSES:
+                status = current["status"]
+            lane = form.get("lane", current["lane"])
+            if lane not in LANES:
+                lane = current["lane"]
+            urgency = to_int(form.get("urgency"), int(current["urgency"] or 3)) or 3
+            impact = to_int(form.get("impact"), int(current["impact"] or 3)) or 3
+            effort = to_int(form.get("effort"), int(current["effort"] or 3)) or 3
+            urgency = max(1, min(5, urgency))
+            impact = max(1, min(5, impact))
+            effort = max(1, min(5, effort))
+            score = intake_score(urgency, impact, effort)
+            title = sanitize_title_for_role(
+                conn,
+                org_id,
+                role,
+                "intake",
+                form.get("title", current["title"]),
+                current["title"],
+                free_edit_min_role="manager",
+            )
 
-        if req.path == "/admin/users/delete" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            target_id = to_int(form.get("target_user_id"))
-            replacement_id = to_int(form.get("reassign_user_id"))
-            if target_id is None:
-                return redirect("/admin/users?msg=User%20not%20found").wsgi(start_response)
-            if target_id == user_id:
-                return redirect("/admin/users?msg=Cannot%20remove%20your%20own%20workspace%20membership").wsgi(start_response)
-            actor_role = str(ctx.get("role") or "").strip().lower()
-            can_manage_target, reason = can_admin_manage_user(conn, org_id, user_id, actor_role, target_id)
-            if not can_manage_target:
-                return redirect(f"/admin/users?msg={quote(reason)}").wsgi(start_response)
-            if replacement_id is None or int(replacement_id) == int(target_id):
-                return redirect("/admin/users?msg=Choose%20a%20valid%20reassignment%20owner").wsgi(start_response)
-            replacement_ok = conn.execute(
+            conn.execute(
                 """
-                SELECT 1
-                FROM memberships m
-                JOIN users u ON u.id = m.user_id
-                WHERE m.organization_id = ? AND m.user_id = ? AND u.is_active = 1
-                LIMIT 1
+                UPDATE intake_requests
+                SET title = ?, lane = ?, urgency = ?, impact = ?, effort = ?, score = ?, status = ?, owner_user_id = ?, details = ?, requestor_name = ?, requestor_email = ?, updated_at = ?
+                WHERE id = ? AND organization_id = ?
                 """,
-                (org_id, replacement_id),
-            ).fetchone()
-            if not replacement_ok:
-                return redirect("/admin/users?msg=Replacement%20user%20must%20be%20active%20in%20this%20workspace").wsgi(start_response)
-
-            conn.execute(
-                "UPDATE projects SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
-                (replacement_id, org_id, target_id),
-            )
-            conn.execute(
-                "UPDATE tasks SET assignee_user_id = ? WHERE organization_id = ? AND assignee_user_id = ?",
-                (replacement_id, org_id, target_id),
-            )
-            conn.execute(
-                "UPDATE tasks SET reporter_user_id = ? WHERE organization_id = ? AND reporter_user_id = ?",
-                (replacement_id, org_id, target_id),
-            )
-            conn.execute(
-                "UPDATE intake_requests SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
-                (replacement_id, org_id, target_id),
-            )
-            conn.execute(
-                "UPDATE equipment_assets SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
-                (replacement_id, org_id, target_id),
-            )
-            conn.execute(
-                "UPDATE consumables SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
-                (replacement_id, org_id, target_id),
-            )
-            conn.execute(
-                "UPDATE partnerships SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
-                (replacement_id, org_id, target_id),
-            )
-            conn.execute(
-                "UPDATE meeting_agendas SET owner_user_id = ? WHERE organization_id = ? AND owner_user_id = ?",
-                (replacement_id, org_id, target_id),
-            )
-            conn.execute(
-                "UPDATE onboarding_assignments SET assignee_user_id = ? WHERE organization_id = ? AND assignee_user_id = ?",
-                (replacement_id, org_id, target_id),
-            )
-            conn.execute(
-                "UPDATE teams SET lead_user_id = ? WHERE organization_id = ? AND lead_user_id = ?",
-                (replacement_id, org_id, target_id),
+                (
+                    title,
+                    lane,
+                    urgency,
+                    impact,
+                    effort,
+                    score,
+                    status,
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
+                    form.get("details", current["details"] or ""),
+                    form.get("requestor_name", current["requestor_name"] or ""),
+                    form.get("requestor_email", current["requestor_email"] or ""),
+                    iso(),
+                    intake_id,
+                    org_id,
+                ),
             )
-            conn.execute("DELETE FROM team_members WHERE user_id = ?", (target_id,))
-            conn.execute("DELETE FROM memberships WHERE organization_id = ? AND user_id = ?", (org_id, target_id))
-            remaining = conn.execute("SELECT COUNT(*) AS c FROM memberships WHERE user_id = ?", (target_id,)).fetchone()
-            if int(remaining["c"] or 0) == 0:
-                conn.execute("DELETE FROM sessions WHERE user_id = ?", (target_id,))
-                conn.execute("UPDATE users SET is_active = 0 WHERE id = ?", (target_id,))
-            conn.commit()
-            return redirect("/admin/users?msg=User%20removed%20from%20workspace%20and%20work%20reassigned").wsgi(start_response)
-
-        if req.path == "/admin/data/purge-item" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
-            if gate:
-                return gate.wsgi(start_response)
-            entity = str(req.form.get("entity") or "").strip().lower()
-            item_id = to_int(req.form.get("item_id"))
-            policy = delete_policy_for_entity(entity)
-            if not policy or item_id is None:
-                return redirect("/admin/users?msg=Invalid%20entity%20or%20item%20id").wsgi(start_response)
-            table = str(policy["table"])
-            before_snapshot = snapshot_row(
+            after_snapshot = snapshot_row(
                 conn.execute(
-                    f"SELECT * FROM {table} WHERE id = ? AND organization_id = ?",
-                    (item_id, org_id),
+                    "SELECT * FROM intake_requests WHERE id = ? AND organization_id = ?",
+                    (intake_id, org_id),
                 ).fetchone()
             )
-            deleted = conn.execute(
-                f"DELETE FROM {table} WHERE id = ? AND organization_id = ?",
-                (item_id, org_id),
-            ).rowcount
-            if int(deleted or 0) == 0:
-                return redirect("/admin/users?msg=Item%20not%20found").wsgi(start_response)
             log_change_with_rollback(
                 conn,
                 org_id,
                 user_id,
-                "item_purged_admin",
-                table,
-                item_id,
+                "intake_saved",
+                "intake_requests",
+                intake_id or 0,
                 before_snapshot,
-                None,
-                f"Admin purge: {policy['label']} #{item_id}",
-                source="admin",
+                after_snapshot,
+                f"Intake updated: {title}",
             )
             conn.commit()
-            return redirect("/admin/users?msg=Item%20purged").wsgi(start_response)
+            return json_response({"ok": True, "status": status, "score": score}).wsgi(start_response)
 
-        if req.path == "/admin/data/purge-keyword" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
-            if gate:
-                return gate.wsgi(start_response)
-            keyword = str(req.form.get("keyword") or "").strip()
-            if len(keyword) < 2:
-                return redirect("/admin/users?msg=Keyword%20must%20be%20at%20least%202%20characters").wsgi(start_response)
-            counts = purge_keyword_test_data(conn, org_id, keyword)
-            summary = ", ".join([f"{table}:{count}" for table, count in counts.items() if int(count or 0) > 0]) or "No matches"
-            log_action(
-                conn,
-                org_id,
-                user_id,
-                "admin_keyword_purge",
-                "cleanup",
-                keyword,
-                json.dumps({"source": "admin", "summary": f"Keyword purge: {keyword}", "payload": counts}, ensure_ascii=True)[:4000],
-            )
-            conn.commit()
-            return redirect(f"/admin/users?msg={quote('Keyword purge complete: ' + summary)}").wsgi(start_response)
+        if req.path == "/assets":
+            content = render_assets_page(conn, org_id, selected_space_name=active_space["name"] if active_space else "")
+            page = render_layout("Assets", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
 
-        if req.path == "/admin/audit/rollback" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
-            if gate:
-                return gate.wsgi(start_response)
-            audit_id = to_int(req.form.get("audit_id"))
-            if audit_id is None:
-                return redirect("/admin/users?msg=Audit%20entry%20id%20is%20required").wsgi(start_response)
-            ok, message = rollback_audit_entry(conn, org_id, user_id, audit_id)
-            if not ok:
-                return redirect(f"/admin/users?msg={quote(message)}").wsgi(start_response)
-            conn.commit()
-            return redirect("/admin/users?msg=Rollback%20applied").wsgi(start_response)
+        if req.path == "/consumables":
+            content = render_consumables_page(conn, org_id, selected_space_id=selected_space_id)
+            page = render_layout("Consumables", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
 
-        if req.path in {"/admin/workspaces/new", "/admin/orgs/new"} and req.method == "POST":
-            gate = require_role(ctx, "owner")
+        if req.path == "/assets/new" and req.method == "POST":
+            gate = require_role(ctx, "staff")
             if gate:
                 return gate.wsgi(start_response)
             form = req.form
-            is_super = bool(user.get("is_superuser"))
-            slug = form.get("slug", "").strip().lower().replace(" ", "-")
-            if not slug:
-                return redirect("/admin/users?msg=Slug%20required").wsgi(start_response)
-            existing = conn.execute("SELECT id FROM organizations WHERE slug = ?", (slug,)).fetchone()
-            if existing:
-                return redirect("/admin/users?msg=Slug%20already%20exists").wsgi(start_response)
-            admin_email = (form.get("workspace_admin_email") or "").strip().lower()
-            admin_name = (form.get("workspace_admin_name") or "").strip()
-            admin_password = (form.get("workspace_admin_password") or "").strip()
-            workspace_admin_id: Optional[int] = None
-            temp_password_message = ""
-
-            if admin_email:
-                existing_admin = conn.execute("SELECT id, name FROM users WHERE email = ?", (admin_email,)).fetchone()
-                if existing_admin:
-                    workspace_admin_id = int(existing_admin["id"])
-                    if not can_manage_workspace_admin_role(conn, workspace_admin_id, -1):
-                        return redirect("/admin/users?msg=Selected%20workspace%20admin%20already%20manages%20another%20workspace").wsgi(start_response)
-                else:
-                    if admin_password and len(admin_password) < 12:
-                        return redirect("/admin/users?msg=Workspace%20admin%20password%20must%20be%20at%20least%2012%20characters").wsgi(start_response)
-                    if not admin_password:
-                        admin_password = secrets.token_urlsafe(12)
-                    pw_hash, pw_salt = hash_password(admin_password)
-                    conn.execute(
-                        "INSERT INTO users (email, name, password_hash, password_salt, is_active, is_superuser, created_at) VALUES (?, ?, ?, ?, 1, 0, ?)",
-                        (admin_email, admin_name or "Workspace Admin", pw_hash, pw_salt, iso()),
-                    )
-                    workspace_admin_id = int(conn.execute("SELECT id FROM users WHERE email = ?", (admin_email,)).fetchone()["id"])
-                    temp_password_message = f" Workspace admin temporary password: {admin_password}"
-            elif is_super:
-                workspace_admin_id = user_id
-            else:
-                return redirect("/admin/users?msg=Provide%20a%20workspace%20admin%20email").wsgi(start_response)
-
-            conn.execute(
-                "INSERT INTO organizations (name, slug, created_at) VALUES (?, ?, ?)",
-                (form.get("name", "New Department"), slug, iso()),
+            role = str(ctx.get("role") or "viewer")
+            status = form.get("status", "Operational")
+            if status not in ASSET_STATUSES:
+                status = "Operational"
+            name = sanitize_title_for_role(
+                conn,
+                org_id,
+                role,
+                "assets",
+                form.get("name"),
+                None,
+                free_edit_min_role="manager",
             )
-            new_org = conn.execute("SELECT id FROM organizations WHERE slug = ?", (slug,)).fetchone()
-            new_org_id = int(new_org["id"])
             conn.execute(
-                "INSERT OR IGNORE INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, 'workspace_admin', ?)",
-                (workspace_admin_id, new_org_id, iso()),
+                """
+                INSERT INTO equipment_assets
+                (organization_id, name, space, asset_type, last_maintenance, next_maintenance, cert_required, cert_name, status, owner_user_id, notes, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    org_id,
+                    name,
+                    form.get("space", "Unknown Space"),
+                    form.get("asset_type", ""),
+                    parse_date(form.get("last_maintenance", "")),
+                    parse_date(form.get("next_maintenance", "")),
+                    1 if form.get("cert_required") == "1" else 0,
+                    form.get("cert_name", ""),
+                    status,
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id")),
+                    form.get("notes", ""),
+                    iso(),
+                    iso(),
+                ),
             )
-            if is_super:
-                conn.execute(
-                    "INSERT OR IGNORE INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, 'owner', ?)",
-                    (user_id, new_org_id, iso()),
-                )
-            ensure_default_view_templates(conn, new_org_id, workspace_admin_id)
-            ensure_default_report_templates(conn, new_org_id, workspace_admin_id)
             conn.commit()
-            msg = f"Workspace created for {slug}.{temp_password_message}"
-            return redirect(f"/admin/users?msg={quote(msg)}").wsgi(start_response)
+            return redirect(scoped("/assets?msg=Asset%20added")).wsgi(start_response)
 
-        if req.path in {"/admin/workspaces/update", "/admin/orgs/update"} and req.method == "POST":
-            gate = require_role(ctx, "owner")
+        if req.path == "/consumables/new" and req.method == "POST":
+            gate = require_role(ctx, "staff")
             if gate:
                 return gate.wsgi(start_response)
             form = req.form
-            workspace_id = to_int(form.get("workspace_id"))
-            if workspace_id is None:
-                return redirect("/admin/users?msg=Workspace%20id%20required").wsgi(start_response)
-            target = conn.execute("SELECT id, slug, name FROM organizations WHERE id = ?", (workspace_id,)).fetchone()
-            if not target:
-                return redirect("/admin/users?msg=Workspace%20not%20found").wsgi(start_response)
-
-            raw_slug = form.get("slug", "").strip().lower().replace(" ", "-")
-            slug = re.sub(r"[^a-z0-9-]", "-", raw_slug)
-            slug = re.sub(r"-+", "-", slug).strip("-")
-            if not slug:
-                return redirect("/admin/users?msg=Slug%20required").wsgi(start_response)
-            existing_slug = conn.execute("SELECT id FROM organizations WHERE slug = ? AND id != ?", (slug, workspace_id)).fetchone()
-            if existing_slug:
-                return redirect("/admin/users?msg=Slug%20already%20exists").wsgi(start_response)
-
-            name = (form.get("name") or "").strip() or str(target["name"] or "Workspace")
-            conn.execute("UPDATE organizations SET name = ?, slug = ? WHERE id = ?", (name, slug, workspace_id))
-
-            admin_email = (form.get("workspace_admin_email") or "").strip().lower()
-            admin_name = (form.get("workspace_admin_name") or "").strip()
-            admin_password = (form.get("workspace_admin_password") or "").strip()
-            temp_password_message = ""
-            if admin_email:
-                existing_admin = conn.execute("SELECT id FROM users WHERE email = ?", (admin_email,)).fetchone()
-                if existing_admin:
-                    workspace_admin_id = int(existing_admin["id"])
-                else:
-                    if admin_password and len(admin_password) < 12:
-                        return redirect("/admin/users?msg=Workspace%20admin%20password%20must%20be%20at%20least%2012%20characters").wsgi(start_response)
-                    if not admin_password:
-                        admin_password = secrets.token_urlsafe(12)
-                    pw_hash, pw_salt = hash_password(admin_password)
-                    conn.execute(
-                        "INSERT INTO users (email, name, password_hash, password_salt, is_active, is_superuser, created_at) VALUES (?, ?, ?, ?, 1, 0, ?)",
-                        (admin_email, admin_name or "Workspace Admin", pw_hash, pw_salt, iso()),
-                    )
-                    workspace_admin_id = int(conn.execute("SELECT id FROM users WHERE email = ?", (admin_email,)).fetchone()["id"])
-                    temp_password_message = f" New workspace admin temporary password: {admin_password}"
-
-                if not can_manage_workspace_admin_role(conn, workspace_admin_id, workspace_id):
-                    return redirect("/admin/users?msg=Selected%20workspace%20admin%20already%20manages%20another%20workspace").wsgi(start_response)
-
-                conn.execute(
-                    "UPDATE memberships SET role = 'staff' WHERE organization_id = ? AND role = 'workspace_admin' AND user_id != ?",
-                    (workspace_id, workspace_admin_id),
-                )
-                conn.execute(
-                    "INSERT OR IGNORE INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, 'workspace_admin', ?)",
-                    (workspace_admin_id, workspace_id, iso()),
-                )
-                conn.execute(
-                    "UPDATE memberships SET role = 'workspace_admin' WHERE user_id = ? AND organization_id = ?",
-                    (workspace_admin_id, workspace_id),
-                )
-
-            conn.commit()
-            msg = f"Workspace updated: {slug}.{temp_password_message}"
-            return redirect(f"/admin/users?msg={quote(msg)}").wsgi(start_response)
-
-        if req.path in {"/admin/workspaces/delete", "/admin/orgs/delete"} and req.method == "POST":
-            gate = require_role(ctx, "owner")
-            if gate:
-                return gate.wsgi(start_response)
-            slug = str(req.form.get("slug") or "").strip().lower()
-            confirm = str(req.form.get("confirm") or "").strip().upper()
-            if not slug:
-                return redirect("/admin/users?msg=Workspace%20slug%20required").wsgi(start_response)
-            if confirm != "DELETE":
-                return redirect("/admin/users?msg=Type%20DELETE%20to%20confirm").wsgi(start_response)
-            target = conn.execute("SELECT id, slug FROM organizations WHERE slug = ?", (slug,)).fetchone()
-            if not target:
-                return redirect("/admin/users?msg=Workspace%20not%20found").wsgi(start_response)
-            target_org_id = int(target["id"])
-            conn.execute("DELETE FROM organizations WHERE id = ?", (target_org_id,))
-            conn.commit()
-            if target_org_id == org_id:
-                next_org = conn.execute(
-                    "SELECT organization_id FROM memberships WHERE user_id = ? ORDER BY created_at LIMIT 1",
-                    (user_id,),
-                ).fetchone()
-                if next_org:
-                    return redirect(f"/dashboard?org_id={next_org['organization_id']}&msg=Workspace%20deleted").wsgi(start_response)
-                return redirect("/login?msg=Workspace%20deleted.%20No%20remaining%20workspace%20access", cookies=[clear_cookie("session_token"), clear_cookie("active_org")]).wsgi(start_response)
-            return redirect("/admin/users?msg=Workspace%20deleted").wsgi(start_response)
-
-        if req.path == "/settings":
-            content = render_settings_page(
+            role = str(ctx.get("role") or "viewer")
+            status = form.get("status", "In Stock")
+            if status not in CONSUMABLE_STATUSES:
+                status = "In Stock"
+            space_id = to_int(form.get("space_id"))
+            if not space_id:
+                return redirect(scoped("/consumables?msg=Space%20location%20is%20required")).wsgi(start_response)
+            valid_space = conn.execute(
+                "SELECT id FROM spaces WHERE id = ? AND organization_id = ?",
+                (space_id, org_id),
+            ).fetchone()
+            if not valid_space:
+                return redirect(scoped("/consumables?msg=Select%20a%20valid%20space%20location")).wsgi(start_response)
+            name = sanitize_title_for_role(
                 conn,
-                user_id,
                 org_id,
-                role=str(ctx.get("role") or "viewer"),
-                selected_space_id=selected_space_id,
+                role,
+                "consumables",
+                form.get("name"),
+                None,
+                free_edit_min_role="manager",
+            )
+            conn.execute(
+                """
+                INSERT INTO consumables
+                (organization_id, space_id, name, category, quantity_on_hand, unit, reorder_point, status, owner_user_id, notes, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    org_id,
+                    space_id,
+                    name,
+                    form.get("category", ""),
+                    to_float(form.get("quantity_on_hand"), 0.0),
+                    form.get("unit", ""),
+                    to_float(form.get("reorder_point"), 0.0),
+                    status,
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id")),
+                    form.get("notes", ""),
+                    iso(),
+                    iso(),
+                ),
             )
-            page = render_layout("Settings", fill_csrf(content, csrf_token), req, ctx, notice)
-            return Response(page).wsgi(start_response)
-
-        if req.path == "/settings/update" and req.method == "POST":
-            form = req.form
-            prefs = load_user_preferences(conn, user_id)
-            prefs["default_task_scope"] = form.get("default_task_scope", "my")
-            prefs["show_weekend_alert"] = form.get("show_weekend_alert") == "1"
-            prefs["dashboard_compact"] = form.get("dashboard_compact") == "1"
-            prefs["email_task_updates"] = form.get("email_task_updates") == "1"
-            prefs["email_project_updates"] = form.get("email_project_updates") == "1"
-            prefs["email_comments"] = form.get("email_comments") == "1"
-            prefs["email_mentions"] = form.get("email_mentions") == "1"
-            actor_role = str(ctx.get("role") or "viewer")
-            nav_primary, nav_account = available_nav_items(actor_role)
-            allowed = nav_keys(nav_primary + nav_account)
-            selected = [key for key in allowed if form.get(f"nav_{key}") == "1"]
-            role_default = load_role_nav_preference(conn, org_id, actor_role, allowed)
-            prefs["nav_visibility"] = sanitize_nav_key_selection(selected, allowed, fallback=role_default)
-            save_user_preferences(conn, user_id, prefs)
             conn.commit()
-            return redirect(scoped("/settings?msg=Preferences%20saved")).wsgi(start_response)
+            return redirect(scoped("/consumables?msg=Consumable%20added")).wsgi(start_response)
 
-        if req.path == "/settings/nav-role/update" and req.method == "POST":
-            gate = require_role(ctx, "workspace_admin")
+        if req.path == "/api/assets/save" and req.method == "POST":
+            gate = require_role(ctx, "staff")
             if gate:
-                return gate.wsgi(start_response)
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
             form = req.form
-            actor_role = str(ctx.get("role") or "viewer")
-            target_role = parse_membership_role(form.get("target_role"), default="staff")
-            if target_role in {"workspace_admin", "owner"} and not role_allows(actor_role, "owner"):
-                return redirect(scoped("/settings?msg=Only%20owner-level%20admins%20can%20edit%20workspace-admin%20or%20owner%20defaults")).wsgi(start_response)
-            role_primary, role_account = available_nav_items(target_role)
-            allowed = nav_keys(role_primary + role_account)
-            selected = [key for key in allowed if form.get(f"role_nav_{key}") == "1"]
-            cleaned = sanitize_nav_key_selection(selected, allowed, fallback=allowed)
-            before_snapshot = snapshot_row(
-                conn.execute(
-                    "SELECT * FROM role_nav_preferences WHERE organization_id = ? AND role = ?",
-                    (org_id, target_role),
-                ).fetchone()
-            )
-            save_role_nav_preference(conn, org_id, target_role, cleaned, user_id)
-            after_row = conn.execute(
-                "SELECT * FROM role_nav_preferences WHERE organization_id = ? AND role = ?",
-                (org_id, target_role),
+            role = str(ctx.get("role") or "viewer")
+            asset_id = to_int(form.get("asset_id"))
+            current = conn.execute(
+                "SELECT * FROM equipment_assets WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
+                (asset_id, org_id),
             ).fetchone()
-            after_snapshot = snapshot_row(after_row)
-            row_id = to_int(str(after_row["id"])) if after_row else to_int(str(before_snapshot.get("id") if before_snapshot else ""))
-            if row_id is not None:
-                log_change_with_rollback(
-                    conn,
-                    org_id,
-                    user_id,
-                    "role_nav_saved",
-                    "role_nav_preferences",
-                    row_id,
-                    before_snapshot,
-                    after_snapshot,
-                    f"Role nav defaults updated: {target_role}",
-                    source="settings",
-                )
-            conn.commit()
-            return redirect(scoped("/settings?msg=Role%20navigation%20defaults%20saved")).wsgi(start_response)
+            if not current:
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
+            before_snapshot = snapshot_row(current)
+            status = form.get("status", current["status"])
+            if status not in ASSET_STATUSES:
+                status = current["status"]
+            name = sanitize_title_for_role(
+                conn,
+                org_id,
+                role,
+                "assets",
+                form.get("name", current["name"]),
+                current["name"],
+                free_edit_min_role="manager",
+            )
 
-        if req.path == "/settings/profile" and req.method == "POST":
-            form = req.form
-            email = form.get("email", "").strip().lower()
-            existing = conn.execute(
-                "SELECT id FROM users WHERE email = ? AND id != ?",
-                (email, user_id),
-            ).fetchone()
-            if existing:
-                return redirect(scoped("/settings?msg=Email%20already%20in%20use")).wsgi(start_response)
             conn.execute(
-                "UPDATE users SET name = ?, email = ?, title = ?, timezone = ? WHERE id = ?",
+                """
+                UPDATE equipment_assets
+                SET name = ?, space = ?, asset_type = ?, status = ?, last_maintenance = ?, next_maintenance = ?, cert_required = ?, cert_name = ?, owner_user_id = ?, notes = ?, updated_at = ?
+                WHERE id = ? AND organization_id = ?
+                """,
                 (
-                    form.get("name", ""),
-                    email,
-                    form.get("title", ""),
-                    form.get("timezone", ""),
-                    user_id,
+                    name,
+                    form.get("space", current["space"]),
+                    form.get("asset_type", current["asset_type"] or ""),
+                    status,
+                    parse_date(form.get("last_maintenance", current["last_maintenance"] or "")),
+                    parse_date(form.get("next_maintenance", current["next_maintenance"] or "")),
+                    1 if form.get("cert_required", str(current["cert_required"])) in {"1", "true", "True", "on"} else 0,
+                    form.get("cert_name", current["cert_name"] or ""),
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
+                    form.get("notes", current["notes"] or ""),
+                    iso(),
+                    asset_id,
+                    org_id,
                 ),
             )
-            conn.commit()
-            return redirect(scoped("/settings?msg=Profile%20updated")).wsgi(start_response)
-
-        if req.path == "/settings/password" and req.method == "POST":
-            form = req.form
-            current = form.get("current_password", "")
-            new_pw = form.get("new_password", "")
-            confirm = form.get("confirm_password", "")
-            user_row = conn.execute(
-                "SELECT password_hash, password_salt FROM users WHERE id = ?",
-                (user_id,),
-            ).fetchone()
-            if not user_row or not verify_password(current, user_row["password_hash"], user_row["password_salt"]):
-                return redirect(scoped("/settings?msg=Current%20password%20is%20incorrect")).wsgi(start_response)
-            if new_pw != confirm or len(new_pw) < 12:
-                return redirect(scoped("/settings?msg=New%20password%20must%20match%20and%20be%2012%2B%20chars")).wsgi(start_response)
-            pw_hash, pw_salt = hash_password(new_pw)
-            conn.execute(
-                "UPDATE users SET password_hash = ?, password_salt = ? WHERE id = ?",
-                (pw_hash, pw_salt, user_id),
+            after_snapshot = snapshot_row(
+                conn.execute(
+                    "SELECT * FROM equipment_assets WHERE id = ? AND organization_id = ?",
+                    (asset_id, org_id),
+                ).fetchone()
+            )
+            log_change_with_rollback(
+                conn,
+                org_id,
+                user_id,
+                "asset_saved",
+                "equipment_assets",
+                asset_id or 0,
+                before_snapshot,
+                after_snapshot,
+                f"Asset updated: {name}",
             )
-            conn.execute("DELETE FROM sessions WHERE user_id = ? AND token_hash != ?", (user_id, token_hash(req.cookies.get("session_token", ""))))
             conn.commit()
-            return redirect(scoped("/settings?msg=Password%20updated")).wsgi(start_response)
-
-        if req.path == "/settings/spaces/new" and req.method == "POST":
-            gate = require_role(ctx, "manager")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            try:
-                conn.execute(
-                    "INSERT INTO spaces (organization_id, name, location, description, created_by, created_at) VALUES (?, ?, ?, ?, ?, ?)",
-                    (org_id, form.get("name", ""), form.get("location", ""), form.get("description", ""), user_id, iso()),
-                )
-                conn.commit()
-                return redirect(scoped("/settings?msg=Makerspace%20added")).wsgi(start_response)
-            except sqlite3.IntegrityError:
-                return redirect(scoped("/settings?msg=Makerspace%20name%20already%20exists")).wsgi(start_response)
+            return json_response({"ok": True, "status": status}).wsgi(start_response)
 
-        if req.path == "/settings/spaces/update" and req.method == "POST":
-            gate = require_role(ctx, "manager")
+        if req.path == "/api/consumables/save" and req.method == "POST":
+            gate = require_role(ctx, "staff")
             if gate:
-                return gate.wsgi(start_response)
+                return json_response({"ok": False, "error": "forbidden"}, status="403 Forbidden").wsgi(start_response)
             form = req.form
-            next_path = str(form.get("next", "/settings") or "/settings").strip()
-            if not next_path.startswith("/"):
-                next_path = "/settings"
-            space_id = to_int(form.get("space_id"))
+            role = str(ctx.get("role") or "viewer")
+            consumable_id = to_int(form.get("consumable_id"))
             current = conn.execute(
-                "SELECT * FROM spaces WHERE id = ? AND organization_id = ?",
-                (space_id, org_id),
+                "SELECT * FROM consumables WHERE id = ? AND organization_id = ? AND deleted_at IS NULL",
+                (consumable_id, org_id),
             ).fetchone()
             if not current:
-                return redirect(scoped(f"{next_path}?msg=Makerspace%20not%20found")).wsgi(start_response)
+                return json_response({"ok": False, "error": "not_found"}, status="404 Not Found").wsgi(start_response)
             before_snapshot = snapshot_row(current)
+
+            status = form.get("status", current["status"])
+            if status not in CONSUMABLE_STATUSES:
+                status = current["status"]
+            space_id = to_int(form.get("space_id"), current["space_id"])
+            if not space_id:
+                return json_response({"ok": False, "error": "space_required"}, status="400 Bad Request").wsgi(start_response)
+            valid_space = conn.execute(
+                "SELECT id FROM spaces WHERE id = ? AND organization_id = ?",
+                (space_id, org_id),
+            ).fetchone()
+            if not valid_space:
+                return json_response({"ok": False, "error": "invalid_space"}, status="400 Bad Request").wsgi(start_response)
             name = sanitize_title_for_role(
                 conn,
                 org_id,
-                str(ctx.get("role") or "viewer"),
-                "spaces",
-                form.get("name"),
+                role,
+                "consumables",
+                form.get("name", current["name"]),
                 current["name"],
                 free_edit_min_role="manager",
             )
-            try:
-                conn.execute(
-                    "UPDATE spaces SET name = ?, location = ?, description = ? WHERE id = ? AND organization_id = ?",
-                    (
-                        name,
-                        form.get("location", ""),
-                        form.get("description", ""),
-                        space_id,
-                        org_id,
-                    ),
-                )
-                after_snapshot = snapshot_row(
-                    conn.execute(
-                        "SELECT * FROM spaces WHERE id = ? AND organization_id = ?",
-                        (space_id, org_id),
-                    ).fetchone()
-                )
-                log_change_with_rollback(
-                    conn,
-                    org_id,
-                    user_id,
-                    "space_saved",
-                    "spaces",
-                    space_id or 0,
-                    before_snapshot,
-                    after_snapshot,
-                    f"Makerspace updated: {name}",
-                    source="settings",
-                )
-                conn.commit()
-                return redirect(scoped(f"{next_path}?msg=Makerspace%20updated")).wsgi(start_response)
-            except sqlite3.IntegrityError:
-                return redirect(scoped(f"{next_path}?msg=Makerspace%20name%20already%20exists")).wsgi(start_response)
-
-        if req.path == "/settings/spaces/delete" and req.method == "POST":
-            gate = require_role(ctx, "manager")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            space_id = to_int(form.get("space_id"))
-            replacement_space_id = to_int(form.get("replacement_space_id"))
-            if space_id is None or replacement_space_id is None or int(space_id) == int(replacement_space_id):
-                return redirect(scoped("/settings?msg=Select%20a%20different%20replacement%20space")).wsgi(start_response)
-            current = conn.execute(
-                "SELECT id, name FROM spaces WHERE id = ? AND organization_id = ?",
-                (space_id, org_id),
-            ).fetchone()
-            replacement = conn.execute(
-                "SELECT id, name FROM spaces WHERE id = ? AND organization_id = ?",
-                (replacement_space_id, org_id),
-            ).fetchone()
-            if not current or not replacement:
-                return redirect(scoped("/settings?msg=Invalid%20space%20selection")).wsgi(start_response)
-            conn.execute(
-                "UPDATE projects SET space_id = ? WHERE organization_id = ? AND space_id = ?",
-                (replacement_space_id, org_id, space_id),
-            )
             conn.execute(
-                "UPDATE tasks SET space_id = ? WHERE organization_id = ? AND space_id = ?",
-                (replacement_space_id, org_id, space_id),
+                """
+                UPDATE consumables
+                SET name = ?, category = ?, space_id = ?, quantity_on_hand = ?, unit = ?, reorder_point = ?, status = ?, owner_user_id = ?, notes = ?, updated_at = ?
+                WHERE id = ? AND organization_id = ?
+                """,
+                (
+                    name,
+                    form.get("category", current["category"] or ""),
+                    space_id,
+                    to_float(form.get("quantity_on_hand"), float(current["quantity_on_hand"] or 0.0)),
+                    form.get("unit", current["unit"] or ""),
+                    to_float(form.get("reorder_point"), float(current["reorder_point"] or 0.0)),
+                    status,
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id"), fallback=to_int(current["owner_user_id"])),
+                    form.get("notes", current["notes"] or ""),
+                    iso(),
+                    consumable_id,
+                    org_id,
+                ),
             )
-            conn.execute(
-                "UPDATE consumables SET space_id = ? WHERE organization_id = ? AND space_id = ?",
-                (replacement_space_id, org_id, space_id),
+            after_snapshot = snapshot_row(
+                conn.execute(
+                    "SELECT * FROM consumables WHERE id = ? AND organization_id = ?",
+                    (consumable_id, org_id),
+                ).fetchone()
             )
-            conn.execute(
-                "UPDATE equipment_assets SET space = ? WHERE organization_id = ? AND space = ?",
-                (replacement["name"], org_id, current["name"]),
+            log_change_with_rollback(
+                conn,
+                org_id,
+                user_id,
+                "consumable_saved",
+                "consumables",
+                consumable_id or 0,
+                before_snapshot,
+                after_snapshot,
+                f"Consumable updated: {name}",
             )
-            conn.execute("DELETE FROM spaces WHERE id = ? AND organization_id = ?", (space_id, org_id))
             conn.commit()
-            return redirect(scoped("/settings?msg=Makerspace%20deleted%20and%20work%20reassigned")).wsgi(start_response)
+            return json_response({"ok": True, "status": status}).wsgi(start_response)
 
-        if req.path == "/settings/teams/new" and req.method == "POST":
-            gate = require_role(ctx, "manager")
-            if gate:
-                return gate.wsgi(start_response)
-            form = req.form
-            try:
-                conn.execute(
-                    "INSERT INTO teams (organization_id, name, focus_area, lead_user_id, created_at) VALUES (?, ?, ?, ?, ?)",
-                    (
-                        org_id,
-                        form.get("name", ""),
-                        form.get("focus_area", ""),
-                        int(form["lead_user_id"]) if form.get("lead_user_id") else None,
-                        iso(),
-                    ),
-                )
-                team_id = conn.execute("SELECT last_insert_rowid() AS id").fetchone()["id"]
-                if form.get("lead_user_id"):
-                    conn.execute(
-                        "INSERT OR IGNORE INTO team_members (team_id, user_id, role, created_at) VALUES (?, ?, 'lead', ?)",
-                        (team_id, int(form["lead_user_id"]), iso()),
-                    )
-                conn.commit()
-                return redirect(scoped("/settings?msg=Team%20added")).wsgi(start_response)
-            except sqlite3.IntegrityError:
-                return redirect(scoped("/settings?msg=Team%20name%20already%20exists")).wsgi(start_response)
+        if req.path == "/partnerships":
+            content = render_partnership_page(conn, org_id)
+            page = render_layout("Partnerships", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
 
-        if req.path == "/settings/teams/update" and req.method == "POST":
-            gate = require_role(ctx, "manager")
+        if req.path == "/partnerships/new" and req.method == "POST":
+            gate = require_role(ctx, "staff")
             if gate:
                 return gate.wsgi(start_response)
             form = req.form
-            team_id = to_int(form.get("team_id"))
-            current = conn.execute(
-                "SELECT * FROM teams WHERE id = ? AND organization_id = ?",
-                (team_id, org_id),
-            ).fetchone()
-            if not current:
-                return redirect(scoped("/settings?msg=Team%20not%20found")).wsgi(start_response)
-            before_snapshot = snapshot_row(current)
-            name = sanitize_title_for_role(
+            role = str(ctx.get("role") or "viewer")
+            stage = form.get("stage", "Discovery")
+            if stage not in PARTNERSHIP_STAGES:
+                stage = "Discovery"
+            health = form.get("health", "Medium")
+            if health not in {"Strong", "Medium", "At Risk"}:
+                health = "Medium"
+            partner_name = sanitize_title_for_role(
                 conn,
                 org_id,
-                str(ctx.get("role") or "viewer"),
-                "teams",
-                form.get("name"),
-                current["name"],
+                role,
+                "partnerships",
+                form.get("partner_name"),
+                None,
                 free_edit_min_role="manager",
             )
-            lead_user_id = to_int(form.get("lead_user_id"))
-            try:
-                conn.execute(
-                    "UPDATE teams SET name = ?, focus_area = ?, lead_user_id = ? WHERE id = ? AND organization_id = ?",
-                    (
-                        name,
-                        form.get("focus_area", ""),
-                        lead_user_id,
-                        team_id,
-                        org_id,
-                    ),
-                )
-                if lead_user_id:
-                    conn.execute(
-                        "INSERT OR IGNORE INTO team_members (team_id, user_id, role, created_at) VALUES (?, ?, 'lead', ?)",
-                        (team_id, lead_user_id, iso()),
-                    )
-                after_snapshot = snapshot_row(
-                    conn.execute(
-                        "SELECT * FROM teams WHERE id = ? AND organization_id = ?",
-                        (team_id, org_id),
-                    ).fetchone()
-                )
-                log_change_with_rollback(
-                    conn,
+            conn.execute(
+                """
+                INSERT INTO partnerships
+                (organization_id, partner_name, school, stage, last_contact, next_followup, owner_user_id, health, notes, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
                     org_id,
-                    user_id,
-                    "team_saved",
-                    "teams",
-                    team_id or 0,
-                    before_snapshot,
-                    after_snapshot,
-                    f"Team updated: {name}",
-                    source="settings",
-                )
-                conn.commit()
-                return redirect(scoped("/settings?msg=Team%20updated")).wsgi(start_response)
-            except sqlite3.IntegrityError:
-                return redirect(scoped("/settings?msg=Team%20name%20already%20exists")).wsgi(start_response)
+                    partner_name,
+                    form.get("school", ""),
+                    stage,
+                    parse_date(form.get("last_contact", "")),
+                    parse_date(form.get("next_followup", "")),
+                    normalize_org_user_id(conn, org_id, form.get("owner_user_id")),
+                    health,
+                    form.get("notes", ""),
+                    iso(),
+                    iso(),
+                ),
+            )
+            conn.commit()
+            return redirect(scoped("/partnerships?msg=Partnership%20added")).wsgi(start_response)
 
-        if req.path == "/settings/teams/delete" and req.method == "POST":
+        if req.path == "/data-hub":
             gate = require_role(ctx, "manager")
             if gate:
                 return gate.wsgi(start_response)
-            form = req.form
-            team_id = to_int(form.get("team_id"))
-            replacement_team_id = to_int(form.get("replacement_team_id"))
-            current = conn.execute(
-                "SELECT id FROM teams WHERE id = ? AND organization_id = ?",
-                (team_id, org_id),
-            ).fetchone()
-            if not current:
-                return redirect(scoped("/settings?msg=Team%20not%20found")).wsgi(start_response)
-            if replacement_team_id is not None:
-                replacement = conn.execute(
-                    "SELECT id FROM teams WHERE id = ? AND organization_id = ?",
-                    (replacement_team_id, org_id),
-                ).fetchone()
-                if not replacement or int(replacement_team_id) == int(team_id or 0):
-                    return redirect(scoped("/settings?msg=Invalid%20replacement%20team")).wsgi(start_response)
-            conn.execute(
-                "UPDATE projects SET team_id = ? WHERE organization_id = ? AND team_id = ?",
-                (replacement_team_id, org_id, team_id),
-            )
-            conn.execute(
-                "UPDATE tasks SET team_id = ? WHERE organization_id = ? AND team_id = ?",
-                (replacement_team_id, org_id, team_id),
-            )
-            conn.execute("DELETE FROM teams WHERE id = ? AND organization_id = ?", (team_id, org_id))
-            conn.commit()
-            return redirect(scoped("/settings?msg=Team%20deleted%20and%20work%20reassigned")).wsgi(start_response)
+            content = render_data_hub_page(conn, org_id)
+            page = render_layout("Data Hub", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
 
-        if req.path == "/settings/field/new" and req.method == "POST":
-            gate = require_role(ctx, "manager")
+        if req.path == "/deleted":
+            gate = require_role(ctx, "workspace_admin")
             if gate:
                 return gate.wsgi(start_response)
-            form = req.form
-            try:
-                conn.execute(
-                    """
-                    INSERT INTO field_configs
-                    (organization_id, entity, field_key, label, field_type, is_required, is_enabled, created_at)
-                    VALUES (?, ?, ?, ?, ?, 0, 1, ?)
-                    """,
-                    (
-                        org_id,
-                        form.get("entity", "projects"),
-                        form.get("field_key", "").strip(),
-                        form.get("label", "Custom Field"),
-                        form.get("field_type", "text"),
-                        iso(),
-                    ),
-                )
-                conn.commit()
-                return redirect(scoped("/settings?msg=Field%20added")).wsgi(start_response)
-            except sqlite3.IntegrityError:
-                return redirect(scoped("/settings?msg=Field%20already%20exists")).wsgi(start_response)
+            content = render_deleted_page(conn, org_id)
+            page = render_layout("Deleted Items", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
+
+        if req.path == "/admin/users":
+            gate = require_role(ctx, "workspace_admin")
+            if gate:
+                return gate.wsgi(start_response)
+            content = render_admin_page(
+                conn,
+                org_id,
+                is_superuser=bool(user.get("is_superuser")),
+                can_provision_workspaces=role_allows(str(ctx.get("role") or ""), "owner"),
+            )
+            page = render_layout("Admin", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
+
+        if req.path == "/settings":
+            content = render_settings_page(
+                conn,
+                user_id,
+                org_id,
+                role=str(ctx.get("role") or "viewer"),
+                selected_space_id=selected_space_id,
+            )
+            page = render_layout("Settings", fill_csrf(content, csrf_token), req, ctx, notice)
+            return Response(page).wsgi(start_response)
 
         if req.path.startswith("/export/"):
             gate = require_role(ctx, "manager")
@@ -13965,7 +14170,9 @@ def app(environ, start_response):
             entity = req.path.replace("/export/", "")
             if entity.endswith(".csv"):
                 entity = entity[:-4]
-            return export_csv(conn, org_id, entity).wsgi(start_response)
+            if entity not in CSV_ENTITIES:
+                return Response("Unknown export entity", status="404 Not Found").wsgi(start_response)
+            return export_csv(org_id, entity).wsgi(start_response)
 
         if req.path.startswith("/import/") and req.method == "POST":
             gate = require_role(ctx, "manager")
@@ -13974,6 +14181,9 @@ def app(environ, start_response):
             entity = req.path.replace("/import/", "")
             if entity.endswith(".csv"):
                 entity = entity[:-4]
+            # Reject unknown entities before parsing the multipart upload.
+            if entity not in CSV_ENTITIES:
+                return redirect(scoped("/data-hub?msg=Unknown%20import%20entity")).wsgi(start_response)
             file = req.files.get("file")
             if file is None:
                 return redirect(scoped("/data-hub?msg=No%20file%20selected")).wsgi(start_response)
@@ -13987,7 +14197,7 @@ def app(environ, start_response):
         traceback.print_exc()
         return Response("<h1>500 Internal Server Error</h1><p>An unexpected server error occurred.</p>", status="500 Internal Server Error").wsgi(start_response)
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 
 def run() -> None:
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
-"""Basic accessibility audit (no external deps), including contrast and structure checks.
+"""Basic accessibility audit, including contrast and structure checks.
 
 Design choice:
-- Keep this script dependency-light so accessibility regressions are easy to catch in local and CI.
+- Keep this script dependency-light so accessibility regressions are easy to catch in local and CI:
+  it runs on the standard library alone and uses optional accelerators when they are installed.
+- selectolax (C HTML parser) is used when installed; otherwise a stdlib regex tokenizer drives
+  PageAuditParser's HTMLParser handlers (see PageAuditParser.scan).
 """
 
 import io
@@ -10,6 +13,8 @@ import json
 import os
 import re
 import sys
+from functools import lru_cache
+from html import unescape
 from html.parser import HTMLParser
 from pathlib import Path
 from urllib.parse import urlencode
@@ -20,21 +25,37 @@ if str(ROOT) not in sys.path:
 
 from app.server import app, db_connect, ensure_bootstrap, hash_password
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional accelerator; the stdlib parser below covers the same checks
+    LexborHTMLParser = None
+
 DEFAULT_ADMIN_EMAIL = os.environ.get("MAKERSPACE_ADMIN_EMAIL", "admin@makerflow.local").strip().lower()
 DEFAULT_ADMIN_PASSWORD = os.environ.get("MAKERSPACE_ADMIN_PASSWORD", "ChangeMeMeow!2026")
 
 
+def _srgb_to_linear(c):
+    return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+
+
+# 8-bit channels only take 256 values, so the sRGB transfer curve is tabulated once, and the
+# per-channel luminance weights are folded in so luminance() is three loads and two adds.
+SRGB_LINEAR_LUT = tuple(_srgb_to_linear(i / 255.0) for i in range(256))
+RED_LUMINANCE_LUT = tuple(0.2126 * c for c in SRGB_LINEAR_LUT)
+GREEN_LUMINANCE_LUT = tuple(0.7152 * c for c in SRGB_LINEAR_LUT)
+BLUE_LUMINANCE_LUT = tuple(0.0722 * c for c in SRGB_LINEAR_LUT)
+
+
+@lru_cache(maxsize=64)
 def hex_to_rgb(value):
+    """Return the 0-255 channel values of a #rrggbb color."""
     value = value.strip().lstrip("#")
-    return tuple(int(value[i : i + 2], 16) / 255.0 for i in (0, 2, 4))
+    return tuple(int(value[i : i + 2], 16) for i in (0, 2, 4))
 
 
+@lru_cache(maxsize=64)
 def luminance(rgb):
-    def chan(c):
-        return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
-
-    r, g, b = [chan(c) for c in rgb]
-    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+    return RED_LUMINANCE_LUT[rgb[0]] + GREEN_LUMINANCE_LUT[rgb[1]] + BLUE_LUMINANCE_LUT[rgb[2]]
 
 
 def contrast_ratio(hex1, hex2):
@@ -44,6 +65,47 @@ def contrast_ratio(hex1, hex2):
     return (lighter + 0.05) / (darker + 0.05)
 
 
+def contrast_batch(pairs):
+    """Contrast ratios for many (foreground, background) hex pairs.
+
+    Each distinct color is parsed and linearized once, so theme-wide scans cost one luminance
+    computation per color rather than two per pair (and do not churn the lru_caches above).
+    """
+    pairs = list(pairs)
+    lum = {color: luminance(hex_to_rgb(color)) for pair in pairs for color in pair}
+    ratios = []
+    for fg, bg in pairs:
+        lighter, darker = max(lum[fg], lum[bg]), min(lum[fg], lum[bg])
+        ratios.append((lighter + 0.05) / (darker + 0.05))
+    return ratios
+
+
+CONTRAST_PAIRS = {
+    "text_on_card": ("#1f2722", "#ffffff"),
+    "muted_on_card": ("#57635a", "#ffffff"),
+    "brand_on_card": ("#0f6b4d", "#ffffff"),
+    "white_on_brand": ("#ffffff", "#0f6b4d"),
+}
+# Theme colors are fixed, so the ratios are computed once at import rather than per audit run.
+CONTRAST_CHECKS = dict(zip(CONTRAST_PAIRS, contrast_batch(CONTRAST_PAIRS.values())))
+
+
+# Start tags that PageAuditParser inspects attributes of; everything else skips the dict() build.
+AUDITED_TAGS = frozenset({"h1", "main", "a", "nav", "table", "thead", "label", "input", "select", "textarea"})
+# Regex tokenizer for PageAuditParser.scan(). One left-to-right sweep consumes every piece of markup
+# whole (comments, CDATA, declarations, script/style elements, and any start/end tag with its quoted
+# attributes), so tag-like text inside an attribute value or a script body is never matched on its own.
+MARKUP_RE = re.compile(
+    r"<!--.*?-->"
+    r"|<!\[CDATA\[.*?\]\]>"
+    r"|<[!?][^>]*>"
+    r"|<(script|style)\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>.*?</\1\s*>"
+    r"|<(/?)([a-zA-Z][^\s/>]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>",
+    re.S | re.I,
+)
+AUDIT_ATTR_RE = re.compile(r"([^\s=/>\"']+)(?:\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+)))?")
+
+
 class PageAuditParser(HTMLParser):
     """Collect structural accessibility signals from server-rendered HTML."""
     def __init__(self):
@@ -62,6 +124,10 @@ class PageAuditParser(HTMLParser):
         self.focusable = 0
 
     def handle_starttag(self, tag, attrs):
+        if tag not in AUDITED_TAGS:
+            if tag == "button":
+                self.focusable += 1
+            return
         attrs = dict(attrs)
         if tag == "h1":
             self.h1_count += 1
@@ -97,10 +163,77 @@ class PageAuditParser(HTMLParser):
         if tag == "label" and self.current_label_depth > 0:
             self.current_label_depth -= 1
 
+    def scan(self, html):
+        """Regex replacement for feed() that calls the same handlers for audited tags.
+
+        Matches feed() on well-formed markup; malformed markup (unclosed comments, unbalanced
+        quotes) may tokenize differently.
+        """
+        for match in MARKUP_RE.finditer(html):
+            _cdata_tag, closing, tag, raw_attrs = match.groups()
+            if tag is None:
+                continue
+            tag = tag.lower()
+            if closing:
+                if tag == "label":
+                    self.handle_endtag(tag)
+                continue
+            if tag not in AUDITED_TAGS and tag != "button":
+                continue
+            attrs = []
+            for match in AUDIT_ATTR_RE.finditer(raw_attrs):
+                attr_name, dquoted, squoted, bare = match.groups()
+                value = next((v for v in (dquoted, squoted, bare) if v is not None), None)
+                # Valueless attributes map to None, as HTMLParser reports them.
+                attrs.append((attr_name.lower(), unescape(value) if value is not None else None))
+            self.handle_starttag(tag, attrs)
+
+
+class SelectolaxPageSignals:
+    """Same signals as PageAuditParser, gathered with CSS selectors over a C-parsed DOM."""
+    def __init__(self, html):
+        tree = LexborHTMLParser(html)
+        self.h1_count = len(tree.css("h1"))
+        self.main_id = tree.css_first("main#main-content") is not None
+        self.skip_link = bool(tree.css("a[class*='skip-link']"))
+        self.nav_has_label = any(node.attributes.get("aria-label") for node in tree.css("nav"))
+        self.tables = len(tree.css("table"))
+        self.theads = len(tree.css("thead"))
+        self.controls_missing_label = 0
+        self.label_for = {node.attributes["for"] for node in tree.css("label[for]") if node.attributes["for"]}
+        self.control_ids = set()
+        self.pending_controls = []
+        self.focusable = len(tree.css("a, button"))
+        for node in tree.css("input, select, textarea"):
+            attrs = node.attributes
+            if attrs.get("type") == "hidden":
+                continue
+            if attrs.get("aria-label") or attrs.get("aria-labelledby"):
+                continue
+            self.focusable += 1
+            cid = attrs.get("id")
+            if cid:
+                self.control_ids.add(cid)
+                self.pending_controls.append(cid)
+            elif not self._inside_label(node):
+                self.controls_missing_label += 1
+
+    @staticmethod
+    def _inside_label(node):
+        parent = node.parent
+        while parent is not None:
+            if parent.tag == "label":
+                return True
+            parent = parent.parent
+        return False
+
 
 def check_page(name, html):
-    p = PageAuditParser()
-    p.feed(html)
+    if LexborHTMLParser is not None:
+        p = SelectolaxPageSignals(html)
+    else:
+        p = PageAuditParser()
+        p.scan(html)
 
     issues = []
     if p.h1_count != 1:
@@ -130,13 +263,13 @@ def check_page(name, html):
 
 class WSGIClient:
     """Cookie-aware in-process client reused across audit pages."""
-    def __init__(self):
-        self.cookies = {}
+    def __init__(self, cookies=None):
+        self.cookies = dict(cookies or {})
+        self._refresh_cookie_header()
 
-    def _cookie_header(self):
-        if not self.cookies:
-            return ""
-        return "; ".join([f"{k}={v}" for k, v in self.cookies.items()])
+    def _refresh_cookie_header(self):
+        # Cookies only change on Set-Cookie responses, so the header is rebuilt there, not per request.
+        self._cookie_header = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
 
     def request(self, path, method="GET", data=None):
         data = data or {}
@@ -151,7 +284,7 @@ class WSGIClient:
             "CONTENT_TYPE": "application/x-www-form-urlencoded",
             "REMOTE_ADDR": "127.0.0.1",
             "HTTP_USER_AGENT": "a11y-audit",
-            "HTTP_COOKIE": self._cookie_header(),
+            "HTTP_COOKIE": self._cookie_header,
             "wsgi.url_scheme": "http",
             "SERVER_NAME": "localhost",
             "SERVER_PORT": "80",
@@ -172,12 +305,16 @@ class WSGIClient:
         chunks = app(environ, start_response)
         payload = b"".join(chunks).decode("utf-8", errors="ignore")
 
+        # Only Set-Cookie headers are parsed; partition avoids building intermediate split lists.
+        cookies_changed = False
         for key, value in captured["headers"]:
             if key.lower() == "set-cookie":
-                token = value.split(";", 1)[0]
-                if "=" in token:
-                    k, v = token.split("=", 1)
-                    self.cookies[k] = v
+                name, sep, cookie_value = value.partition(";")[0].partition("=")
+                if sep:
+                    self.cookies[name] = cookie_value
+                    cookies_changed = True
+        if cookies_changed:
+            self._refresh_cookie_header()
 
         return captured["status"], dict(captured["headers"]), payload
 
@@ -230,32 +367,26 @@ def main():
             continue
         page_results.append(check_page(page, html))
 
-    contrast_checks = {
-        "text_on_card": contrast_ratio("#1f2722", "#ffffff"),
-        "muted_on_card": contrast_ratio("#57635a", "#ffffff"),
-        "brand_on_card": contrast_ratio("#0f6b4d", "#ffffff"),
-        "white_on_brand": contrast_ratio("#ffffff", "#0f6b4d"),
-    }
-
     contrast_issues = []
-    for key, ratio in contrast_checks.items():
+    for key, ratio in CONTRAST_CHECKS.items():
         if ratio < 4.5:
             contrast_issues.append(f"{key} fails AA normal text ({ratio:.2f})")
 
     report = {
         "pages": page_results,
-        "contrast": {k: round(v, 2) for k, v in contrast_checks.items()},
+        "contrast": {k: round(v, 2) for k, v in CONTRAST_CHECKS.items()},
         "contrast_issues": contrast_issues,
-        "total_page_issues": sum(len(p.get("issues", [])) for p in page_results),
+        "total_page_issues": sum(len(p["issues"]) for p in page_results),
     }
 
     out = ROOT / "analysis_outputs"
     out.mkdir(exist_ok=True)
     target = out / "accessibility_audit.json"
-    target.write_text(json.dumps(report, indent=2))
+    payload = json.dumps(report, indent=2)
+    target.write_text(payload)
 
     print("A11Y_AUDIT_COMPLETE", target)
-    print(json.dumps(report, indent=2))
+    print(payload)
 
 
 if __name__ == "__main__":
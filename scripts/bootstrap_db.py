@@ -12,14 +12,17 @@ if str(ROOT) not in sys.path:
 
 from app.server import DB_BACKEND, DB_PATH, DATABASE_URL, db_connect, ensure_bootstrap
 
+PROBE_TABLES = ("organizations", "users", "memberships", "spaces", "teams", "projects", "tasks", "sessions")
+
 
 def main() -> int:
     ensure_bootstrap()
     conn = db_connect()
     try:
-        probes = {}
-        for table in ("organizations", "users", "memberships", "spaces", "teams", "projects", "tasks", "sessions"):
-            probes[table] = int(conn.execute(f"SELECT COUNT(*) AS c FROM {table}").fetchone()["c"])
+        # One round trip: each table count is a scalar subquery aliased by table name.
+        columns = ", ".join(f"(SELECT COUNT(*) FROM {table}) AS {table}" for table in PROBE_TABLES)
+        row = conn.execute(f"SELECT {columns}").fetchone()
+        probes = {table: int(row[table]) for table in PROBE_TABLES}
     finally:
         conn.close()
 
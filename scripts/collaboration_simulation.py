@@ -12,7 +12,7 @@ REPORT = ROOT / "analysis_outputs" / "collaboration_simulation_report.md"
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.server import db_connect, ensure_bootstrap, hash_password, intake_score, iso
+from app.server import begin_immediate, db_connect, ensure_bootstrap, hash_password, intake_score, iso
 from scripts.test_data_cleanup import cleanup_test_data, summarize_counts
 
 DEFAULT_ORG_SLUG = os.environ.get("MAKERSPACE_DEFAULT_ORG_SLUG", "default").strip().lower()
@@ -29,6 +29,8 @@ def main() -> None:
     org_id = int(org["id"])
 
     try:
+        # One write transaction for the whole simulation; the single commit below ends it.
+        begin_immediate(conn)
         existing_users = {
             row["email"]: int(row["id"])
             for row in conn.execute(
@@ -45,11 +47,12 @@ def main() -> None:
                 user_id = existing_users[email]
             else:
                 pw_hash, pw_salt = hash_password("SimUserPass!2026")
-                conn.execute(
-                    "INSERT INTO users (email, name, password_hash, password_salt, is_active, is_superuser, created_at) VALUES (?, ?, ?, ?, 1, 0, ?)",
-                    (email, name, pw_hash, pw_salt, iso()),
+                user_id = int(
+                    conn.execute(
+                        "INSERT INTO users (email, name, password_hash, password_salt, is_active, is_superuser, created_at) VALUES (?, ?, ?, ?, 1, 0, ?) RETURNING id",
+                        (email, name, pw_hash, pw_salt, iso()),
+                    ).fetchone()["id"]
                 )
-                user_id = int(conn.execute("SELECT last_insert_rowid() AS id").fetchone()["id"])
             conn.execute(
                 "INSERT OR IGNORE INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, ?, ?)",
                 (user_id, org_id, role, iso()),
@@ -70,113 +73,153 @@ def main() -> None:
             for r in conn.execute("SELECT id FROM projects WHERE organization_id = ? ORDER BY id", (org_id,)).fetchall()
         ]
 
+        def draw(population, k):
+            # Batch random draws per column; empty populations yield NULLs.
+            return rng.choices(population, k=k) if population else [None] * k
+
         base_date = dt.date.today()
-        created_tasks = 0
-        for user_id in sim_user_ids:
-            for offset in range(3):
-                title = f"SIM Task U{user_id}-{offset+1}"
-                due = (base_date + dt.timedelta(days=rng.randint(0, 21))).isoformat()
-                status = rng.choice(["Todo", "In Progress", "Blocked"])
-                priority = rng.choice(["Low", "Medium", "High"])
-                conn.execute(
-                    """
-                    INSERT INTO tasks
-                    (organization_id, project_id, title, description, status, priority, assignee_user_id, reporter_user_id, due_date, planned_week, energy, estimate_hours, meta_json, created_at, updated_at, team_id, space_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        org_id,
-                        rng.choice(project_ids) if project_ids else None,
-                        title,
-                        "Simulation generated workload item.",
-                        status,
-                        priority,
-                        user_id,
-                        rng.choice(sim_user_ids),
-                        due,
-                        base_date.isocalendar()[1],
-                        rng.choice(["Low", "Medium", "High"]),
-                        round(rng.uniform(0.5, 4.0), 2),
-                        "{}",
-                        iso(),
-                        iso(),
-                        rng.choice(team_ids) if team_ids else None,
-                        rng.choice(space_ids) if space_ids else None,
-                    ),
+        task_owners = [(user_id, offset) for user_id in sim_user_ids for offset in range(3)]
+        task_count = len(task_owners)
+        due_offsets = draw(range(22), task_count)
+        statuses = draw(["Todo", "In Progress", "Blocked"], task_count)
+        priorities = draw(["Low", "Medium", "High"], task_count)
+        projects = draw(project_ids, task_count)
+        reporters = draw(sim_user_ids, task_count)
+        energies = draw(["Low", "Medium", "High"], task_count)
+        teams = draw(team_ids, task_count)
+        spaces = draw(space_ids, task_count)
+        task_rows = []
+        for idx, (user_id, offset) in enumerate(task_owners):
+            now = iso()
+            task_rows.append(
+                (
+                    org_id,
+                    projects[idx],
+                    f"SIM Task U{user_id}-{offset+1}",
+                    "Simulation generated workload item.",
+                    statuses[idx],
+                    priorities[idx],
+                    user_id,
+                    reporters[idx],
+                    (base_date + dt.timedelta(days=due_offsets[idx])).isoformat(),
+                    base_date.isocalendar()[1],
+                    energies[idx],
+                    round(rng.uniform(0.5, 4.0), 2),
+                    "{}",
+                    now,
+                    now,
+                    teams[idx],
+                    spaces[idx],
                 )
-                created_tasks += 1
+            )
+        last_task_id = int(conn.execute("SELECT COALESCE(MAX(id), 0) AS id FROM tasks").fetchone()["id"])
+        conn.executemany(
+            """
+            INSERT INTO tasks
+            (organization_id, project_id, title, description, status, priority, assignee_user_id, reporter_user_id, due_date, planned_week, energy, estimate_hours, meta_json, created_at, updated_at, team_id, space_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            task_rows,
+        )
+        created_tasks = len(task_rows)
 
+        # The id bound narrows the read to rows added by this run; the org and title filters stay
+        # because begin_immediate does not lock the table on PostgreSQL, where other sessions may insert.
         sim_tasks = conn.execute(
-            "SELECT id, assignee_user_id, status FROM tasks WHERE organization_id = ? AND title LIKE 'SIM Task %' ORDER BY id",
-            (org_id,),
+            "SELECT id, assignee_user_id FROM tasks WHERE id > ? AND organization_id = ? AND title LIKE 'SIM Task %' ORDER BY id",
+            (last_task_id, org_id),
         ).fetchall()
 
-        status_transitions = 0
-        reassignments = 0
+        status_updates = []
+        assignee_updates = []
+        batch_ts = iso()
         for row in sim_tasks:
             task_id = int(row["id"])
             current_assignee = row["assignee_user_id"]
 
             if rng.random() < 0.65:
                 new_status = rng.choice(["In Progress", "Blocked", "Done", "Todo"])
-                conn.execute("UPDATE tasks SET status = ?, updated_at = ? WHERE id = ?", (new_status, iso(), task_id))
-                status_transitions += 1
+                status_updates.append((new_status, batch_ts, task_id))
 
             if rng.random() < 0.45:
                 new_assignee = rng.choice(sim_user_ids)
                 if new_assignee != current_assignee:
-                    conn.execute("UPDATE tasks SET assignee_user_id = ?, updated_at = ? WHERE id = ?", (new_assignee, iso(), task_id))
-                    reassignments += 1
+                    assignee_updates.append((new_assignee, batch_ts, task_id))
+        conn.executemany("UPDATE tasks SET status = ?, updated_at = ? WHERE id = ?", status_updates)
+        conn.executemany("UPDATE tasks SET assignee_user_id = ?, updated_at = ? WHERE id = ?", assignee_updates)
+        status_transitions = len(status_updates)
+        reassignments = len(assignee_updates)
 
-        for i in range(20):
-            urgency = rng.randint(1, 5)
-            impact = rng.randint(1, 5)
-            effort = rng.randint(1, 5)
-            conn.execute(
-                """
-                INSERT INTO intake_requests
-                (organization_id, title, requestor_name, requestor_email, lane, urgency, impact, effort, score, status, owner_user_id, details, meta_json, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, '{}', ?, ?)
-                """,
+        intake_count = 20
+        urgencies = draw(range(1, 6), intake_count)
+        impacts = draw(range(1, 6), intake_count)
+        efforts = draw(range(1, 6), intake_count)
+        lanes = draw(["Core Operations", "Course/Faculty Support", "Student Programs", "Strategic Partnerships"], intake_count)
+        intake_statuses = draw(["Triage", "Planned", "Active", "On Hold"], intake_count)
+        owners = draw(sim_user_ids, intake_count)
+        scores = list(map(intake_score, urgencies, impacts, efforts))
+        intake_rows = []
+        for i in range(intake_count):
+            now = iso()
+            intake_rows.append(
                 (
                     org_id,
                     f"SIM Intake {i+1:02d}",
                     f"Requester {i+1:02d}",
                     f"requester{i+1:02d}@example.edu",
-                    rng.choice(["Core Operations", "Course/Faculty Support", "Student Programs", "Strategic Partnerships"]),
-                    urgency,
-                    impact,
-                    effort,
-                    intake_score(urgency, impact, effort),
-                    rng.choice(["Triage", "Planned", "Active", "On Hold"]),
-                    rng.choice(sim_user_ids),
+                    lanes[i],
+                    urgencies[i],
+                    impacts[i],
+                    efforts[i],
+                    scores[i],
+                    intake_statuses[i],
+                    owners[i],
                     "Simulated intake payload.",
-                    iso(),
-                    iso(),
-                ),
+                    now,
+                    now,
+                )
             )
-
-        open_by_user = conn.execute(
+        conn.executemany(
             """
-            SELECT COALESCE(u.email, 'unassigned') AS user_email, COUNT(*) AS open_tasks
-            FROM tasks t
-            LEFT JOIN users u ON u.id = t.assignee_user_id
-            WHERE t.organization_id = ? AND t.status NOT IN ('Done','Cancelled')
-            GROUP BY COALESCE(u.email, 'unassigned')
-            ORDER BY open_tasks DESC
+            INSERT INTO intake_requests
+            (organization_id, title, requestor_name, requestor_email, lane, urgency, impact, effort, score, status, owner_user_id, details, meta_json, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, '{}', ?, ?)
             """,
-            (org_id,),
-        ).fetchall()
-
-        peak = int(open_by_user[0]["open_tasks"]) if open_by_user else 0
-        median = int(open_by_user[len(open_by_user) // 2]["open_tasks"]) if open_by_user else 0
-        unassigned_open = int(
-            conn.execute(
-                "SELECT COUNT(*) AS c FROM tasks WHERE organization_id = ? AND assignee_user_id IS NULL AND status NOT IN ('Done','Cancelled')",
-                (org_id,),
-            ).fetchone()["c"]
+            intake_rows,
         )
 
+        # Peak, median (the middle entry of the load list sorted descending) and the unassigned
+        # count come back from one query instead of a grouped fetch plus a second COUNT.
+        load_snapshot = conn.execute(
+            """
+            WITH loads AS (
+                SELECT COALESCE(u.email, 'unassigned') AS user_email, COUNT(*) AS open_tasks
+                FROM tasks t
+                LEFT JOIN users u ON u.id = t.assignee_user_id
+                WHERE t.organization_id = ? AND t.status NOT IN ('Done','Cancelled')
+                GROUP BY COALESCE(u.email, 'unassigned')
+            ),
+            ranked AS (
+                SELECT open_tasks,
+                       ROW_NUMBER() OVER (ORDER BY open_tasks DESC) - 1 AS pos,
+                       COUNT(*) OVER () AS total
+                FROM loads
+            )
+            SELECT
+                COALESCE(MAX(open_tasks), 0) AS peak,
+                COALESCE(MAX(CASE WHEN pos = total / 2 THEN open_tasks END), 0) AS median,
+                (
+                    SELECT COUNT(*) FROM tasks
+                    WHERE organization_id = ? AND assignee_user_id IS NULL AND status NOT IN ('Done','Cancelled')
+                ) AS unassigned_open
+            FROM ranked
+            """,
+            (org_id, org_id),
+        ).fetchone()
+        peak = int(load_snapshot["peak"])
+        median = int(load_snapshot["median"])
+        unassigned_open = int(load_snapshot["unassigned_open"])
+
         opportunities = []
         if peak > max(1, median * 2):
             opportunities.append("Workload concentration is high; keep team filters and delegation queue visible by default.")
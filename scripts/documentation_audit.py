@@ -13,7 +13,12 @@ import json
 import re
 import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator; per-token substring checks give the same result
+    ahocorasick = None
 
 ROOT = Path(__file__).resolve().parent.parent
 OUT = ROOT / "analysis_outputs" / "documentation_audit.json"
@@ -42,6 +47,14 @@ FORBIDDEN_PATTERNS: Dict[str, str] = {
     r"makerflow\.yourdomain\.edu": "Contains placeholder domain not suitable for launch docs.",
 }
 
+# Each pattern is compiled once and searched on its own, so overlapping hits (e.g. "Codex/Users/")
+# are all reported. The patterns are ASCII, so the scan runs on the raw file bytes and never
+# decodes them.
+FORBIDDEN_RULES: List[Tuple[str, str, re.Pattern[bytes]]] = [
+    (pattern, reason, re.compile(pattern.encode("utf-8"), re.IGNORECASE))
+    for pattern, reason in FORBIDDEN_PATTERNS.items()
+]
+
 REQUIRED_SNIPPETS: Dict[Path, List[str]] = {
     ROOT / "README.md": [
         "https://github.com/ianroy/makerflowPM",
@@ -61,37 +74,71 @@ REQUIRED_SNIPPETS: Dict[Path, List[str]] = {
 }
 
 
+def build_snippet_automata() -> Dict[Path, object]:
+    """Compile one Aho-Corasick automaton per file so all of its required snippets are found in a single pass."""
+    if ahocorasick is None:
+        return {}
+    automata: Dict[Path, object] = {}
+    for path, tokens in REQUIRED_SNIPPETS.items():
+        automaton = ahocorasick.Automaton()
+        for token in tokens:
+            automaton.add_word(token, token)
+        automaton.make_automaton()
+        automata[path] = automaton
+    return automata
+
+
+SNIPPET_AUTOMATA = build_snippet_automata()
+
+
+def missing_snippets(path: Path, raw: bytes) -> List[str]:
+    required = REQUIRED_SNIPPETS.get(path, [])
+    automaton = SNIPPET_AUTOMATA.get(path)
+    if automaton is None:
+        return [token for token in required if token.encode("utf-8") not in raw]
+    # pyahocorasick's standard build matches str, so only this path decodes the file.
+    found = {token for _end, token in automaton.iter(raw.decode("utf-8", errors="ignore"))}
+    return [token for token in required if token not in found]
+
+
+def audit_one(path: Path) -> Tuple[bool, List[Dict[str, str]]]:
+    """Scan one target file; returns whether it was checked and its findings."""
+    rel = str(path.relative_to(ROOT))
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return False, [{"file": rel, "issue": "Missing required file"}]
+
+    findings: List[Dict[str, str]] = []
+    for pattern, reason, compiled in FORBIDDEN_RULES:
+        if compiled.search(raw):
+            findings.append(
+                {
+                    "file": rel,
+                    "issue": reason,
+                    "pattern": pattern,
+                }
+            )
+
+    for token in missing_snippets(path, raw):
+        findings.append(
+            {
+                "file": rel,
+                "issue": f"Missing required content: {token}",
+            }
+        )
+    return True, findings
+
+
 def main() -> int:
     findings: List[Dict[str, str]] = []
     checked_files: List[str] = []
 
     for path in TARGETS:
-        if not path.exists():
-            findings.append({"file": str(path.relative_to(ROOT)), "issue": "Missing required file"})
-            continue
-
-        checked_files.append(str(path.relative_to(ROOT)))
-        text = path.read_text(encoding="utf-8", errors="ignore")
-
-        for pattern, reason in FORBIDDEN_PATTERNS.items():
-            if re.search(pattern, text, flags=re.IGNORECASE):
-                findings.append(
-                    {
-                        "file": str(path.relative_to(ROOT)),
-                        "issue": reason,
-                        "pattern": pattern,
-                    }
-                )
-
-        required = REQUIRED_SNIPPETS.get(path, [])
-        for token in required:
-            if token not in text:
-                findings.append(
-                    {
-                        "file": str(path.relative_to(ROOT)),
-                        "issue": f"Missing required content: {token}",
-                    }
-                )
+        checked, file_findings = audit_one(path)
+        if checked:
+            checked_files.append(str(path.relative_to(ROOT)))
+        findings.extend(file_findings)
 
     for must_exist in (ROOT / "LICENSE", ROOT / "docs" / "LICENSE.md"):
         if not must_exist.exists():
@@ -11,7 +11,7 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.server import LANES, db_connect, ensure_bootstrap, intake_score, iso
+from app.server import LANES, begin_immediate, db_connect, ensure_bootstrap, hash_password, intake_score, iso
 from scripts.test_data_cleanup import cleanup_test_data, summarize_counts
 import datetime as dt
 
@@ -37,8 +37,21 @@ PROJECT_STATUSES = ["Planned", "Active", "Blocked", "Complete"]
 TASK_STATUSES = ["Todo", "In Progress", "Blocked", "Done"]
 PRIORITIES = ["Low", "Medium", "High", "Critical"]
 ENERGIES = ["Low", "Medium", "High"]
+TASK_LABELS = ["Prep workshop", "Faculty sync", "Prototype support", "Cert review", "Documentation"]
+SAMPLE_TASK_COUNT = 260
+EVENT_TITLES = [
+    "[SAMPLE] Makerspace staff meeting",
+    "[SAMPLE] Course support sync",
+    "[SAMPLE] Workshop facilitation",
+    "[SAMPLE] Project build block",
+    "[SAMPLE] Partner follow-up",
+]
+EVENT_DURATION_MINUTES = [30, 45, 60, 90, 120]
+SAMPLE_EVENT_COUNT = 420
 PARTNER_STAGES = ["Discovery", "Active", "Pilot", "Dormant"]
 HEALTH = ["Strong", "Medium", "At Risk"]
+# SQLite builds before 3.32 cap a statement at 999 bound parameters.
+SQLITE_MAX_PARAMS = 999
 DEFAULT_ORG_SLUG = os.environ.get("MAKERSPACE_DEFAULT_ORG_SLUG", "default").strip().lower()
 DEFAULT_ADMIN_EMAIL = os.environ.get("MAKERSPACE_ADMIN_EMAIL", "admin@makerflow.local").strip().lower()
 
@@ -49,39 +62,54 @@ def rand_date(days_back: int = 30, days_forward: int = 90) -> str:
     return (today + dt.timedelta(days=offset)).isoformat()
 
 
-def upsert_sample_users(conn, org_id):
-    user_ids = []
-    for idx, name in enumerate(NAMES, start=1):
-        email = f"sample{idx}@makerflow.local"
-        row = conn.execute("SELECT id FROM users WHERE email = ?", (email,)).fetchone()
-        if row:
-            user_id = row[0]
-        else:
-            from app.server import hash_password
+def bulk_insert(conn, table, columns, rows):
+    """Insert rows with multi-row VALUES statements, each kept under SQLite's bound-parameter limit."""
+    row_sql = "(" + ", ".join(["?"] * len(columns)) + ")"
+    chunk = max(1, SQLITE_MAX_PARAMS // len(columns))
+    for start in range(0, len(rows), chunk):
+        part = rows[start:start + chunk]
+        conn.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row_sql] * len(part))}",
+            [value for row in part for value in row],
+        )
 
-            pw_hash, pw_salt = hash_password("SamplePassword!2026")
-            conn.execute(
-                "INSERT INTO users (email, name, password_hash, password_salt, is_active, is_superuser, created_at) VALUES (?, ?, ?, ?, 1, 0, ?)",
-                (email, name, pw_hash, pw_salt, iso()),
-            )
-            user_id = conn.execute("SELECT id FROM users WHERE email = ?", (email,)).fetchone()[0]
-        user_ids.append(user_id)
 
-        m = conn.execute(
-            "SELECT id FROM memberships WHERE user_id = ? AND organization_id = ?",
-            (user_id, org_id),
-        ).fetchone()
-        if not m:
-            role = "student" if idx % 3 == 0 else ("manager" if idx % 5 == 0 else "staff")
-            conn.execute(
-                "INSERT INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, ?, ?)",
-                (user_id, org_id, role, iso()),
-            )
+def sample_user_ids(conn, emails):
+    placeholders = ", ".join(["?"] * len(emails))
+    rows = conn.execute(f"SELECT id, email FROM users WHERE email IN ({placeholders})", tuple(emails)).fetchall()
+    return {row[1]: row[0] for row in rows}
+
+
+def upsert_sample_users(conn, org_id):
+    emails = [f"sample{idx}@makerflow.local" for idx in range(1, len(NAMES) + 1)]
+    existing = sample_user_ids(conn, emails)
+    missing = [(email, name) for email, name in zip(emails, NAMES) if email not in existing]
+    if missing:
+        # PBKDF2 dominates this step, so every new sample account shares one hash of the shared password.
+        pw_hash, pw_salt = hash_password("SamplePassword!2026")
+        now = iso()
+        conn.executemany(
+            "INSERT OR IGNORE INTO users (email, name, password_hash, password_salt, is_active, is_superuser, created_at) VALUES (?, ?, ?, ?, 1, 0, ?)",
+            [(email, name, pw_hash, pw_salt, now) for email, name in missing],
+        )
+        existing = sample_user_ids(conn, emails)
+    user_ids = [existing[email] for email in emails]
+
+    # The (user_id, organization_id) unique key makes OR IGNORE skip memberships that already exist.
+    now = iso()
+    conn.executemany(
+        "INSERT OR IGNORE INTO memberships (user_id, organization_id, role, created_at) VALUES (?, ?, ?, ?)",
+        [
+            (user_id, org_id, "student" if idx % 3 == 0 else ("manager" if idx % 5 == 0 else "staff"), now)
+            for idx, user_id in enumerate(user_ids, start=1)
+        ],
+    )
     return user_ids
 
 
 def clear_previous_sample(conn, org_id):
-    sample_tag = "%[SAMPLE]%"
+    # Every sample row is titled "[SAMPLE] ...", so a prefix match selects exactly the same rows.
+    sample_tag = "[SAMPLE]%"
     conn.execute("DELETE FROM tasks WHERE organization_id = ? AND title LIKE ?", (org_id, sample_tag))
     conn.execute("DELETE FROM projects WHERE organization_id = ? AND name LIKE ?", (org_id, sample_tag))
     conn.execute("DELETE FROM intake_requests WHERE organization_id = ? AND title LIKE ?", (org_id, sample_tag))
@@ -120,23 +148,23 @@ def main():
             cleanup_ran = True
             return
 
+        # One write transaction for the whole reseed; db_connect() already applies WAL/NORMAL/cache PRAGMAs.
+        begin_immediate(conn)
         clear_previous_sample(conn, org_id)
         user_ids = upsert_sample_users(conn, org_id)
         owner_id = conn.execute("SELECT id FROM users WHERE email = ?", (DEFAULT_ADMIN_EMAIL,)).fetchone()[0]
+        # Constant for the whole batch, so computed once rather than per row.
+        now_iso = iso()
+        planned_week = dt.date.today().isocalendar()[1]
 
-        project_ids = []
+        project_rows = []
         for i in range(28):
             lane = random.choice(LANES)
             status = random.choice(PROJECT_STATUSES)
             priority = random.choice(PRIORITIES)
             school = random.choice(SCHOOLS)
             name = f"[SAMPLE] {school} Initiative {i+1}"
-            conn.execute(
-                """
-                INSERT INTO projects
-                (organization_id, name, description, lane, status, priority, owner_user_id, start_date, due_date, tags, meta_json, created_by, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            project_rows.append(
                 (
                     org_id,
                     name,
@@ -150,51 +178,74 @@ def main():
                     f"sample,school:{school}",
                     "{}",
                     owner_id,
-                    iso(),
-                    iso(),
-                ),
+                    now_iso,
+                    now_iso,
+                )
             )
-            project_ids.append(conn.execute("SELECT last_insert_rowid()").fetchone()[0])
+        bulk_insert(
+            conn,
+            "projects",
+            (
+                "organization_id", "name", "description", "lane", "status", "priority",
+                "owner_user_id", "start_date", "due_date", "tags", "meta_json", "created_by",
+                "created_at", "updated_at",
+            ),
+            project_rows,
+        )
+        # clear_previous_sample() removed earlier runs, so the sample projects are exactly the rows just inserted.
+        project_ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT id FROM projects WHERE organization_id = ? AND name LIKE '[SAMPLE]%' ORDER BY id",
+                (org_id,),
+            ).fetchall()
+        ]
 
-        for i in range(260):
-            status = random.choices(TASK_STATUSES, weights=[4, 3, 1, 2], k=1)[0]
-            priority = random.choices(PRIORITIES, weights=[2, 4, 3, 1], k=1)[0]
-            title = f"[SAMPLE] Task {i+1}: {random.choice(['Prep workshop', 'Faculty sync', 'Prototype support', 'Cert review', 'Documentation'])}"
-            conn.execute(
-                """
-                INSERT INTO tasks
-                (organization_id, project_id, title, description, status, priority, assignee_user_id, reporter_user_id, due_date, planned_week, energy, estimate_hours, meta_json, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+        # Draw each categorical column in one batched call; the loop below only assembles tuples.
+        task_statuses = random.choices(TASK_STATUSES, weights=[4, 3, 1, 2], k=SAMPLE_TASK_COUNT)
+        task_priorities = random.choices(PRIORITIES, weights=[2, 4, 3, 1], k=SAMPLE_TASK_COUNT)
+        task_labels = random.choices(TASK_LABELS, k=SAMPLE_TASK_COUNT)
+        task_projects = random.choices(project_ids, k=SAMPLE_TASK_COUNT)
+        task_assignees = random.choices(user_ids, k=SAMPLE_TASK_COUNT)
+        task_energies = random.choices(ENERGIES, k=SAMPLE_TASK_COUNT)
+        task_rows = []
+        for i in range(SAMPLE_TASK_COUNT):
+            task_rows.append(
                 (
                     org_id,
-                    random.choice(project_ids),
-                    title,
+                    task_projects[i],
+                    f"[SAMPLE] Task {i+1}: {task_labels[i]}",
                     "Generated for usability test load.",
-                    status,
-                    priority,
-                    random.choice(user_ids),
+                    task_statuses[i],
+                    task_priorities[i],
+                    task_assignees[i],
                     owner_id,
                     rand_date(15, 30),
-                    dt.date.today().isocalendar()[1],
-                    random.choice(ENERGIES),
+                    planned_week,
+                    task_energies[i],
                     round(random.uniform(0.5, 6.0), 2),
                     "{}",
-                    iso(),
-                    iso(),
-                ),
+                    now_iso,
+                    now_iso,
+                )
             )
+        bulk_insert(
+            conn,
+            "tasks",
+            (
+                "organization_id", "project_id", "title", "description", "status", "priority",
+                "assignee_user_id", "reporter_user_id", "due_date", "planned_week", "energy",
+                "estimate_hours", "meta_json", "created_at", "updated_at",
+            ),
+            task_rows,
+        )
 
+        intake_rows = []
         for i in range(36):
             urgency = random.randint(1, 5)
             impact = random.randint(1, 5)
             effort = random.randint(1, 5)
-            conn.execute(
-                """
-                INSERT INTO intake_requests
-                (organization_id, title, requestor_name, requestor_email, lane, urgency, impact, effort, score, status, owner_user_id, details, meta_json, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            intake_rows.append(
                 (
                     org_id,
                     f"[SAMPLE] Intake request {i+1}",
@@ -209,20 +260,26 @@ def main():
                     random.choice(user_ids),
                     "Sample intake workload for queue testing.",
                     "{}",
-                    iso(),
-                    iso(),
-                ),
+                    now_iso,
+                    now_iso,
+                )
             )
+        bulk_insert(
+            conn,
+            "intake_requests",
+            (
+                "organization_id", "title", "requestor_name", "requestor_email", "lane", "urgency",
+                "impact", "effort", "score", "status", "owner_user_id", "details", "meta_json",
+                "created_at", "updated_at",
+            ),
+            intake_rows,
+        )
 
         spaces = ["MakerLab", "Automation Lab", "Digital Scholarship Lab"]
         asset_types = ["3D Printer", "Laser Cutter", "CNC", "Scanner", "Electronics Bench"]
+        asset_rows = []
         for i in range(24):
-            conn.execute(
-                """
-                INSERT INTO equipment_assets
-                (organization_id, name, space, asset_type, last_maintenance, next_maintenance, cert_required, cert_name, status, owner_user_id, notes, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            asset_rows.append(
                 (
                     org_id,
                     f"[SAMPLE] Asset {i+1}",
@@ -235,18 +292,24 @@ def main():
                     random.choice(["Operational", "Needs Service", "Down"]),
                     random.choice(user_ids),
                     "",
-                    iso(),
-                    iso(),
-                ),
+                    now_iso,
+                    now_iso,
+                )
             )
+        bulk_insert(
+            conn,
+            "equipment_assets",
+            (
+                "organization_id", "name", "space", "asset_type", "last_maintenance",
+                "next_maintenance", "cert_required", "cert_name", "status", "owner_user_id",
+                "notes", "created_at", "updated_at",
+            ),
+            asset_rows,
+        )
 
+        partnership_rows = []
         for i in range(26):
-            conn.execute(
-                """
-                INSERT INTO partnerships
-                (organization_id, partner_name, school, stage, last_contact, next_followup, owner_user_id, health, notes, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            partnership_rows.append(
                 (
                     org_id,
                     f"[SAMPLE] Partner {i+1}",
@@ -257,10 +320,19 @@ def main():
                     random.choice(user_ids),
                     random.choice(HEALTH),
                     "",
-                    iso(),
-                    iso(),
-                ),
+                    now_iso,
+                    now_iso,
+                )
             )
+        bulk_insert(
+            conn,
+            "partnerships",
+            (
+                "organization_id", "partner_name", "school", "stage", "last_contact",
+                "next_followup", "owner_user_id", "health", "notes", "created_at", "updated_at",
+            ),
+            partnership_rows,
+        )
 
         categories = [
             "Teaching & Mentoring",
@@ -271,40 +343,47 @@ def main():
             "Personal/Recovery",
             "Other",
         ]
-        for _ in range(420):
-            start = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=random.randint(0, 365), hours=random.randint(0, 12))
-            duration = dt.timedelta(minutes=random.choice([30, 45, 60, 90, 120]))
-            end = start + duration
-            title = random.choice(
-                [
-                    "[SAMPLE] Makerspace staff meeting",
-                    "[SAMPLE] Course support sync",
-                    "[SAMPLE] Workshop facilitation",
-                    "[SAMPLE] Project build block",
-                    "[SAMPLE] Partner follow-up",
-                ]
-            )
-            conn.execute(
-                """
-                INSERT INTO calendar_events
-                (organization_id, user_id, source, title, start_at, end_at, attendees_count, location, description, category, energy_score, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+        # Same batched draws as the task columns: every per-event value is sampled up front.
+        event_day_offsets = random.choices(range(366), k=SAMPLE_EVENT_COUNT)
+        event_hour_offsets = random.choices(range(13), k=SAMPLE_EVENT_COUNT)
+        event_durations = random.choices(EVENT_DURATION_MINUTES, k=SAMPLE_EVENT_COUNT)
+        event_titles = random.choices(EVENT_TITLES, k=SAMPLE_EVENT_COUNT)
+        event_users = random.choices(user_ids, k=SAMPLE_EVENT_COUNT)
+        event_attendees = random.choices(range(1, 13), k=SAMPLE_EVENT_COUNT)
+        event_spaces = random.choices(spaces, k=SAMPLE_EVENT_COUNT)
+        event_categories = random.choices(categories, k=SAMPLE_EVENT_COUNT)
+        event_energy = random.choices(range(1, 6), k=SAMPLE_EVENT_COUNT)
+        now = dt.datetime.now(dt.timezone.utc).replace(microsecond=0)
+        event_rows = []
+        for i in range(SAMPLE_EVENT_COUNT):
+            start = now - dt.timedelta(days=event_day_offsets[i], hours=event_hour_offsets[i])
+            end = start + dt.timedelta(minutes=event_durations[i])
+            event_rows.append(
                 (
                     org_id,
-                    random.choice(user_ids),
+                    event_users[i],
                     "sample",
-                    title,
-                    start.replace(microsecond=0).isoformat(),
-                    end.replace(microsecond=0).isoformat(),
-                    random.randint(1, 12),
-                    random.choice(spaces),
+                    event_titles[i],
+                    start.isoformat(),
+                    end.isoformat(),
+                    event_attendees[i],
+                    event_spaces[i],
                     "Sample event for trend testing.",
-                    random.choice(categories),
-                    random.randint(1, 5),
-                    iso(),
-                ),
+                    event_categories[i],
+                    event_energy[i],
+                    now_iso,
+                )
             )
+        bulk_insert(
+            conn,
+            "calendar_events",
+            (
+                "organization_id", "user_id", "source", "title", "start_at", "end_at",
+                "attendees_count", "location", "description", "category", "energy_score",
+                "created_at",
+            ),
+            event_rows,
+        )
 
         conn.commit()
         summary = {
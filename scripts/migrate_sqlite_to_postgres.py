@@ -22,6 +22,7 @@ except Exception as exc:  # pragma: no cover
 
 
 ROOT = Path(__file__).resolve().parent.parent
+FETCH_CHUNK = 5000
 
 
 def sqlite_tables(conn: sqlite3.Connection) -> List[str]:
@@ -70,12 +71,16 @@ def main() -> int:
 
     src = sqlite3.connect(str(source_path))
     src.row_factory = sqlite3.Row
-    dst = psycopg.connect(db_url, autocommit=False)
+    # prepare_threshold=0 server-prepares statements on first use; the per-table column lookup
+    # repeats the same text for every table, so it is planned once instead of once per table.
+    dst = psycopg.connect(db_url, autocommit=False, prepare_threshold=0)
 
     migrated: Dict[str, int] = {}
     try:
         tables = sqlite_tables(src)
         with dst.cursor() as dcur:
+            # The whole import commits once; an fsync per WAL flush buys nothing until then.
+            dcur.execute("SET LOCAL synchronous_commit = off")
             for table in tables:
                 src_cols = sqlite_columns(src, table)
                 dst_cols = pg_columns(dcur, table)
@@ -89,17 +94,27 @@ def main() -> int:
                     dcur.execute(f'TRUNCATE TABLE "{table}" RESTART IDENTITY CASCADE')
 
                 qcols = ", ".join([f'"{c}"' for c in cols])
-                ph = ", ".join(["%s"] * len(cols))
-                insert_sql = f'INSERT INTO "{table}" ({qcols}) VALUES ({ph}) ON CONFLICT DO NOTHING'
-
-                rows = src.execute(f'SELECT {qcols} FROM "{table}"').fetchall()
-                if not rows:
-                    migrated[table] = 0
-                    continue
-
-                batch = [tuple(row[c] for c in cols) for row in rows]
-                dcur.executemany(insert_sql, batch)
-                migrated[table] = len(batch)
+                # COPY has no ON CONFLICT clause, so rows land in a staging table first and are merged
+                # with DO NOTHING. Source rows that conflict (a populated destination, or duplicates the
+                # destination's constraints reject even after --truncate) are skipped, not fatal.
+                target = f'"_migrate_{table}"'
+                dcur.execute(f'CREATE TEMP TABLE {target} (LIKE "{table}" INCLUDING DEFAULTS) ON COMMIT DROP')
+
+                # Stream rows from SQLite into COPY in bounded chunks instead of materializing the table.
+                count = 0
+                scur = src.execute(f'SELECT {qcols} FROM "{table}"')
+                with dcur.copy(f"COPY {target} ({qcols}) FROM STDIN") as copy:
+                    while True:
+                        chunk = scur.fetchmany(FETCH_CHUNK)
+                        if not chunk:
+                            break
+                        for row in chunk:
+                            copy.write_row(tuple(row))
+                        count += len(chunk)
+
+                if count:
+                    dcur.execute(f'INSERT INTO "{table}" ({qcols}) SELECT {qcols} FROM {target} ON CONFLICT DO NOTHING')
+                migrated[table] = count
 
         dst.commit()
     finally:
@@ -17,6 +17,19 @@ if str(ROOT) not in sys.path:
 
 from app.server import DB_PATH, db_connect, ensure_bootstrap
 
+SUMMARY_TABLES = (
+    "organizations",
+    "users",
+    "projects",
+    "tasks",
+    "intake_requests",
+    "equipment_assets",
+    "consumables",
+    "partnerships",
+    "meeting_agendas",
+    "meeting_note_sources",
+)
+
 
 def main() -> int:
     db_files = {DB_PATH, Path(f"{DB_PATH}-shm"), Path(f"{DB_PATH}-wal")}
@@ -36,18 +49,10 @@ def main() -> int:
 
     conn = db_connect()
     try:
-        summary = {
-            "organizations": int(conn.execute("SELECT COUNT(*) AS c FROM organizations").fetchone()["c"]),
-            "users": int(conn.execute("SELECT COUNT(*) AS c FROM users").fetchone()["c"]),
-            "projects": int(conn.execute("SELECT COUNT(*) AS c FROM projects").fetchone()["c"]),
-            "tasks": int(conn.execute("SELECT COUNT(*) AS c FROM tasks").fetchone()["c"]),
-            "intake_requests": int(conn.execute("SELECT COUNT(*) AS c FROM intake_requests").fetchone()["c"]),
-            "equipment_assets": int(conn.execute("SELECT COUNT(*) AS c FROM equipment_assets").fetchone()["c"]),
-            "consumables": int(conn.execute("SELECT COUNT(*) AS c FROM consumables").fetchone()["c"]),
-            "partnerships": int(conn.execute("SELECT COUNT(*) AS c FROM partnerships").fetchone()["c"]),
-            "meeting_agendas": int(conn.execute("SELECT COUNT(*) AS c FROM meeting_agendas").fetchone()["c"]),
-            "meeting_note_sources": int(conn.execute("SELECT COUNT(*) AS c FROM meeting_note_sources").fetchone()["c"]),
-        }
+        # One UNION ALL statement instead of a round trip per table; names come from this fixed list.
+        summary_sql = " UNION ALL ".join(f"SELECT '{table}' AS t, COUNT(*) AS c FROM {table}" for table in SUMMARY_TABLES)
+        counts = {str(row["t"]): int(row["c"]) for row in conn.execute(summary_sql).fetchall()}
+        summary = {table: counts[table] for table in SUMMARY_TABLES}
         org = conn.execute("SELECT id, name, slug FROM organizations ORDER BY id LIMIT 1").fetchone()
         admin = conn.execute("SELECT id, email, name FROM users ORDER BY id LIMIT 1").fetchone()
     finally:
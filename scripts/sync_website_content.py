@@ -16,8 +16,9 @@ import datetime as dt
 import json
 import os
 import subprocess
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterator, List, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 WEBSITE_DATA_DIR = REPO_ROOT / "MakerFlow Website" / "data"
@@ -54,78 +55,124 @@ PATH_DESCRIPTIONS: Dict[str, str] = {
     "README.md": "Project overview, local run instructions, and deployment commands.",
 }
 
+CATEGORY_PREFIXES = (
+    ("app/", "Application Code"),
+    ("scripts/", "Automation Script"),
+    ("docs/", "Project Documentation"),
+    ("MakerFlow Website/", "Website and Wiki"),
+    ("data/", "Data and Storage"),
+)
+
+SUFFIX_DESCRIPTIONS: Dict[str, str] = {
+    ".py": "Python source file.",
+    ".js": "Frontend web asset.",
+    ".css": "Frontend web asset.",
+    ".html": "Frontend web asset.",
+    ".svg": "Frontend web asset.",
+    ".md": "Documentation/content file.",
+    ".txt": "Documentation/content file.",
+    ".json": "Data/configuration file.",
+    ".csv": "Data/configuration file.",
+    ".ics": "Data/configuration file.",
+    ".sh": "Shell automation script.",
+}
+
 
-def should_skip(relative_path: str, parts: Iterable[str]) -> bool:
+def should_skip(relative_path: str) -> bool:
+    """File-level exclusions; excluded directories are already pruned by list_directory before descent."""
     if relative_path in EXCLUDED_EXACT_PATHS:
         return True
-    if any(part in EXCLUDED_DIR_NAMES for part in parts):
+    if relative_path.startswith(EXCLUDED_PREFIXES):
         return True
-    if any(relative_path.startswith(prefix) for prefix in EXCLUDED_PREFIXES):
-        return True
-    if Path(relative_path).name in EXCLUDED_FILE_NAMES:
+    # Excluded directory names still apply to files of that name (e.g. a worktree's `.git` file).
+    name = relative_path.rpartition("/")[2]
+    if name in EXCLUDED_FILE_NAMES or name in EXCLUDED_DIR_NAMES:
         return True
     return False
 
 
 def categorize_path(relative_path: str) -> str:
-    if relative_path.startswith("app/"):
-        return "Application Code"
-    if relative_path.startswith("scripts/"):
-        return "Automation Script"
-    if relative_path.startswith("docs/"):
-        return "Project Documentation"
-    if relative_path.startswith("MakerFlow Website/"):
-        return "Website and Wiki"
-    if relative_path.startswith("data/"):
-        return "Data and Storage"
+    for prefix, category in CATEGORY_PREFIXES:
+        if relative_path.startswith(prefix):
+            return category
     return "Project Root"
 
 
+def path_suffix(relative_path: str) -> str:
+    """Lower-cased `Path(relative_path).suffix`, computed on the string without building a Path."""
+    name = relative_path.rpartition("/")[2]
+    dot = name.rfind(".")
+    return name[dot:].lower() if 0 < dot < len(name) - 1 else ""
+
+
 def describe_path(relative_path: str) -> str:
-    if relative_path in PATH_DESCRIPTIONS:
-        return PATH_DESCRIPTIONS[relative_path]
-    suffix = Path(relative_path).suffix.lower()
-    if suffix == ".py":
-        return "Python source file."
-    if suffix in {".js", ".css", ".html", ".svg"}:
-        return "Frontend web asset."
-    if suffix in {".md", ".txt"}:
-        return "Documentation/content file."
-    if suffix in {".json", ".csv", ".ics"}:
-        return "Data/configuration file."
-    if suffix == ".sh":
-        return "Shell automation script."
-    return "Project file."
+    description = PATH_DESCRIPTIONS.get(relative_path)
+    if description is not None:
+        return description
+    return SUFFIX_DESCRIPTIONS.get(path_suffix(relative_path), "Project file.")
+
+
+def list_directory(directory: str, prefix: str) -> Tuple[List[List[object]], List[str]]:
+    """Return ([[file_name, size_bytes], ...], subdir_names) for one directory.
+
+    Uses `os.scandir` directly; entry types come from the directory listing itself (no lstat per
+    entry), symlinks and other non-regular entries are skipped, and excluded directory names are
+    dropped so they are never descended into.
+    """
+    files = []
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDED_DIR_NAMES:
+                    subdirs.append(entry.name)
+            elif entry.is_file(follow_symlinks=False) and not should_skip(f"{prefix}{entry.name}"):
+                # Only files that survive should_skip() pay for a stat call.
+                files.append([entry.name, entry.stat(follow_symlinks=False).st_size])
+    return files, subdirs
+
+
+def iter_repo_files(directory: str, prefix: str) -> Iterator[Tuple[str, List[List[object]]]]:
+    """Yield (prefix, [[file_name, size_bytes], ...]) for `directory` and every directory below it.
+
+    `prefix` is the directory's repo-relative path with a trailing slash ("" for the root); file
+    paths are `prefix + name`, so no `Path` objects are built per entry.
+    """
+    files, subdirs = list_directory(directory, prefix)
+    yield prefix, files
+    for name in subdirs:
+        yield from iter_repo_files(os.path.join(directory, name), f"{prefix}{name}/")
 
 
 def collect_file_map() -> Dict[str, object]:
-    files: List[Dict[str, object]] = []
+    """Walk the repo and return the file map payload.
+
+    The walk only records two parallel lists; entry dicts are built once, in path order, at the end.
+    """
+    paths: List[str] = []
+    sizes: List[int] = []
     directories = set()
 
-    for root, dirnames, filenames in os.walk(REPO_ROOT):
-        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIR_NAMES]
-        root_path = Path(root)
-        for filename in filenames:
-            full_path = root_path / filename
-            relative = full_path.relative_to(REPO_ROOT).as_posix()
-            parts = Path(relative).parts
-            if should_skip(relative, parts):
-                continue
-            directories.add(str(Path(relative).parent.as_posix()))
-            files.append(
-                {
-                    "path": relative,
-                    "category": categorize_path(relative),
-                    "description": describe_path(relative),
-                    "size_bytes": full_path.stat().st_size,
-                }
-            )
-
-    files.sort(key=lambda item: str(item["path"]))
+    for prefix, dir_files in iter_repo_files(str(REPO_ROOT), ""):
+        if dir_files:
+            directories.add(prefix[:-1] or ".")
+        for name, size in dir_files:
+            paths.append(f"{prefix}{name}")
+            sizes.append(size)
+
+    files = [
+        {
+            "path": relative,
+            "category": categorize_path(relative),
+            "description": describe_path(relative),
+            "size_bytes": size,
+        }
+        for relative, size in sorted(zip(paths, sizes), key=itemgetter(0))
+    ]
     return {
         "generated_at": dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat(),
         "stats": {
-            "file_count": len(files),
+            "file_count": len(paths),
             "directory_count": len(directories),
         },
         "files": files,
@@ -140,31 +187,34 @@ def collect_release_updates() -> Dict[str, object]:
         }
     ]
     try:
-        completed = subprocess.run(
+        # Stream the log line by line instead of buffering it; -s and --no-renames rule out any diff work.
+        entries = []
+        with subprocess.Popen(
             [
                 "git",
                 "-C",
                 str(REPO_ROOT),
                 "log",
+                "--no-renames",
+                "--no-decorate",
+                "-s",
                 "--date=short",
                 "--pretty=format:%h|%ad|%s",
                 "-n",
                 "40",
             ],
-            check=False,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-        )
-        if completed.returncode != 0:
-            raise RuntimeError(completed.stderr.strip() or "git log failed")
-        lines = [line.strip() for line in completed.stdout.splitlines() if line.strip()]
-        entries = []
-        for line in lines:
-            parts = line.split("|", 2)
-            if len(parts) != 3:
-                continue
-            commit_id, commit_date, subject = parts
-            entries.append({"date": commit_date, "summary": f"{subject} ({commit_id})"})
+        ) as proc:
+            for line in proc.stdout:
+                parts = line.strip().split("|", 2)
+                if len(parts) != 3:
+                    continue
+                commit_id, commit_date, subject = parts
+                entries.append({"date": commit_date, "summary": f"{subject} ({commit_id})"})
+        if proc.returncode != 0:
+            raise RuntimeError("git log failed")
         if not entries:
             entries = default_entry
     except Exception:
@@ -13,14 +13,15 @@ import argparse
 import re
 import sqlite3
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.server import db_connect, ensure_bootstrap
+from app.server import begin_immediate, db_connect, ensure_bootstrap
 
 DEFAULT_MARKERS: Sequence[str] = ("qa", "sim", "sample")
 
@@ -33,9 +34,13 @@ def build_marker_pattern(markers: Sequence[str]) -> re.Pattern[str]:
     - Standalone words: QA, SIM, SAMPLE, SIMULATION
     - Known synthetic email patterns used by local scripts.
     """
-    marker_tokens = [m.strip().lower() for m in markers if m and m.strip()]
-    if not marker_tokens:
-        marker_tokens = list(DEFAULT_MARKERS)
+    marker_tokens = tuple(m.strip().lower() for m in markers if m and m.strip())
+    return _compile_marker_pattern(marker_tokens or tuple(DEFAULT_MARKERS))
+
+
+@lru_cache(maxsize=8)
+def _compile_marker_pattern(marker_tokens: Tuple[str, ...]) -> re.Pattern[str]:
+    """Build and compile the verbose marker regex once per distinct token set."""
     token_union = "|".join(re.escape(token) for token in marker_tokens)
 
     return re.compile(
@@ -53,39 +58,53 @@ def build_marker_pattern(markers: Sequence[str]) -> re.Pattern[str]:
     )
 
 
-def table_names(conn: sqlite3.Connection) -> List[str]:
-    rows = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
-    ).fetchall()
-    return [str(row["name"]) for row in rows]
+# Compiled at import; build_marker_pattern(DEFAULT_MARKERS) returns this same cached object.
+DEFAULT_MARKER_PATTERN = build_marker_pattern(DEFAULT_MARKERS)
 
 
-def table_columns(conn: sqlite3.Connection, table: str) -> List[sqlite3.Row]:
-    return conn.execute(f"PRAGMA table_info({table})").fetchall()
+def columns_by_table(conn: sqlite3.Connection) -> Dict[str, List[sqlite3.Row]]:
+    """Read every user table's columns in one query via the pragma_table_info table-valued function."""
+    rows = conn.execute(
+        """
+        SELECT m.name AS table_name, p.name AS name, p.type AS type
+        FROM sqlite_master AS m
+        JOIN pragma_table_info(m.name) AS p
+        WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+        ORDER BY m.name, p.cid
+        """
+    ).fetchall()
+    tables: Dict[str, List[sqlite3.Row]] = {}
+    for row in rows:
+        tables.setdefault(str(row["table_name"]), []).append(row)
+    return tables
 
 
-def text_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+def text_columns(columns: Sequence[sqlite3.Row]) -> List[str]:
     names: List[str] = []
-    for row in table_columns(conn, table):
+    for row in columns:
         col_type = str(row["type"] or "").upper()
         if "TEXT" in col_type:
             names.append(str(row["name"]))
     return names
 
 
-def primary_identifier(conn: sqlite3.Connection, table: str) -> str:
-    cols = table_columns(conn, table)
-    names = [str(row["name"]) for row in cols]
-    if "id" in names:
+def primary_identifier(columns: Sequence[sqlite3.Row]) -> str:
+    if has_column(columns, "id"):
         return "id"
     return "rowid"
 
 
-def has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
-    return any(str(row["name"]) == column for row in table_columns(conn, table))
+def has_column(columns: Sequence[sqlite3.Row], column: str) -> bool:
+    return any(str(row["name"]) == column for row in columns)
+
 
+def deletion_order(all_tables: Iterable[str]) -> Tuple[str, ...]:
+    """Children first, then parents, then any remaining tables; memoized on the table set."""
+    return _deletion_order_cached(tuple(sorted(all_tables)))
 
-def deletion_order(all_tables: Iterable[str]) -> List[str]:
+
+@lru_cache(maxsize=8)
+def _deletion_order_cached(all_tables: Tuple[str, ...]) -> Tuple[str, ...]:
     ordered = [
         "meeting_items",
         "onboarding_assignments",
@@ -116,25 +135,31 @@ def deletion_order(all_tables: Iterable[str]) -> List[str]:
         "users",
         "insight_snapshots",
     ]
+    present = set(all_tables)
     seen = set()
     result: List[str] = []
     for table in ordered:
-        if table in all_tables and table not in seen:
+        if table in present and table not in seen:
             result.append(table)
             seen.add(table)
-    for table in sorted(all_tables):
+    for table in all_tables:
         if table not in seen and table != "organizations":
             result.append(table)
-    return result
+    return tuple(result)
+
 
+def register_marker_function(conn: sqlite3.Connection, pattern: re.Pattern[str]) -> None:
+    """Expose the marker regex to SQL as `marker_match(value)` so rows are filtered inside SQLite."""
 
-def row_has_marker(values: Iterable[object], pattern: re.Pattern[str]) -> bool:
-    for value in values:
+    search = pattern.search
+
+    def marker_match(value: object) -> int:
+        # Called once per text cell: skip the str() coercion for values that are already text.
         if value is None:
-            continue
-        if pattern.search(str(value)):
-            return True
-    return False
+            return 0
+        return 1 if search(value if type(value) is str else str(value)) else 0
+
+    conn.create_function("marker_match", 1, marker_match, deterministic=True)
 
 
 def collect_matching_ids(
@@ -145,29 +170,61 @@ def collect_matching_ids(
     pattern: re.Pattern[str],
     organization_id: Optional[int],
 ) -> List[int]:
-    scoped = has_column(conn, table, "organization_id") and organization_id is not None
-    where = " WHERE organization_id = ?" if scoped else ""
+    """Return ids of marker rows; `organization_id` must only be passed for tables that have that column."""
+    scoped = organization_id is not None
+    marker_where = " OR ".join(f"marker_match({col})" for col in text_cols)
+    where = f" WHERE organization_id = ? AND ({marker_where})" if scoped else f" WHERE {marker_where}"
     params: tuple = (organization_id,) if scoped else ()
-    sql = f"SELECT {id_col} AS row_id, {', '.join(text_cols)} FROM {table}{where}"
+    # Only matching ids cross back into Python; non-matching rows never leave SQLite.
+    register_marker_function(conn, pattern)
+    sql = f"SELECT {id_col} FROM {table}{where}"
 
+    # Plain tuples for this cursor only: the id is read positionally, so sqlite3.Row's name lookup is wasted.
+    cursor = conn.cursor()
+    cursor.row_factory = None
     matches: List[int] = []
-    for row in conn.execute(sql, params).fetchall():
-        values = [row[col] for col in text_cols]
-        if row_has_marker(values, pattern):
-            try:
-                matches.append(int(row["row_id"]))
-            except (TypeError, ValueError):
-                continue
+    for (row_id,) in cursor.execute(sql, params):
+        try:
+            matches.append(int(row_id))
+        except (TypeError, ValueError):
+            continue
     return matches
 
 
+def id_runs(ids: Sequence[int]) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """Split ids into runs of consecutive values (lo, hi) and the isolated ids left over."""
+    runs: List[Tuple[int, int]] = []
+    singles: List[int] = []
+    ordered = sorted(set(ids))
+    if not ordered:
+        return runs, singles
+    lo = hi = ordered[0]
+    for value in ordered[1:] + [None]:
+        if value is not None and value == hi + 1:
+            hi = value
+            continue
+        if hi > lo:
+            runs.append((lo, hi))
+        else:
+            singles.append(lo)
+        if value is not None:
+            lo = hi = value
+    return runs, singles
+
+
 def delete_rows(conn: sqlite3.Connection, table: str, id_col: str, ids: Sequence[int]) -> int:
     if not ids:
         return 0
     total = 0
+    # Test rows are created in bursts, so most ids form consecutive runs: one range scan per run
+    # replaces an index probe per id. Every id inside a run is a matched id, so BETWEEN is exact.
+    runs, singles = id_runs(ids)
+    for lo, hi in runs:
+        cursor = conn.execute(f"DELETE FROM {table} WHERE {id_col} BETWEEN ? AND ?", (lo, hi))
+        total += int(cursor.rowcount or 0)
     chunk_size = 250
-    for start in range(0, len(ids), chunk_size):
-        chunk = ids[start : start + chunk_size]
+    for start in range(0, len(singles), chunk_size):
+        chunk = singles[start : start + chunk_size]
         placeholders = ", ".join(["?"] * len(chunk))
         cursor = conn.execute(f"DELETE FROM {table} WHERE {id_col} IN ({placeholders})", tuple(chunk))
         total += int(cursor.rowcount or 0)
@@ -183,14 +240,20 @@ def cleanup_test_data(
     """Delete marker-matching test rows and return counts by table."""
     pattern = build_marker_pattern(markers)
     counts: Dict[str, int] = {}
-    tables = table_names(conn)
+    # One write transaction for the sweep: the marker scans and every DELETE share a snapshot and a
+    # single commit. db_connect() already applies the WAL/NORMAL/temp_store PRAGMAs.
+    if not dry_run:
+        begin_immediate(conn)
+    tables = columns_by_table(conn)
 
     for table in deletion_order(tables):
-        txt_cols = text_columns(conn, table)
+        columns = tables[table]
+        txt_cols = text_columns(columns)
         if not txt_cols:
             continue
-        id_col = primary_identifier(conn, table)
-        ids = collect_matching_ids(conn, table, id_col, txt_cols, pattern, organization_id)
+        id_col = primary_identifier(columns)
+        scope_id = organization_id if has_column(columns, "organization_id") else None
+        ids = collect_matching_ids(conn, table, id_col, txt_cols, pattern, scope_id)
         if not ids:
             continue
         counts[table] = len(ids) if dry_run else delete_rows(conn, table, id_col, ids)
@@ -10,6 +10,7 @@ import io
 import os
 import re
 import sys
+from collections import Counter
 from pathlib import Path
 from urllib.parse import urlencode
 
@@ -97,6 +98,17 @@ ROUTES = [
 if FEATURE_INTAKE_ENABLED:
     ROUTES.insert(8, "/intake")
 
+# Every page check is a marker count, so one alternation pass over the body replaces a scan per marker.
+PAGE_MARKERS = (
+    "<h1>",
+    "class='kanban-col'",
+    'class="kanban-col"',
+    'id="task-search"',
+    "Quick Add Task",
+    "My Daily Focus",
+)
+PAGE_MARKER_RE = re.compile("|".join(re.escape(marker) for marker in PAGE_MARKERS))
+
 
 def find_csrf(html):
     m = re.search(r'name="csrf_token"\s+value="([^"]+)"', html)
@@ -105,21 +117,22 @@ def find_csrf(html):
 
 def main():
     ensure_bootstrap()
-    setup_conn = db_connect()
-    org = setup_conn.execute("SELECT id FROM organizations WHERE slug = ?", (DEFAULT_ORG_SLUG,)).fetchone()
+    # One connection for setup and cleanup; it sits idle with no open transaction while the app runs.
+    conn = db_connect()
+    org = conn.execute("SELECT id FROM organizations WHERE slug = ?", (DEFAULT_ORG_SLUG,)).fetchone()
     if not org:
         raise SystemExit(f"Missing required org slug '{DEFAULT_ORG_SLUG}'")
     org_id = int(org["id"])
-    admin = setup_conn.execute("SELECT id FROM users WHERE email = ?", (DEFAULT_ADMIN_EMAIL,)).fetchone()
+    admin = conn.execute("SELECT id FROM users WHERE email = ?", (DEFAULT_ADMIN_EMAIL,)).fetchone()
     if not admin:
         raise SystemExit(f"Missing {DEFAULT_ADMIN_EMAIL} account")
     pw_hash, pw_salt = hash_password(DEFAULT_ADMIN_PASSWORD)
-    setup_conn.execute(
+    conn.execute(
         "UPDATE users SET password_hash = ?, password_salt = ?, is_active = 1 WHERE id = ?",
         (pw_hash, pw_salt, int(admin["id"])),
     )
     temp_task_title = "[QA CASE] Usability Temp Task"
-    setup_conn.execute(
+    conn.execute(
         """
         INSERT INTO tasks
         (organization_id, project_id, title, description, status, priority, assignee_user_id, reporter_user_id, due_date, planned_week, energy, estimate_hours, meta_json, created_at, updated_at)
@@ -127,9 +140,8 @@ def main():
         """,
         (org_id, temp_task_title, "Temporary task for usability script update-flow check.", int(admin["id"]), iso(), iso()),
     )
-    temp_task_id = int(setup_conn.execute("SELECT last_insert_rowid() AS id").fetchone()["id"])
-    setup_conn.commit()
-    setup_conn.close()
+    temp_task_id = int(conn.execute("SELECT last_insert_rowid() AS id").fetchone()["id"])
+    conn.commit()
 
     client = WSGIClient()
     try:
@@ -151,21 +163,21 @@ def main():
                 findings.append({"route": route, "severity": "high", "issue": f"status {status}"})
                 continue
 
-            if "<h1>" not in body:
+            markers = Counter(match.group() for match in PAGE_MARKER_RE.finditer(body))
+            if not markers["<h1>"]:
                 findings.append({"route": route, "severity": "medium", "issue": "missing primary heading"})
 
-            row_count = body.count("<tr>")
             if route in {"/projects", "/tasks"}:
-                column_count = body.count("class='kanban-col'") + body.count('class=\"kanban-col\"')
+                column_count = markers["class='kanban-col'"] + markers['class="kanban-col"']
                 if column_count < 3:
                     findings.append({"route": route, "severity": "high", "issue": "kanban columns not rendering"})
 
-            if route == "/tasks" and "id=\"task-search\"" not in body:
+            if route == "/tasks" and not markers['id="task-search"']:
                 findings.append({"route": route, "severity": "medium", "issue": "task search control missing"})
-            if route == "/tasks" and "Quick Add Task" not in body:
+            if route == "/tasks" and not markers["Quick Add Task"]:
                 findings.append({"route": route, "severity": "medium", "issue": "quick-add composer missing"})
 
-            if route == "/dashboard" and "My Daily Focus" not in body:
+            if route == "/dashboard" and not markers["My Daily Focus"]:
                 findings.append({"route": route, "severity": "high", "issue": "key panel missing"})
 
         # update disposable QA task to validate action flow without mutating production tasks
@@ -196,12 +208,11 @@ def main():
         }
         print("USABILITY_TEST_SUMMARY", summary)
     finally:
-        cleanup_conn = db_connect()
         try:
-            cleanup_counts = cleanup_test_data(cleanup_conn, organization_id=org_id)
+            cleanup_counts = cleanup_test_data(conn, organization_id=org_id)
             print("TEST_DATA_CLEANUP", summarize_counts(cleanup_counts))
         finally:
-            cleanup_conn.close()
+            conn.close()
 
 
 if __name__ == "__main__":